@@ -10,6 +10,7 @@ import multiprocessing
 import os
 import signal
 import sys
+import time
 from collections.abc import Callable
 from pathlib import Path
 
@@ -26,16 +27,18 @@ from cmk.checkengine.plugin_backend import (
     extract_known_discovery_rulesets,
 )
 from cmk.checkengine.plugins import AgentBasedPlugins
+from cmk.utils import paths
 from cmk.utils.caching import cache_manager
 from cmk.utils.labels import Labels
 from cmk.utils.paths import omd_root
 from cmk.utils.redis import get_redis_client
 
-from ._app import make_application
+from ._app import make_application, PreloadedConfig
 from ._cache import Cache
-from ._config import config_from_disk_or_default_config
+from ._config import Config, config_from_disk_or_default_config
 from ._log import configure_logger, LOGGER
 from ._server import run as run_server
+from ._supervisor import run as run_supervisor
 from ._tracer import configure_tracer
 from ._watcher import run as run_watcher
 
@@ -73,7 +76,6 @@ def _main() -> int:
         signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
 
     with pid_file_lock(config.server_config.pid_file):
-        configure_tracer(omd_root)
         configure_logger(log_directory)
 
         config = config_from_disk_or_default_config(
@@ -82,23 +84,40 @@ def _main() -> int:
             log_directory=log_directory,
         )
 
-        with run_watcher(
-            config.watcher_config,
-            Cache.setup(client=get_redis_client()),
-        ):
-            try:
-                run_server(
+        try:
+            if config.server_config.preload:
+                # The supervisor forks the workers, so it must not start any threads itself.
+                cache_manager.set_limits(config.cache_limits, collect_statistics=True)
+                run_supervisor(
                     config.server_config,
-                    f"cmk.base.automation_helper:{_application.__name__}",
+                    config.reloader_config,
+                    cache=Cache.setup(client=get_redis_client()),
+                    load=_preload_automation_config,
+                    make_application=lambda preloaded: _make_application(config, preloaded),
+                    configure_worker=lambda: configure_tracer(omd_root),
+                    watch=lambda: run_watcher(
+                        config.watcher_config,
+                        Cache.setup(client=get_redis_client()),
+                    ),
                 )
-                raise SystemExit(0)
-            # in case of multiple workers: raised by us in the line above
-            # in case of a single worker: re-raised by uvicorn when shutting down
-            except SystemExit as system_exit:
-                if isinstance(system_exit.code, int):
-                    exit_code = system_exit.code
-
-            LOGGER.info("Received termination signal, shutting down")
+            else:
+                configure_tracer(omd_root)
+                with run_watcher(
+                    config.watcher_config,
+                    Cache.setup(client=get_redis_client()),
+                ):
+                    run_server(
+                        config.server_config,
+                        f"cmk.base.automation_helper:{_application.__name__}",
+                    )
+            raise SystemExit(0)
+        # in case of multiple workers: raised by us in the line above
+        # in case of a single worker: re-raised by uvicorn when shutting down
+        except SystemExit as system_exit:
+            if isinstance(system_exit.code, int):
+                exit_code = system_exit.code
+
+        LOGGER.info("Received termination signal, shutting down")
 
     return exit_code
 
@@ -120,12 +139,38 @@ def _application() -> FastAPI:
         configure_tracer(omd_root)
         configure_logger(omd_root / _RELATIVE_LOG_DIRECTORY)
 
+    cache_manager.set_limits(config.cache_limits, collect_statistics=True)
+
+    return _make_application(config, None)
+
+
+def _make_application(config: Config, preloaded: PreloadedConfig | None) -> FastAPI:
     return make_application(
         engine=make_app(cmk_version.edition(omd_root)).automations,
         cache=Cache.setup(client=get_redis_client()),
-        reloader_config=config.reloader_config,
+        reloader_config=(
+            config.reloader_config
+            if preloaded is None
+            # The supervisor reloads the configuration and replaces the worker
+            else config.reloader_config.model_copy(update={"active": False})
+        ),
         reload_config=_reload_automation_config,
         clear_caches_before_each_call=_clear_caches_before_each_call,
+        preloaded=preloaded,
+    )
+
+
+def _preload_automation_config(plugins: AgentBasedPlugins | None) -> PreloadedConfig:
+    # Do not set the time after loading, we might miss changes made in the meantime.
+    loaded_at = time.time()
+    if plugins is None:
+        plugins = config.load_all_pluginX(paths.checks_dir)
+    return PreloadedConfig(
+        plugins=plugins,
+        loading_result=_reload_automation_config(
+            plugins, make_app(cmk_version.edition(omd_root)).get_builtin_host_labels
+        ),
+        loaded_at=loaded_at,
     )
 
 
@@ -7,7 +7,7 @@ import asyncio
 import io
 import sys
 import time
-from collections.abc import AsyncGenerator, Awaitable, Callable, Iterator
+from collections.abc import AsyncGenerator, Awaitable, Callable, Iterator, Mapping
 from contextlib import asynccontextmanager, contextmanager, redirect_stderr, redirect_stdout
 from dataclasses import dataclass
 from typing import assert_never, Protocol
@@ -28,6 +28,7 @@ from cmk.ccc import version as cmk_version
 from cmk.ccc.site import SiteId
 from cmk.checkengine.plugins import AgentBasedPlugins
 from cmk.utils import paths
+from cmk.utils.caching import cache_manager, CacheStatistics
 from cmk.utils.labels import Labels
 from cmk.utils.log import logger as cmk_logger
 
@@ -78,12 +79,23 @@ class _State:
                 raise
 
 
+@dataclass(frozen=True)
+class PreloadedConfig:
+    """Plugins and configuration loaded before the application is created"""
+
+    plugins: AgentBasedPlugins
+    loading_result: config.LoadingResult
+    loaded_at: float
+
+
 @dataclass(frozen=True)
 class _ApplicationDependencies:
     automation_engine: AutomationEngine
     changes_cache: Cache
     reloader_config: ReloaderConfig
     clear_caches_before_each_call: Callable[[ConfigCache], None]
+    # Preloaded workers keep their configuration, the supervisor replaces them after reloading it
+    reload_stale_config: bool
     state: _State
 
 
@@ -91,6 +103,10 @@ class HealthCheckResponse(BaseModel, frozen=True):
     last_reload_at: float
 
 
+class CacheStatisticsResponse(BaseModel, frozen=True):
+    caches: Mapping[str, CacheStatistics]
+
+
 def make_application(
     *,
     engine: AutomationEngine,
@@ -104,6 +120,7 @@ def make_application(
         config.LoadingResult,
     ],
     clear_caches_before_each_call: Callable[[ConfigCache], None],
+    preloaded: PreloadedConfig | None = None,
 ) -> FastAPI:
     app = FastAPI(
         lifespan=_lifespan,
@@ -127,12 +144,13 @@ def make_application(
         changes_cache=cache,
         reloader_config=reloader_config,
         clear_caches_before_each_call=clear_caches_before_each_call,
+        reload_stale_config=preloaded is None,
         state=_State(
             automation_or_reload_lock=asyncio.Lock(),
             reload_config=reload_config,
-            last_reload_at=0,
-            plugins=None,
-            loading_result=None,
+            last_reload_at=preloaded.loaded_at if preloaded else 0,
+            plugins=preloaded.plugins if preloaded else None,
+            loading_result=preloaded.loading_result if preloaded else None,
             get_builtin_host_labels=make_app(
                 cmk_version.edition(paths.omd_root)
             ).get_builtin_host_labels,
@@ -141,6 +159,7 @@ def make_application(
 
     app.post("/automation")(_automation_endpoint)
     app.get("/health")(_health_endpoint)
+    app.get("/cache-statistics")(_cache_statistics_endpoint)
 
     FastAPIInstrumentor.instrument_app(app)
 
@@ -151,8 +170,9 @@ def make_application(
 async def _lifespan(app: FastAPI) -> AsyncGenerator[None]:
     dependencies: _ApplicationDependencies = app.state.dependencies
 
-    # Continue on error. Either the reloader can fix it, or we will raise in the automation endpoint.
-    dependencies.state.load_new(continue_on_error=True)
+    if dependencies.state.loading_result is None:
+        # Continue on error. Either the reloader can fix it, or we will raise in the automation endpoint.
+        dependencies.state.load_new(continue_on_error=True)
 
     tty.reinit()
 
@@ -236,6 +256,7 @@ async def _automation_endpoint(request: Request, payload: AutomationPayload) ->
             dependencies.changes_cache,
             dependencies.clear_caches_before_each_call,
             dependencies.state,
+            reload_stale_config=dependencies.reload_stale_config,
         )
 
 
@@ -245,13 +266,15 @@ def _execute_automation_endpoint(
     cache: Cache,
     clear_caches_before_each_call: Callable[[ConfigCache], None],
     state: _State,
+    *,
+    reload_stale_config: bool,
 ) -> AutomationResponse:
     LOGGER.info(
         '[automation] Processing automation command "%s" with args: %s',
         payload.name,
         payload.args,
     )
-    if cache.reload_required(state.last_reload_at):
+    if reload_stale_config and cache.reload_required(state.last_reload_at):
         try:
             state.load_new(continue_on_error=False)
             LOGGER.warning("[automation] configurations were reloaded due to a stale state.")
@@ -349,3 +372,7 @@ def _redirect_stdin(stream: io.StringIO) -> Iterator[None]:
 async def _health_endpoint(request: Request) -> HealthCheckResponse:
     dependencies: _ApplicationDependencies = request.app.state.dependencies
     return HealthCheckResponse(last_reload_at=dependencies.state.last_reload_at)
+
+
+async def _cache_statistics_endpoint() -> CacheStatisticsResponse:
+    return CacheStatisticsResponse(caches=cache_manager.statistics())
@@ -3,11 +3,13 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
 from pathlib import Path
 
 from pydantic import BaseModel
 
+from cmk.utils.caching import CacheLimits
+
 RELATIVE_CONFIG_PATH_FOR_TESTING = "automation_helper_config.json"
 
 
@@ -18,6 +20,8 @@ class ServerConfig(BaseModel, frozen=True):
     access_log: Path
     error_log: Path
     num_workers: int
+    # Load the configuration once and fork the workers afterwards, see `_supervisor`
+    preload: bool = False
 
 
 class Schedule(BaseModel, frozen=True):
@@ -41,6 +45,7 @@ class Config(BaseModel, frozen=True):
     server_config: ServerConfig
     watcher_config: WatcherConfig
     reloader_config: ReloaderConfig
+    cache_limits: Mapping[str, CacheLimits] = {}
 
 
 def default_config(
@@ -68,6 +73,7 @@ def default_config(
             # possible that the reloader task is never executed. This is not a problem, since the
             # automation endpoint anyway reloads on its own if needed.
             num_workers=2,
+            preload=True,
         ),
         watcher_config=WatcherConfig(
             schedules=[
@@ -108,6 +114,14 @@ def default_config(
             poll_interval=1.0,
             cooldown_interval=5.0,
         ),
+        # The caches of cmk.base are only flushed when the configuration is reloaded.
+        # Bound the ones growing with the number of hosts and services.
+        cache_limits={
+            "check_tables": CacheLimits(maxsize=10_000),
+            "final_service_description": CacheLimits(maxsize=100_000),
+            "service_description_translations": CacheLimits(maxsize=10_000),
+            "strip_tags": CacheLimits(maxsize=10_000),
+        },
     )
 
 
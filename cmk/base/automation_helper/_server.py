@@ -17,7 +17,7 @@ def run(
     config: ServerConfig,
     application_factory_import_path: str,
 ) -> None:
-    with _provide_unix_socket(
+    with provide_unix_socket(
         path=config.unix_socket_path,
         permissions=config.unix_socket_permissions,
     ) as socket_file_descriptor:
@@ -27,53 +27,57 @@ def run(
             fd=socket_file_descriptor,
             workers=config.num_workers,
             timeout_graceful_shutdown=30,
-            log_config={
-                "version": 1,
-                "disable_existing_loggers": False,
-                "formatters": {
-                    "default": {
-                        "()": "uvicorn.logging.DefaultFormatter",
-                        "fmt": "%(asctime)s [%(levelno)s] [%(process)d] %(message)s",
-                        "use_colors": None,
-                    },
-                    "access": {
-                        "()": "uvicorn.logging.AccessFormatter",
-                        "fmt": "%(asctime)s %(message)s",
-                    },
-                },
-                "handlers": {
-                    "default": {
-                        "class": "logging.FileHandler",
-                        "filename": str(config.error_log),
-                        "formatter": "default",
-                    },
-                    "access": {
-                        "class": "logging.FileHandler",
-                        "filename": str(config.access_log),
-                        "formatter": "access",
-                    },
-                },
-                "loggers": {
-                    "uvicorn": {
-                        "handlers": ["default"],
-                        "level": "INFO",
-                        "propagate": False,
-                    },
-                    "uvicorn.error": {
-                        "level": "INFO",
-                    },
-                    "uvicorn.access": {
-                        "handlers": ["access"],
-                        "level": "INFO",
-                        "propagate": False,
-                    },
-                },
-            },
+            log_config=log_config(config),
         )
 
 
+def log_config(config: ServerConfig) -> dict[str, object]:
+    return {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": {
+            "default": {
+                "()": "uvicorn.logging.DefaultFormatter",
+                "fmt": "%(asctime)s [%(levelno)s] [%(process)d] %(message)s",
+                "use_colors": None,
+            },
+            "access": {
+                "()": "uvicorn.logging.AccessFormatter",
+                "fmt": "%(asctime)s %(message)s",
+            },
+        },
+        "handlers": {
+            "default": {
+                "class": "logging.FileHandler",
+                "filename": str(config.error_log),
+                "formatter": "default",
+            },
+            "access": {
+                "class": "logging.FileHandler",
+                "filename": str(config.access_log),
+                "formatter": "access",
+            },
+        },
+        "loggers": {
+            "uvicorn": {
+                "handlers": ["default"],
+                "level": "INFO",
+                "propagate": False,
+            },
+            "uvicorn.error": {
+                "level": "INFO",
+            },
+            "uvicorn.access": {
+                "handlers": ["access"],
+                "level": "INFO",
+                "propagate": False,
+            },
+        },
+    }
+
+
 @contextmanager
-def _provide_unix_socket(path: Path, permissions: int) -> Generator[int]:
+def provide_unix_socket(path: Path, permissions: int) -> Generator[int]:
     try:
         with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
             path.unlink(missing_ok=True)  # Handle stale socket files
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+"""Preload-then-fork worker model
+
+The supervisor loads the plugins and the configuration once and forks the workers afterwards.
+The workers share the memory pages holding the loaded configuration copy-on-write, instead of
+loading it on their own. Before forking, the loaded objects are moved to the permanent generation
+of the garbage collector, so that the collections in the workers do not touch (and thus copy)
+the shared pages.
+
+When the configuration changes, the supervisor loads it again and replaces the workers one by
+one, so that the others keep serving requests in the meantime. Until they are replaced, the workers
+serve the requests with their previous configuration instead of loading it on their own.
+
+Forking a process with running threads only copies the forking thread, the locks held by the
+others are never released in the child. So the supervisor runs no threads at all: the watcher
+runs in a process of its own, and every worker configures its threads (e.g. the tracer) after
+forking, see `configure_worker`.
+"""
+
+import gc
+import os
+import signal
+import time
+from collections.abc import Callable, Sequence
+from contextlib import AbstractContextManager
+from pathlib import Path
+from types import FrameType
+from typing import NoReturn
+
+import uvicorn
+from fastapi import FastAPI
+from setproctitle import setproctitle
+
+from cmk.checkengine.plugins import AgentBasedPlugins
+
+from ._app import PreloadedConfig
+from ._cache import Cache, CacheError
+from ._config import ReloaderConfig, ServerConfig
+from ._log import LOGGER
+from ._server import log_config, provide_unix_socket
+
+
+def run(
+    server_config: ServerConfig,
+    reloader_config: ReloaderConfig,
+    *,
+    cache: Cache,
+    load: Callable[[AgentBasedPlugins | None], PreloadedConfig],
+    make_application: Callable[[PreloadedConfig | None], FastAPI],
+    configure_worker: Callable[[], None],
+    watch: Callable[[], AbstractContextManager[None]],
+) -> None:
+    with provide_unix_socket(
+        path=server_config.unix_socket_path,
+        permissions=server_config.unix_socket_permissions,
+    ) as socket_file_descriptor:
+        _Supervisor(
+            server_config,
+            socket_file_descriptor,
+            load=load,
+            make_application=make_application,
+            configure_worker=configure_worker,
+            watch=watch,
+        ).run(reloader_config, cache)
+
+
+class _Supervisor:
+    def __init__(
+        self,
+        config: ServerConfig,
+        socket_file_descriptor: int,
+        *,
+        load: Callable[[AgentBasedPlugins | None], PreloadedConfig],
+        make_application: Callable[[PreloadedConfig | None], FastAPI],
+        configure_worker: Callable[[], None],
+        watch: Callable[[], AbstractContextManager[None]],
+    ) -> None:
+        self._config = config
+        self._socket_file_descriptor = socket_file_descriptor
+        self._load = load
+        self._make_application = make_application
+        self._configure_worker = configure_worker
+        self._watch = watch
+        self._watcher = 0
+        self._preloaded: PreloadedConfig | None = None
+        self._last_load_attempt_at = 0.0
+        self._workers: list[int] = []
+        self._should_exit = False
+
+    def run(self, reloader_config: ReloaderConfig, cache: Cache) -> None:
+        signal.signal(signal.SIGTERM, self._handle_exit)
+        signal.signal(signal.SIGINT, self._handle_exit)
+
+        self._watcher = self._start_watcher()
+        # Without the configuration, the workers load it on their own, see `make_application`.
+        self._preload()
+        self._workers = [self._start_worker() for _ in range(self._config.num_workers)]
+        try:
+            while not self._should_exit:
+                time.sleep(reloader_config.poll_interval)
+                if (status := _exit_status(self._watcher)) is not None:
+                    LOGGER.error(
+                        "[supervisor] Watcher %d exited with status %d", self._watcher, status
+                    )
+                    self._watcher = self._start_watcher()
+                self._restart_exited_workers()
+                if self._reload_required(cache, reloader_config.cooldown_interval):
+                    LOGGER.info("[supervisor] Reloading configuration")
+                    if self._preload():
+                        self._replace_workers()
+        finally:
+            self._stop_workers(self._workers)
+            _stop_processes([self._watcher])
+
+    def _handle_exit(self, _signum: int, _frame: FrameType | None) -> None:
+        self._should_exit = True
+
+    def _reload_required(self, cache: Cache, cooldown_interval: float) -> bool:
+        """Whether the configuration has changed since we tried loading it and then settled"""
+        try:
+            last_change = cache.get_last_detected_change()
+        except CacheError as err:
+            LOGGER.error("[supervisor] Cache failure", exc_info=err)
+            return False
+        return last_change >= self._last_load_attempt_at and (
+            time.time() - last_change >= cooldown_interval
+        )
+
+    def _preload(self) -> bool:
+        self._last_load_attempt_at = time.time()
+        try:
+            preloaded = self._load(self._preloaded.plugins if self._preloaded else None)
+        except Exception as e:
+            LOGGER.error("[supervisor] Error loading configuration: %s", e)
+            return False
+
+        # The previous configuration is only needed by the workers about to be replaced, which
+        # have their own copy anyway.
+        gc.unfreeze()
+        self._preloaded = preloaded
+        gc.collect()
+        gc.freeze()
+        return True
+
+    def _start_watcher(self) -> int:
+        if pid := os.fork():
+            LOGGER.info("[supervisor] Started watcher %d", pid)
+            return pid
+        self._run_watcher()
+
+    def _run_watcher(self) -> NoReturn:
+        exit_code = 0
+        try:
+            setproctitle("cmk-automation-helper[watcher]")
+            # The inherited signal handlers set `_should_exit` of our copy of the supervisor
+            with self._watch():
+                while not self._should_exit:
+                    time.sleep(1)
+        except BaseException:
+            LOGGER.exception("[watcher] Unexpected error")
+            exit_code = 1
+        finally:
+            # Never return to the code of the supervisor
+            os._exit(exit_code)
+
+    def _start_worker(self) -> int:
+        if pid := os.fork():
+            LOGGER.info("[supervisor] Started worker %d", pid)
+            return pid
+        self._run_worker()
+
+    def _run_worker(self) -> NoReturn:
+        exit_code = 0
+        try:
+            setproctitle("cmk-automation-helper[worker]")
+            # uvicorn installs its own handlers for a graceful shutdown
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            self._configure_worker()
+            uvicorn.Server(
+                uvicorn.Config(
+                    self._make_application(self._preloaded),
+                    fd=self._socket_file_descriptor,
+                    timeout_graceful_shutdown=30,
+                    log_config=log_config(self._config),
+                )
+            ).run()
+        except BaseException:
+            LOGGER.exception("[worker] Unexpected error")
+            exit_code = 1
+        finally:
+            # Never return to the code of the supervisor
+            os._exit(exit_code)
+
+    def _restart_exited_workers(self) -> None:
+        for index, pid in enumerate(self._workers):
+            if (status := _exit_status(pid)) is not None:
+                LOGGER.error("[supervisor] Worker %d exited with status %d", pid, status)
+                self._workers[index] = self._start_worker()
+
+    def _replace_workers(self) -> None:
+        for index, pid in enumerate(self._workers):
+            if self._should_exit:
+                return
+            self._workers[index] = self._start_worker()
+            self._stop_workers([pid])
+
+    @staticmethod
+    def _stop_workers(pids: Sequence[int]) -> None:
+        for pid in pids:
+            LOGGER.info("[supervisor] Stopping worker %d (%s)", pid, _memory_usage(pid))
+        _stop_processes(pids)
+
+
+def _exit_status(pid: int) -> int | None:
+    """The wait status of the child process, if it has exited"""
+    try:
+        exited_pid, status = os.waitpid(pid, os.WNOHANG)
+    except ChildProcessError:
+        return 0
+    return status if exited_pid else None
+
+
+def _stop_processes(pids: Sequence[int]) -> None:
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    for pid in pids:
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+
+
+def _memory_usage(pid: int) -> str:
+    """The resident and the proportional set size of the process
+
+    The proportional set size only accounts for a fraction of the pages shared with other
+    processes, so it shows how much memory the process actually costs."""
+    try:
+        lines = Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]
+    except OSError:
+        return "memory usage unknown"
+    kib = {key: int(value.split()[0]) for key, value in (line.split(":", 1) for line in lines)}
+    return f"RSS {kib['Rss'] // 1024} MiB, PSS {kib['Pss'] // 1024} MiB"
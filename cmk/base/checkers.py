@@ -12,9 +12,14 @@ from __future__ import annotations
 
 import functools
 import logging
+import os
+import queue
 import socket
+import threading
 import time
 from collections.abc import Callable, Container, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import Future
+from contextlib import suppress
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Final, Literal
@@ -142,6 +147,11 @@ class CheckerConfig:
     timeperiods_active: Mapping[str, bool]
 
 
+# Upper bound for the fetches running at the same time in this process, across all hosts
+_MAX_CONCURRENT_FETCHES: Final = 32
+_fetch_slots: Final = threading.BoundedSemaphore(_MAX_CONCURRENT_FETCHES)
+
+
 def _fetch_all(
     trigger: FetcherTrigger,
     sources: Iterable[Source],
@@ -150,6 +160,7 @@ def _fetch_all(
     secrets: FetcherSecrets,
     *,
     simulation: bool,
+    max_concurrent_fetches: int = 1,
 ) -> Sequence[
     tuple[
         SourceInfo,
@@ -157,17 +168,111 @@ def _fetch_all(
         Snapshot,
     ]
 ]:
-    return [
-        _do_fetch(
+    sources = list(sources)
+    fetchers = [source.fetcher() for source in sources]
+    fetches = [
+        functools.partial(
+            _do_fetch,
             trigger,
             source.source_info(),
             source.file_cache(simulation=simulation, file_cache_options=file_cache_options),
-            source.fetcher(),
+            fetcher,
             mode,
             secrets,
         )
-        for source in sources
+        for source, fetcher in zip(sources, fetchers)
     ]
+    # Ad hoc secrets are written to a file for every fetch and removed right after it.
+    # Concurrent fetches would pull the file from under each other.
+    if max_concurrent_fetches < 2 or len(fetches) < 2 or isinstance(secrets, AdHocSecrets):
+        return [fetch() for fetch in fetches]
+    return _fetch_concurrently(fetches, fetchers, max_concurrent_fetches)
+
+
+def _fetch_concurrently(
+    fetches: Sequence[
+        Callable[
+            [],
+            tuple[SourceInfo, result.Result[AgentRawData | SNMPRawData, Exception], Snapshot],
+        ]
+    ],
+    fetchers: Sequence[Fetcher],
+    max_workers: int,
+) -> Sequence[
+    tuple[
+        SourceInfo,
+        result.Result[AgentRawData | SNMPRawData, Exception],
+        Snapshot,
+    ]
+]:
+    """Run the fetches in worker threads
+
+    The results are in the order of the fetches, so the parser gets the same input
+    as if we had fetched one source after the other. Errors of a fetch are part of
+    its result, only a timeout aborts all of them.
+
+    The timeout (MKTimeout, raised by the SIGALRM handler) only interrupts the main
+    thread. The fetchers still running are closed then, which e.g. kills the special
+    agents. The workers are daemon threads, so that the process does not wait for
+    fetches hanging nevertheless.
+
+    The process times of concurrent fetches overlap, so the snapshots taken during the
+    fetches add up to more than has been spent. We track the whole batch instead, and
+    share its times out among the sources in proportion to their own snapshots.
+    """
+    with CPUTracker(console.debug) as tracker:
+        futures = _start_fetches(fetches, min(max_workers, len(fetches)))
+        try:
+            fetched = [future.result() for future in futures]
+        except BaseException:
+            for future, fetcher in zip(futures, fetchers):
+                if not future.cancel() and not future.done():
+                    with suppress(Exception):
+                        fetcher.close()
+            raise
+
+    return [
+        (source_info, raw_data, duration)
+        for (source_info, raw_data, _duration), duration in zip(
+            fetched, _share_out(tracker.duration, [duration for _s, _r, duration in fetched])
+        )
+    ]
+
+
+def _start_fetches[T](fetches: Sequence[Callable[[], T]], workers: int) -> Sequence[Future[T]]:
+    jobs: queue.SimpleQueue[tuple[Callable[[], T], Future[T]]] = queue.SimpleQueue()
+    futures = [Future[T]() for _fetch in fetches]
+    for job in zip(fetches, futures):
+        jobs.put(job)
+
+    def work() -> None:
+        while True:
+            try:
+                fetch, future = jobs.get_nowait()
+            except queue.Empty:
+                return
+            # Fetches waiting for a slot can still be cancelled.
+            with _fetch_slots:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(fetch())
+                except BaseException as e:
+                    future.set_exception(e)
+
+    for index in range(workers):
+        threading.Thread(target=work, name=f"fetch_{index}", daemon=True).start()
+    return futures
+
+
+def _share_out(total: Snapshot, measured: Sequence[Snapshot]) -> Sequence[Snapshot]:
+    shares: list[list[float]] = [[] for _ in measured]
+    for index, total_time in enumerate(total.process):
+        times = [max(snapshot.process[index], 0.0) for snapshot in measured]
+        times_sum = sum(times)
+        for share, time_ in zip(shares, times):
+            share.append(total_time * time_ / times_sum if times_sum else total_time / len(times))
+    return [Snapshot(os.times_result(share)) for share in shares]
 
 
 def _do_fetch(
@@ -367,6 +472,7 @@ class CMKFetcher:
         simulation_mode: bool,
         metric_backend_fetcher_factory: Callable[[HostAddress], Fetcher[AgentRawData] | None],
         max_cachefile_age: MaxAge | None = None,
+        max_concurrent_fetches: int = 1,
     ) -> None:
         self.config_cache: Final = config_cache
         self.get_relay_id: Final = get_relay_id
@@ -386,6 +492,7 @@ class CMKFetcher:
         self.simulation_mode: Final = simulation_mode
         self.max_cachefile_age: Final = max_cachefile_age
         self.metric_backend_fetcher_factory: Final = metric_backend_fetcher_factory
+        self.max_concurrent_fetches: Final = max_concurrent_fetches
 
     def __call__(
         self, host_name: HostName, *, ip_address: HostAddress | None
@@ -503,6 +610,7 @@ class CMKFetcher:
                 mode=self.mode,
                 secrets=secrets_config,
                 simulation=self.simulation_mode,
+                max_concurrent_fetches=self.max_concurrent_fetches,
             )
         ]
 
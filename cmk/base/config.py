@@ -19,6 +19,7 @@ import contextlib
 import copy
 import dataclasses
 import enum
+import hashlib
 import itertools
 import numbers
 import os
@@ -26,7 +27,16 @@ import pickle
 import socket
 import sys
 import time
-from collections.abc import Callable, Container, Iterable, Iterator, Mapping, Sequence
+import types
+from collections.abc import (
+    Callable,
+    Container,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    Sequence,
+)
 from pathlib import Path
 from typing import (
     Any,
@@ -62,7 +72,7 @@ from cmk.base.default_config import *  # noqa: F403
 from cmk.base.parent_scan import ScanConfig as ParentScanConfig
 from cmk.base.snmp_plugin_store import make_plugin_store
 from cmk.base.sources import ParserConfig
-from cmk.ccc import tty
+from cmk.ccc import store, tty
 from cmk.ccc.exceptions import MKBailOut, MKGeneralException
 from cmk.ccc.hostaddress import HostAddress, HostName, Hosts
 from cmk.ccc.regex import regex
@@ -575,7 +585,7 @@ def load(
 
     storage_format = get_storage_format(experimental_config.get("config_storage_format"))
 
-    _changed_var_names = _load_config(storage_format, with_conf_d=with_conf_d)
+    _load_config_bundled(storage_format, with_conf_d=with_conf_d)
 
     loading_result = _perform_post_config_loading_actions(
         discovery_rulesets, get_builtin_host_labels, experimental_config
@@ -865,6 +875,82 @@ def _load_config(
     return {k for k, v in global_dict.items() if k not in pre_load_vars or v != pre_load_vars[k]}
 
 
+def _load_config_bundled(
+    storage_format: StorageFormat,
+    *,
+    with_conf_d: bool,
+) -> None:
+    """Load the configuration files, preferably from a precompiled bundle
+
+    Executing all configuration files takes quite some time on bigger sites. The
+    resulting global variables are stored as a bundle which is used by all later
+    invocations as long as the configuration files and the defaults did not change.
+    """
+    bundle_store = ConfigLoadBundleStore(
+        ConfigLoadBundleStore.make_config_bundle_store_path(cmk.utils.paths.tmp_dir)
+    )
+    digest = bundle_store.digest(
+        _config_bundle_files(get_config_file_paths(with_conf_d)),
+        salt=_config_bundle_salt(storage_format, with_conf_d=with_conf_d),
+    )
+    if digest is not None and (bundle := bundle_store.read(digest)) is not None:
+        globals().update(bundle)
+        return
+
+    pre_load_vars = {**globals()}
+    _load_config(storage_format, with_conf_d=with_conf_d)
+    if digest is not None and (bundle := _make_config_bundle(pre_load_vars)) is not None:
+        bundle_store.write(digest, bundle)
+
+
+def _config_bundle_files(config_file_paths: Iterable[Path]) -> list[Path]:
+    # Depending on the storage format, the hosts are read from one of the siblings
+    files = []
+    for path in config_file_paths:
+        files.append(path)
+        if path.name == "hosts.mk":
+            files.extend(
+                sibling
+                for storage_format in (StorageFormat.PICKLE, StorageFormat.RAW)
+                if (sibling := path.with_suffix(storage_format.extension())).exists()
+            )
+    return files
+
+
+def _config_bundle_salt(storage_format: StorageFormat, *, with_conf_d: bool) -> bytes:
+    return repr(
+        (
+            cmk_version.__version__,
+            sys.hexversion,
+            str(storage_format),
+            with_conf_d,
+            sorted(get_default_config().items()),
+        )
+    ).encode()
+
+
+def _make_config_bundle(pre_load_vars: Mapping[str, object]) -> dict[str, object] | None:
+    """Collect the global variables that have been set by the configuration files
+
+    Default values may have been modified in place, so they are compared to the
+    pristine defaults instead of the values before loading.
+    """
+    default_values = get_default_config()
+    bundle = {}
+    for varname, value in globals().items():
+        if (
+            varname in pre_load_vars
+            and value is pre_load_vars[varname]
+            and (varname not in default_values or value == default_values[varname])
+        ):
+            continue
+        if isinstance(value, types.FunctionType | types.ModuleType | type):
+            # Can not be restored without executing the configuration files
+            return None
+        bundle[varname] = value
+    return bundle
+
+
 def _transform_plugin_names_from_160_to_170(global_dict: dict[str, Any]) -> None:
     # Pre 1.7.0 check plug-in names may have dots or dashes (one case) in them.
     # Now they don't, and we have to translate all variables that may use them:
@@ -1076,6 +1162,85 @@ class PackedConfigStore:
             return pickle.load(f)  # nosec B301 # BNS:c3c5e9
 
 
+class ConfigLoadBundleStore:
+    """Caring about persistence of the configuration bundles
+
+    A bundle is addressed by a digest over the contents of the configuration files
+    it has been created from, so it never has to be invalidated explicitly. To save
+    reading all the files, the digest is remembered for the inode, modification time
+    and size of the files.
+    """
+
+    # Files modified this recently may be changed again without a visible change
+    # of their modification time, so we have to look at their contents.
+    _RACY_PERIOD: Final = 2.0
+    _KEEP_BUNDLES: Final = 4
+    _KEEP_DIGESTS: Final = 32
+
+    def __init__(self, path: Path) -> None:
+        self.path: Final = path
+
+    @classmethod
+    def make_config_bundle_store_path(cls, tmp_dir: Path) -> Path:
+        return tmp_dir / "config_bundles"
+
+    def digest(self, files: Sequence[Path], *, salt: bytes) -> str | None:
+        try:
+            stats = [path.stat() for path in files]
+        except FileNotFoundError:
+            return None
+
+        signature = hashlib.sha256(
+            repr(
+                (salt, [(str(p), s.st_ino, s.st_mtime_ns, s.st_size) for p, s in zip(files, stats)])
+            ).encode()
+        ).hexdigest()
+        signature_path = self.path / f"{signature}.digest"
+        with contextlib.suppress(OSError):
+            return signature_path.read_text()
+
+        content_hash = hashlib.sha256(salt)
+        try:
+            for path in files:
+                content = path.read_bytes()
+                content_hash.update(f"{path}\0{len(content)}\0".encode())
+                content_hash.update(content)
+        except FileNotFoundError:
+            return None
+        digest = content_hash.hexdigest()
+
+        if max((s.st_mtime for s in stats), default=0.0) < time.time() - self._RACY_PERIOD:
+            self.path.mkdir(parents=True, exist_ok=True)
+            store.save_text_to_file(signature_path, digest)
+            self._cleanup("*.digest", self._KEEP_DIGESTS)
+        return digest
+
+    def write(self, digest: str, bundle: Mapping[str, object]) -> None:
+        try:
+            serialized = pickle.dumps(bundle, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # Configuration files may define arbitrary objects. We just don't bundle them.
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        store.save_bytes_to_file(self.path / f"{digest}.pkl", serialized)
+        self._cleanup("*.pkl", self._KEEP_BUNDLES)
+
+    def read(self, digest: str) -> Mapping[str, Any] | None:
+        try:
+            with (self.path / f"{digest}.pkl").open("rb") as f:
+                return pickle.load(f)  # nosec B301 # BNS:c3c5e9
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+
+    def _cleanup(self, pattern: str, keep: int) -> None:
+        entries = []
+        for path in self.path.glob(pattern):
+            with contextlib.suppress(FileNotFoundError):
+                entries.append((path.stat().st_mtime, path))
+        for _mtime, path in sorted(entries, reverse=True)[keep:]:
+            path.unlink(missing_ok=True)
+
+
 @contextlib.contextmanager
 def set_use_core_config(
     *, autochecks_dir: Path, discovered_host_labels_dir: Path
@@ -1579,6 +1744,7 @@ class ConfigCache:
 
     def initialize(self, get_builtin_host_labels: Callable[[SiteId], Labels]) -> ConfigCache:
         self.invalidate_host_config()
+        self._get_builtin_host_labels = get_builtin_host_labels
 
         self._check_table_cache = cache_manager.obtain_cache("check_tables")
         self._cache_section_name_of: dict[str, str] = {}
@@ -1621,7 +1787,7 @@ class ConfigCache:
                 )
             ),
         )
-        builtin_host_labels = {
+        self._builtin_host_labels = {
             hostname: get_builtin_host_labels(self._site_of_host(hostname))
             for hostname in self.hosts_config
         }
@@ -1633,7 +1799,7 @@ class ConfigCache:
             ),
             self._nodes_cache,
             host_labels,
-            builtin_host_labels=builtin_host_labels,
+            builtin_host_labels=self._builtin_host_labels,
         )
 
         self.ruleset_matcher.ruleset_optimizer.set_all_processed_hosts(
@@ -1910,6 +2076,130 @@ class ConfigCache:
         self.__notification_plugin_parameters.clear()
         self.__snmp_backend.clear()
 
+    def update_hosts(self, host_names: Iterable[HostName]) -> None:
+        """Recompute the cached configuration of the given hosts
+
+        Use this after the tags, labels or folders of existing hosts have been changed in
+        the loaded configuration. In contrast to initialize(), only the cached entries
+        involving these hosts are recomputed. Adding or removing hosts or changing the
+        clusters still requires initialize().
+        """
+        changed_hosts = set(host_names)
+        affected_hosts = changed_hosts.union(
+            *(self._clusters_of_cache.get(hn, ()) for hn in changed_hosts),
+            *(self._nodes_cache.get(hn, ()) for hn in changed_hosts),
+        )
+
+        for hostname in changed_hosts:
+            self._host_paths.pop(hostname, None)
+        self._host_paths.update(
+            ConfigCache._get_host_paths(
+                {hn: path for hn, path in host_paths.items() if hn in changed_hosts}
+            )
+        )
+
+        changed_host_tags = cmk.utils.tags.HostTags.make(
+            self._host_paths,
+            self._loaded_config.tag_config,
+            {hn: tags for hn, tags in self._loaded_config.host_tags.items() if hn in changed_hosts},
+            [
+                tagged_host
+                for tagged_host in itertools.chain(
+                    self._loaded_config.all_hosts, self._loaded_config.clusters
+                )
+                if tagged_host.split("|", 1)[0] in changed_hosts
+            ],
+            {
+                hn: spec
+                for hn, spec in self._loaded_config.shadow_hosts.items()
+                if hn in changed_hosts
+            },
+        )
+        self.host_tags = cmk.utils.tags.HostTags(
+            {**self.host_tags.host_tags_sequences, **changed_host_tags.host_tags_sequences},
+            {**self.host_tags.host_tags_maps, **changed_host_tags.host_tags_maps},
+        )
+
+        self._builtin_host_labels.update(
+            {
+                hn: self._get_builtin_host_labels(self._site_of_host(hn))
+                for hn in changed_hosts
+                if hn in self._builtin_host_labels
+            }
+        )
+        self.label_manager.explicit_host_labels = host_labels
+        self.label_manager.invalidate_hosts(affected_hosts)
+        self.ruleset_matcher.update_hosts(
+            changed_hosts,
+            host_tags=self.host_tags.host_tags_maps,
+            host_paths=self._host_paths,
+            labels_of_host=self.label_manager.labels_of_host,
+        )
+
+        for host_cache in (
+            self.__enforced_services_table,
+            self.__is_piggyback_host,
+            self.__is_waiting_for_discovery_host,
+            self.__hwsw_inventory_parameters,
+            self.__explicit_host_attributes,
+            self.__computed_datasources,
+            self.__discovery_check_parameters,
+            self.__active_checks,
+            self.__special_agents,
+            self.__hostgroups,
+            self.__contactgroups,
+            self.__explicit_check_command,
+            self.__snmp_fetch_interval,
+            self.__snmp_backend,
+        ):
+            for hostname in affected_hosts:
+                host_cache.pop(hostname, None)
+
+        for keyed_by_host in (
+            self.__snmp_config,
+            self.__notification_plugin_parameters,
+            self._effective_host_cache,
+            self._check_table_cache,
+        ):
+            _drop_entries_of_hosts(keyed_by_host, affected_hosts)
+
+        service_translations = cache_manager.obtain_cache("service_description_translations")
+        for hostname in affected_hosts:
+            service_translations.pop(hostname, None)
+
+    def update_folders(self, folder_paths: Iterable[str]) -> None:
+        """Recompute the cached configuration of all hosts within the given folders
+
+        The folders are given like the host paths ("/wato/folder/"). This covers the
+        hosts that have been moved into or out of these folders, too.
+        """
+        folder_prefixes = tuple(
+            folder_path if folder_path.endswith("/") else f"{folder_path}/"
+            for folder_path in folder_paths
+        )
+        self.update_hosts(
+            {
+                hostname
+                for hostname, path in itertools.chain(
+                    self._host_paths.items(), ConfigCache._get_host_paths(host_paths).items()
+                )
+                if path.startswith(folder_prefixes)
+            }
+        )
+
+    def invalidate_rulesets(self, rulesets: Iterable[Sequence[RuleSpec[Any]]]) -> None:
+        """Forget everything computed from the given rulesets after they have been modified"""
+        rulesets = list(rulesets)
+        self.ruleset_matcher.invalidate_rulesets(rulesets)
+        if any(ruleset is host_label_rules for ruleset in rulesets):
+            # Any condition on host labels may be affected
+            self.label_manager.invalidate_hosts(self.hosts_config)
+            self.ruleset_matcher.clear_caches()
+
+        self.invalidate_host_config()
+        self._effective_host_cache.clear()
+        self._check_table_cache.clear()
+
     @staticmethod
     def _get_host_paths(config_host_paths: dict[HostName, str]) -> dict[HostName, str]:
         """Reference hostname -> dirname including /"""
@@ -3615,6 +3905,13 @@ class ConfigCache:
         )
 
 
+def _drop_entries_of_hosts[TKey: tuple[object, ...]](
+    cache: MutableMapping[TKey, Any], host_names: Container[HostName]
+) -> None:
+    for key in [key for key in cache if key[0] in host_names]:
+        del cache[key]
+
+
 class EnforcedServicesTable:
     """A table of enforced services"""
 
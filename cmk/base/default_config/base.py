@@ -59,6 +59,7 @@ default_host_group = "check_mk"
 check_max_cachefile_age = 0  # per default do not use cache files when checking
 cluster_max_cachefile_age = 90  # secs.
 piggyback_max_cachefile_age = 3600  # secs
+max_concurrent_fetches = 1  # per host, 1 fetches the data sources one after another
 # Ruleset for translating piggyback host names
 piggyback_translation: Sequence[RuleSpec[Mapping[str, object]]] = []
 # Ruleset for translating service names
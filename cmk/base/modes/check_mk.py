@@ -2128,6 +2128,7 @@ def mode_check_discovery(
         or ip_lookup.make_lookup_mgmt_board_ip_address(ip_lookup_config),
         mode=FetchMode.DISCOVERY,
         simulation_mode=config.simulation_mode,
+        max_concurrent_fetches=config.max_concurrent_fetches,
         max_cachefile_age=MaxAge(
             checking=config.check_max_cachefile_age,
             discovery=discovery_file_cache_max_age,
@@ -2786,6 +2787,7 @@ def run_checking(
             FetchMode.CHECKING if selected_sections is NO_SELECTION else FetchMode.FORCE_SECTIONS
         ),
         simulation_mode=config.simulation_mode,
+        max_concurrent_fetches=config.max_concurrent_fetches,
         secrets_config_relay=secrets_config_relay,
         secrets_config_site=secrets_config_site,
         metric_backend_fetcher_factory=lambda hn: app.make_metric_backend_fetcher(
@@ -103,6 +103,15 @@ class ParserState(abc.ABC):
     def do_action(self, line: bytes) -> ParserState:
         raise NotImplementedError()
 
+    def skips_content(self, selection: SectionNameCollection) -> bool:
+        """Whether all lines up to the next header can be skipped without looking at them"""
+        return False
+
+    def do_bulk_action(self, lines: Sequence[bytes]) -> None:
+        """Process all (non-empty) lines up to the next header at once"""
+        for line in lines:
+            self.do_action(line)
+
     @abc.abstractmethod
     def on_section_header(self, section_header: SectionMarker) -> ParserState:
         raise NotImplementedError()
@@ -271,6 +280,9 @@ class NOOPParser(ParserState):
     def do_action(self, line: bytes) -> ParserState:
         return self
 
+    def skips_content(self, selection: SectionNameCollection) -> bool:
+        return True
+
     def on_piggyback_header(self, piggyback_header: PiggybackMarker) -> ParserState:
         if piggyback_header.hostname == self.hostname:
             # Unpiggybacked "normal" host
@@ -316,6 +328,9 @@ class PiggybackParser(ParserState):
         # We are not in a section -> ignore line.
         return self
 
+    def skips_content(self, selection: SectionNameCollection) -> bool:
+        return True
+
     def on_piggyback_header(self, piggyback_header: PiggybackMarker) -> ParserState:
         if piggyback_header.hostname == self.hostname:
             # Unpiggybacked "normal" host
@@ -363,6 +378,12 @@ class PiggybackSectionParser(ParserState):
         self.piggyback_sections[self.current_host][-1].section.append(AgentRawData(line))
         return self
 
+    def do_bulk_action(self, lines: Sequence[bytes]) -> None:
+        # We have to keep all piggybacked sections, the selection is about our own host.
+        self.piggyback_sections[self.current_host][-1].section.extend(
+            AgentRawData(line) for line in lines
+        )
+
     def on_piggyback_header(self, piggyback_header: PiggybackMarker) -> ParserState:
         if piggyback_header.should_be_ignored():
             return self.to_piggyback_ignore_parser()
@@ -404,6 +425,9 @@ class PiggybackNOOPParser(ParserState):
     def do_action(self, line: bytes) -> PiggybackNOOPParser:
         return self
 
+    def skips_content(self, selection: SectionNameCollection) -> bool:
+        return True
+
     def on_piggyback_header(self, piggyback_header: PiggybackMarker) -> ParserState:
         if piggyback_header.hostname == self.hostname:
             # Unpiggybacked "normal" host
@@ -427,6 +451,9 @@ class PiggybackIgnoreParser(ParserState):
     def do_action(self, line: bytes) -> PiggybackIgnoreParser:
         return self
 
+    def skips_content(self, selection: SectionNameCollection) -> bool:
+        return True
+
     def on_piggyback_header(self, piggyback_header: PiggybackMarker) -> ParserState:
         if piggyback_header.hostname == self.hostname:
             # Unpiggybacked "normal" host
@@ -473,6 +500,15 @@ class HostSectionParser(ParserState):
         )
         return self
 
+    def skips_content(self, selection: SectionNameCollection) -> bool:
+        return selection is not NO_SELECTION and self.current_section.name not in selection
+
+    def do_bulk_action(self, lines: Sequence[bytes]) -> None:
+        self.sections[-1].section.extend(
+            AgentRawData(line)
+            for line in (lines if self.current_section.nostrip else (l.strip() for l in lines))
+        )
+
     def on_piggyback_header(self, piggyback_header: PiggybackMarker) -> ParserState:
         if piggyback_header.hostname == self.hostname:
             # Unpiggybacked "normal" host
@@ -548,7 +584,13 @@ class AgentParser(Parser[AgentRawData, AgentRawDataSection]):
         raw_data: AgentRawData,
         selection: SectionNameCollection,
     ) -> tuple[ImmutableSection, Mapping[PiggybackMarker, ImmutableSection]]:
-        """Split agent output in chunks, splits lines by whitespaces."""
+        """Split agent output in chunks, splits lines by whitespaces.
+
+        Only lines starting with "<<<" (potential headers) are fed to the parser one by one.
+        All other lines up to the next potential header are handled as one block, which is
+        skipped entirely if the parser does not need it (e.g. unselected sections).
+        We work with offsets into the raw data to avoid copying anything we skip.
+        """
         parser: ParserState = NOOPParser(
             self.hostname,
             [],
@@ -557,8 +599,27 @@ class AgentParser(Parser[AgentRawData, AgentRawDataSection]):
             encoding_fallback=self.encoding_fallback,
             logger=self._logger,
         )
-        for line in raw_data.split(b"\n"):
-            parser = parser(line.rstrip(b"\r"))
+        pos = 0
+        size = len(raw_data)
+        while pos < size:
+            if raw_data.startswith(b"<<<", pos):
+                if (line_end := raw_data.find(b"\n", pos)) == -1:
+                    line_end = size
+                parser = parser(raw_data[pos:line_end].rstrip(b"\r"))
+                pos = line_end + 1
+                continue
+
+            if (block_end := raw_data.find(b"\n<<<", pos)) == -1:
+                block_end = size
+            if not parser.skips_content(selection):
+                parser.do_bulk_action(
+                    [
+                        line
+                        for raw_line in raw_data[pos:block_end].split(b"\n")
+                        if (line := raw_line.rstrip(b"\r")) and not line.isspace()
+                    ]
+                )
+            pos = block_end + 1
 
         return parser.sections if selection is NO_SELECTION else [
             s for s in parser.sections if s.header.name in selection
@@ -3,20 +3,50 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import json
 import logging
+import pickle
 from collections.abc import Callable, Mapping, MutableMapping
 from pathlib import Path
-from typing import Final, Generic, TypeVar
+from typing import Final, Generic, NamedTuple, TypeVar
 
 import cmk.ccc.store as _store
+from cmk.ccc.exceptions import MKGeneralException
 from cmk.checkengine.plugins import SectionName
 
 __all__ = ["SectionStore"]
 
 _T = TypeVar("_T")
 
+# File format:
+#
+#   _MAGIC
+#   [[section_name, created_at, valid_until, payload_length], ...]\n  (JSON)
+#   payload of the first section (JSON)
+#   payload of the second section (JSON)
+#   ...
+#
+# The header line allows us to check for expired or unchanged sections without
+# decoding any of the payloads.
+_MAGIC: Final = b"CMK-SECTION-STORE 1\n"
+
+
+class _PersistedSection(NamedTuple):
+    created_at: int
+    valid_until: int
+    payload: bytes
+
+
+def _encode(section_content: object) -> bytes:
+    return json.dumps(section_content, separators=(",", ":")).encode("utf-8")
+
 
 class SectionStore(Generic[_T]):
+    """Persist sections of a host together with their validity
+
+    The section contents have to be JSON serializable.
+    """
+
     def __init__(
         self,
         path: str | Path,
@@ -31,21 +61,75 @@ class SectionStore(Generic[_T]):
         return f"{type(self).__name__}({self.path!r}, logger={self._logger!r})"
 
     def store(self, sections: MutableMapping[SectionName, tuple[int, int, _T]]) -> None:
+        with _store.locked(self.path):
+            self._store_raw(
+                {
+                    section_name: _PersistedSection(created_at, valid_until, _encode(content))
+                    for section_name, (created_at, valid_until, content) in sections.items()
+                }
+            )
+
+    def load(self) -> MutableMapping[SectionName, tuple[int, int, _T]]:
+        return {
+            section_name: (entry.created_at, entry.valid_until, self._decode(entry.payload))
+            for section_name, entry in self._load_raw().items()
+        }
+
+    def _store_raw(self, sections: Mapping[SectionName, _PersistedSection]) -> None:
         if not sections:
             self._logger.debug("No persisted sections")
             self.path.unlink(missing_ok=True)
             return
 
+        header = json.dumps(
+            [
+                [str(section_name), entry.created_at, entry.valid_until, len(entry.payload)]
+                for section_name, entry in sections.items()
+            ],
+            separators=(",", ":"),
+        ).encode("ascii")
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        _store.save_object_to_pickle_file(
+        _store.save_bytes_to_file(
             self.path,
-            {str(k): v for k, v in sections.items()},
+            b"".join((_MAGIC, header, b"\n", *(entry.payload for entry in sections.values()))),
         )
         self._logger.debug("Stored persisted sections: %s", ", ".join(str(s) for s in sections))
 
-    def load(self) -> MutableMapping[SectionName, tuple[int, int, _T]]:
-        raw_sections_data = _store.load_object_from_pickle_file(self.path, default={})
-        return {SectionName(k): v for k, v in raw_sections_data.items()}
+    def _load_raw(self) -> dict[SectionName, _PersistedSection]:
+        raw = _store.load_bytes_from_file(self.path, default=b"")
+        if not raw:
+            return {}
+
+        if not raw.startswith(_MAGIC):
+            # Written by a version that pickled the sections. It will be
+            # converted as soon as the sections are stored again.
+            return {
+                SectionName(section_name): _PersistedSection(
+                    created_at, valid_until, _encode(content)
+                )
+                for section_name, (created_at, valid_until, content) in pickle.loads(raw).items()
+            }
+
+        try:
+            header_end = raw.index(b"\n", len(_MAGIC))
+            offset = header_end + 1
+            sections = {}
+            for section_name, created_at, valid_until, length in json.loads(
+                raw[len(_MAGIC) : header_end]
+            ):
+                sections[SectionName(section_name)] = _PersistedSection(
+                    created_at, valid_until, raw[offset : offset + length]
+                )
+                offset += length
+        except ValueError as exc:
+            raise MKGeneralException(f"Cannot read persisted sections {self.path}: {exc}") from exc
+
+        if offset != len(raw):
+            raise MKGeneralException(f"Cannot read persisted sections {self.path}: size mismatch")
+        return sections
+
+    def _decode(self, payload: bytes) -> _T:
+        return json.loads(payload)  # type: ignore[no-any-return]
 
     def update(
         self,
@@ -77,41 +161,78 @@ class SectionStore(Generic[_T]):
         *,
         now: int,
         keep_outdated: bool,
-    ) -> MutableMapping[SectionName, tuple[int, int, _T]]:
-        # TODO: This is not race condition free when modifying the data. Either remove
-        # the possible write here and simply ignore the outdated sections or lock when
-        # reading and unlock after writing
-        persisted_sections = self.load()
-
+    ) -> Mapping[SectionName, _PersistedSection]:
         new_sections = {
-            section_name: (now, persist_info, section_content)
+            section_name: _PersistedSection(now, persist_info, _encode(section_content))
             for section_name, section_content in sections.items()
             if (persist_info := lookup_persist.get(section_name)) is not None
         }
-        store_sections = bool(new_sections)
-        persisted_sections.update(new_sections)
+
+        # Files are replaced atomically, so reading does not need the lock. Only if we
+        # have to write, we lock and apply our changes to the then current contents.
+        persisted_sections = self._load_raw()
+        if not self._merge(
+            persisted_sections,
+            new_sections,
+            section_outdated,
+            now=now,
+            keep_outdated=keep_outdated,
+        ):
+            return persisted_sections
+
+        with _store.locked(self.path):
+            persisted_sections = self._load_raw()
+            if self._merge(
+                persisted_sections,
+                new_sections,
+                section_outdated,
+                now=now,
+                keep_outdated=keep_outdated,
+            ):
+                self._store_raw(persisted_sections)
+        return persisted_sections
+
+    @staticmethod
+    def _merge(
+        persisted_sections: MutableMapping[SectionName, _PersistedSection],
+        new_sections: Mapping[SectionName, _PersistedSection],
+        section_outdated: Callable[[int, int], bool],
+        *,
+        now: int,
+        keep_outdated: bool,
+    ) -> bool:
+        """Update the persisted sections in place and report whether they changed"""
+        changed = False
+        for section_name, new_entry in new_sections.items():
+            # Cached agent plugins deliver the same data until they are run again.
+            # Keep the original entry in that case (including the creation time).
+            if (
+                (entry := persisted_sections.get(section_name)) is not None
+                and entry.valid_until == new_entry.valid_until
+                and entry.payload == new_entry.payload
+            ):
+                continue
+            persisted_sections[section_name] = new_entry
+            changed = True
 
         if not keep_outdated:
             for section_name in tuple(persisted_sections):
-                (_created_at, valid_until, _section_content) = persisted_sections[section_name]
-                if section_outdated(valid_until, now):
-                    store_sections = True
+                if section_outdated(persisted_sections[section_name].valid_until, now):
                     del persisted_sections[section_name]
+                    changed = True
 
-        if store_sections:
-            self.store(persisted_sections)
-        return persisted_sections
+        return changed
 
     def _add_persisted_sections(
         self,
         sections: Mapping[SectionName, _T],
         cache_info: MutableMapping[SectionName, tuple[int, int]],
-        persisted_sections: MutableMapping[SectionName, tuple[int, int, _T]],
+        persisted_sections: Mapping[SectionName, _PersistedSection],
     ) -> Mapping[SectionName, _T]:
         cache_info.update(
             {
-                section_name: (created_at, valid_until - created_at)
-                for section_name, (created_at, valid_until, *_rest) in persisted_sections.items()
+                section_name: (entry.created_at, entry.valid_until - entry.created_at)
+                for section_name, entry in persisted_sections.items()
                 if section_name not in sections
             }
         )
@@ -126,5 +247,5 @@ class SectionStore(Generic[_T]):
                 continue
 
             self._logger.debug("Using persisted section %r", section_name)
-            result[section_name] = entry[-1]
+            result[section_name] = self._decode(entry.payload)
         return result
@@ -70,7 +70,7 @@ from cmk.gui.views.layout import layout_registry
 from cmk.gui.views.row_post_processing import row_post_processor_registry
 from cmk.gui.views.sorter import sorter_registry
 from cmk.gui.visuals import default_site_filter_heading_info
-from cmk.gui.visuals.filter import filter_registry
+from cmk.gui.visuals.filter import filter_pushdown_registry, filter_registry
 from cmk.gui.visuals.info import visual_info_registry
 from cmk.gui.visuals.type import visual_type_registry
 from cmk.gui.wato import default_user_menu_topics
@@ -303,6 +303,7 @@ def register(edition: Edition, *, ignore_duplicate_endpoints: bool = False) -> N
         rulespec_registry,
         autocompleter_registry,
         filter_registry,
+        filter_pushdown_registry,
         notification_parameter_registry,
         snapin_registry,
         contact_group_usage_finder_registry,
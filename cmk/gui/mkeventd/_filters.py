@@ -20,6 +20,8 @@ from cmk.gui.visuals.filter import (
     FilterGroupCombo,
     FilterNumberRange,
     FilterOption,
+    FilterPushdown,
+    FilterPushdownRegistry,
     FilterRegistry,
     FilterTime,
     InputTextFilter,
@@ -29,8 +31,13 @@ from cmk.gui.visuals.filter.components import Dropdown, FilterComponent
 
 from .defines import action_whats, phase_names, syslog_priorities
 
+# Larger ranges of service levels are checked after querying Livestatus
+_MAX_PUSHED_DOWN_SERVICE_LEVELS = 1000
 
-def register(filter_registry: FilterRegistry) -> None:
+
+def register(
+    filter_registry: FilterRegistry, filter_pushdown_registry: FilterPushdownRegistry
+) -> None:
     filter_registry.register(
         InputTextFilter(
             title=_l("Event ID (exact match)"),
@@ -279,21 +286,25 @@ def register(filter_registry: FilterRegistry) -> None:
 
     filter_registry.register(_FilterOptEventEffectiveContactgroup())
 
-    filter_registry.register(
+    for service_level_filter in [
         FilterECServiceLevelRange(
             ident="svc_service_level",
             title=_l("Service service level"),
             info="service",
-        )
-    )
-
-    filter_registry.register(
+        ),
         FilterECServiceLevelRange(
             ident="hst_service_level",
             title=_l("Host service level"),
             info="host",
+        ),
+    ]:
+        filter_registry.register(service_level_filter)
+        filter_pushdown_registry.register(
+            FilterPushdown(
+                ident=service_level_filter.ident,
+                filter_headers=service_level_filter.livestatus_filter_headers,
+            )
         )
-    )
 
 
 # TODO: Cleanup as a dropdown visual Filter later on
@@ -350,9 +361,32 @@ class FilterECServiceLevelRange(Filter):
     def filter_table(self, context: VisualContext, rows: Rows) -> Rows:
         # NOTE: We need this special case only because our construction of the
         # disjunction is broken. We should really have a Livestatus Query DSL...
+        if (bounds := self._bounds(context)) is None:
+            return rows
+
+        lower_bound, upper_bound = bounds
+        return [
+            row
+            for row in rows
+            if lower_bound <= int(row["%s_custom_variables" % self.info]["EC_SL"]) <= upper_bound
+        ]
+
+    def livestatus_filter_headers(self, context: VisualContext) -> FilterHeader | None:
+        """Select the rows filter_table() keeps by matching the service levels in range"""
+        if (bounds := self._bounds(context)) is None:
+            return ""
+
+        lower_bound, upper_bound = bounds
+        if not 0 < upper_bound - lower_bound + 1 <= _MAX_PUSHED_DOWN_SERVICE_LEVELS:
+            return None
+
+        service_levels = "|".join(str(sl) for sl in range(lower_bound, upper_bound + 1))
+        return "Filter: %s_custom_variables ~ EC_SL ^(%s)$\n" % (self.info, service_levels)
+
+    def _bounds(self, context: VisualContext) -> tuple[int, int] | None:
         bounds: FilterHTTPVariables = context.get(self.ident, {})
         if not any(v for _k, v in bounds.items()):
-            return rows
+            return None
 
         lower_bound: str | None = bounds.get(self.lower_bound_varname)
         upper_bound: str | None = bounds.get(self.upper_bound_varname)
@@ -368,15 +402,9 @@ class FilterECServiceLevelRange(Filter):
             assert lower_bound is not None
             request.set_var(self.upper_bound_varname, lower_bound)
 
-        filtered_rows: Rows = []
         assert lower_bound is not None
         assert upper_bound is not None
-        for row in rows:
-            service_level = int(row["%s_custom_variables" % self.info]["EC_SL"])
-            if int(lower_bound) <= service_level <= int(upper_bound):
-                filtered_rows.append(row)
-
-        return filtered_rows
+        return int(lower_bound), int(upper_bound)
 
     def filter(self, value: FilterHTTPVariables) -> FilterHeader:
         if not value.get(self.lower_bound_varname) and not value.get(self.upper_bound_varname):
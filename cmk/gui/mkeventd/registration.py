@@ -16,7 +16,7 @@ from cmk.gui.valuespec import AutocompleterRegistry
 from cmk.gui.views.command import CommandRegistry
 from cmk.gui.views.icon import IconRegistry
 from cmk.gui.views.sorter import SorterRegistry
-from cmk.gui.visuals.filter import FilterRegistry
+from cmk.gui.visuals.filter import FilterPushdownRegistry, FilterRegistry
 from cmk.gui.watolib.config_domain_name import (
     ConfigDomainRegistry,
     ConfigVariableGroupRegistry,
@@ -65,6 +65,7 @@ def register(
     rulespec_registry: RulespecRegistry,
     autocompleter_registry: AutocompleterRegistry,
     filter_registry: FilterRegistry,
+    filter_pushdown_registry: FilterPushdownRegistry,
     notification_parameter_registry: NotificationParameterRegistry,
     snapin_registry: SnapinRegistry,
     contact_group_usage_finder_registry: ContactGroupUsageFinderRegistry,
@@ -105,7 +106,7 @@ def register(
         "syslog_facilities", syslog_facilities_autocompleter
     )
     autocompleter_registry.register_autocompleter("service_levels", service_levels_autocompleter)
-    _filters.register(filter_registry)
+    _filters.register(filter_registry, filter_pushdown_registry)
     snapin_registry.register(SidebarSnapinEventConsole)
     contact_group_usage_finder_registry.register(find_usages_of_contact_group_in_ec_rules)
     contact_group_usage_finder_registry.register(
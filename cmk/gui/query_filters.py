@@ -58,6 +58,7 @@ class Query:
         self.request_vars = request_vars
         self.livestatus_query = livestatus_query or (lambda x: "")
         self.rows_filter = rows_filter or (lambda _ctx, rows: rows)
+        self._has_rows_filter = rows_filter is not None
 
     def filter(self, value: FilterHTTPVariables) -> FilterHeader:
         return self.livestatus_query(value)
@@ -65,6 +66,10 @@ class Query:
     def filter_table(self, context: VisualContext, rows: Rows) -> Rows:
         return self.rows_filter(context, rows)
 
+    def uses_filter_table(self) -> bool:
+        """Whether filter_table() filters the rows at all"""
+        return self._has_rows_filter
+
 
 class MultipleOptionsQuery(Query):
     def __init__(
@@ -130,6 +135,7 @@ class SingleOptionQuery(Query):
         self.options = options
         self.filter_code = filter_code
         self.filter_row = filter_row or (lambda _selection, _row: True)
+        self._has_rows_filter = filter_row is not None
         self.ignore = self.options[-1][0]
 
     def selection_value(self, value: FilterHTTPVariables) -> str:
@@ -168,7 +174,7 @@ class TristateQuery(SingleOptionQuery):
             ident=ident,
             filter_code=lambda pick: filter_code(pick == "1"),
             filter_row=(
-                lambda pick, row: (filter_row(pick == "1", row) if filter_row is not None else True)
+                None if filter_row is None else lambda pick, row: filter_row(pick == "1", row)
             ),
             options=options or default_tri_state_options(),
         )
@@ -332,6 +338,10 @@ class NumberRangeQuery(Query):
 
         return [row for row in rows if self.filter_row(row, self.column, (from_value, to_value))]
 
+    @override
+    def uses_filter_table(self) -> bool:
+        return self.filter_row is not None
+
 
 def value_in_range(value: int | float, bounds: MaybeBounds) -> bool:
     from_value, to_value = bounds
@@ -505,6 +515,10 @@ class TableTextQuery(TextQuery):
 
         return [row for row in rows if keep(row)]
 
+    @override
+    def uses_filter_table(self) -> bool:
+        return True
+
 
 def re_ignorecase(text: str, varprefix: str) -> re.Pattern:
     try:
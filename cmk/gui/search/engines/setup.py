@@ -6,9 +6,10 @@
 from __future__ import annotations
 
 import itertools
+import re
 from abc import ABC, abstractmethod
 from collections import defaultdict
-from collections.abc import Awaitable, Callable, Collection, Iterable, Iterator, Mapping
+from collections.abc import Awaitable, Callable, Collection, Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass
 from itertools import chain
 from typing import Final, override
@@ -111,8 +112,17 @@ class MatchItemGeneratorRegistry(Registry[ABCMatchItemGenerator]):
 match_item_generator_registry = MatchItemGeneratorRegistry()
 
 
+# Length of the substrings the search index maps to the match items containing them
+_NGRAM_LENGTH: Final = 3
+
+
+def _ngrams(text: str) -> set[str]:
+    return {text[i : i + _NGRAM_LENGTH] for i in range(len(text) - _NGRAM_LENGTH + 1)}
+
+
 class IndexBuilder:
-    _KEY_INDEX_BUILT = "si:index_built"
+    # Changing the layout of the index requires changing this key, so that the index is rebuilt
+    _KEY_INDEX_BUILT = "si:ngram_index_built"
     PREFIX_LOCALIZATION_INDEPENDENT = "si:li"
     PREFIX_LOCALIZATION_DEPENDENT = "si:ld"
 
@@ -136,6 +146,10 @@ class IndexBuilder:
     def key_match_texts(cls, prefix: str) -> str:
         return cls.add_to_prefix(prefix, "match_texts")
 
+    @classmethod
+    def key_ngrams(cls, prefix: str) -> str:
+        return cls.add_to_prefix(prefix, "ngrams")
+
     def _build_index(
         self,
         match_item_generators: Iterable[ABCMatchItemGenerator],
@@ -240,17 +254,20 @@ class IndexBuilder:
         redis_prefix: str,
         user_permissions: UserPermissions,
     ) -> None:
+        """Add the match items of a generator and the n-gram index over their match texts
+
+        Of the match items with the same match text, only the last one can be found. The match
+        texts are stored by the index of their match item. The n-gram index maps every n-gram to
+        the comma-separated indices of the match items containing it."""
         prefix = cls.add_to_prefix(redis_prefix, match_item_generator.name)
         key_match_texts = cls.key_match_texts(prefix)
-        redis_pipeline.delete(key_match_texts)
+        key_ngrams = cls.key_ngrams(prefix)
+        redis_pipeline.delete(key_match_texts, key_ngrams)
+        idxs_by_match_text: dict[str, str] = {}
         for idx, match_item in enumerate(
             match_item_generator.generate_match_items(user_permissions)
         ):
-            redis_pipeline.hset(
-                key_match_texts,
-                key=" ".join(match_item.match_texts),
-                value=str(idx),
-            )
+            idxs_by_match_text[" ".join(match_item.match_texts)] = str(idx)
             redis_pipeline.hset(
                 cls.add_to_prefix(prefix, idx),
                 mapping={
@@ -262,6 +279,19 @@ class IndexBuilder:
                     else "",
                 },
             )
+        match_items_by_ngram: defaultdict[str, list[str]] = defaultdict(list)
+        for match_text, idx_match_item in idxs_by_match_text.items():
+            for ngram in _ngrams(match_text):
+                match_items_by_ngram[ngram].append(idx_match_item)
+        if idxs_by_match_text:
+            redis_pipeline.hset(
+                key_match_texts,
+                mapping={i: match_text for match_text, i in idxs_by_match_text.items()},
+            )
+            redis_pipeline.hset(
+                key_ngrams,
+                mapping={ngram: ",".join(idxs) for ngram, idxs in match_items_by_ngram.items()},
+            )
 
     def _mark_index_as_built(self) -> None:
         self._redis_client.set(
@@ -397,10 +427,12 @@ class IndexSearcher:
         self,
         redis_client: redis.Redis,
         permissions_handler: PermissionsHandler,
+        max_results_per_topic: int | None = None,
     ) -> None:
         self._redis_client = redis_client
         if not redis_server_reachable(self._redis_client):
             raise RuntimeError("Redis server is not reachable")
+        self._max_results_per_topic = max_results_per_topic
         self._may_see_category = permissions_handler.may_see_category
         self._may_see_item_func = permissions_handler.may_see_items()
         self._user_id = user.ident
@@ -413,7 +445,8 @@ class IndexSearcher:
         search in Redis. Searching in Redis and sorting the results by topic is fast. Checking the
         permissions can be quite slow, so we do this step at the very end in a generator function.
         This way, the code which displays the results can request as many results as it wants to
-        render only, thus avoiding checking the permissions for all found results.
+        render only, thus avoiding checking the permissions for all found results. For the same
+        reason, the results are capped per topic before checking the permissions.
         """
         yield from self._filter_results_by_user_permissions(
             self._sort_search_results(self._search_redis(query, config)), config
@@ -448,7 +481,7 @@ class IndexSearcher:
             topic: [
                 *results_localization_independent[topic],
                 *results_localization_dependent[topic],
-            ]
+            ][: self._max_results_per_topic]
             for topic in chain(results_localization_independent, results_localization_dependent)
         }
 
@@ -480,28 +513,26 @@ class IndexSearcher:
         key_categories: str,
         key_prefix_match_items: str,
     ) -> defaultdict[str, list[_SearchResultWithVisibilityCheck]]:
-        results = defaultdict(list)
         categories = self._redis_client.smembers(key_categories)
         assert not isinstance(categories, Awaitable)
-        for category in categories:
-            if not self._may_see_category(category):
-                continue
+        prefixes_by_category = {
+            category: IndexBuilder.add_to_prefix(key_prefix_match_items, category)
+            for category in sorted(categories)
+            if self._may_see_category(category)
+        }
+        matches = self._find_matches(query, list(prefixes_by_category.values()))
 
-            prefix_category = IndexBuilder.add_to_prefix(
-                key_prefix_match_items,
-                category,
-            )
-            visibility_check = self._may_see_item_func.get(category, lambda _url, _config: True)
+        with self._redis_client.pipeline(transaction=False) as pipeline:
+            for prefix in prefixes_by_category.values():
+                for idx_matched_item in matches[prefix]:
+                    pipeline.hgetall(IndexBuilder.add_to_prefix(prefix, idx_matched_item))
+            match_item_dicts = iter(pipeline.execute())
 
-            for _matched_text, idx_matched_item in self._redis_client.hscan_iter(
-                IndexBuilder.key_match_texts(prefix_category),
-                match=query,
-            ):
-                match_item_dict = self._redis_client.hgetall(
-                    IndexBuilder.add_to_prefix(prefix_category, idx_matched_item)
-                )
-                assert not isinstance(match_item_dict, Awaitable)
+        results = defaultdict(list)
+        for category, prefix in prefixes_by_category.items():
+            visibility_check = self._may_see_item_func.get(category, lambda _url, _config: True)
 
+            for match_item_dict in itertools.islice(match_item_dicts, len(matches[prefix])):
                 # We translate the topics of our search results. For localization-dependent search
                 # results, such as rulesets, they are already localized anyway. However, for
                 # localization-independent results, such as hosts, they are not. For example,
@@ -525,6 +556,46 @@ class IndexSearcher:
                 )
         return results
 
+    def _find_matches(self, query: str, prefixes: Sequence[str]) -> Mapping[str, Sequence[str]]:
+        """Find the indices of the match items whose match text matches the glob-style query
+
+        The query is matched like Redis matches glob-style patterns, e.g. in HSCAN. The n-gram
+        index narrows down the match items to the ones containing all n-grams of the query. Only
+        their match texts are fetched and matched against the query. Queries which are too short
+        for that are matched against all match texts."""
+        if ngrams := sorted(_query_ngrams(query)):
+            with self._redis_client.pipeline(transaction=False) as pipeline:
+                for prefix in prefixes:
+                    pipeline.hmget(IndexBuilder.key_ngrams(prefix), ngrams)
+                candidates = [_intersect_match_items(postings) for postings in pipeline.execute()]
+
+            with self._redis_client.pipeline(transaction=False) as pipeline:
+                for prefix, idxs in zip(prefixes, candidates):
+                    if idxs:
+                        pipeline.hmget(IndexBuilder.key_match_texts(prefix), idxs)
+                texts = iter(pipeline.execute())
+            match_texts: list[Mapping[str, str | None]] = [
+                dict(zip(idxs, next(texts))) if idxs else {} for idxs in candidates
+            ]
+        else:
+            with self._redis_client.pipeline(transaction=False) as pipeline:
+                for prefix in prefixes:
+                    pipeline.hgetall(IndexBuilder.key_match_texts(prefix))
+                match_texts = pipeline.execute()
+
+        pattern = _redis_glob_to_regex(query)
+        return {
+            prefix: sorted(
+                (
+                    idx
+                    for idx, text in texts_by_idx.items()
+                    if text is not None and pattern.fullmatch(text)
+                ),
+                key=int,
+            )
+            for prefix, texts_by_idx in zip(prefixes, match_texts)
+        }
+
     @classmethod
     def _sort_search_results(
         cls,
@@ -595,6 +666,62 @@ class IndexSearcher:
         )
 
 
+def _query_ngrams(query: str) -> set[str]:
+    """The n-grams every match text matching the glob-style query contains"""
+    if "[" in query or "\\" in query:
+        # Don't bother with character classes and escapes, just match all match texts
+        return set()
+    return {ngram for fragment in re.split(r"[*?]", query) for ngram in _ngrams(fragment)}
+
+
+def _redis_glob_to_regex(pattern: str) -> re.Pattern[str]:
+    """Translate a glob-style pattern the way Redis interprets it (see stringmatchlen)
+
+    Unlike fnmatch, a backslash escapes the next character, also within brackets, "[^...]" negates
+    a character class and an unterminated character class ends with the pattern."""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        i += 1
+        if char == "*":
+            parts.append(".*")
+        elif char == "?":
+            parts.append(".")
+        elif char == "\\" and i < len(pattern):
+            parts.append(re.escape(pattern[i]))
+            i += 1
+        elif char == "[":
+            if negate := pattern.startswith("^", i):
+                i += 1
+            members = []
+            while i < len(pattern) and pattern[i] != "]":
+                if pattern[i] == "\\" and i + 1 < len(pattern):
+                    members.append(re.escape(pattern[i + 1]))
+                    i += 2
+                elif pattern.startswith("-", i + 1) and i + 2 < len(pattern):
+                    start, end = sorted((pattern[i], pattern[i + 2]))
+                    members.append(f"{re.escape(start)}-{re.escape(end)}")
+                    i += 3
+                else:
+                    members.append(re.escape(pattern[i]))
+                    i += 1
+            i += 1  # the closing bracket
+            if members:
+                parts.append(f"[{'^' if negate else ''}{''.join(members)}]")
+            else:
+                parts.append("." if negate else "(?!)")
+        else:
+            parts.append(re.escape(char))
+    return re.compile("".join(parts), re.DOTALL)
+
+
+def _intersect_match_items(postings: Sequence[str | None]) -> list[str]:
+    if any(p is None for p in postings):
+        return []
+    return sorted(set.intersection(*(set(p.split(",")) for p in postings if p is not None)))
+
+
 @dataclass(frozen=True)
 class _SearchResultWithVisibilityCheck:
     result: SearchResult
@@ -717,6 +844,10 @@ class SearchIndexBackgroundJob(BackgroundJob):
         super().__init__(self.job_prefix)
 
 
+# Nobody scrolls through more results of a topic than that, they refine the query instead
+_MAX_RESULTS_PER_TOPIC: Final = 100
+
+
 # TODO: rework setup search façade to return correct payload for unified search.
 class SetupSearchEngine:
     def __init__(
@@ -730,6 +861,7 @@ class SetupSearchEngine:
         self._legacy_engine = IndexSearcher(
             redis_client=redis_client or get_redis_client(),
             permissions_handler=permissions_handler or PermissionsHandler(),
+            max_results_per_topic=_MAX_RESULTS_PER_TOPIC,
         )
 
     def search(self, query: str) -> Iterable[UnifiedSearchResultItem]:
@@ -786,6 +786,7 @@ class ViewProcessTracking:
     duration_fetch_rows: Snapshot = Snapshot.null()
     duration_filter_rows: Snapshot = Snapshot.null()
     duration_view_render: Snapshot = Snapshot.null()
+    client_side_filters: list[FilterName] = field(default_factory=list)
 
 
 GlobalSettings = Mapping[str, Any]
@@ -41,6 +41,7 @@ from cmk.gui.painter_options import PainterOptions
 from cmk.gui.permissions import permission_registry
 from cmk.gui.type_defs import (
     ColumnName,
+    FilterHeader,
     IconNames,
     PainterParameters,
     Row,
@@ -49,6 +50,7 @@ from cmk.gui.type_defs import (
     SorterSpec,
     StaticIcon,
     ViewSpec,
+    VisualContext,
 )
 from cmk.gui.utils.roles import UserPermissions
 from cmk.gui.utils.urls import makeuri_contextless
@@ -59,7 +61,7 @@ from cmk.gui.visuals import (
     get_livestatus_filter_headers,
     get_only_sites_from_context,
 )
-from cmk.gui.visuals.filter import Filter
+from cmk.gui.visuals.filter import Filter, filter_pushdown_registry
 from cmk.livestatus_client.queries import Query
 
 from . import availability
@@ -141,6 +143,7 @@ def _may_create_slow_view_log_entry(
             "View name: %s, User: %s, Row limit: %s, Limit type: %s, URL variables: %s"
             ", View context: %s, Unfiltered rows: %s, Filtered rows: %s, Rows after limit: %s"
             ", Duration fetching rows: %s, Duration filtering rows: %s, Duration rendering view: %s"
+            ", Filters applied after fetching rows: %s"
             ", Rendering page exceeds %ss: %s"
         ),
         view.name,
@@ -156,6 +159,7 @@ def _may_create_slow_view_log_entry(
         _format_snapshot_duration(view.process_tracking.duration_fetch_rows),
         _format_snapshot_duration(view.process_tracking.duration_filter_rows),
         _format_snapshot_duration(view.process_tracking.duration_view_render),
+        view.process_tracking.client_side_filters,
         duration_threshold,
         _format_snapshot_duration(page_view_tracker.duration),
     )
@@ -349,6 +353,7 @@ def get_row_count(view: View) -> int:
 def _get_view_rows(
     view: View, all_active_filters: list[Filter], only_count: bool = False
 ) -> tuple[int, Rows]:
+    pushed_down_headers, client_side_filters = _push_down_filters(view.context, all_active_filters)
     with CPUTracker(log.logger.debug) as fetch_rows_tracker:
         # Fetch data. Some views show data only after pressing [Search]
         if (
@@ -356,7 +361,17 @@ def _get_view_rows(
             or (not view.spec.get("mustsearch"))
             or request.var("filled_in") in ["filter", "actions", "confirm", "painteroptions"]
         ):
-            rows, unfiltered_amount_of_rows = _fetch_rows_from_livestatus(view, all_active_filters)
+            rows, unfiltered_amount_of_rows = _fetch_rows_from_livestatus(
+                view,
+                all_active_filters,
+                pushed_down_headers,
+                # We test for limit here and not inside view.row_limit, because view.row_limit
+                # is used for rendering limits. Livestatus must not cut off rows before they
+                # are filtered here.
+                limit=(
+                    None if view.datasource.ignore_limit or client_side_filters else view.row_limit
+                ),
+            )
         else:
             rows = []
             unfiltered_amount_of_rows = 0
@@ -368,7 +383,7 @@ def _get_view_rows(
 
     with CPUTracker(log.logger.debug) as filter_rows_tracker:
         # Apply non-Livestatus filters
-        for filter_ in all_active_filters:
+        for filter_ in client_side_filters:
             try:
                 rows = filter_.filter_table(view.context, rows)
             except MKMissingDataError as e:
@@ -378,17 +393,46 @@ def _get_view_rows(
     view.process_tracking.amount_filtered_rows = len(rows)
     view.process_tracking.duration_fetch_rows = fetch_rows_tracker.duration
     view.process_tracking.duration_filter_rows = filter_rows_tracker.duration
+    view.process_tracking.client_side_filters = [f.ident for f in client_side_filters]
 
+    if client_side_filters:
+        # The rows have been fetched without limit, only the filtered ones count towards it
+        return len(rows), rows
     return unfiltered_amount_of_rows, rows
 
 
-def _fetch_rows_from_livestatus(view: View, all_active_filters: list[Filter]) -> tuple[Rows, int]:
+def _push_down_filters(
+    context: VisualContext, all_active_filters: Iterable[Filter]
+) -> tuple[FilterHeader, list[Filter]]:
+    """Let Livestatus do as much of the post-Livestatus filtering as possible
+
+    Returns the Livestatus filter headers replacing the post-Livestatus filtering and the
+    filters that still have to filter the fetched rows."""
+    headers: list[FilterHeader] = []
+    client_side_filters: list[Filter] = []
+    for filter_ in all_active_filters:
+        if not filter_.uses_filter_table():
+            continue
+        if (pushdown := filter_pushdown_registry.get(filter_.ident)) is not None and (
+            filter_headers := pushdown.filter_headers(context)
+        ) is not None:
+            headers.append(filter_headers)
+        elif any(context.get(filter_.ident, {}).values()):
+            # Without a value, filter_table() keeps all rows
+            client_side_filters.append(filter_)
+    return "".join(headers), client_side_filters
+
+
+def _fetch_rows_from_livestatus(
+    view: View,
+    all_active_filters: list[Filter],
+    pushed_down_headers: FilterHeader,
+    limit: int | None,
+) -> tuple[Rows, int]:
     """Fetches the view rows from livestatus
 
     Besides gathering the information from livestatus it performs livestatus table joining
     (e.g. Adding service row info to host rows (For join painters))"""
-    # We test for limit here and not inside view.row_limit, because view.row_limit is used
-    # for rendering limits.
     row_data: Rows | tuple[Rows, int] = view.datasource.table.query(
         view.datasource,
         view.row_cells,
@@ -399,10 +443,11 @@ def _fetch_rows_from_livestatus(view: View, all_active_filters: list[Filter]) ->
         view.context,
         (
             "".join(get_livestatus_filter_headers(view.context, all_active_filters))
+            + pushed_down_headers
             + view.spec.get("add_headers", "")
         ),
         view.only_sites,
-        None if view.datasource.ignore_limit else view.row_limit,
+        limit,
         all_active_filters,
     )
 
@@ -676,10 +721,67 @@ def _link_to_folder_by_path(path: str) -> str:
 
 
 def _sort_data(data: Rows, sorters: list[SorterEntry]) -> None:
-    """Sort data according to list of sorters."""
+    """Sort data according to list of sorters.
+
+    The sort is stable, so sorting by the least significant sorters first results in the
+    same order as comparing the rows by all sorters at once. Sorters with a key function
+    are combined to a composite key, which is computed only once per row. Sorters having
+    only a cmp function are sorted with it.
+    """
     if not sorters:
         return
 
+    for group in reversed(_group_sorters(sorters)):
+        if all(entry.sorter.key is not None for entry in group):
+            data.sort(key=_make_sort_key(group), reverse=group[0].negate)
+        else:
+            data.sort(key=functools.cmp_to_key(_make_multisort(group)), reverse=group[0].negate)
+
+
+def _group_sorters(sorters: Sequence[SorterEntry]) -> list[list[SorterEntry]]:
+    """Group consecutive sorters of the same direction that can be sorted together"""
+    groups: list[list[SorterEntry]] = []
+    for entry in sorters:
+        if (
+            groups
+            and groups[-1][0].negate == entry.negate
+            and (groups[-1][0].sorter.key is None) == (entry.sorter.key is None)
+        ):
+            groups[-1].append(entry)
+        else:
+            groups.append([entry])
+    return groups
+
+
+def _make_sort_key(sorters: Sequence[SorterEntry]) -> Callable[[Row], tuple[Any, ...]]:
+    key_functions = [
+        (
+            entry.join_key,
+            functools.partial(
+                entry.sorter.key, parameters=entry.parameters, config=active_config, request=request
+            ),
+        )
+        for entry in sorters
+        if entry.sorter.key is not None
+    ]
+
+    def sort_key(row: Row) -> tuple[Any, ...]:
+        return tuple(
+            key_function(row)
+            if not join_key
+            # Handle case where join columns are not present for all rows
+            else (
+                (False,)
+                if (join_row := row["JOIN"].get(join_key)) is None
+                else (True, key_function(join_row))
+            )
+            for join_key, key_function in key_functions
+        )
+
+    return sort_key
+
+
+def _make_multisort(sorters: Sequence[SorterEntry]) -> Callable[[Row, Row], int]:
     # Handle case where join columns are not present for all rows
     def safe_compare(
         compfunc: SorterProtocol,
@@ -705,10 +807,8 @@ def _sort_data(data: Rows, sorters: list[SorterEntry]) -> None:
 
     def multisort(e1: Row, e2: Row) -> int:
         for entry in sorters:
-            neg = -1 if entry.negate else 1
-
             if entry.join_key:  # Sorter for join column, use JOIN info
-                c = neg * safe_compare(
+                c = safe_compare(
                     entry.sorter.cmp,
                     e1["JOIN"].get(entry.join_key),
                     e2["JOIN"].get(entry.join_key),
@@ -717,7 +817,7 @@ def _sort_data(data: Rows, sorters: list[SorterEntry]) -> None:
                     request,
                 )
             else:
-                c = neg * entry.sorter.cmp(
+                c = entry.sorter.cmp(
                     e1,
                     e2,
                     parameters=entry.parameters,
@@ -729,4 +829,4 @@ def _sort_data(data: Rows, sorters: list[SorterEntry]) -> None:
                 return c
         return 0  # equal
 
-    data.sort(key=functools.cmp_to_key(multisort))
+    return multisort
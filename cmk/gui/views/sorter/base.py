@@ -42,6 +42,23 @@ class SorterProtocol(Protocol):
         """
 
 
+class SorterKeyProtocol(Protocol):
+    def __call__(
+        self,
+        row: Row,
+        *,
+        parameters: Mapping[str, Any] | None,
+        config: Config,
+        request: Request,
+    ) -> Any:
+        """Sorting rows by the returned keys must result in the same order as sorting them
+        with the cmp function of the sorter.
+
+        The key is computed once per row, where the cmp function is called for every
+        comparison. Sorters without a key function are sorted using their cmp function.
+        """
+
+
 class SorterEntry(NamedTuple):
     sorter: Sorter
     negate: bool
@@ -59,12 +76,15 @@ class Sorter:
         columns: Sequence[ColumnName],
         sort_function: SorterProtocol,
         load_inv: bool = False,
+        *,
+        sort_key: SorterKeyProtocol | None = None,
     ):
         self.ident = ident
         self._title = title
         self.columns = columns
         self.cmp = sort_function
         self.load_inv = load_inv
+        self.key = sort_key
 
     @property
     def title(self) -> str:
@@ -80,6 +100,8 @@ class ParameterizedSorter(Sorter):
         sort_function: SorterProtocol,
         parameter_valuespec: Callable[[Config, Sequence[ColumnSpec]], Dictionary],
         load_inv: bool = False,
+        *,
+        sort_key: SorterKeyProtocol | None = None,
     ):
-        super().__init__(ident, title, columns, sort_function, load_inv)
+        super().__init__(ident, title, columns, sort_function, load_inv, sort_key=sort_key)
         self.vs_parameters = parameter_valuespec
@@ -6,11 +6,15 @@
 # mypy: disable-error-code="no-any-return"
 # mypy: disable-error-code="type-arg"
 
-from typing import Literal
+from collections.abc import Callable, Mapping
+from typing import Any, Literal
 
 from cmk.gui.num_split import cmp_num_split as _cmp_num_split
+from cmk.gui.num_split import key_num_split as _key_num_split
 from cmk.gui.type_defs import ColumnName, Row, SorterFunction
 
+SorterKeyFunction = Callable[[ColumnName, Row], Any]
+
 
 def cmp_simple_number(column: ColumnName, r1: Row, r2: Row) -> int:
     v1 = r1[column]
@@ -66,22 +70,65 @@ def cmp_ip_address(column: ColumnName, r1: Row, r2: Row) -> int:
 
 
 def compare_ips(ip1: str, ip2: str, ipv: Literal["ipv4", "ipv6"] = "ipv4") -> int:
-    def split_ip(ip: str) -> tuple:
-        if ipv == "ipv4":
-            try:
-                return tuple(int(part) for part in ip.split("."))
-            except ValueError:
-                # Make hostnames comparable with IPv4 address representations
-                return (255, 255, 255, 255, ip)
-
-        # ipv == "ipv6"
-        if not ip:
-            return ("ffff",) * 8
-        return tuple(part for part in ip.split(":"))
-
-    v1, v2 = split_ip(ip1), split_ip(ip2)
+    v1, v2 = key_ip(ip1, ipv), key_ip(ip2, ipv)
     return (v1 > v2) - (v1 < v2)
 
 
+def key_ip(ip: str, ipv: Literal["ipv4", "ipv6"] = "ipv4") -> tuple:
+    if ipv == "ipv4":
+        try:
+            return tuple(int(part) for part in ip.split("."))
+        except ValueError:
+            # Make hostnames comparable with IPv4 address representations
+            return (255, 255, 255, 255, ip)
+
+    # ipv == "ipv6"
+    if not ip:
+        return ("ffff",) * 8
+    return tuple(part for part in ip.split(":"))
+
+
 def _get_custom_var(row: Row, key: str) -> str:
     return row["custom_variables"].get(key, "")
+
+
+# Key functions equivalent to the cmp functions above. See SorterKeyProtocol.
+
+
+def key_simple_number(column: ColumnName, row: Row) -> Any:
+    return row[column]
+
+
+def key_num_split(column: ColumnName, row: Row) -> tuple[int | str, ...]:
+    return _key_num_split(row[column].lower())
+
+
+def key_simple_string(column: ColumnName, row: Row) -> tuple[str, str]:
+    return key_insensitive_string(row.get(column, ""))
+
+
+def key_insensitive_string(value: str) -> tuple[str, str]:
+    # Equal spelling but different case is ordered by case, see cmp_insensitive_string
+    return value.lower(), value
+
+
+def key_string_list(column: ColumnName, row: Row) -> tuple[str, str]:
+    return key_insensitive_string("".join(row.get(column, [])))
+
+
+def key_ip_address(column: ColumnName, row: Row) -> tuple:
+    return key_ip(row.get(column, ""))
+
+
+_KEY_FUNCTIONS: Mapping[SorterFunction, SorterKeyFunction] = {
+    cmp_simple_number: key_simple_number,
+    cmp_num_split: key_num_split,
+    cmp_simple_string: key_simple_string,
+    cmp_string_list: key_string_list,
+    cmp_ip_address: key_ip_address,
+}
+
+
+def key_function_of(func: SorterFunction) -> SorterKeyFunction | None:
+    """Return the key function equivalent to the given cmp function, if there is one"""
+    return _KEY_FUNCTIONS.get(func)
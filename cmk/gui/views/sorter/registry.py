@@ -19,6 +19,7 @@ from cmk.gui.type_defs import ColumnName, PainterName, SorterFunction
 from cmk.gui.utils.roles import UserPermissions
 
 from .base import Sorter
+from .helpers import key_function_of
 from .host_tag_sorters import host_tag_config_based_sorters
 
 
@@ -50,12 +51,14 @@ def register_sorter(ident: str, spec: dict[str, Any]) -> None:
 
 
 def declare_simple_sorter(name: str, title: str, column: ColumnName, func: SorterFunction) -> None:
+    key_func = key_function_of(func)
     sorter_registry.register(
         Sorter(
             ident=name,
             title=title,
             columns=[column],
             sort_function=lambda r1, r2, **_kwargs: func(column, r1, r2),
+            sort_key=(None if key_func is None else lambda row, **_kwargs: key_func(column, row)),
         )
     )
 
@@ -82,6 +85,12 @@ def declare_1to1_sorter(
                 if reverse
                 else lambda r1, r2, **_kwargs: func(painter.columns[col_num], r1, r2)
             ),
+            # Keys can't be reversed in general, so reversed sorters stick to their cmp function.
+            sort_key=(
+                None
+                if reverse or (key_func := key_function_of(func)) is None
+                else lambda row, **_kwargs: key_func(painter.columns[col_num], row)
+            ),
         )
     )
 
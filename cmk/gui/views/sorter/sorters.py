@@ -30,6 +30,9 @@ from .helpers import (
     cmp_simple_string,
     cmp_string_list,
     compare_ips,
+    key_insensitive_string,
+    key_ip,
+    key_num_split,
 )
 from .registry import declare_1to1_sorter, declare_simple_sorter, SorterRegistry
 
@@ -61,7 +64,7 @@ def register_sorters(registry: SorterRegistry) -> None:
     registry.register(SorterNumProblems)
     registry.register(SorterHostDockerNode)
 
-    declare_simple_sorter("svcdescr", _("Service name"), "service_description", cmp_service_name)
+    registry.register(SorterSvcdescr)
     declare_simple_sorter(
         "svcdispname",
         _("Service alternative display name"),
@@ -293,6 +296,7 @@ SorterSvcstate = Sorter(
     title=_l("Service state"),
     columns=["service_state", "service_has_been_checked"],
     sort_function=_sort_service_state,
+    sort_key=lambda row, **_kwargs: cmp_state_equiv(row),
 )
 
 
@@ -314,6 +318,7 @@ SorterHoststate = Sorter(
     title=_l("Host state"),
     columns=["host_state", "host_has_been_checked"],
     sort_function=_sort_host_state,
+    sort_key=lambda row, **_kwargs: cmp_host_state_equiv(row),
 )
 
 
@@ -335,6 +340,7 @@ SorterSiteHost = Sorter(
     title=_l("Host site and name"),
     columns=["site", "host_name"],
     sort_function=_sort_site_host,
+    sort_key=lambda row, **_kwargs: (row["site"], key_num_split("host_name", row)),
 )
 
 
@@ -354,6 +360,7 @@ SorterHostName = Sorter(
     title=_l("Host name"),
     columns=["host_name"],
     sort_function=_sort_host_name,
+    sort_key=lambda row, **_kwargs: key_num_split("host_name", row),
 )
 
 
@@ -375,6 +382,7 @@ SorterSitealias = Sorter(
     title=_l("Site Alias"),
     columns=["site"],
     sort_function=_sort_site_alias,
+    sort_key=lambda row, *, config, **_kwargs: config.sites[row["site"]]["alias"],
 )
 
 
@@ -387,16 +395,21 @@ def _sort_tags(
     request: Request,
     object_type: str,
 ) -> int:
-    tag_groups_1 = sorted(get_tag_groups(r1, object_type).items())
-    tag_groups_2 = sorted(get_tag_groups(r2, object_type).items())
+    tag_groups_1 = _key_tags(r1, object_type=object_type)
+    tag_groups_2 = _key_tags(r2, object_type=object_type)
     return (tag_groups_1 > tag_groups_2) - (tag_groups_1 < tag_groups_2)
 
 
+def _key_tags(row: Row, *, object_type: str, **_kwargs: object) -> list[tuple[str, str]]:
+    return sorted(get_tag_groups(row, object_type).items())
+
+
 SorterHostTags = Sorter(
     ident="host",
     title=_l("Host Tags"),
     columns=["host_tags"],
     sort_function=partial(_sort_tags, object_type="host"),
+    sort_key=partial(_key_tags, object_type="host"),
 )
 
 SorterServiceTags = Sorter(
@@ -404,6 +417,7 @@ SorterServiceTags = Sorter(
     title=_l("Service Tags"),
     columns=["service_tags"],
     sort_function=partial(_sort_tags, object_type="service"),
+    sort_key=partial(_key_tags, object_type="service"),
 )
 
 
@@ -416,16 +430,21 @@ def _sort_labels(
     request: Request,
     object_type: str,
 ) -> int:
-    labels_1 = sorted(get_labels(r1, object_type).items())
-    labels_2 = sorted(get_labels(r2, object_type).items())
+    labels_1 = _key_labels(r1, object_type=object_type)
+    labels_2 = _key_labels(r2, object_type=object_type)
     return (labels_1 > labels_2) - (labels_1 < labels_2)
 
 
+def _key_labels(row: Row, *, object_type: str, **_kwargs: object) -> list[tuple[str, str]]:
+    return sorted(get_labels(row, object_type).items())
+
+
 SorterHostLabels = Sorter(
     ident="host_labels",
     title=_l("Host labels"),
     columns=["host_labels"],
     sort_function=partial(_sort_labels, object_type="host"),
+    sort_key=partial(_key_labels, object_type="host"),
 )
 
 
@@ -434,6 +453,7 @@ SorterServiceLabels = Sorter(
     title=_l("Service labels"),
     columns=["service_labels"],
     sort_function=partial(_sort_labels, object_type="service"),
+    sort_key=partial(_key_labels, object_type="service"),
 )
 
 
@@ -443,6 +463,19 @@ def cmp_service_name(column: str, r1: Row, r2: Row) -> int:
     ) or cmp_num_split(column, r1, r2)
 
 
+def _key_service_name(column: str, row: Row) -> tuple[int, tuple[int | str, ...]]:
+    return utils.cmp_service_name_equiv(row[column]), key_num_split(column, row)
+
+
+SorterSvcdescr = Sorter(
+    ident="svcdescr",
+    title=_l("Service name"),
+    columns=["service_description"],
+    sort_function=lambda r1, r2, **_kwargs: cmp_service_name("service_description", r1, r2),
+    sort_key=lambda row, **_kwargs: _key_service_name("service_description", row),
+)
+
+
 def _sort_service_perf_val(
     r1: Row,
     r2: Row,
@@ -452,16 +485,21 @@ def _sort_service_perf_val(
     request: Request,
     num: int,
 ) -> int:
-    v1 = utils.savefloat(get_perfdata_nth_value(r1, num - 1, True))
-    v2 = utils.savefloat(get_perfdata_nth_value(r2, num - 1, True))
+    v1 = _key_service_perf_val(r1, num=num)
+    v2 = _key_service_perf_val(r2, num=num)
     return (v1 > v2) - (v1 < v2)
 
 
+def _key_service_perf_val(row: Row, *, num: int, **_kwargs: object) -> float:
+    return utils.savefloat(get_perfdata_nth_value(row, num - 1, True))
+
+
 SorterSvcPerfVal01 = Sorter(
     ident="svc_perf_val01",
     title=_("Service performance data - value number 01"),
     columns=["service_perf_data"],
     sort_function=partial(_sort_service_perf_val, num=1),
+    sort_key=partial(_key_service_perf_val, num=1),
 )
 
 SorterSvcPerfVal02 = Sorter(
@@ -469,6 +507,7 @@ SorterSvcPerfVal02 = Sorter(
     title=_("Service metrics - value number 02"),
     columns=["service_perf_data"],
     sort_function=partial(_sort_service_perf_val, num=2),
+    sort_key=partial(_key_service_perf_val, num=2),
 )
 
 SorterSvcPerfVal03 = Sorter(
@@ -476,6 +515,7 @@ SorterSvcPerfVal03 = Sorter(
     title=_("Service performance data - value number 03"),
     columns=["service_perf_data"],
     sort_function=partial(_sort_service_perf_val, num=3),
+    sort_key=partial(_key_service_perf_val, num=3),
 )
 
 
@@ -484,6 +524,7 @@ SorterSvcPerfVal04 = Sorter(
     title=_("Service performance data - value number 04"),
     columns=["service_perf_data"],
     sort_function=partial(_sort_service_perf_val, num=4),
+    sort_key=partial(_key_service_perf_val, num=4),
 )
 
 SorterSvcPerfVal05 = Sorter(
@@ -491,6 +532,7 @@ SorterSvcPerfVal05 = Sorter(
     title=_("Service performance data - value number 05"),
     columns=["service_perf_data"],
     sort_function=partial(_sort_service_perf_val, num=5),
+    sort_key=partial(_key_service_perf_val, num=5),
 )
 
 
@@ -499,6 +541,7 @@ SorterSvcPerfVal06 = Sorter(
     title=_("Service performance data - value number 06"),
     columns=["service_perf_data"],
     sort_function=partial(_sort_service_perf_val, num=6),
+    sort_key=partial(_key_service_perf_val, num=6),
 )
 
 SorterSvcPerfVal07 = Sorter(
@@ -506,6 +549,7 @@ SorterSvcPerfVal07 = Sorter(
     title=_("Service performance data - value number 07"),
     columns=["service_perf_data"],
     sort_function=partial(_sort_service_perf_val, num=7),
+    sort_key=partial(_key_service_perf_val, num=7),
 )
 
 SorterSvcPerfVal08 = Sorter(
@@ -513,6 +557,7 @@ SorterSvcPerfVal08 = Sorter(
     title=_("Service performance data - value number 08"),
     columns=["service_perf_data"],
     sort_function=partial(_sort_service_perf_val, num=8),
+    sort_key=partial(_key_service_perf_val, num=8),
 )
 
 SorterSvcPerfVal09 = Sorter(
@@ -520,6 +565,7 @@ SorterSvcPerfVal09 = Sorter(
     title=_("Service performance data - value number 09"),
     columns=["service_perf_data"],
     sort_function=partial(_sort_service_perf_val, num=9),
+    sort_key=partial(_key_service_perf_val, num=9),
 )
 
 SorterSvcPerfVal10 = Sorter(
@@ -527,6 +573,7 @@ SorterSvcPerfVal10 = Sorter(
     title=_("Service metrics - value number 10"),
     columns=["service_perf_data"],
     sort_function=partial(_sort_service_perf_val, num=10),
+    sort_key=partial(_key_service_perf_val, num=10),
 )
 
 
@@ -539,16 +586,24 @@ def _sort_host_custom_variable(
     request: Request,
 ) -> int:
     assert parameters is not None
-    variable_name = parameters["ident"].upper()
+    return cmp_insensitive_string(
+        _get_host_custom_variable(r1, parameters), _get_host_custom_variable(r2, parameters)
+    )
+
 
-    def _get_value(row: Row) -> str:
-        try:
-            index = row["host_custom_variable_names"].index(variable_name)
-        except ValueError:
-            return ""
-        return row["host_custom_variable_values"][index]
+def _key_host_custom_variable(
+    row: Row, *, parameters: Mapping[str, Any] | None, **_kwargs: object
+) -> tuple[str, str]:
+    assert parameters is not None
+    return key_insensitive_string(_get_host_custom_variable(row, parameters))
 
-    return cmp_insensitive_string(_get_value(r1), _get_value(r2))
+
+def _get_host_custom_variable(row: Row, parameters: Mapping[str, Any]) -> str:
+    try:
+        index = row["host_custom_variable_names"].index(parameters["ident"].upper())
+    except ValueError:
+        return ""
+    return row["host_custom_variable_values"][index]
 
 
 def _sort_host_custom_variable_parameter_valuespec(
@@ -579,6 +634,7 @@ SorterCustomHostVariable = ParameterizedSorter(
     columns=["host_custom_variable_names", "host_custom_variable_values"],
     sort_function=_sort_host_custom_variable,
     parameter_valuespec=_sort_host_custom_variable_parameter_valuespec,
+    sort_key=_key_host_custom_variable,
 )
 
 
@@ -591,25 +647,31 @@ def _sort_host_ip_addresses(
     config: Config,
     request: Request,
 ) -> int:
-    def get_address(row: Row, ipv: Literal["ipv4", "ipv6"]) -> str:
-        custom_vars = dict(
-            zip(row["host_custom_variable_names"], row["host_custom_variable_values"])
-        )
-        if ipv == "ipv4":
-            return custom_vars.get("ADDRESS_4", "")
-        return custom_vars.get("ADDRESS_6", "")
-
     for ipv in ip_versions:
-        if (result := compare_ips(get_address(r1, ipv), get_address(r2, ipv), ipv)) != 0:
+        if (result := compare_ips(_get_address(r1, ipv), _get_address(r2, ipv), ipv)) != 0:
             return result
     return 0
 
 
+def _key_host_ip_addresses(
+    ip_versions: Sequence[Literal["ipv4", "ipv6"]], row: Row, **_kwargs: object
+) -> tuple[object, ...]:
+    return tuple(key_ip(_get_address(row, ipv), ipv) for ipv in ip_versions)
+
+
+def _get_address(row: Row, ipv: Literal["ipv4", "ipv6"]) -> str:
+    custom_vars = dict(zip(row["host_custom_variable_names"], row["host_custom_variable_values"]))
+    if ipv == "ipv4":
+        return custom_vars.get("ADDRESS_4", "")
+    return custom_vars.get("ADDRESS_6", "")
+
+
 SorterHostIpv4Address = Sorter(
     ident="host_ipv4_address",
     title=_l("Host IPv4 address"),
     columns=["host_custom_variable_names", "host_custom_variable_values"],
     sort_function=partial(_sort_host_ip_addresses, ["ipv4"]),
+    sort_key=partial(_key_host_ip_addresses, ["ipv4"]),
 )
 
 
@@ -618,6 +680,7 @@ SorterHostIpv6Address = Sorter(
     title=_l("Host IPv6 address"),
     columns=["host_custom_variable_names", "host_custom_variable_values"],
     sort_function=partial(_sort_host_ip_addresses, ["ipv6"]),
+    sort_key=partial(_key_host_ip_addresses, ["ipv6"]),
 )
 
 
@@ -626,6 +689,7 @@ SorterHostIpAddresses = Sorter(
     title=_l("Host addresses (IPv4/IPv6)"),
     columns=["host_custom_variable_names", "host_custom_variable_values"],
     sort_function=partial(_sort_host_ip_addresses, ["ipv4", "ipv6"]),
+    sort_key=partial(_key_host_ip_addresses, ["ipv4", "ipv6"]),
 )
 
 
@@ -651,6 +715,9 @@ SorterNumProblems = Sorter(
     title=_l("Number of problems"),
     columns=["host_num_services", "host_num_services_ok", "host_num_services_pending"],
     sort_function=_sort_num_problems,
+    sort_key=lambda row, **_kwargs: (
+        row["host_num_services"] - row["host_num_services_ok"] - row["host_num_services_pending"]
+    ),
 )
 
 
@@ -717,4 +784,5 @@ SorterHostDockerNode = Sorter(
     title=_l("Node name"),
     columns=["host_labels", "host_label_sources"],
     sort_function=_sort_docker_nodes_,
+    sort_key=lambda row, **_kwargs: key_insensitive_string(_get_docker_nodes(row=row)),
 )
@@ -15,5 +15,8 @@ from ._base import FilterOption as FilterOption
 from ._base import FilterTime as FilterTime
 from ._base import InputTextFilter as InputTextFilter
 from ._base import RegexFilter as RegexFilter
+from ._registry import filter_pushdown_registry as filter_pushdown_registry
 from ._registry import filter_registry as filter_registry
+from ._registry import FilterPushdown as FilterPushdown
+from ._registry import FilterPushdownRegistry as FilterPushdownRegistry
 from ._registry import FilterRegistry as FilterRegistry
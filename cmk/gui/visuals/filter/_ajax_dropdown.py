@@ -67,6 +67,9 @@ class AjaxDropdownFilter(Filter):
     def filter_table(self, context: VisualContext, rows: Rows) -> Rows:
         return self.query_filter.filter_table(context, rows)
 
+    def uses_filter_table(self) -> bool:
+        return self.query_filter.uses_filter_table()
+
     def request_vars_from_row(self, row: Row) -> dict[str, str]:
         return {self.query_filter.request_vars[0]: row[self.query_filter.column]}
 
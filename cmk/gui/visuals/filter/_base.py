@@ -148,6 +148,10 @@ class Filter(abc.ABC):
         """post-Livestatus filtering (e.g. for BI aggregations)"""
         return rows
 
+    def uses_filter_table(self) -> bool:
+        """Whether filter_table() filters the rows at all"""
+        return type(self).filter_table is not Filter.filter_table
+
     def request_vars_from_row(self, row: Row) -> FilterHTTPVariables:
         """return filter request variables built from the given row"""
         return {}
@@ -204,6 +208,9 @@ class FilterOption(Filter):
         """post-Livestatus filtering (e.g. for BI aggregations)"""
         return self.query_filter.filter_table(context, rows)
 
+    def uses_filter_table(self) -> bool:
+        return self.query_filter.uses_filter_table()
+
 
 def recover_pre_2_1_range_filter_request_vars(
     query: query_filters.NumberRangeQuery,
@@ -286,6 +293,9 @@ class FilterNumberRange(Filter):  # type is int
     def filter_table(self, context: VisualContext, rows: Rows) -> Rows:
         return self.query_filter.filter_table(context, rows)
 
+    def uses_filter_table(self) -> bool:
+        return self.query_filter.uses_filter_table()
+
     def value(self) -> FilterHTTPVariables:
         """Returns the current representation of the filter settings from the request context."""
         return recover_pre_2_1_range_filter_request_vars(self.query_filter)
@@ -361,6 +371,9 @@ class FilterTime(Filter):
     def filter_table(self, context: VisualContext, rows: Rows) -> Rows:
         return self.query_filter.filter_table(context, rows)
 
+    def uses_filter_table(self) -> bool:
+        return self.query_filter.uses_filter_table()
+
     def value(self) -> FilterHTTPVariables:
         """Returns the current representation of the filter settings from the request context."""
         return recover_pre_2_1_range_filter_request_vars(self.query_filter)
@@ -429,6 +442,9 @@ class InputTextFilter(Filter):
     def filter_table(self, context: VisualContext, rows: Rows) -> Rows:
         return self.query_filter.filter_table(context, rows)
 
+    def uses_filter_table(self) -> bool:
+        return self.query_filter.uses_filter_table()
+
 
 class CheckboxRowFilter(Filter):
     def __init__(
@@ -462,6 +478,9 @@ class CheckboxRowFilter(Filter):
     def filter_table(self, context: VisualContext, rows: Rows) -> Rows:
         return self.query_filter.filter_table(context, rows)
 
+    def uses_filter_table(self) -> bool:
+        return self.query_filter.uses_filter_table()
+
 
 class DualListFilter(Filter):
     def __init__(
@@ -4,11 +4,12 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
 
 from cmk.ccc.exceptions import MKGeneralException
 from cmk.ccc.plugin_registry import Registry
-from cmk.gui.type_defs import FilterName
+from cmk.gui.type_defs import FilterHeader, FilterName, VisualContext
 
 from ._base import Filter
 
@@ -59,3 +60,24 @@ class FilterRegistry(Registry[Filter]):
 
 
 filter_registry = FilterRegistry()
+
+
+@dataclass(frozen=True)
+class FilterPushdown:
+    """Moves the post-Livestatus filtering of a filter into the Livestatus query
+
+    filter_headers computes the Livestatus filter headers selecting exactly the rows
+    filter_table() of the filter would keep. It returns None, if this is not possible for
+    the current filter value. In this case the rows are filtered by filter_table() as usual.
+    """
+
+    ident: FilterName
+    filter_headers: Callable[[VisualContext], FilterHeader | None]
+
+
+class FilterPushdownRegistry(Registry[FilterPushdown]):
+    def plugin_name(self, instance: FilterPushdown) -> str:
+        return instance.ident
+
+
+filter_pushdown_registry = FilterPushdownRegistry()
@@ -222,6 +222,7 @@ def register(
     config_variable_registry.register(ConfigVariableClusterMaxCachefileAge)
     config_variable_registry.register(ConfigVariablePiggybackMaxCachefileAge)
     config_variable_registry.register(ConfigVariableCheckMKPerfdataWithTimes)
+    config_variable_registry.register(ConfigVariableMaxConcurrentFetches)
     config_variable_registry.register(ConfigVariableUseDNSCache)
     config_variable_registry.register(ConfigVariableChooseSNMPBackend)
     config_variable_registry.register(ConfigVariableSNMPwalkDownloadTimeout)
@@ -2737,6 +2738,24 @@ ConfigVariableCheckMKPerfdataWithTimes = ConfigVariable(
     ),
 )
 
+ConfigVariableMaxConcurrentFetches = ConfigVariable(
+    group=ConfigVariableGroupCheckExecution,
+    primary_domain=ConfigDomainCore,
+    ident="max_concurrent_fetches",
+    valuespec=lambda context: Integer(
+        title=_("Maximum concurrent data sources per host"),
+        help=_(
+            "The number of data sources (agent, special agents, SNMP, piggyback) of a host "
+            "Checkmk fetches at the same time. With the default of one, the sources are "
+            "queried one after another and the Checkmk service waits for the sum of their "
+            "response times. Higher values reduce this to the slowest source, at the price "
+            "of more simultaneous connections and processes."
+        ),
+        minvalue=1,
+        maxvalue=16,
+    ),
+)
+
 ConfigVariableUseDNSCache = ConfigVariable(
     group=ConfigVariableGroupCheckExecution,
     primary_domain=ConfigDomainCore,
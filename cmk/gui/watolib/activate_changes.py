@@ -700,7 +700,7 @@ def _get_config_sync_state(
     replication_paths: Sequence[ReplicationPath],
     *,
     debug: bool,
-) -> tuple[ConfigSyncFileInfos, int]:
+) -> tuple[ConfigSyncFileInfos, int, bool]:
     """Get the config file states from the remote sites
 
     Calls the automation call "get-config-sync-state" on the remote site,
@@ -713,7 +713,12 @@ def _get_config_sync_state(
     )
 
     assert isinstance(response, tuple)
-    return {k: ConfigSyncFileInfo(*v) for k, v in response[0].items()}, response[1]
+    return (
+        {k: ConfigSyncFileInfo(*v) for k, v in response[0].items()},
+        response[1],
+        # Remote sites of older versions don't report whether they accept compressed archives
+        len(response) > 2 and response[2] is True,
+    )
 
 
 def _synchronize_files(
@@ -724,15 +729,17 @@ def _synchronize_files(
     remote_config_generation: int,
     site_config_dir: Path,
     *,
+    compress: bool = False,
     debug: bool,
 ) -> None:
     """Pack the files in a simple tar archive and send it to the remote site
 
     We build a simple tar archive containing all files to be synchronized.  The list of file to
     be deleted and the current config generation is handed over using dedicated HTTP parameters.
+    The archive is gzip compressed in case the remote site is able to extract it.
     """
 
-    sync_archive = _get_sync_archive(files_to_sync, site_config_dir)
+    sync_archive = _get_sync_archive(files_to_sync, site_config_dir, compress=compress)
 
     response = cmk.gui.watolib.automations.do_remote_automation(
         automation_config,
@@ -755,6 +762,7 @@ class SyncState:
     central_file_infos: ConfigSyncFileInfos
     remote_file_infos: ConfigSyncFileInfos
     remote_config_generation: int
+    remote_accepts_compressed_archive: bool = False
 
 
 def fetch_sync_state(
@@ -778,7 +786,11 @@ def fetch_sync_state(
             _set_sync_state(site_activation_state, _("Fetching sync state"))
             site_logger.debug("Starting config sync (%r)", site_activation_state)
 
-            remote_file_infos, remote_config_generation = _get_config_sync_state(
+            (
+                remote_file_infos,
+                remote_config_generation,
+                remote_accepts_compressed_archive,
+            ) = _get_config_sync_state(
                 automation_config,
                 replication_paths,
                 debug=debug,
@@ -790,6 +802,7 @@ def fetch_sync_state(
                     central_file_infos=central_file_infos,
                     remote_file_infos=remote_file_infos,
                     remote_config_generation=remote_config_generation,
+                    remote_accepts_compressed_archive=remote_accepts_compressed_archive,
                 ),
                 site_activation_state,
                 sync_start,
@@ -846,6 +859,7 @@ def synchronize_files(
     origin_span: trace.Span,
     automation_config: RemoteAutomationConfig,
     debug: bool,
+    compress_sync_archive: bool = False,
 ) -> SiteActivationState | None:
     site_id = site_activation_state["_site_id"]
     site_logger = logger.getChild(f"site[{site_id}]")
@@ -879,6 +893,7 @@ def synchronize_files(
                 sync_delta.to_delete,
                 remote_config_generation,
                 site_config_dir,
+                compress=compress_sync_archive,
                 debug=debug,
             )
             site_logger.debug("Finished config sync")
@@ -2235,6 +2250,7 @@ def _initialize_site_activation_state(
 
 def _get_config_sync_file_infos_per_inode(
     replication_paths: Sequence[ReplicationPath],
+    hash_cache: ConfigSyncFileHashCache | None = None,
 ) -> Mapping[int, ConfigSyncFileInfo]:
     inode_sync_states = {}
 
@@ -2246,11 +2262,11 @@ def _get_config_sync_file_infos_per_inode(
 
         if replication_path.ty == ReplicationPathType.FILE:
             inode_sync_states[os.stat(replication_path_full).st_ino] = _get_config_sync_file_info(
-                replication_path_full
+                replication_path_full, hash_cache
             )
         elif replication_path.ty == ReplicationPathType.DIR:
             _get_replication_dir_config_sync_file_infos_per_inode(
-                inode_sync_states, replication_path_full, replication_path.is_excluded
+                inode_sync_states, replication_path_full, replication_path.is_excluded, hash_cache
             )
         else:
             raise NotImplementedError()
@@ -2262,6 +2278,7 @@ def _get_replication_dir_config_sync_file_infos_per_inode(
     inode_sync_states: MutableMapping[int, ConfigSyncFileInfo],
     replication_path: str,
     replication_path_excluder: Callable[[str], bool],
+    hash_cache: ConfigSyncFileHashCache | None = None,
 ) -> None:
     # Use os functionality instead of pathlib since it is faster
     for root, dir_names, file_names in os.walk(replication_path):
@@ -2282,7 +2299,9 @@ def _get_replication_dir_config_sync_file_infos_per_inode(
         for file_name in file_names:
             file_path = os.path.join(root, file_name)
             try:
-                inode_sync_states[os.stat(file_path).st_ino] = _get_config_sync_file_info(file_path)
+                inode_sync_states[os.stat(file_path).st_ino] = _get_config_sync_file_info(
+                    file_path, hash_cache
+                )
             except FileNotFoundError:
                 pass  # Ignore files vanishing during processing
 
@@ -2298,9 +2317,10 @@ def _prepare_for_activation_tasks(
 ) -> tuple[Mapping[SiteId, ConfigSyncFileInfos], Mapping[SiteId, SiteActivationState]]:
     # All activations need to fail if the initialization failed
     initialization_failure: Exception | None = None
+    hash_cache = ConfigSyncFileHashCache(_config_sync_file_hash_cache_path())
     try:
         config_sync_file_infos_per_inode = _get_config_sync_file_infos_per_inode(
-            list(replication_path_registry.values())
+            list(replication_path_registry.values()), hash_cache
         )
     except Exception as e:
         initialization_failure = e
@@ -2335,13 +2355,19 @@ def _prepare_for_activation_tasks(
 
             if activate_changes.is_sync_needed(site_id, snapshot_settings.site_config):
                 central_file_infos_per_site[site_id] = _get_site_central_file_infos(
-                    site_id, snapshot_settings, config_sync_file_infos_per_inode
+                    site_id, snapshot_settings, config_sync_file_infos_per_inode, hash_cache
                 )
         except Exception as e:
             _handle_activation_changes_exception(
                 logger.getChild(f"site[{site_id}]"), e, site_activation_state
             )
             _finalize_activation(site_id, activation_id, source)
+
+    if initialization_failure is None:
+        try:
+            hash_cache.save()
+        except Exception:
+            logger.exception("Failed to save the config sync file hashes")
     return central_file_infos_per_site, site_activation_states_per_site
 
 
@@ -2349,6 +2375,7 @@ def _get_site_central_file_infos(
     site_id: SiteId,
     snapshot_settings: SnapshotSettings,
     config_sync_file_infos_per_inode: Mapping[int, ConfigSyncFileInfo],
+    hash_cache: ConfigSyncFileHashCache | None = None,
 ) -> ConfigSyncFileInfos:
     # In case we experience performance issues here, we could postpone the hashing of the
     # central files to only be done ad-hoc in get_file_names_to_sync when the other attributes
@@ -2359,6 +2386,7 @@ def _get_site_central_file_infos(
         snapshot_settings.snapshot_components,
         site_config_dir,
         config_sync_file_infos_per_inode,
+        hash_cache,
     )
 
     logger.getChild(f"site[{site_id}]").debug(
@@ -2492,7 +2520,7 @@ def _sync_and_activate(
                 )
                 active_tasks["activate_site_changes"][site_id] = async_result_activate_site_changes
 
-        remote_config_generation_per_site: dict[SiteId, int] = {}
+        sync_state_per_site: dict[SiteId, SyncState] = {}
         # we want to mostly parallelize the activation steps, but if one site takes longer,
         # it should not hold up the other sites
         # -> monitor active tasks to handle results as soon as one finishes and start a task for
@@ -2509,7 +2537,7 @@ def _sync_and_activate(
                 activate_changes,
                 file_filter_func,
                 prevent_activate,
-                remote_config_generation_per_site,
+                sync_state_per_site,
                 site_snapshot_settings,
                 task_pool,
                 automation_configs,
@@ -2627,7 +2655,7 @@ def _handle_active_tasks(
     activate_changes: ActivateChanges,
     file_filter_func: FileFilterFunc,
     prevent_activate: bool,
-    remote_config_generation_per_site: MutableMapping[SiteId, int],
+    sync_state_per_site: MutableMapping[SiteId, SyncState],
     site_snapshot_settings: Mapping[SiteId, SnapshotSettings],
     task_pool: ThreadPool,
     automation_configs: Mapping[SiteId, LocalAutomationConfig | RemoteAutomationConfig],
@@ -2643,7 +2671,7 @@ def _handle_active_tasks(
             return  # exception handling happens in thread
 
         sync_state, activation_state, sync_start_time = fetch_sync_state_results
-        remote_config_generation_per_site[site_id] = sync_state.remote_config_generation
+        sync_state_per_site[site_id] = sync_state
 
         active_tasks["calc_sync_delta"][site_id] = task_pool.apply_async(
             func=copy_request_context(calc_sync_delta),
@@ -2674,13 +2702,14 @@ def _handle_active_tasks(
             func=copy_request_context(synchronize_files),
             args=(
                 sync_delta,
-                remote_config_generation_per_site[site_id],
+                sync_state_per_site[site_id].remote_config_generation,
                 Path(site_snapshot_settings[site_id].work_dir),
                 activation_state,
                 sync_start_time,
                 trace.get_current_span(),
                 automation_config,
                 debug,
+                sync_state_per_site[site_id].remote_accepts_compressed_archive,
             ),
             error_callback=_error_callback,
         )
@@ -3235,12 +3264,16 @@ def _filter_remote_files(remote_files: set[str]) -> set[str]:
     return remote_files_to_keep
 
 
-def _get_sync_archive(to_sync: list[str], base_dir: Path) -> bytes:
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _get_sync_archive(to_sync: list[str], base_dir: Path, *, compress: bool = False) -> bytes:
     # Use native tar instead of python tarfile for performance reasons
     completed_process = subprocess.run(
         [
             "tar",
             "-c",
+            *(["-z"] if compress else []),
             "-C",
             str(base_dir),
             "-f",
@@ -3257,8 +3290,8 @@ def _get_sync_archive(to_sync: list[str], base_dir: Path) -> bytes:
         check=False,
     )
 
-    # Since we don't stream the archive to the remote site (we could probably do this) it should be
-    # no problem to buffer it in memory for the moment
+    # The automation call transports the archive as a multipart form field, which is always
+    # completely read into memory. Streaming the tar output would not save anything here.
 
     if completed_process.returncode:
         raise MKGeneralException(
@@ -3274,6 +3307,8 @@ def _unpack_sync_archive(sync_archive: bytes, base_dir: Path) -> None:
         [
             "tar",
             "-x",
+            # Central sites compress the archive in case we told them we are able to extract it
+            *(["-z"] if sync_archive.startswith(_GZIP_MAGIC) else []),
             "-C",
             str(base_dir),
             "-f",
@@ -3308,8 +3343,10 @@ class ConfigSyncFileInfo(NamedTuple):
 # GetConfigSyncStateResponse = NamedTuple("GetConfigSyncStateResponse", [
 #    ("file_infos", dict[str, ConfigSyncFileInfo]),
 #    ("config_generation", int),
+#    ("accepts_compressed_archive", bool),
 # ])
-GetConfigSyncStateResponse = tuple[dict[str, tuple[int, int, str | None, str | None]], int]
+# The last element was added later. Central sites must not rely on it being present.
+GetConfigSyncStateResponse = tuple[dict[str, tuple[int, int, str | None, str | None]], int, bool]
 
 ConfigSyncFileInfos = dict[str, ConfigSyncFileInfo]
 
@@ -3327,7 +3364,8 @@ class AutomationGetConfigSyncState(AutomationCommand[list[ReplicationPath]]):
     The central site hands over the list of replication paths it will try to synchronize later.  The
     remote site computes the list of replication files and sends it back together with the current
     configuration generation ID. The config generation ID is increased on every Setup modification
-    and ensures that nothing is changed between the two config sync steps.
+    and ensures that nothing is changed between the two config sync steps. It also tells the central
+    site that it is able to extract gzip compressed sync archives.
     """
 
     def command_name(self) -> str:
@@ -3341,11 +3379,15 @@ class AutomationGetConfigSyncState(AutomationCommand[list[ReplicationPath]]):
 
     def execute(self, api_request: list[ReplicationPath]) -> GetConfigSyncStateResponse:
         with store.lock_checkmk_configuration(configuration_lockfile):
-            file_infos = _get_config_sync_file_infos(api_request, base_dir=cmk.utils.paths.omd_root)
+            hash_cache = ConfigSyncFileHashCache(_config_sync_file_hash_cache_path())
+            file_infos = _get_config_sync_file_infos(
+                api_request, base_dir=cmk.utils.paths.omd_root, hash_cache=hash_cache
+            )
+            hash_cache.save()
             transport_file_infos = {
                 k: (v.st_mode, v.st_size, v.link_target, v.file_hash) for k, v in file_infos.items()
             }
-            return (transport_file_infos, _get_current_config_generation())
+            return (transport_file_infos, _get_current_config_generation(), True)
 
 
 def _get_config_sync_paths(
@@ -3381,6 +3423,7 @@ def _get_config_sync_file_infos(
     replication_paths: list[ReplicationPath],
     base_dir: Path,
     config_sync_file_infos_per_inode: Mapping[int, ConfigSyncFileInfo] | None = None,
+    hash_cache: ConfigSyncFileHashCache | None = None,
 ) -> ConfigSyncFileInfos:
     """Scans the given replication paths for the information needed for the config sync
 
@@ -3402,7 +3445,7 @@ def _get_config_sync_file_infos(
         match replication_path.ty:
             case ReplicationPathType.FILE:
                 infos[replication_path.site_path] = _get_config_sync_file_info(
-                    replication_path_full
+                    replication_path_full, hash_cache
                 )
 
             case ReplicationPathType.DIR:
@@ -3412,6 +3455,7 @@ def _get_config_sync_file_infos(
                     base_dir,
                     replication_path_full,
                     replication_path.is_excluded,
+                    hash_cache,
                 )
             case _:
                 assert_never(replication_path.ty)
@@ -3424,6 +3468,7 @@ def _get_replication_dir_config_sync_file_infos(
     base_dir: Path,
     replication_path: str,
     replication_path_excluder: Callable[[str], bool],
+    hash_cache: ConfigSyncFileHashCache | None = None,
 ) -> None:
     # Use os functionality instead of pathlib since it is faster
     for root, dir_names, file_names in os.walk(replication_path):
@@ -3443,19 +3488,29 @@ def _get_replication_dir_config_sync_file_infos(
                 ):
                     infos[valid_site_path] = sync_file_info
                 else:
-                    infos[valid_site_path] = _get_config_sync_file_info(config_sync_path)
+                    infos[valid_site_path] = _get_config_sync_file_info(
+                        config_sync_path, hash_cache
+                    )
             except FileNotFoundError:  # e.g. broken symlinks
-                infos[valid_site_path] = _get_config_sync_file_info(config_sync_path)
+                infos[valid_site_path] = _get_config_sync_file_info(config_sync_path, hash_cache)
 
 
-def _get_config_sync_file_info(file_path: str) -> ConfigSyncFileInfo:
+def _get_config_sync_file_info(
+    file_path: str, hash_cache: ConfigSyncFileHashCache | None = None
+) -> ConfigSyncFileInfo:
     stat = os.lstat(file_path)
     is_symlink = os.path.islink(file_path)
+    if is_symlink:
+        file_hash = None
+    elif hash_cache is None:
+        file_hash = _create_config_sync_file_hash(file_path)
+    else:
+        file_hash = hash_cache.file_hash(file_path, stat)
     return ConfigSyncFileInfo(
         stat.st_mode,
         stat.st_size,
         os.readlink(str(file_path)) if is_symlink else None,
-        _create_config_sync_file_hash(file_path) if not is_symlink else None,
+        file_hash,
     )
 
 
@@ -3470,6 +3525,68 @@ def _create_config_sync_file_hash(file_path: str) -> str:
     return sha256.hexdigest()
 
 
+class ConfigSyncFileHashCache:
+    """Remembers the hashes of the replicated files between two config syncs
+
+    Similar to the quick check of rsync, a file is considered to be unchanged as long as its
+    inode, modification time and size are the same, so only new and modified files are read.
+    The change time is not part of the key, because hardlinking the files into the site
+    specific work directories updates it on every activation.
+    """
+
+    # Files modified within this period may be changed again without their modification time
+    # changing (coarse timestamps of some file systems). Their hashes are not remembered.
+    _RACY_PERIOD = 2.0
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._entries: dict[tuple[int, int], tuple[int, int, str]] = self._load()
+        self._used: dict[tuple[int, int], tuple[int, int, str]] = {}
+        self._changed = False
+        self._racy_mtime_ns = time.time_ns() - int(self._RACY_PERIOD * 1e9)
+
+    def _load(self) -> dict[tuple[int, int], tuple[int, int, str]]:
+        try:
+            entries = store.load_object_from_pickle_file(self._path, default={})
+        except Exception:
+            # A broken cache is no reason to fail the activation. Simply start over.
+            logger.exception("Failed to load %s", self._path)
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def file_hash(self, file_path: str, stat: os.stat_result) -> str:
+        key = (stat.st_dev, stat.st_ino)
+        if (entry := self._entries.get(key)) is not None and entry[:2] == (
+            stat.st_mtime_ns,
+            stat.st_size,
+        ):
+            self._used[key] = entry
+            return entry[2]
+
+        file_hash = _create_config_sync_file_hash(file_path)
+        if stat.st_mtime_ns < self._racy_mtime_ns:
+            self._used[key] = self._entries[key] = (stat.st_mtime_ns, stat.st_size, file_hash)
+            self._changed = True
+        return file_hash
+
+    def save(self) -> None:
+        """Persist the hashes of all files that were looked up since the cache was loaded
+
+        The entries of files that were not looked up are dropped. Only save the cache after
+        scanning all replication paths.
+        """
+        if not self._changed and len(self._used) == len(self._entries):
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        store.save_object_to_pickle_file(self._path, self._used)
+        self._entries = dict(self._used)
+        self._changed = False
+
+
+def _config_sync_file_hash_cache_path() -> Path:
+    return cmk.utils.paths.tmp_dir / "wato" / "config_sync_file_hashes.pkl"
+
+
 def update_config_generation() -> None:
     """Increase the config generation ID
 
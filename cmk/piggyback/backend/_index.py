@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+"""Index of the stored piggyback data
+
+For every source host we keep a manifest of the piggybacked hosts it has stored data for,
+together with the time of the last update. This answers "which hosts does this source feed"
+and "which files are outdated" without scanning the whole piggyback directory.
+
+The payload files remain the single source of truth. A manifest may list files that have
+vanished in the meantime, so callers have to verify the entries they rely on.
+Data that has been stored without updating the index (e.g. by a previous version) is added
+when the index is rebuilt from the directory tree. Until then, the index is not complete and
+must not be used.
+"""
+
+import json
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+
+import cmk.ccc.store as _store
+
+from ._paths import index_dir
+
+# File format of a manifest:
+#
+#   size of the compacted entries\n
+#   ["piggybacked host", last update]\n
+#   ...
+#
+# Storing data only appends the updated entries, so it does not have to read the manifest.
+# Later entries supersede earlier ones. Once the appended entries outgrow the compacted ones,
+# the manifest is compacted again.
+
+_COMPLETE_MARKER = ".complete"
+
+# Don't bother compacting small manifests
+_MIN_COMPACTION_SIZE = 4096
+
+
+def is_complete(omd_root: Path) -> bool:
+    return (index_dir(omd_root) / _COMPLETE_MARKER).exists()
+
+
+def mark_complete(omd_root: Path) -> None:
+    index_dir(omd_root).mkdir(mode=0o770, exist_ok=True, parents=True)
+    (index_dir(omd_root) / _COMPLETE_MARKER).touch()
+
+
+def indexed_sources(omd_root: Path) -> Sequence[str]:
+    try:
+        return sorted(f.name for f in index_dir(omd_root).iterdir() if not f.name.startswith("."))
+    except FileNotFoundError:
+        return []
+
+
+def load_manifest(omd_root: Path, source: str) -> Mapping[str, int]:
+    """Return the piggybacked hosts of the source and the time of their last update
+
+    Manifests are only appended to or replaced atomically, so reading them does not need a lock.
+    """
+    return _parse(_store.load_bytes_from_file(_manifest_path(omd_root, source), default=b""))
+
+
+def record_updates(omd_root: Path, source: str, last_updates: Mapping[str, int]) -> None:
+    """Add or update the entries of the given piggybacked hosts"""
+    if not last_updates:
+        return
+    path = _manifest_path(omd_root, source)
+    entries = b"".join(_serialize_entry(k, v) for k, v in last_updates.items())
+    with _store.locked(path):
+        with path.open("ab") as f:
+            if not f.tell():
+                f.write(b"0\n")
+            f.write(entries)
+            size = f.tell()
+
+        with path.open("rb") as f:
+            compacted_size = int(f.readline())
+        if size > max(2 * compacted_size, _MIN_COMPACTION_SIZE):
+            _save(path, _parse(path.read_bytes()))
+
+
+@contextmanager
+def edit_manifest(omd_root: Path, source: str) -> Iterator[dict[str, int]]:
+    """Lock the manifest of the source and write back the changes made to it"""
+    path = _manifest_path(omd_root, source)
+    with _store.locked(path):
+        manifest = _parse(_store.load_bytes_from_file(path, default=b""))
+        original = dict(manifest)
+        yield manifest
+        if not manifest:
+            path.unlink(missing_ok=True)
+        elif manifest != original:
+            _save(path, manifest)
+
+
+def _manifest_path(omd_root: Path, source: str) -> Path:
+    return index_dir(omd_root) / source
+
+
+def _serialize_entry(piggybacked: str, last_update: int) -> bytes:
+    return b"%s\n" % json.dumps([piggybacked, last_update], separators=(",", ":")).encode("utf-8")
+
+
+def _parse(raw: bytes) -> dict[str, int]:
+    # The file may exist but be empty, if someone else just created it for locking.
+    _header, _sep, body = raw.partition(b"\n")
+    # Ignore an entry that is just being appended
+    entries, _sep, _incomplete = body.rpartition(b"\n")
+    return {
+        str(piggybacked): int(last_update)
+        for piggybacked, last_update in json.loads(b"[%s]" % entries.replace(b"\n", b","))
+    }
+
+
+def _save(path: Path, manifest: Mapping[str, int]) -> None:
+    body = b"".join(_serialize_entry(k, v) for k, v in manifest.items())
+    _store.save_bytes_to_file(path, b"%d\n%s" % (len(body), body))
@@ -21,6 +21,7 @@ from typing import Self
 from cmk.ccc.hostaddress import HostAddress, HostName
 from cmk.utils.log.security_event import InputValidationFailureEvent, log_security_event
 
+from . import _index
 from ._inotify import Event, INotify, Masks
 from ._paths import payload_dir, source_status_dir
 
@@ -86,8 +87,14 @@ class PiggybackMessage:
 # - Path(tmp/check_mk/piggyback_sources/SOURCE).name
 
 
-def watch_new_messages(omd_root: Path) -> Iterator[PiggybackMessage]:
-    """Yields piggyback messages as they come in."""
+def watch_new_message_batches(
+    omd_root: Path, coalescing_window: float = 0.0
+) -> Iterator[Sequence[PiggybackMessage]]:
+    """Yields piggyback messages as they come in.
+
+    Messages coming in within `coalescing_window` seconds after the first one
+    are yielded together.
+    """
 
     with INotify() as inotify:
         watch_for_new_piggybacked_hosts = inotify.add_watch(payload_dir(omd_root), Masks.CREATE)
@@ -97,31 +104,40 @@ def watch_new_messages(omd_root: Path) -> Iterator[PiggybackMessage]:
         for folder in _get_piggybacked_host_folders(omd_root):
             inotify.add_watch(folder, Masks.MOVED_TO)
 
-        for event in inotify.read_forever():
-            # check if a new piggybacked host folder was created
-            if event.watchee == watch_for_new_piggybacked_hosts:
-                if event.type & Masks.CREATE:
-                    inotify.add_watch(event.watchee.path / event.name, Masks.MOVED_TO)
-                    # Handle all files already in the folder (we rather have duplicates than missing files)
-                    yield from get_messages_for(HostAddress(event.name), omd_root)
-                continue
-            if event.watchee == watch_for_deleted_status_files:
-                if event.type & Masks.DELETE:
-                    source = _hostname_validation_helper(event.name)
-                    for piggybacked_host in _get_piggybacked_hosts_for_source(omd_root, source):
-                        yield PiggybackMessage(
-                            PiggybackMetaData(
-                                source=source,
-                                piggybacked=piggybacked_host,
-                                last_update=int(time.time()),
-                                last_contact=None,
-                            ),
-                            b"",
-                        )
-                continue
-
-            if message := _make_message_from_event(event, omd_root):
-                yield message
+        def _messages_from_events(events: Iterable[Event]) -> Iterator[PiggybackMessage]:
+            for event in events:
+                # check if a new piggybacked host folder was created
+                if event.watchee == watch_for_new_piggybacked_hosts:
+                    if event.type & Masks.CREATE:
+                        inotify.add_watch(event.watchee.path / event.name, Masks.MOVED_TO)
+                        # Handle all files already in the folder (we rather have duplicates than missing files)
+                        yield from get_messages_for(HostAddress(event.name), omd_root)
+                    continue
+                if event.watchee == watch_for_deleted_status_files:
+                    if event.type & Masks.DELETE:
+                        source = _hostname_validation_helper(event.name)
+                        for piggybacked_host in _get_piggybacked_hosts_for_source(omd_root, source):
+                            yield PiggybackMessage(
+                                PiggybackMetaData(
+                                    source=source,
+                                    piggybacked=piggybacked_host,
+                                    last_update=int(time.time()),
+                                    last_contact=None,
+                                ),
+                                b"",
+                            )
+                    continue
+
+                if message := _make_message_from_event(event, omd_root):
+                    yield message
+
+        while True:
+            messages = list(_messages_from_events(inotify.read()))
+            deadline = time.monotonic() + coalescing_window
+            while messages and (remaining := deadline - time.monotonic()) > 0:
+                messages.extend(_messages_from_events(inotify.read(timeout=remaining)))
+            if messages:
+                yield messages
 
 
 def _make_message_from_event(event: Event, omd_root: Path) -> PiggybackMessage | None:
@@ -171,6 +187,15 @@ def get_messages_for(
 
 
 def get_all_current_piggyback_sources(omd_root: Path) -> Collection[HostName]:
+    if _index.is_complete(omd_root):
+        return {
+            source
+            for source in map(_hostname_validation_helper, _index.indexed_sources(omd_root))
+            if any(
+                _get_piggybacked_file_path(source, HostName(piggybacked), omd_root).exists()
+                for piggybacked in _index.load_manifest(omd_root, source)
+            )
+        }
     return {
         m.source
         for meta_infos in get_piggybacked_host_with_sources(omd_root).values()
@@ -205,6 +230,14 @@ def get_piggybacked_host_with_sources(
 
 
 def _get_piggybacked_hosts_for_source(omd_root: Path, source: HostName) -> Sequence[HostName]:
+    if _index.is_complete(omd_root):
+        return [
+            piggybacked
+            for piggybacked in map(
+                _hostname_validation_helper, sorted(_index.load_manifest(omd_root, source))
+            )
+            if _get_piggybacked_file_path(source, piggybacked, omd_root).exists()
+        ]
     return [
         _hostname_validation_helper(piggybacked_host.name)
         for piggybacked_host in _get_piggybacked_host_folders(omd_root)
@@ -249,6 +282,15 @@ def store_piggyback_raw_data(
     # work as if on the source system
     _write_file_with_mtime(file_path=status_file_path, content=b"", mtime=contact_timestamp)
 
+    # Index the files before writing them. An entry without a file does no harm.
+    _index.record_updates(
+        omd_root,
+        source_hostname,
+        {
+            piggybacked_hostname: int(message_timestamp)
+            for piggybacked_hostname in piggybacked_raw_data
+        },
+    )
     for piggybacked_hostname, lines in piggybacked_raw_data.items():
         logger.debug("Storing piggyback data for: %r", piggybacked_hostname)
         # Raw data is always stored as bytes. Later the content is
@@ -411,13 +453,18 @@ def cleanup_piggyback_files(
         cut_off_timestamp,
     )
 
+    _cleanup_old_source_status_files(_get_source_state_files(omd_root), cut_off_timestamp)
+
+    if _index.is_complete(omd_root):
+        _cleanup_old_indexed_piggybacked_files(omd_root, cut_off_timestamp)
+        return
+
     piggybacked_hosts_settings = [
         (piggybacked_host_folder, _files_in(piggybacked_host_folder))
         for piggybacked_host_folder in _get_piggybacked_host_folders(omd_root)
     ]
-
-    _cleanup_old_source_status_files(_get_source_state_files(omd_root), cut_off_timestamp)
     _cleanup_old_piggybacked_files(piggybacked_hosts_settings, cut_off_timestamp)
+    _rebuild_index(omd_root)
 
 
 def _cleanup_old_source_status_files(
@@ -456,17 +503,73 @@ def _cleanup_old_piggybacked_files(
                 )
                 _remove_piggyback_file(piggybacked_host_source)
 
-        # Remove empty backed host directory
-        try:
-            piggybacked_host_folder.rmdir()
-        except OSError as e:
-            if e.errno == errno.ENOTEMPTY:
+        _remove_empty_piggybacked_host_folder(piggybacked_host_folder)
+
+
+def _cleanup_old_indexed_piggybacked_files(omd_root: Path, cut_off_timestamp: float) -> None:
+    """Remove piggybacked data files which exceed provided maximum age.
+
+    Only the files the index considers to be outdated are looked at.
+    """
+    for source in map(_hostname_validation_helper, _index.indexed_sources(omd_root)):
+        with _index.edit_manifest(omd_root, source) as manifest:
+            for piggybacked, last_update in list(manifest.items()):
+                if last_update >= cut_off_timestamp:
+                    continue
+
+                piggybacked_host_source = _get_piggybacked_file_path(
+                    source, HostName(piggybacked), omd_root
+                )
+                if (mtime := _get_mtime(piggybacked_host_source)) is None:
+                    del manifest[piggybacked]
+                    continue
+
+                if mtime >= cut_off_timestamp:
+                    manifest[piggybacked] = mtime
+                    continue
+
+                logger.debug(
+                    "Piggyback file '%s' too old (%s). Remove it.",
+                    piggybacked_host_source,
+                    _render_datetime(mtime),
+                )
+                _remove_piggyback_file(piggybacked_host_source)
+                del manifest[piggybacked]
+                _remove_empty_piggybacked_host_folder(piggybacked_host_source.parent)
+
+
+def _remove_empty_piggybacked_host_folder(piggybacked_host_folder: Path) -> None:
+    try:
+        piggybacked_host_folder.rmdir()
+    except FileNotFoundError:
+        return
+    except OSError as e:
+        if e.errno == errno.ENOTEMPTY:
+            return
+        raise
+    logger.debug(
+        "Piggyback folder '%s' was empty. Removed it.",
+        piggybacked_host_folder,
+    )
+
+
+def _rebuild_index(omd_root: Path) -> None:
+    """Add all stored piggyback files to the index and mark it as complete"""
+    last_updates_per_source: dict[str, dict[str, int]] = {}
+    for piggybacked_host_folder in _get_piggybacked_host_folders(omd_root):
+        for piggybacked_host_source in _files_in(piggybacked_host_folder):
+            if (mtime := _get_mtime(piggybacked_host_source)) is None:
                 continue
-            raise
-        logger.debug(
-            "Piggyback folder '%s' was empty. Removed it.",
-            piggybacked_host_folder,
-        )
+            last_updates_per_source.setdefault(piggybacked_host_source.name, {})[
+                piggybacked_host_folder.name
+            ] = mtime
+
+    for source, last_updates in last_updates_per_source.items():
+        with _index.edit_manifest(omd_root, source) as manifest:
+            manifest.update(last_updates)
+
+    _index.mark_complete(omd_root)
+    logger.debug("Indexed piggyback data of %d sources", len(last_updates_per_source))
 
 
 def _get_mtime(path: Path) -> int | None:
@@ -501,6 +604,10 @@ def move_for_host_rename(omd_root: Path, old_host: str, new_host: str) -> tuple[
             pass
 
         os.rename(str(old_path), str(new_path))
+        for piggybacked_host_source in _files_in(new_path):
+            with _index.edit_manifest(omd_root, piggybacked_host_source.name) as manifest:
+                if (last_update := manifest.pop(old_name, None)) is not None:
+                    manifest[new_name] = last_update
         yield "piggyback-load"
 
     def _rename_payload_file(basedir: Path, old_name: str, new_name: str) -> Iterable[str]:
@@ -8,7 +8,7 @@
 import logging
 import multiprocessing
 import signal
-from collections.abc import Callable, Mapping, Sequence
+from collections.abc import Callable, Iterable, Mapping, Sequence
 from multiprocessing.synchronize import Event
 from pathlib import Path
 from typing import Self
@@ -21,7 +21,7 @@ from cmk.piggyback.backend import (
     get_messages_for,
     PiggybackMessage,
     store_piggyback_raw_data,
-    watch_new_messages,
+    watch_new_message_batches,
 )
 
 from ._config import AnnotatedHostName, load_config, PiggybackHubConfig
@@ -44,6 +44,41 @@ class PiggybackPayload(BaseModel):
         )
 
 
+# Stay well below the default maximum message size of RabbitMQ
+_MAX_PAYLOAD_SIZE = 16 * 1024 * 1024
+
+
+def make_payloads(
+    messages: Iterable[PiggybackMessage], max_size: int = _MAX_PAYLOAD_SIZE
+) -> Sequence[PiggybackPayload]:
+    """Combine the messages of a source that have been stored at the same time
+
+    A source stores the data of all its piggybacked hosts at once. Sending it in as few
+    payloads as possible lets the receiving site store it at once, too.
+    """
+    grouped: dict[tuple[HostName, int, int | None], list[dict[HostName, Sequence[bytes]]]] = {}
+    sizes: dict[tuple[HostName, int, int | None], int] = {}
+    for message in messages:
+        key = (message.meta.source, message.meta.last_update, message.meta.last_contact)
+        chunks = grouped.setdefault(key, [{}])
+        if chunks[-1] and sizes[key] + len(message.raw_data) > max_size:
+            chunks.append({})
+            sizes[key] = 0
+        chunks[-1][message.meta.piggybacked] = (message.raw_data,)
+        sizes[key] = sizes.get(key, 0) + len(message.raw_data)
+
+    return [
+        PiggybackPayload(
+            source_host=source,
+            raw_data=raw_data,
+            message_timestamp=last_update,
+            contact_timestamp=last_contact,
+        )
+        for (source, last_update, last_contact), chunks in grouped.items()
+        for raw_data in chunks
+    ]
+
+
 def save_payload_on_message(
     logger: logging.Logger,
     omd_root: Path,
@@ -52,7 +87,9 @@ def save_payload_on_message(
         channel: Channel[PiggybackPayload], delivery_tag: DeliveryTag, received: PiggybackPayload
     ) -> None:
         logger.debug(
-            "Received payload for piggybacked host from source host '%s'", received.source_host
+            "Received payload for %d piggybacked hosts from source host '%s'",
+            len(received.raw_data),
+            received.source_host,
         )
         store_piggyback_raw_data(
             source_hostname=received.source_host,
@@ -73,6 +110,7 @@ class SendingPayloadProcess(multiprocessing.Process):
         omd_root: Path,
         reload_config: Event,
         crash_report_callback: Callable[[], str],
+        coalescing_window: float = 1.0,
     ) -> None:
         super().__init__()
         self.logger = logger
@@ -80,6 +118,7 @@ class SendingPayloadProcess(multiprocessing.Process):
         self.site = omd_root.name
         self.reload_config = reload_config
         self.crash_report_callback = crash_report_callback
+        self.coalescing_window = coalescing_window
         self.task_name = "publishing on queue 'payload'"
 
     def run(self) -> None:
@@ -92,21 +131,25 @@ class SendingPayloadProcess(multiprocessing.Process):
         config = load_config(self.omd_root)
         self.logger.debug("Loaded configuration: %r", config)
 
-        failed_message = None
+        failed_messages: Sequence[PiggybackMessage] = ()
+        piggyback_messages: Sequence[PiggybackMessage] = ()
         try:
             while True:
                 with make_connection(self.omd_root, self.site, self.logger, self.task_name) as conn:
                     try:
                         channel = conn.channel(PiggybackPayload)
-                        if failed_message is not None:
+                        if failed_messages:
                             # Retry in case the first time the channel was not available after make_connection
-                            self._handle_message(channel, config, failed_message)
-                            failed_message = None
-                        for piggyback_message in watch_new_messages(self.omd_root):
+                            self._handle_messages(channel, config, failed_messages)
+                            failed_messages = ()
+                        for piggyback_messages in watch_new_message_batches(
+                            self.omd_root, self.coalescing_window
+                        ):
                             config = self._check_for_config_reload(config)
-                            self._handle_message(channel, config, piggyback_message)
+                            self._handle_messages(channel, config, piggyback_messages)
                     except CMKConnectionError as exc:
-                        failed_message = piggyback_message
+                        # Some payloads may have been sent already. We rather have duplicates than missing data.
+                        failed_messages = piggyback_messages
                         self.logger.info("Reconnecting: %s: %s", self.task_name, exc)
         except CMKConnectionError as exc:
             self.logger.error("Connection error: %s: %s", self.task_name, exc)
@@ -116,25 +159,27 @@ class SendingPayloadProcess(multiprocessing.Process):
             self.logger.error(crash_report_msg)
             raise
 
-    def _handle_message(
+    def _handle_messages(
         self,
         channel: Channel[PiggybackPayload],
         config: PiggybackHubConfig,
-        message: PiggybackMessage,
+        messages: Iterable[PiggybackMessage],
     ) -> None:
-        if (site_id := config.locations.get(message.meta.piggybacked, self.site)) == self.site:
-            return
-
-        self.logger.debug(
-            "%s: from host '%s' to host '%s' on site '%s'",
-            self.task_name.title(),
-            message.meta.source,
-            message.meta.piggybacked,
-            site_id,
-        )
-        channel.publish_for_site(
-            site_id, PiggybackPayload.from_message(message), routing=RoutingKey("payload")
-        )
+        messages_per_site: dict[str, list[PiggybackMessage]] = {}
+        for message in messages:
+            if (site_id := config.locations.get(message.meta.piggybacked, self.site)) != self.site:
+                messages_per_site.setdefault(site_id, []).append(message)
+
+        for site_id, site_messages in messages_per_site.items():
+            for payload in make_payloads(site_messages):
+                self.logger.debug(
+                    "%s: from host '%s' to %d hosts on site '%s'",
+                    self.task_name.title(),
+                    payload.source_host,
+                    len(payload.raw_data),
+                    site_id,
+                )
+                channel.publish_for_site(site_id, payload, routing=RoutingKey("payload"))
 
     def _check_for_config_reload(self, current_config: PiggybackHubConfig) -> PiggybackHubConfig:
         if not self.reload_config.is_set():
@@ -154,10 +199,13 @@ def send_messages_oneshot(
     task_name = "sending oneshot messages"
     logger.info("Starting: %s", task_name)
 
+    messages_per_site: dict[str, list[PiggybackMessage]] = {}
+    for host, site_id in targets.items():
+        messages_per_site.setdefault(site_id, []).extend(get_messages_for(host, omd_root))
     hub_payloads = [
-        (site_id, PiggybackPayload.from_message(message))
-        for host, site_id in targets.items()
-        for message in get_messages_for(host, omd_root)
+        (site_id, payload)
+        for site_id, messages in messages_per_site.items()
+        for payload in make_payloads(messages)
     ]
 
     try:
@@ -168,7 +216,7 @@ def send_messages_oneshot(
                     "%s: to site '%s' for host '%s'",
                     task_name.title(),
                     site,
-                    ",".join(payload.raw_data),  # it's only one.
+                    ",".join(payload.raw_data),
                 )
                 channel.publish_for_site(site, payload, routing=RoutingKey("payload"))
 
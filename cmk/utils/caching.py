@@ -10,10 +10,13 @@ from __future__ import annotations
 
 import collections
 import itertools
+import math
 import sys
-from collections.abc import Callable, Iterator
+import time
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass
 from functools import lru_cache, wraps
-from typing import Any, ParamSpec, TypeVar
+from typing import Any, NamedTuple, ParamSpec, TypeVar
 
 P = ParamSpec("P")
 R = TypeVar("R")
@@ -40,16 +43,63 @@ def instance_method_lru_cache(
     return wrap
 
 
+class CacheLimits(NamedTuple):
+    """Bounds of a cache
+
+    maxsize: Maximum number of entries. The least recently used entries are evicted.
+    ttl: Seconds after which an entry is considered to be expired.
+    """
+
+    maxsize: int | None = None
+    ttl: float | None = None
+
+
+@dataclass(frozen=True)
+class CacheStatistics:
+    """Hits and misses are only counted by instrumented caches (None otherwise)"""
+
+    size: int
+    maxsize: int | None
+    hits: int | None
+    misses: int | None
+    evictions: int
+
+
 class CacheManager:
     def __init__(self) -> None:
-        self._caches: dict[str, DictCache] = collections.defaultdict(DictCache)
+        self._caches: dict[str, DictCache] = {}
+        self._limits: dict[str, CacheLimits] = {}
+        self._collect_statistics = False
 
     def __contains__(self, name: str) -> bool:
         return name in self._caches
 
+    def set_limits(
+        self, limits: Mapping[str, CacheLimits], *, collect_statistics: bool = False
+    ) -> None:
+        """Configure the bounds of the named caches and whether to count hits and misses
+
+        The limits are applied to caches created after this call. Unbounded caches
+        are the default, because most of our processes are short-lived. Long-running
+        processes (like the automation helper) should configure limits before creating
+        the caches. Bounded caches always count hits and misses, the others only if
+        requested, as this slows down every lookup."""
+        self._limits = dict(limits)
+        self._collect_statistics = collect_statistics
+
     def obtain_cache(self, name: str) -> DictCache:
         """get or create cache with provided name"""
-        return self._caches[name]
+        try:
+            return self._caches[name]
+        except KeyError:
+            pass
+
+        limits = self._limits.get(name, CacheLimits())
+        if limits != CacheLimits():
+            return self._caches.setdefault(name, BoundedDictCache(*limits))
+        return self._caches.setdefault(
+            name, InstrumentedDictCache() if self._collect_statistics else DictCache()
+        )
 
     def clear(self) -> None:
         self._caches.clear()
@@ -61,6 +111,10 @@ class CacheManager:
     def dump_sizes(self) -> dict[str, int]:
         return {name: _total_size(cache) for name, cache in self._caches.items()}
 
+    def statistics(self) -> dict[str, CacheStatistics]:
+        """Cheap in contrast to dump_sizes(): Does not look into the cached objects"""
+        return {name: cache.statistics() for name, cache in self._caches.items()}
+
 
 def _total_size(o: object) -> int:
     """Returns the approximate memory footprint an object and all of its contents.
@@ -116,6 +170,118 @@ class DictCache(dict):
         super().clear()
         self.set_not_populated()
 
+    def statistics(self) -> CacheStatistics:
+        return CacheStatistics(size=len(self), maxsize=None, hits=None, misses=None, evictions=0)
+
+
+class InstrumentedDictCache(DictCache):
+    """A DictCache counting the hits and misses of its lookups
+
+    Lookups are `cache[key]`, `get()` and `setdefault()`. Membership tests are not counted.
+    """
+
+    hits = 0
+    misses = 0
+
+    def __getitem__(self, key: Any) -> Any:
+        try:
+            value = super().__getitem__(key)
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
+        return value
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            self[key] = default
+            return default
+
+    def statistics(self) -> CacheStatistics:
+        return CacheStatistics(
+            size=len(self),
+            maxsize=None,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=0,
+        )
+
+
+class BoundedDictCache(InstrumentedDictCache, collections.OrderedDict):
+    """An InstrumentedDictCache evicting the least recently used entries and / or expired entries
+
+    Expired entries are dropped when they are looked up or when they are evicted
+    due to the size limit.
+    Note: Bounded caches must not be used with the populated flag, as they may
+    drop entries at any time.
+    """
+
+    evictions = 0
+
+    def __init__(self, maxsize: int | None = None, ttl: float | None = None) -> None:
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._expires_at: dict[Any, float] = {}
+
+    def _expired(self, key: Any) -> bool:
+        return self.ttl is not None and self._expires_at.get(key, math.inf) < time.monotonic()
+
+    def __getitem__(self, key: Any) -> Any:
+        if self._expired(key):
+            del self[key]
+            self.evictions += 1
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return super().__contains__(key) and not self._expired(key)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if self.ttl is not None:
+            self._expires_at[key] = time.monotonic() + self.ttl
+        if self.maxsize is not None:
+            while len(self) > self.maxsize:
+                self.popitem(last=False)
+                self.evictions += 1
+
+    def __delitem__(self, key: Any) -> None:
+        super().__delitem__(key)
+        self._expires_at.pop(key, None)
+
+    def pop(self, key: Any, *args: Any) -> Any:
+        self._expires_at.pop(key, None)
+        return super().pop(key, *args)
+
+    def popitem(self, last: bool = True) -> tuple[Any, Any]:
+        key, value = super().popitem(last=last)
+        self._expires_at.pop(key, None)
+        return key, value
+
+    def clear(self) -> None:
+        super().clear()
+        self._expires_at.clear()
+
+    def statistics(self) -> CacheStatistics:
+        return CacheStatistics(
+            size=len(self),
+            maxsize=self.maxsize,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+        )
+
 
 # This cache manager holds all caches that rely on the configuration
 # and have to be flushed once the configuration is reloaded in the
@@ -264,6 +264,11 @@ class LabelManager:
 
         self.__labels_of_host: dict[HostName, Labels] = {}
 
+    def invalidate_hosts(self, host_names: Iterable[HostName]) -> None:
+        """Forget the computed labels of the given hosts"""
+        for hostname in host_names:
+            self.__labels_of_host.pop(hostname, None)
+
     def labels_of_host(self, hostname: HostName) -> Labels:
         """Returns the effective set of host labels from all available sources
 
@@ -9,13 +9,16 @@
 # mypy: disable-error-code="redundant-expr"
 
 import contextlib
+import re
 from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass
 from re import Pattern
 from typing import (
     Any,
     cast,
+    Final,
     Generic,
+    NamedTuple,
     NotRequired,
     TypeAlias,
     TypedDict,
@@ -179,18 +182,34 @@ class RulesetMatcher:
             nodes_of,
         )
 
-        self._service_match_cache: dict[
-            tuple[
-                tuple[ServiceName | None, int], PreprocessedPattern, tuple[tuple[str, object], ...]
-            ],
-            object,
-        ] = {}
+        self._service_labels_match_cache: dict[tuple[int, LabelGroupsCacheId], bool] = {}
 
     def clear_caches(self) -> None:
         # clear caches that don't work properly (the ruleset optimizer ignores host labels).
-        # self._service_match_cache works also in the case of changed labels, so we DON'T need to clear it.
+        # self._service_labels_match_cache works also in the case of changed labels, so we DON'T need to clear it.
         self.ruleset_optimizer.clear_caches()
 
+    def update_hosts(
+        self,
+        host_names: Iterable[HostName],
+        *,
+        host_tags: TagsOfHosts,
+        host_paths: Mapping[HostName, str],
+        labels_of_host: Callable[[HostName], Labels],
+    ) -> None:
+        """Recompute the cached matches of the given hosts
+
+        Use this after the tags, labels or folders of some hosts have changed. The cached
+        entries of all other hosts are kept. The set of configured hosts must not change.
+        """
+        self.ruleset_optimizer.update_hosts(
+            host_names, host_tags=host_tags, host_paths=host_paths, labels_of_host=labels_of_host
+        )
+
+    def invalidate_rulesets(self, rulesets: Iterable[Sequence[RuleSpec[Any]]]) -> None:
+        """Forget the cached matches of the given rulesets after they have been modified"""
+        self.ruleset_optimizer.invalidate_rulesets(rulesets)
+
     def get_host_bool_value(
         self,
         hostname: HostName,
@@ -328,45 +347,65 @@ class RulesetMatcher:
         labels_of_host: Callable[[HostName], Labels],
     ) -> Iterator[TRuleValue]:
         """Returns a generator of the values of the matched rules"""
+        if match_text is None:
+            return
+
         optimized_ruleset = self.ruleset_optimizer.get_service_ruleset(
             host_name, ruleset, labels_of_host
         )
+        # Match the service description against the conditions of all rules at once
+        matching_descriptions = self.ruleset_optimizer.get_service_description_matcher(
+            ruleset, optimized_ruleset
+        )(match_text)
 
         for (
-            value,
-            hosts,
-            service_label_groups,
-            service_label_groups_cache_id,
-            service_description_condition,
-        ) in optimized_ruleset:
-            if match_text is None:
+            rule_index,
+            (
+                value,
+                hosts,
+                service_label_groups,
+                service_label_groups_cache_id,
+                _service_description_condition,
+            ),
+        ) in enumerate(optimized_ruleset):
+            if not matching_descriptions >> rule_index & 1:
                 continue
 
             if host_name not in hosts:
                 continue
 
-            service_cache_id = (
-                (
-                    match_text,
-                    hash(None if service_labels is None else frozenset(service_labels.items())),
-                ),
-                service_description_condition,
-                service_label_groups_cache_id,
-            )
+            if service_label_groups and not self._matches_service_labels(
+                service_labels, service_label_groups, service_label_groups_cache_id
+            ):
+                continue
+
+            yield value
+
+    def _matches_service_labels(
+        self,
+        service_labels: Labels,
+        service_label_groups: LabelGroups,
+        service_label_groups_cache_id: LabelGroupsCacheId,
+    ) -> bool:
+        cache_id = (
+            hash(None if service_labels is None else frozenset(service_labels.items())),
+            service_label_groups_cache_id,
+        )
+        try:
+            return self._service_labels_match_cache[cache_id]
+        except KeyError:
+            pass
+
+        return self._service_labels_match_cache.setdefault(
+            cache_id, matches_labels(service_labels, service_label_groups)
+        )
 
-            if service_cache_id in self._service_match_cache:
-                match = self._service_match_cache[service_cache_id]
-            else:
-                match = _matches_service_conditions(
-                    service_description_condition,
-                    service_label_groups,
-                    match_text,
-                    service_labels,
-                )
-                self._service_match_cache[service_cache_id] = match
 
-            if match:
-                yield value
+class _HostConditions(NamedTuple):
+    rule_path: str
+    host_conditions: HostOrServiceConditions | None
+    tag_conditions: Mapping[TagGroupID, TagCondition]
+    label_conditions: LabelGroups
 
 
 # TODO: improve and cleanup types
@@ -405,37 +444,46 @@ class RulesetOptimizer:
         # is enabled.
         self._all_processed_hosts = self._all_configured_hosts
 
-        # A factor which indicates how much hosts share the same host tag configuration (excluding folders).
-        # len(all_processed_hosts) / len(different tag combinations)
-        # It is used to determine the best rule evualation method
-        self._all_processed_hosts_similarity = 1.0
-
         self.__service_ruleset_cache: dict[
             tuple[int, bool], Sequence[_PreprocessedServiceRule[Any]]
         ] = {}
-        self.__host_ruleset_cache: dict[tuple[int, bool], Mapping[HostAddress, Sequence[Any]]] = {}
+        self.__service_description_matcher_cache: dict[int, _ServiceDescriptionMatcher] = {}
+        self.__host_ruleset_cache: dict[tuple[int, bool], dict[HostAddress, list[Any]]] = {}
+        # The rulesets (and how to get the host labels) the above cache has been computed
+        # from. We need them to recompute the entries of single hosts.
+        self.__host_ruleset_sources: dict[
+            tuple[int, bool], tuple[Sequence[RuleSpec[Any]], Callable[[HostName], Labels]]
+        ] = {}
         self._all_matching_hosts_match_cache: dict[
             tuple[_ConditionCacheID, bool], set[HostName]
         ] = {}
+        # Same for the conditions of the cached sets of matching hosts
+        self._all_matching_hosts_conditions: dict[
+            tuple[_ConditionCacheID, bool], _HostConditions
+        ] = {}
 
         # Reference dirname -> hosts in this dir including subfolders
         self._folder_host_lookup: dict[tuple[bool, str], set[HostName]] = {}
+        # Same as above, but as bitset of the host ids of the bitmap index
+        self._folder_host_bits_lookup: dict[tuple[bool, str], int] = {}
 
-        # Provides a list of hosts with the same hosttags, excluding the folder
-        self._hosts_grouped_by_tags: dict[tuple[tuple[TagGroupID, TagID], ...], set[HostName]] = {}
-        # Reference hostname -> tag group reference
-        self._host_grouped_ref: dict[HostName, tuple[tuple[TagGroupID, TagID], ...]] = {}
-
-        # TODO: Clean this one up?
-        self._initialize_host_lookup()
+        # Inverted index tag / label -> hosts. It is built on first use, because small
+        # scopes (e.g. a single host) are evaluated host by host.
+        self._host_bitmap_index: _HostBitmapIndex | None = None
 
     def clear_ruleset_caches(self) -> None:
         self.__host_ruleset_cache.clear()
+        self.__host_ruleset_sources.clear()
         self.__service_ruleset_cache.clear()
+        self.__service_description_matcher_cache.clear()
 
     def clear_caches(self) -> None:
         self.__host_ruleset_cache.clear()
+        self.__host_ruleset_sources.clear()
         self._all_matching_hosts_match_cache.clear()
+        self._all_matching_hosts_conditions.clear()
+        if self._host_bitmap_index is not None:
+            self._host_bitmap_index.clear_labels()
 
     def set_all_processed_hosts(self, all_processed_hosts: set[HostName]) -> None:
         involved_clusters: set[HostName] = set()
@@ -456,20 +504,109 @@ class RulesetOptimizer:
 
         # The folder host lookup includes a list of all -processed- hosts within a given
         # folder. Any update with set_all_processed hosts invalidates this cache, because
-        # the scope of relevant hosts has changed. This is -good-, since the values in this
-        # lookup are iterated one by one later on in all_matching_hosts
+        # the scope of relevant hosts has changed.
         self._folder_host_lookup = {}
+        self._folder_host_bits_lookup = {}
+
+    def invalidate_rulesets(self, rulesets: Iterable[Sequence[RuleSpec[Any]]]) -> None:
+        # The sets of matching hosts only depend on the conditions, so they stay valid.
+        for ruleset in rulesets:
+            for with_foreign_hosts in (False, True):
+                cache_id = id(ruleset), with_foreign_hosts
+                self.__host_ruleset_cache.pop(cache_id, None)
+                self.__host_ruleset_sources.pop(cache_id, None)
+                self.__service_ruleset_cache.pop(cache_id, None)
+            self.__service_description_matcher_cache.pop(id(ruleset), None)
+
+    def update_hosts(
+        self,
+        host_names: Iterable[HostName],
+        *,
+        host_tags: TagsOfHosts,
+        host_paths: Mapping[HostName, str],
+        labels_of_host: Callable[[HostName], Labels],
+    ) -> None:
+        # Hosts that are not configured can not be matched by any rule
+        changed_hosts = set(host_names).intersection(self._all_configured_hosts)
+        self._host_paths = host_paths
+        for hostname in changed_hosts:
+            self._host_tags[hostname] = set(host_tags.get(hostname, {}).items())
 
-        used_groups = {
-            self._host_grouped_ref.get(hostname, ()) for hostname in self._all_processed_hosts
-        }
-
-        if not used_groups:
-            self._all_processed_hosts_similarity = 1.0
-            return
+        for (with_foreign_hosts, folder_path), hosts_in_folder in self._folder_host_lookup.items():
+            relevant_hosts = (
+                self._all_configured_hosts if with_foreign_hosts else self._all_processed_hosts
+            )
+            for hostname in changed_hosts:
+                if hostname in relevant_hosts and host_paths.get(hostname, "/").startswith(
+                    folder_path
+                ):
+                    hosts_in_folder.add(hostname)
+                else:
+                    hosts_in_folder.discard(hostname)
+
+        if self._host_bitmap_index is not None:
+            self._host_bitmap_index.update_hosts({hn: self._host_tags[hn] for hn in changed_hosts})
+            changed_bits = self._host_bitmap_index.host_bits(changed_hosts)
+            for folder_cache_id, bits in self._folder_host_bits_lookup.items():
+                self._folder_host_bits_lookup[folder_cache_id] = (
+                    bits & ~changed_bits
+                ) | self._host_bitmap_index.host_bits(
+                    self._folder_host_lookup[folder_cache_id].intersection(changed_hosts)
+                )
 
-        self._all_processed_hosts_similarity = (
-            1.0 * len(self._all_processed_hosts) / len(used_groups)
+        # The cached sets of matching hosts are shared with the optimized service rulesets,
+        # so updating them in place updates those, too. Conditions on host labels are
+        # evaluated last, because the host labels themselves may depend on the rules
+        # matching the host. Computing them may add entries to the caches, so we iterate
+        # over copies.
+        for with_label_conditions in (False, True):
+            for cache_id, conditions in list(self._all_matching_hosts_conditions.items()):
+                if bool(conditions.label_conditions) is not with_label_conditions:
+                    continue
+                matching_hosts = self._all_matching_hosts_match_cache[cache_id]
+                with_foreign_hosts = cache_id[1]
+                for hostname in changed_hosts:
+                    if self._host_matches(hostname, conditions, with_foreign_hosts, labels_of_host):
+                        matching_hosts.add(hostname)
+                    else:
+                        matching_hosts.discard(hostname)
+            self._update_host_rulesets(changed_hosts)
+
+    def _update_host_rulesets(self, host_names: Iterable[HostName]) -> None:
+        for cache_id, (ruleset, labels_of_host) in list(self.__host_ruleset_sources.items()):
+            host_values = self.__host_ruleset_cache[cache_id]
+            for hostname in host_names:
+                if values := [
+                    rule["value"]
+                    for rule in ruleset
+                    if not is_disabled(rule)
+                    and hostname
+                    in self._all_matching_hosts(rule["condition"], cache_id[1], labels_of_host)
+                ]:
+                    host_values[hostname] = values
+                else:
+                    host_values.pop(hostname, None)
+
+    def _host_matches(
+        self,
+        hostname: HostName,
+        conditions: "_HostConditions",
+        with_foreign_hosts: bool,
+        labels_of_host: Callable[[HostName], Labels],
+    ) -> bool:
+        """Single host equivalent of _all_matching_hosts_computation()"""
+        if conditions.host_conditions == []:
+            return False
+        if hostname not in self._get_hosts_within_folder(conditions.rule_path, with_foreign_hosts):
+            return False
+        return bool(
+            self._match_hosts_by_iteration(
+                {hostname},
+                conditions.host_conditions,
+                conditions.tag_conditions,
+                conditions.label_conditions,
+                labels_of_host,
+            )
         )
 
     def get_host_ruleset(
@@ -480,7 +617,7 @@ class RulesetOptimizer:
     ) -> Sequence[TRuleValue]:
         def _impl(
             ruleset: Iterable[RuleSpec[TRuleValue]], with_foreign_hosts: bool
-        ) -> Mapping[HostAddress, Sequence[TRuleValue]]:
+        ) -> dict[HostAddress, list[TRuleValue]]:
             host_values: dict[HostAddress, list[TRuleValue]] = {}
             for rule in ruleset:
                 if is_disabled(rule):
@@ -504,6 +641,7 @@ class RulesetOptimizer:
             optimized_ruleset = self.__host_ruleset_cache.setdefault(
                 cache_id, _impl(ruleset, with_foreign_hosts)
             )
+            self.__host_ruleset_sources[cache_id] = ruleset, labels_of_host
         return optimized_ruleset.get(host_name, [])
 
     def get_service_ruleset(
@@ -557,6 +695,22 @@ class RulesetOptimizer:
 
         return self.__service_ruleset_cache.setdefault(cache_id, _impl(ruleset, with_foreign_hosts))
 
+    def get_service_description_matcher(
+        self,
+        ruleset: Sequence[RuleSpec[TRuleValue]],
+        optimized_ruleset: Sequence[_PreprocessedServiceRule[TRuleValue]],
+    ) -> "_ServiceDescriptionMatcher":
+        # The service description conditions do not depend on the host, so the optimized
+        # rulesets with and without foreign hosts share one matcher.
+        cache_id = id(ruleset)
+        with contextlib.suppress(KeyError):
+            return self.__service_description_matcher_cache[cache_id]
+
+        return self.__service_description_matcher_cache.setdefault(
+            cache_id,
+            _ServiceDescriptionMatcher([rule[4] for rule in optimized_ruleset]),
+        )
+
     @staticmethod
     def _convert_pattern_list(patterns: HostOrServiceConditions | None) -> PreprocessedPattern:
         """Compiles a list of service match patterns to a to a single regex
@@ -606,32 +760,34 @@ class RulesetOptimizer:
         except KeyError:
             pass
 
+        self._all_matching_hosts_conditions[cache_id] = _HostConditions(
+            rule_path, host_conditions, tag_conditions, label_conditions
+        )
         return self._all_matching_hosts_match_cache.setdefault(
             cache_id,
             self._all_matching_hosts_computation(
                 # Determine match candidates.
                 # If the rule is located in a folder we only need the hosts in that folder.
-                self._get_hosts_within_folder(rule_path, with_foreign_hosts),
-                host_conditions,
-                tag_conditions,
-                label_conditions,
-                labels_of_host,
+                rule_path,
+                with_foreign_hosts,
+                host_conditions=host_conditions,
+                tag_conditions=tag_conditions,
+                label_conditions=label_conditions,
+                labels_of_host=labels_of_host,
             ),
         )
 
     def _all_matching_hosts_computation(
         self,
-        hosts_in_rule_scope: set[HostName],
+        rule_path: str,
+        with_foreign_hosts: bool,
+        *,
         host_conditions: HostOrServiceConditions | None,
         tag_conditions: Mapping[TagGroupID, TagCondition],
         label_conditions: LabelGroups,
         labels_of_host: Callable[[HostName], Labels],
     ) -> set[HostName]:
-        if tag_conditions and host_conditions is None and not label_conditions:
-            # TODO: Labels could also be optimized like the tags
-            matched_by_tags = self._match_hosts_by_tags(hosts_in_rule_scope, tag_conditions)
-            if matched_by_tags is not None:
-                return matched_by_tags
+        hosts_in_rule_scope = self._get_hosts_within_folder(rule_path, with_foreign_hosts)
 
         only_specific_hosts = (
             host_conditions is not None
@@ -661,6 +817,34 @@ class RulesetOptimizer:
         else:
             hosts_to_check = hosts_in_rule_scope
 
+        if len(hosts_to_check) < _BITMAP_INDEX_MIN_HOSTS:
+            return self._match_hosts_by_iteration(
+                hosts_to_check,
+                host_conditions,
+                tag_conditions,
+                label_conditions,
+                labels_of_host,
+            )
+
+        index = self._get_host_bitmap_index()
+        return index.host_names(
+            index.match(
+                self._get_host_bits_within_folder(rule_path, with_foreign_hosts),
+                host_conditions,
+                tag_conditions,
+                label_conditions,
+                labels_of_host,
+            )
+        )
+
+    def _match_hosts_by_iteration(
+        self,
+        hosts_to_check: set[HostName],
+        host_conditions: HostOrServiceConditions | None,
+        tag_conditions: Mapping[TagGroupID, TagCondition],
+        label_conditions: LabelGroups,
+        labels_of_host: Callable[[HostName], Labels],
+    ) -> set[HostName]:
         matching: set[HostName] = set()
         for hostname in hosts_to_check:
             # When no tag matching is requested, do not filter by tags. Accept all hosts
@@ -717,95 +901,261 @@ class RulesetOptimizer:
             rule_path,
         )
 
-    # TODO: Generalize this optimization: Build some kind of key out of the tag conditions
-    # (positive, negative, ...). Make it work with the new tag group based "$or" handling.
-    def _match_hosts_by_tags(
+    def _get_hosts_within_folder(self, folder_path: str, with_foreign_hosts: bool) -> set[HostName]:
+        cache_id = with_foreign_hosts, folder_path
+        if cache_id not in self._folder_host_lookup:
+            hosts_in_folder = set()
+            relevant_hosts = (
+                self._all_configured_hosts if with_foreign_hosts else self._all_processed_hosts
+            )
+
+            for hostname in relevant_hosts:
+                host_path = self._host_paths.get(hostname, "/")
+                if host_path.startswith(folder_path):
+                    hosts_in_folder.add(hostname)
+
+            self._folder_host_lookup[cache_id] = hosts_in_folder
+            return hosts_in_folder
+
+        return self._folder_host_lookup[cache_id]
+
+    def _get_host_bits_within_folder(self, folder_path: str, with_foreign_hosts: bool) -> int:
+        cache_id = with_foreign_hosts, folder_path
+        try:
+            return self._folder_host_bits_lookup[cache_id]
+        except KeyError:
+            pass
+
+        return self._folder_host_bits_lookup.setdefault(
+            cache_id,
+            self._get_host_bitmap_index().host_bits(
+                self._get_hosts_within_folder(folder_path, with_foreign_hosts)
+            ),
+        )
+
+    def _get_host_bitmap_index(self) -> "_HostBitmapIndex":
+        if self._host_bitmap_index is None:
+            self._host_bitmap_index = _HostBitmapIndex(
+                {hn: self._host_tags[hn] for hn in self._all_configured_hosts}
+            )
+        return self._host_bitmap_index
+
+
+# Below this number of candidate hosts, it is cheaper to evaluate the conditions host by
+# host than to build (and operate on) the bitmap index of all configured hosts.
+_BITMAP_INDEX_MIN_HOSTS = 64
+
+
+class _HostBitmapIndex:
+    """Inverted index from host tags and labels to sets of hosts
+
+    The sets of hosts are represented as bitsets (python ints) of compact host ids.
+    This allows us to evaluate rule conditions as set algebra, instead of matching
+    every host in scope against every condition.
+
+    Host labels are only indexed for the hosts we actually need them for, because
+    computing them may be expensive.
+    """
+
+    def __init__(self, host_tags: Mapping[HostName, set[tuple[TagGroupID, TagID]]]) -> None:
+        self._host_names: Final = sorted(host_tags)
+        self._host_ids: Final[Mapping[str, int]] = {hn: i for i, hn in enumerate(self._host_names)}
+
+        host_ids_by_tag: dict[tuple[TagGroupID, TagID | None], list[int]] = {}
+        for hostname, tags_of_host in host_tags.items():
+            host_id = self._host_ids[hostname]
+            for tag in tags_of_host:
+                host_ids_by_tag.setdefault(tag, []).append(host_id)
+        self._tags: Final = {
+            tag: self._bits_from_ids(host_ids) for tag, host_ids in host_ids_by_tag.items()
+        }
+
+        self._host_name_regexes: Final[dict[str, int]] = {}
+
+        self._labels: dict[tuple[str, str], int] = {}
+        self._labels_indexed = 0
+        self._with_labels = 0
+
+    def clear_labels(self) -> None:
+        self._labels = {}
+        self._labels_indexed = 0
+        self._with_labels = 0
+
+    def update_hosts(self, host_tags: Mapping[HostName, set[tuple[TagGroupID, TagID]]]) -> None:
+        """Re-index the tags of the given (already indexed) hosts and forget their labels"""
+        changed_bits = self.host_bits(host_tags)
+        for tag, bits in self._tags.items():
+            self._tags[tag] = bits & ~changed_bits
+        for hostname, tags_of_host in host_tags.items():
+            host_bit = 1 << self._host_ids[hostname]
+            for tag in tags_of_host:
+                self._tags[tag] = self._tags.get(tag, 0) | host_bit
+
+        for label, bits in self._labels.items():
+            self._labels[label] = bits & ~changed_bits
+        self._labels_indexed &= ~changed_bits
+        self._with_labels &= ~changed_bits
+
+    def _bits_from_ids(self, host_ids: Iterable[int]) -> int:
+        # Setting the bits one by one on the int would copy the whole int each time.
+        buf = bytearray((len(self._host_names) >> 3) + 1)
+        for host_id in host_ids:
+            buf[host_id >> 3] |= 1 << (host_id & 7)
+        return int.from_bytes(buf, "little")
+
+    @staticmethod
+    def _ids_from_bits(bits: int) -> Iterator[int]:
+        bit_string = bin(bits)[:1:-1]  # least significant bit first
+        host_id = bit_string.find("1")
+        while host_id != -1:
+            yield host_id
+            host_id = bit_string.find("1", host_id + 1)
+
+    def host_bits(self, host_names: Iterable[HostName]) -> int:
+        return self._bits_from_ids(
+            host_id for hn in host_names if (host_id := self._host_ids.get(hn)) is not None
+        )
+
+    def host_names(self, bits: int) -> set[HostName]:
+        return {self._host_names[host_id] for host_id in self._ids_from_bits(bits)}
+
+    def match(
         self,
-        valid_hosts: set[HostName],
+        candidates: int,
+        host_conditions: HostOrServiceConditions | None,
         tag_conditions: Mapping[TagGroupID, TagCondition],
-    ) -> set[HostName] | None:
-        matching = set()
-        negative_match_tags = set()
-        positive_match_tags = set()
+        label_conditions: LabelGroups,
+        labels_of_host: Callable[[HostName], Labels],
+    ) -> int:
+        """Narrow down the candidates to the hosts matching all conditions
+
+        Labels are evaluated last, so that we only compute labels of hosts
+        that are not already excluded by other conditions."""
+        if host_conditions:
+            candidates &= self._match_host_name(host_conditions)
+
         for taggroup_id, tag_condition in tag_conditions.items():
-            if isinstance(tag_condition, dict):
-                if "$ne" in tag_condition:
-                    negative_match_tags.add(
-                        (
-                            taggroup_id,
-                            cast(TagConditionNE, tag_condition)["$ne"],
-                        )
-                    )
-                    continue
+            if not candidates:
+                return 0
+            candidates &= self._match_tag_condition(taggroup_id, tag_condition)
+
+        if label_conditions and candidates:
+            candidates &= self._match_labels(candidates, label_conditions, labels_of_host)
+
+        return candidates
+
+    def _match_host_name(self, host_conditions: HostOrServiceConditions) -> int:
+        negate, host_entries = parse_negated_condition_list(host_conditions)
+        matching = 0
+        for entry in host_entries:
+            if isinstance(entry, dict):
+                matching |= self._match_host_name_regex(entry["$regex"])
+            elif (host_id := self._host_ids.get(entry)) is not None:
+                matching |= 1 << host_id
+        return ~matching if negate else matching
+
+    def _match_host_name_regex(self, pattern: str) -> int:
+        try:
+            return self._host_name_regexes[pattern]
+        except KeyError:
+            pass
+
+        compiled = regex(pattern)
+        return self._host_name_regexes.setdefault(
+            pattern,
+            self._bits_from_ids(
+                host_id
+                for host_id, hostname in enumerate(self._host_names)
+                if compiled.match(hostname) is not None
+            ),
+        )
 
-                if "$or" in tag_condition:
-                    return None  # Can not be optimized, makes _all_matching_hosts proceed
+    def _match_tag_condition(self, taggroup_id: TagGroupID, tag_condition: TagCondition) -> int:
+        if isinstance(tag_condition, dict):
+            if "$ne" in tag_condition:
+                return ~self._tags.get(
+                    (taggroup_id, cast(TagConditionNE, tag_condition)["$ne"]),
+                    0,
+                )
 
-                if "$nor" in tag_condition:
-                    return None  # Can not be optimized, makes _all_matching_hosts proceed
+            if "$or" in tag_condition:
+                matching = 0
+                for opt_tag_id in cast(TagConditionOR, tag_condition)["$or"]:
+                    matching |= self._tags.get((taggroup_id, opt_tag_id), 0)
+                return matching
 
-                raise NotImplementedError()
+            if "$nor" in tag_condition:
+                matching = 0
+                for opt_tag_id in tag_condition["$nor"]:
+                    matching |= self._tags.get((taggroup_id, opt_tag_id), 0)
+                return ~matching
 
-            positive_match_tags.add((taggroup_id, tag_condition))
+            raise NotImplementedError()
 
-        # TODO:
-        # if has_specific_folder_tag or self._all_processed_hosts_similarity < 3.0:
-        if self._all_processed_hosts_similarity < 3.0:
-            # Without shared folders
-            for hostname in valid_hosts:
-                if positive_match_tags <= self._host_tags[
-                    hostname
-                ] and not negative_match_tags.intersection(self._host_tags[hostname]):
-                    matching.add(hostname)
+        return self._tags.get((taggroup_id, tag_condition), 0)
 
-            return matching
+    def _index_labels(self, candidates: int, labels_of_host: Callable[[HostName], Labels]) -> None:
+        if not (missing := candidates & ~self._labels_indexed):
+            return
 
-        # With shared folders
-        checked_hosts: set[str] = set()
-        for hostname in valid_hosts:
-            if hostname in checked_hosts:
+        host_ids_by_label: dict[tuple[str, str], list[int]] = {}
+        with_labels: list[int] = []
+        for host_id in self._ids_from_bits(missing):
+            if not (host_labels := labels_of_host(self._host_names[host_id])):
                 continue
+            with_labels.append(host_id)
+            for label in host_labels.items():
+                host_ids_by_label.setdefault(label, []).append(host_id)
 
-            hosts_with_same_tag = self._filter_hosts_with_same_tags_as_host(hostname, valid_hosts)
-            checked_hosts.update(hosts_with_same_tag)
+        for label, host_ids in host_ids_by_label.items():
+            self._labels[label] = self._labels.get(label, 0) | self._bits_from_ids(host_ids)
+        self._with_labels |= self._bits_from_ids(with_labels)
+        self._labels_indexed |= missing
 
-            if positive_match_tags <= self._host_tags[
-                hostname
-            ] and not negative_match_tags.intersection(self._host_tags[hostname]):
-                matching.update(hosts_with_same_tag)
+    def _match_labels(
+        self,
+        candidates: int,
+        label_groups: LabelGroups,
+        labels_of_host: Callable[[HostName], Labels],
+    ) -> int:
+        """Set algebra equivalent of matches_labels()"""
+        self._index_labels(candidates, labels_of_host)
+        with_labels = candidates & self._with_labels
+        without_labels = candidates & ~self._with_labels
+
+        overall_match = candidates
+        for group_operator, label_group in label_groups:
+            group_match = with_labels
+            # A label group matches a host without labels only if it has no "and" operators
+            without_labels_match = without_labels
+            for label_operator, label in label_group:
+                if not label:
+                    continue
 
-        return matching
+                if label_operator == "and":
+                    without_labels_match = 0
 
-    def _filter_hosts_with_same_tags_as_host(
-        self,
-        hostname: HostName,
-        hosts: set[HostName],
-    ) -> set[HostName]:
-        return self._hosts_grouped_by_tags[self._host_grouped_ref[hostname]].intersection(hosts)
+                l = BaseLabel.from_str(label)
+                label_match = self._labels.get((l.name, l.value), 0)
+                group_match = _and_or_not_bits(group_match, label_match, label_operator)
 
-    def _get_hosts_within_folder(self, folder_path: str, with_foreign_hosts: bool) -> set[HostName]:
-        cache_id = with_foreign_hosts, folder_path
-        if cache_id not in self._folder_host_lookup:
-            hosts_in_folder = set()
-            relevant_hosts = (
-                self._all_configured_hosts if with_foreign_hosts else self._all_processed_hosts
+            overall_match = _and_or_not_bits(
+                overall_match,
+                (group_match & with_labels) | without_labels_match,
+                group_operator,
             )
 
-            for hostname in relevant_hosts:
-                host_path = self._host_paths.get(hostname, "/")
-                if host_path.startswith(folder_path):
-                    hosts_in_folder.add(hostname)
+        return overall_match
 
-            self._folder_host_lookup[cache_id] = hosts_in_folder
-            return hosts_in_folder
 
-        return self._folder_host_lookup[cache_id]
-
-    def _initialize_host_lookup(self) -> None:
-        for hostname in self._all_configured_hosts:
-            group_ref = tuple(sorted(self._host_tags[hostname]))
-            self._hosts_grouped_by_tags.setdefault(group_ref, set()).add(hostname)
-            self._host_grouped_ref[hostname] = group_ref
+def _and_or_not_bits(given_match: int, new_match: int, operator: AndOrNotLiteral) -> int:
+    match operator:
+        case "and":
+            return given_match & new_match
+        case "or":
+            return given_match | new_match
+        case "not":
+            return given_match & ~new_match
 
 
 def _tags_cache_id(tag_or_label_spec: object) -> object:
@@ -915,30 +1265,68 @@ def _and_or_not_group_match(
             return given_group_match and not new_single_match
 
 
-def _matches_service_conditions(
-    service_description_condition: tuple[bool, Pattern[str]],
-    service_labels_condition: LabelGroups,
-    match_text: ServiceName | Item,
-    service_labels: Labels,
-) -> bool:
-    if not _matches_service_description_condition(service_description_condition, match_text):
-        return False
+# Patterns referring to their own groups by number (or defining named groups, which may
+# clash) can not be embedded into the combined pattern of _ServiceDescriptionMatcher.
+_NOT_COMBINABLE_PATTERN = re.compile(r"\\[1-9]|\(\?P|\(\?\(")
 
-    if service_labels_condition and not matches_labels(service_labels, service_labels_condition):
-        return False
 
-    return True
+class _ServiceDescriptionMatcher:
+    """Matches a service description against the conditions of all rules of a ruleset
 
+    The patterns of all rules are compiled into one regex, each of them in a lookahead
+    with its own named group. The lookaheads are optional, so that the combined regex
+    always matches and every group that participated in the match tells us that the
+    respective pattern matches.
 
-def _matches_service_description_condition(
-    service_description_condition: tuple[bool, Pattern[str]],
-    match_text: ServiceName | Item,
-) -> bool:
-    negate, pattern = service_description_condition
+    The result is a bitset of the indices of the matching rules, and is cached per
+    service description.
+    """
 
-    if match_text is not None and pattern.match(match_text) is not None:
-        return not negate
-    return negate
+    def __init__(self, conditions: Sequence[PreprocessedPattern]) -> None:
+        self._negated = 0
+        combinable: list[tuple[int, str]] = []
+        self._individual: list[tuple[int, Pattern[str]]] = []
+        for rule_index, (negate, pattern) in enumerate(conditions):
+            if negate:
+                self._negated |= 1 << rule_index
+            if _NOT_COMBINABLE_PATTERN.search(pattern.pattern):
+                self._individual.append((rule_index, pattern))
+            else:
+                combinable.append((rule_index, pattern.pattern))
+
+        self._combined: Pattern[str] | None = None
+        self._groups: list[tuple[int, int]] = []
+        try:
+            combined = re.compile(
+                "".join(f"(?:(?=(?P<r{i}>{p}))|)" for i, p in combinable),
+            )
+        except re.error:
+            # Be robust: We'd rather be slow than fail on some exotic pattern
+            self._individual = [(i, conditions[i][1]) for i in range(len(conditions))]
+        else:
+            self._combined = combined
+            self._groups = [(i, combined.groupindex[f"r{i}"]) for i, _p in combinable]
+
+        self._cache: dict[str, int] = {}
+
+    def __call__(self, match_text: str) -> int:
+        try:
+            return self._cache[match_text]
+        except KeyError:
+            pass
+
+        matching = 0
+        if self._combined is not None and (match := self._combined.match(match_text)):
+            spans = match.regs
+            for rule_index, group in self._groups:
+                if spans[group][0] != -1:
+                    matching |= 1 << rule_index
+
+        for rule_index, pattern in self._individual:
+            if pattern.match(match_text) is not None:
+                matching |= 1 << rule_index
+
+        return self._cache.setdefault(match_text, matching ^ self._negated)
 
 
 def matches_tag_condition(
@@ -4,13 +4,21 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 import subprocess
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 from typing import assert_never, Literal, TypeAlias
 
 from cmk.ccc import tty
 from cmk.ccc.exceptions import MKGeneralException, MKTimeout
 from cmk.helper_interface import FetcherError
-from cmk.snmplib import OID, SNMPBackend, SNMPContext, SNMPRawValue, SNMPRowInfo, SNMPVersion
+from cmk.snmplib import (
+    OID,
+    SNMPBackend,
+    SNMPContext,
+    SNMPRawValue,
+    SNMPRowInfo,
+    SNMPSectionName,
+    SNMPVersion,
+)
 
 from ._utils import strip_snmp_value
 
@@ -107,6 +115,55 @@ class ClassicSNMPBackend(SNMPBackend):
         context: SNMPContext,
         section_name: object = None,  # noqa: ARG002
         table_base_oid: object = None,  # noqa: ARG002
+    ) -> SNMPRowInfo:
+        return self._walk(oid, context=context, stop=None)
+
+    def walk_columns(
+        self,
+        /,
+        oids: Sequence[OID],
+        *,
+        context: SNMPContext,
+        section_name: SNMPSectionName | None = None,
+        table_base_oid: OID | None = None,
+    ) -> Sequence[SNMPRowInfo]:
+        """Walk the columns of a table entry with a single walk of the entry
+
+        This saves us one snmp(bulk)walk process per column, at the cost of also
+        fetching the columns in between the requested ones.
+        """
+        columns: list[SNMPRowInfo] = [[] for _ in oids]
+        batched = _batched_columns(oids)
+        batched_indices = {
+            index
+            for entry_columns in batched.values()
+            for indices in entry_columns.values()
+            for index in indices
+        }
+        for index, oid in enumerate(oids):
+            if index not in batched_indices:
+                columns[index] = self.walk(
+                    oid,
+                    context=context,
+                    section_name=section_name,
+                    table_base_oid=table_base_oid,
+                )
+
+        for entry_oid, entry_columns in batched.items():
+            prefix = f".{entry_oid.strip('.')}."
+            last_column = max(entry_columns)
+            for row in self._walk(
+                entry_oid,
+                context=context,
+                stop=lambda row_oid: _column_of(prefix, row_oid) > last_column,
+            ):
+                for index in entry_columns.get(_column_of(prefix, row[0]), ()):
+                    columns[index].append(row)
+
+        return columns
+
+    def _walk(
+        self, oid: OID, *, context: SNMPContext, stop: Callable[[OID], bool] | None
     ) -> SNMPRowInfo:
         protospec = self._snmp_proto_spec()
 
@@ -120,6 +177,7 @@ class ClassicSNMPBackend(SNMPBackend):
         self._logger.debug(f"Running '{subprocess.list2cmdline(command)}'")
 
         rowinfo: SNMPRowInfo = []
+        stopped = False
         with subprocess.Popen(
             command,
             close_fds=True,
@@ -131,35 +189,37 @@ class ClassicSNMPBackend(SNMPBackend):
             assert snmp_process.stdout
             assert snmp_process.stderr
             try:
-                rowinfo = self._get_rowinfo_from_walk_output(snmp_process.stdout)
+                for row in self._iter_rowinfo_from_walk_output(snmp_process.stdout):
+                    if stop is not None and stop(row[0]):
+                        # We have got everything we need, don't fetch the rest.
+                        snmp_process.kill()
+                        stopped = True
+                        break
+                    rowinfo.append(row)
                 error = snmp_process.stderr.read()
             except MKTimeout:
                 snmp_process.kill()
                 raise
 
-        if snmp_process.returncode:
+        if snmp_process.returncode and not stopped:
             self._logger.debug(f"{tty.red}{tty.bold}ERROR: {tty.normal}SNMP error: {error.strip()}")
             raise FetcherError(
                 f"SNMP Error on {ipaddress}: {error.strip()} (Exit-Code: {snmp_process.returncode})"
             )
         return rowinfo
 
-    def _get_rowinfo_from_walk_output(self, lines: Iterable[str]) -> SNMPRowInfo:
+    def _iter_rowinfo_from_walk_output(
+        self, lines: Iterable[str]
+    ) -> Iterator[tuple[OID, SNMPRawValue]]:
         # Ugly(1): in some cases snmpwalk inserts line feed within one
         # dataset. This happens for example on hexdump outputs longer
         # than a few bytes. Those dumps are enclosed in double quotes.
         # So if the value begins with a double quote, but the line
         # does not end with a double quote, we take the next line(s) as
         # a continuation line.
-        rowinfo = []
         line_iter = iter(lines)
-        while True:
-            try:
-                line = next(line_iter).strip()
-            except StopIteration:
-                break
-
-            parts = line.split("=", 1)
+        for line in line_iter:
+            parts = line.strip().split("=", 1)
             if len(parts) < 2:
                 continue  # broken line, must contain =
             oid = parts[0].strip()
@@ -176,13 +236,11 @@ class ClassicSNMPBackend(SNMPBackend):
             if value == '"' or (
                 len(value) > 1 and value[0] == '"' and (value[-1] != '"')
             ):  # to be continued
-                while True:  # scan for end of this dataset
-                    nextline = next(line_iter).strip()
-                    value += " " + nextline
+                for nextline in line_iter:  # scan for end of this dataset
+                    value += " " + nextline.strip()
                     if value[-1] == '"':
                         break
-            rowinfo.append((oid, strip_snmp_value(value)))
-        return rowinfo
+            yield oid, strip_snmp_value(value)
 
     def _snmp_proto_spec(self) -> str:
         if self.config.is_ipv6_primary:
@@ -302,6 +360,45 @@ class ClassicSNMPBackend(SNMPBackend):
         return command + options
 
 
+def _batched_columns(oids: Sequence[OID]) -> Mapping[OID, Mapping[int, Sequence[int]]]:
+    """Find the columns worth walking together with the other columns of their table entry
+
+    Returns the indices of these columns by column number, grouped by the OID of the entry.
+    We only batch at least two columns, and only if at least every second column of the
+    entry up to the last requested column is requested. This keeps the overhead of
+    fetching columns that are not requested at bay.
+
+    >>> _batched_columns([".1.2.1.2", ".1.2.1.3", ".1.3.0", ".1.2.1.2"])
+    {'.1.2.1': {2: [0, 3], 3: [1]}}
+    >>> _batched_columns([".1.2.1.9", ".1.2.1.10"])
+    {}
+    """
+    entries: dict[OID, dict[int, list[int]]] = {}
+    for index, oid in enumerate(oids):
+        entry_oid, _sep, column = oid.rpartition(".")
+        if entry_oid.strip(".") and column.isdigit():
+            entries.setdefault(entry_oid, {}).setdefault(int(column), []).append(index)
+    return {
+        entry_oid: columns
+        for entry_oid, columns in entries.items()
+        if len(columns) > 1 and 2 * len(columns) >= max(columns)
+    }
+
+
+def _column_of(prefix: OID, row_oid: OID) -> int:
+    """The column number of a row OID within the entry given by prefix (0 if there is none)
+
+    >>> _column_of(".1.2.1.", ".1.2.1.10.4")
+    10
+    >>> _column_of(".1.2.1.", ".1.2.1")
+    0
+    """
+    if not row_oid.startswith(prefix):
+        return 0
+    column, _sep, _index = row_oid[len(prefix) :].partition(".")
+    return int(column) if column.isdigit() else 0
+
+
 def _auth_proto_for(proto_name: str) -> str:
     if proto_name in {"md5", "sha", "SHA-224", "SHA-256", "SHA-384", "SHA-512"}:
         return proto_name
@@ -4,8 +4,15 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 """Abstract classes and types."""
 
+import bisect
+import itertools
 import logging
-from collections.abc import Sequence
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
 from pathlib import Path
 from typing import Final
 
@@ -16,6 +23,79 @@ from ._utils import strip_snmp_value
 
 __all__ = ["StoredWalkSNMPBackend"]
 
+# A record starts with a line starting with a dot. Its value starts after the
+# OID and the following whitespace and ends where the next record starts.
+# Sometimes there are newlines in the data of snmpwalks, so values may span lines.
+_RECORD: Final = re.compile(rb"^\.(\S*)\s*", re.MULTILINE)
+
+
+def _parse_oid(oid: str) -> tuple[int, ...]:
+    return tuple(map(int, oid.strip(".").split(".")))
+
+
+class _WalkIndex:
+    """Sorted OIDs of a stored walk and the location of their values in the file
+
+    The values are read from a memory map of the file when needed.
+    """
+
+    def __init__(self, path: Path, logger: logging.Logger) -> None:
+        logger.debug(f"  Indexing {path}")
+        with path.open("rb") as f:
+            self.signature: Final = self.make_signature(os.fstat(f.fileno()))
+            self._data: Final = (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.signature[-1] else b""
+            )
+
+        matches = list(_RECORD.finditer(self._data))
+        value_ends = [match.start() for match in matches[1:]] + [len(self._data)]
+        records = []
+        for match, value_end in zip(matches, value_ends):
+            try:
+                oid = _parse_oid(match.group(1).decode("ascii"))
+            except ValueError:
+                logger.debug(f"  Skipping invalid OID {match.group(1)!r}")
+                continue
+            records.append((oid, (match.start(), match.end(1), match.end(), value_end)))
+
+        # Stable sort: multiple entries for the same OID stay in the order of the file.
+        records.sort(key=lambda record: record[0])
+        self._oids: Final = [oid for oid, _spans in records]
+        # (start of OID, end of OID, start of value, end of value)
+        self._spans: Final = [spans for _oid, spans in records]
+
+    @staticmethod
+    def make_signature(stat: os.stat_result) -> tuple[int, int, int]:
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _value(self, index: int) -> SNMPRawValue:
+        _oid_start, _oid_end, value_start, value_end = self._spans[index]
+        return strip_snmp_value(self._data[value_start:value_end].decode("utf-8"))
+
+    def get(self, oid: tuple[int, ...]) -> SNMPRawValue | None:
+        index = bisect.bisect_left(self._oids, oid)
+        if index < len(self._oids) and self._oids[index] == oid:
+            return self._value(index)
+        return None
+
+    def walk(
+        self, prefix: tuple[int, ...], *, include_prefix: bool
+    ) -> Iterator[tuple[OID, SNMPRawValue]]:
+        """Yield all entries below `prefix` (and `prefix` itself, if requested)"""
+        begin = (bisect.bisect_left if include_prefix else bisect.bisect_right)(self._oids, prefix)
+        end = bisect.bisect_left(self._oids, (*prefix[:-1], prefix[-1] + 1), lo=begin)
+        for index in range(begin, end):
+            oid_start, oid_end, _value_start, _value_end = self._spans[index]
+            yield self._data[oid_start:oid_end].decode("ascii"), self._value(index)
+
+
+# Built once per walk file and process, rebuilt if the file changes. Every index keeps its walk
+# file mapped (and thus open), so only the most recently used ones are kept. The dropped ones are
+# unmapped as soon as no running lookup uses them anymore.
+_MAX_WALK_INDEXES: Final = 16
+_WALK_INDEXES: Final[OrderedDict[Path, _WalkIndex]] = OrderedDict()
+_WALK_INDEXES_LOCK: Final = threading.Lock()
+
 
 class StoredWalkSNMPBackend(SNMPBackend):
     def __init__(self, snmp_config: SNMPHostConfig, logger: logging.Logger, path: Path) -> None:
@@ -24,15 +104,19 @@ class StoredWalkSNMPBackend(SNMPBackend):
         if not self.path.exists():
             raise FetcherError(f"No snmpwalk file {self.path}")
 
-    def get(self, /, oid: OID, *, context: SNMPContext) -> SNMPRawValue | None:
-        walk = self.walk(oid, context=context)
-        # get_stored_snmpwalk returns all oids that start with oid but here
-        # we need an exact match
-        if len(walk) == 1 and oid == walk[0][0]:
-            return walk[0][1]
-        if oid.endswith(".*") and len(walk) > 0:
-            return walk[0][1]
-        return None
+    def get(
+        self,
+        /,
+        oid: OID,
+        *,
+        context: SNMPContext,  # noqa: ARG002
+    ) -> SNMPRawValue | None:
+        if oid.endswith(".*"):
+            return next((value for _oid, value in self._walk(oid[:-2], include_prefix=False)), None)
+        try:
+            return self._get_index().get(_parse_oid(oid))
+        except ValueError:
+            return None
 
     def walk(
         self,
@@ -43,46 +127,30 @@ class StoredWalkSNMPBackend(SNMPBackend):
         section_name: object = None,  # noqa: ARG002
         table_base_oid: object = None,  # noqa: ARG002
     ) -> SNMPRowInfo:
-        if oid.startswith("."):
-            oid = oid[1:]
-
+        self._logger.debug(f"  Loading {oid}")
         if oid.endswith(".*"):
-            oid_prefix = oid[:-2]
-            dot_star = True
-        else:
-            oid_prefix = oid
-            dot_star = False
+            return list(itertools.islice(self._walk(oid[:-2], include_prefix=False), 1))
+        return list(self._walk(oid, include_prefix=True))
 
-        self._logger.debug(f"  Loading {oid}")
-        lines = self.read_walk_data()
-
-        begin = 0
-        end = len(lines)
-        current = (begin + end) // 2
-        hit = None
-        while end - begin > 0:
-            parts = lines[current].split(None, 1)
-            comp = parts[0]
-            hit = StoredWalkSNMPBackend._compare_oids(oid_prefix, comp)
-            if hit == 0:
-                break
-            if hit == 1:  # we are too low
-                begin = current + 1
-            else:
-                end = current
-            current = (begin + end) // 2
-
-        if hit != 0:
-            return []  # not found
-
-        rowinfo = StoredWalkSNMPBackend._collect_until(oid, oid_prefix, lines, current, -1)
-        rowinfo.reverse()
-        rowinfo += StoredWalkSNMPBackend._collect_until(oid, oid_prefix, lines, current + 1, 1)
-
-        if dot_star:
-            return [rowinfo[0]]
-
-        return rowinfo
+    def _walk(self, oid: OID, *, include_prefix: bool) -> Iterator[tuple[OID, SNMPRawValue]]:
+        try:
+            prefix = _parse_oid(oid)
+        except ValueError:
+            return iter(())
+        return self._get_index().walk(prefix, include_prefix=include_prefix)
+
+    def _get_index(self) -> _WalkIndex:
+        try:
+            signature = _WalkIndex.make_signature(self.path.stat())
+            with _WALK_INDEXES_LOCK:
+                if (index := _WALK_INDEXES.get(self.path)) is None or index.signature != signature:
+                    index = _WALK_INDEXES[self.path] = _WalkIndex(self.path, self._logger)
+                _WALK_INDEXES.move_to_end(self.path)
+                while len(_WALK_INDEXES) > _MAX_WALK_INDEXES:
+                    _WALK_INDEXES.popitem(last=False)
+        except OSError:
+            raise FetcherError(f"No snmpwalk file {self.path}")
+        return index
 
     @staticmethod
     def read_walk_from_path(path: Path, logger: logging.Logger) -> Sequence[str]:
@@ -103,47 +171,3 @@ class StoredWalkSNMPBackend(SNMPBackend):
             return self.read_walk_from_path(self.path, self._logger)
         except OSError:
             raise FetcherError(f"No snmpwalk file {self.path}")
-
-    @staticmethod
-    def _compare_oids(a: OID, b: OID) -> int:
-        aa = StoredWalkSNMPBackend._to_bin_string(a)
-        bb = StoredWalkSNMPBackend._to_bin_string(b)
-        if len(aa) <= len(bb) and bb[: len(aa)] == aa:
-            result = 0
-        else:
-            result = (aa > bb) - (aa < bb)
-        return result
-
-    @staticmethod
-    def _to_bin_string(oid: OID) -> tuple[int, ...]:
-        return tuple(map(int, oid.strip(".").split(".")))
-
-    @staticmethod
-    def _collect_until(
-        oid: OID, oid_prefix: OID, lines: Sequence[str], index: int, direction: int
-    ) -> SNMPRowInfo:
-        rows = []
-        # Handle case, where we run after the end of the lines list
-        if index >= len(lines):
-            if direction > 0:
-                return []
-            index -= 1
-        while True:
-            line = lines[index]
-            parts = line.split(None, 1)
-            o = parts[0]
-            if o.startswith("."):
-                o = o[1:]
-            if o == oid or o.startswith(oid_prefix + "."):
-                if len(parts) > 1:
-                    value = parts[1]
-                else:
-                    value = ""
-                # Fix for missing starting oids
-                rows.append(("." + o, strip_snmp_value(value)))
-                index += direction
-                if index < 0 or index >= len(lines):
-                    break
-            else:
-                break
-        return rows
@@ -51,8 +51,23 @@ def get_snmp_table(
     max_len = 0
     max_len_col = -1
 
-    for oid in tree.oids:
-        fetchoid: OID = f"{tree.base}.{oid.column}"
+    fetchoids: list[OID] = [f"{tree.base}.{oid.column}" for oid in tree.oids]
+    rowinfos = iter(
+        get_snmpwalks(
+            section_name,
+            tree.base,
+            [
+                (fetchoid, oid.save_to_cache)
+                for fetchoid, oid in zip(fetchoids, tree.oids)
+                if not isinstance(oid.column, SpecialColumn)
+            ],
+            walk_cache=walk_cache,
+            backend=backend,
+            log=log,
+        )
+    )
+
+    for fetchoid, oid in zip(fetchoids, tree.oids):
         # column may be integer or string like "1.5.4.2.3"
         # if column is 0, we do not fetch any data from snmp, but use
         # a running counter as index. If the index column is the first one,
@@ -71,15 +86,7 @@ def get_snmp_table(
             index_column = len(columns)
             index_format = oid.column
         else:
-            rowinfo = get_snmpwalk(
-                section_name,
-                tree.base,
-                fetchoid,
-                walk_cache=walk_cache,
-                save_walk_cache=oid.save_to_cache,
-                backend=backend,
-                log=log,
-            )
+            rowinfo = next(rowinfos)
             if len(rowinfo) > max_len:
                 max_len_col = len(columns)
 
@@ -179,19 +186,49 @@ def get_snmpwalk(
     backend: SNMPBackend,
     log: Callable[[str], None],
 ) -> SNMPRowInfo:
+    return get_snmpwalks(
+        section_name,
+        base_oid,
+        [(fetchoid, save_walk_cache)],
+        walk_cache=walk_cache,
+        backend=backend,
+        log=log,
+    )[0]
+
+
+def get_snmpwalks(
+    section_name: SNMPSectionName | None,
+    base_oid: str,
+    fetchoids: Sequence[tuple[OID, bool]],
+    *,
+    walk_cache: MutableMapping[tuple[str, str, bool], SNMPRowInfo],
+    backend: SNMPBackend,
+    log: Callable[[str], None],
+) -> Sequence[SNMPRowInfo]:
+    """Walk all given OIDs (and whether to save them in the walk cache)
+
+    All OIDs that are not cached yet are passed to the backend at once.
+    """
     context_config = backend.config.snmpv3_contexts_of(section_name)
     context_string = "-".join(["no_context" if not c else c for c in context_config.contexts])
 
     # contexts are hashed in order not to exceed max pathname length
     context_hash = hashlib.shake_256(context_string.encode("utf-8")).hexdigest(15)
 
-    with contextlib.suppress(KeyError):
-        cache_info = walk_cache[(fetchoid, context_hash, save_walk_cache)]
-        log(f"Already fetched OID: {fetchoid}")
-        return cache_info
+    results: dict[tuple[OID, bool], SNMPRowInfo] = {}
+    for fetchoid, save_walk_cache in fetchoids:
+        with contextlib.suppress(KeyError):
+            results[(fetchoid, save_walk_cache)] = walk_cache[
+                (fetchoid, context_hash, save_walk_cache)
+            ]
+            log(f"Already fetched OID: {fetchoid}")
+
+    if not (missing := [key for key in dict.fromkeys(fetchoids) if key not in results]):
+        return [results[key] for key in fetchoids]
 
-    added_oids: set[OID] = set()
-    rowinfo: SNMPRowInfo = []
+    missing_oids = [fetchoid for fetchoid, _save_walk_cache in missing]
+    rowinfos: list[SNMPRowInfo] = [[] for _ in missing]
+    added_oids: list[set[OID]] = [set() for _ in missing]
 
     skip: set[SNMPContext] = set()
     for context in context_config.contexts:
@@ -199,8 +236,8 @@ def get_snmpwalk(
             continue
 
         try:
-            rows = backend.walk(
-                fetchoid,
+            columns = backend.walk_columns(
+                missing_oids,
                 section_name=section_name,
                 table_base_oid=base_oid,
                 context=context,
@@ -213,26 +250,29 @@ def get_snmpwalk(
             skip.add(context)
             continue
 
-        # I've seen a broken device (Mikrotik Router), that broke after an
-        # update to RouterOS v6.22. It would return 9 time the same OID when
-        # .1.3.6.1.2.1.1.1.0 was being walked. We try to detect these situations
-        # by removing any duplicate OID information
-        if len(rows) > 1 and rows[0][0] == rows[1][0]:
-            log("Detected broken SNMP agent. Ignoring duplicate OID {rows[0][0]}.")
-            rows = rows[:1]
-
-        for row_oid, val in rows:
-            if row_oid in added_oids:
-                log(f"Duplicate OID found: {row_oid} ({val!r})")
-            else:
-                rowinfo.append((row_oid, val))
-                added_oids.add(row_oid)
-
-    if skip and not rowinfo:
+        for rows, rowinfo, added in zip(columns, rowinfos, added_oids):
+            # I've seen a broken device (Mikrotik Router), that broke after an
+            # update to RouterOS v6.22. It would return 9 time the same OID when
+            # .1.3.6.1.2.1.1.1.0 was being walked. We try to detect these situations
+            # by removing any duplicate OID information
+            if len(rows) > 1 and rows[0][0] == rows[1][0]:
+                log("Detected broken SNMP agent. Ignoring duplicate OID {rows[0][0]}.")
+                rows = rows[:1]
+
+            for row_oid, val in rows:
+                if row_oid in added:
+                    log(f"Duplicate OID found: {row_oid} ({val!r})")
+                else:
+                    rowinfo.append((row_oid, val))
+                    added.add(row_oid)
+
+    if skip and not all(rowinfos):
         raise SNMPTimeout("SNMP Error on %s: SNMP query timed out" % backend.config.hostname)
 
-    walk_cache[(fetchoid, context_hash, save_walk_cache)] = rowinfo
-    return rowinfo
+    for (fetchoid, save_walk_cache), rowinfo in zip(missing, rowinfos):
+        walk_cache[(fetchoid, context_hash, save_walk_cache)] = rowinfo
+        results[(fetchoid, save_walk_cache)] = rowinfo
+    return [results[key] for key in fetchoids]
 
 
 def _decode_column(
@@ -249,6 +249,29 @@ class SNMPBackend(abc.ABC):
     ) -> SNMPRowInfo:
         return []
 
+    def walk_columns(
+        self,
+        /,
+        oids: Sequence[OID],
+        *,
+        context: SNMPContext,
+        section_name: SNMPSectionName | None = None,
+        table_base_oid: OID | None = None,
+    ) -> Sequence[SNMPRowInfo]:
+        """Walk several OIDs (usually the columns of a table) in the given SNMP context
+
+        Backends may override this to fetch the OIDs with fewer requests.
+        """
+        return [
+            self.walk(
+                oid,
+                context=context,
+                section_name=section_name,
+                table_base_oid=table_base_oid,
+            )
+            for oid in oids
+        ]
+
 
 class SpecialColumn(enum.IntEnum):
     # Until we remove all but the first, its worth having an enum
@@ -5,7 +5,9 @@
 
 
 import logging
+import os
 from collections.abc import Sequence
+from pathlib import Path
 from typing import NamedTuple
 
 import pytest
@@ -329,3 +331,71 @@ def test_priv_proto(proto: str, result: str) -> None:
 def test_priv_proto_unknown(proto: str) -> None:
     with pytest.raises(MKGeneralException):
         classic_snmp._priv_proto_for(proto)  # noqa: SLF001
+
+
+_WALK_OUTPUT = """\
+.1.3.6.1.2.1.2.2.1.1.1 = 1
+.1.3.6.1.2.1.2.2.1.1.2 = 2
+.1.3.6.1.2.1.2.2.1.2.1 = "lo"
+.1.3.6.1.2.1.2.2.1.2.2 = "eth0"
+.1.3.6.1.2.1.2.2.1.3.1 = 24
+.1.3.6.1.2.1.2.2.1.3.2 = 6
+.1.3.6.1.2.1.2.2.1.6.1 = "00 00 00 00 00 00 "
+.1.3.6.1.2.1.2.2.1.6.2 = "52 54 00
+B2 E0 7D "
+.1.3.6.1.2.1.2.2.1.7.1 = 1
+.1.3.6.1.2.1.2.2.1.8.1 = 1
+"""
+
+
+@pytest.fixture(name="fake_snmpbulkwalk")
+def _fake_snmpbulkwalk(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """An snmpbulkwalk printing the rows below the requested OID, logging its invocations"""
+    (tmp_path / "walk").write_text(_WALK_OUTPUT)
+    script = tmp_path / "snmpbulkwalk"
+    script.write_text(
+        "#!/bin/sh\n"
+        "for oid; do :; done\n"
+        f'echo "$oid" >> {tmp_path / "calls"}\n'
+        f"awk -v p=\"$oid.\" '/^\\./ {{ keep = index($0, p) == 1 }} keep' {tmp_path / 'walk'}\n"
+    )
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}:{os.environ['PATH']}")
+    return tmp_path / "calls"
+
+
+def test_walk_columns(fake_snmpbulkwalk: Path) -> None:
+    snmp_config = SNMPHostConfig(
+        is_ipv6_primary=False,
+        hostname=HostName("localhost"),
+        ipaddress=HostAddress("127.0.0.1"),
+        credentials="public",
+        port=161,
+        bulkwalk_enabled=True,
+        snmp_version=SNMPVersion.V2C,
+        bulk_walk_size_of=10,
+        timing={},
+        oid_range_limits={},
+        snmpv3_contexts=[],
+        character_encoding=None,
+        snmp_backend=SNMPBackendEnum.CLASSIC,
+    )
+    backend = ClassicSNMPBackend(snmp_config, logger)
+    oids = [
+        ".1.3.6.1.2.1.2.2.1.2",
+        ".1.3.6.1.2.1.2.2.1.6",
+        ".1.3.6.1.2.1.2.2.1.3",
+        ".1.3.6.1.2.1.2.2.1.2",
+        ".1.3.6.1.2.1.2.2.1.5",
+        ".1.3.6.1.2.1.2.2.1.7",
+    ]
+
+    columns = backend.walk_columns(oids, context="")
+
+    assert columns == [backend.walk(oid, context="") for oid in oids]
+    assert columns[1] == [
+        (".1.3.6.1.2.1.2.2.1.6.1", b"\x00\x00\x00\x00\x00\x00"),
+        (".1.3.6.1.2.1.2.2.1.6.2", b"RT\x00\xb2\xe0}"),
+    ]
+    assert fake_snmpbulkwalk.read_text().splitlines()[0] == ".1.3.6.1.2.1.2.2.1"
+    assert len(fake_snmpbulkwalk.read_text().splitlines()) == 1 + len(oids)
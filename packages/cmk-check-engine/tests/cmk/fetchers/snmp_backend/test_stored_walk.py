@@ -5,12 +5,16 @@
 
 
 import logging
+import os
+import weakref
 from pathlib import Path
 
 import pytest
 
 import cmk.fetchers.snmp_backend._utils as utils
-from cmk.fetchers.snmp_backend import StoredWalkSNMPBackend
+from cmk.ccc.hostaddress import HostAddress, HostName
+from cmk.fetchers.snmp_backend import stored_walk, StoredWalkSNMPBackend
+from cmk.snmplib import SNMPBackendEnum, SNMPHostConfig, SNMPVersion
 
 
 @pytest.mark.parametrize(
@@ -28,21 +32,6 @@ def test_strip_snmp_value(value: str, expected: bytes) -> None:
 
 @pytest.mark.usefixtures("create_files")
 class TestStoredWalkSNMPBackend:
-    @pytest.mark.parametrize(
-        "a, b, result",
-        [
-            ("1.2.3", "1.2.3", 0),
-            ("1.2.3", ".1.2.3", 0),
-            (".1.2.3", "1.2.3", 0),
-            (".1.2.3", ".1.2.3", 0),
-            ("1.2.3", "1.2.3.4", 0),
-            ("1.2.3.4", "1.2.3", 1),
-            ("1.2.3", "4.5.6", -1),
-        ],
-    )
-    def test_compare_oids(self, a: str, b: str, result: int) -> None:
-        assert StoredWalkSNMPBackend._compare_oids(a, b) == result  # noqa: SLF001
-
     def test_read_walk_data(self, tmpdir: Path) -> None:
         assert StoredWalkSNMPBackend.read_walk_from_path(
             tmpdir / "walkdata" / "1.txt", logging.getLogger("test")
@@ -57,6 +46,81 @@ class TestStoredWalkSNMPBackend:
             ".1.2.5 test\n",
         ]
 
+    @pytest.fixture
+    def backend(self, tmp_path: Path) -> StoredWalkSNMPBackend:
+        (tmp_path / "walk").write_text(
+            ".1.2.3.1 one\n"
+            ".1.2.10.1 ten\n"
+            "continued\n"
+            ".1.2.3.2 two\n"
+            ".1.2.3.2 two again\n"
+            ".1.2.30 thirty\n"
+            ".1.2.4\n"
+            ".iso.3.6.1 textual oid\n"
+            '.1.2.5 "41 42 43 "\n'
+        )
+        return StoredWalkSNMPBackend(
+            SNMPHostConfig(
+                is_ipv6_primary=False,
+                hostname=HostName("walkhost"),
+                ipaddress=HostAddress("127.0.0.1"),
+                credentials="public",
+                port=161,
+                bulkwalk_enabled=True,
+                snmp_version=SNMPVersion.V2C,
+                bulk_walk_size_of=10,
+                timing={},
+                oid_range_limits={},
+                snmpv3_contexts=[],
+                character_encoding=None,
+                snmp_backend=SNMPBackendEnum.STORED_WALK,
+            ),
+            logging.getLogger("test"),
+            tmp_path / "walk",
+        )
+
+    def test_walk(self, backend: StoredWalkSNMPBackend) -> None:
+        assert backend.walk(".1.2.3", context="") == [
+            (".1.2.3.1", b"one"),
+            (".1.2.3.2", b"two"),
+            (".1.2.3.2", b"two again"),
+        ]
+        assert backend.walk("1.2.10", context="") == [(".1.2.10.1", b"ten\ncontinued")]
+        assert backend.walk(".1.2.4", context="") == [(".1.2.4", b"")]
+        assert backend.walk(".1.2.5", context="") == [(".1.2.5", b"ABC")]
+        assert backend.walk(".1.2.3.*", context="") == [(".1.2.3.1", b"one")]
+        assert not backend.walk(".1.2.6", context="")
+        assert not backend.walk(".1.2.30.*", context="")
+
+    def test_get(self, backend: StoredWalkSNMPBackend) -> None:
+        assert backend.get(".1.2.30", context="") == b"thirty"
+        assert backend.get(".1.2.3.*", context="") == b"one"
+        assert backend.get(".1.2.3", context="") is None
+        assert backend.get(".1.2.30.*", context="") is None
+
+    def test_changed_file_is_reindexed(self, backend: StoredWalkSNMPBackend) -> None:
+        assert backend.get(".1.2.30", context="") == b"thirty"
+        backend.path.write_text(".1.2.30 changed\n")
+        stat = backend.path.stat()
+        os.utime(backend.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        assert backend.get(".1.2.30", context="") == b"changed"
+
+    def test_least_recently_used_index_is_dropped(
+        self, backend: StoredWalkSNMPBackend, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(stored_walk, "_MAX_WALK_INDEXES", 1)
+        other_path = backend.path.with_name("other_walk")
+        other_path.write_text(".1.2.30 other\n")
+        other_backend = StoredWalkSNMPBackend(backend.config, logging.getLogger("test"), other_path)
+
+        assert backend.get(".1.2.30", context="") == b"thirty"
+        dropped_index = weakref.ref(stored_walk._WALK_INDEXES[backend.path])  # noqa: SLF001
+        assert other_backend.get(".1.2.30", context="") == b"other"
+
+        assert list(stored_walk._WALK_INDEXES) == [other_path]  # noqa: SLF001
+        # Nothing refers to the dropped index anymore, so its memory map is closed
+        assert dropped_index() is None
+
 
 @pytest.fixture
 def create_files(tmp_path: Path) -> None:
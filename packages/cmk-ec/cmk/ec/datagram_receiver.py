@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Receiving datagrams in a thread of their own
+
+While the event server processes a burst of messages, further datagrams pile up in the receive
+buffer of the socket, and the kernel drops them once it is full. The receiver drains the socket
+in batches, independently of the processing, and hands the batches over in the order they have
+been received. If the processing falls behind for too long, the receiver stops draining, so the
+memory used for pending datagrams is limited.
+"""
+
+from __future__ import annotations
+
+import os
+import select
+import socket
+import threading
+from collections import deque
+from logging import Logger
+from typing import Final
+
+BATCH_SIZE: Final = 1000
+_MAX_PENDING: Final = 100 * BATCH_SIZE
+
+type Datagram = tuple[bytes, object]  # the data and the remote address
+
+
+class DatagramReceiver(threading.Thread):
+    def __init__(self, name: str, sock: socket.socket, buffer_size: int, logger: Logger) -> None:
+        super().__init__(name=name, daemon=True)
+        self._socket = sock
+        self._buffer_size = buffer_size
+        self._logger = logger
+        self._pending: deque[Datagram] = deque()
+        self._not_full = threading.Condition()
+        # Holds a byte as long as there are pending datagrams, so that one can select() on it.
+        self._wakeup_read, self._wakeup_write = os.pipe()
+        self._terminate_event = threading.Event()
+
+    def fileno(self) -> int:
+        """Readable as long as there are pending datagrams"""
+        return self._wakeup_read
+
+    def run(self) -> None:
+        self._logger.info("Starting up")
+        while not self._terminate_event.is_set():
+            if select.select([self._socket], [], [], 1)[0] and (batch := self._receive_batch()):
+                self._put(batch)
+        self._logger.info("Terminated")
+
+    def terminate(self) -> None:
+        self._terminate_event.set()
+        self.join()
+        os.close(self._wakeup_read)
+        os.close(self._wakeup_write)
+
+    def next_batch(self) -> list[Datagram]:
+        """The oldest pending datagrams, at most BATCH_SIZE of them"""
+        with self._not_full:
+            batch = [self._pending.popleft() for _ in range(min(BATCH_SIZE, len(self._pending)))]
+            if batch and not self._pending:
+                os.read(self._wakeup_read, 1)
+            self._not_full.notify()
+        return batch
+
+    def _receive_batch(self) -> list[Datagram]:
+        batch: list[Datagram] = []
+        while len(batch) < BATCH_SIZE:
+            try:
+                batch.append(self._socket.recvfrom(self._buffer_size, socket.MSG_DONTWAIT))
+            except BlockingIOError:
+                break
+            except OSError:
+                self._logger.exception("Exception during %s recvfrom", self.name)
+                break
+        return batch
+
+    def _put(self, batch: list[Datagram]) -> None:
+        with self._not_full:
+            # The datagrams queue up in the socket meanwhile.
+            while len(self._pending) >= _MAX_PENDING:
+                if self._terminate_event.is_set():
+                    return
+                self._not_full.wait(1)
+            if not self._pending:
+                os.write(self._wakeup_write, b"\0")
+            self._pending.extend(batch)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""The open events, indexed by the attributes the event processing looks them up by"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from cmk.ccc.hostaddress import HostName
+
+from .event import Event
+
+type HostKey = tuple[HostName, HostName | None]
+
+
+def host_key(event: Event) -> HostKey:
+    return event["host"], event["core_host"]
+
+
+class EventStore:
+    """Keeps the events in the order they have been added, i.e. the oldest one first
+
+    The ids of the events grow in that order, too, and must not change while an event is stored.
+    Whoever changes the rule or the host of a stored event (e.g. when counting it up) has to
+    update it. All accessors return snapshots, so callers may remove events while iterating them.
+    """
+
+    def __init__(self, events: Iterable[Event] = ()) -> None:
+        # All indices rely on dicts keeping the insertion order.
+        self._by_id: dict[int, Event] = {}
+        self._by_rule: dict[str | None, dict[int, Event]] = {}
+        self._by_host: dict[HostKey, dict[int, Event]] = {}
+        self._by_rule_and_host: dict[tuple[str | None, HostName], dict[int, Event]] = {}
+        self._index_keys: dict[int, tuple[str | None, HostKey]] = {}
+        for event in events:
+            self.add(event)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def add(self, event: Event) -> None:
+        self._by_id[event["id"]] = event
+        self._add_to_indices(event)
+
+    def remove(self, event: Event) -> None:
+        """Remove the event, raises ValueError if it is not present (like list.remove)"""
+        eid = event["id"]
+        if (stored := self._by_id.get(eid)) is None or (stored is not event and stored != event):
+            raise ValueError(f"event {eid} not present")
+        del self._by_id[eid]
+        self._remove_from_indices(eid)
+
+    def update(self, event: Event) -> None:
+        """Index the stored event by its current rule and host"""
+        if self._index_keys[event["id"]] != (event["rule_id"], host_key(event)):
+            self._remove_from_indices(event["id"])
+            self._add_to_indices(event)
+
+    def get(self, eid: int) -> Event | None:
+        return self._by_id.get(eid)
+
+    def all(self) -> list[Event]:
+        return list(self._by_id.values())
+
+    def of_rule(self, rule_id: str | None) -> list[Event]:
+        return list(self._by_rule.get(rule_id, {}).values())
+
+    def of_rule_and_host(self, rule_id: str | None, host: HostName) -> list[Event]:
+        return list(self._by_rule_and_host.get((rule_id, host), {}).values())
+
+    def num_of_rule(self, rule_id: str | None) -> int:
+        return len(self._by_rule.get(rule_id, {}))
+
+    def num_of_host(self, key: HostKey) -> int:
+        return len(self._by_host.get(key, {}))
+
+    def num_by_rule(self) -> dict[str | None, int]:
+        return {rule_id: len(events) for rule_id, events in self._by_rule.items()}
+
+    def num_by_host(self) -> dict[HostKey, int]:
+        return {key: len(events) for key, events in self._by_host.items()}
+
+    def oldest(self) -> Event | None:
+        return next(iter(self._by_id.values()), None)
+
+    def oldest_of_rule(self, rule_id: str | None) -> Event | None:
+        return next(iter(self._by_rule.get(rule_id, {}).values()), None)
+
+    def oldest_of_host(self, key: HostKey) -> Event | None:
+        return next(iter(self._by_host.get(key, {}).values()), None)
+
+    def _add_to_indices(self, event: Event) -> None:
+        self._index_keys[event["id"]] = rule_id, key = event["rule_id"], host_key(event)
+        _add_to_index(self._by_rule, rule_id, event)
+        _add_to_index(self._by_host, key, event)
+        _add_to_index(self._by_rule_and_host, (rule_id, key[0]), event)
+
+    def _remove_from_indices(self, eid: int) -> None:
+        rule_id, key = self._index_keys.pop(eid)
+        _remove_from_index(self._by_rule, rule_id, eid)
+        _remove_from_index(self._by_host, key, eid)
+        _remove_from_index(self._by_rule_and_host, (rule_id, key[0]), eid)
+
+
+def _add_to_index[K](index: dict[K, dict[int, Event]], key: K, event: Event) -> None:
+    events = index.setdefault(key, {})
+    eid = event["id"]
+    moved_here = bool(events) and next(reversed(events)) > eid
+    events[eid] = event
+    if moved_here:
+        # An updated event is older than the ones already present
+        index[key] = dict(sorted(events.items()))
+
+
+def _remove_from_index[K](index: dict[K, dict[int, Event]], key: K, eid: int) -> None:
+    events = index[key]
+    del events[eid]
+    if not events:
+        del index[key]
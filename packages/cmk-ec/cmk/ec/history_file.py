@@ -3,24 +3,43 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
-import shlex
-import subprocess
+import itertools
 import threading
 import time
 from collections.abc import Callable, Iterable, Sequence
 from logging import Logger
 from pathlib import Path
-from typing import Any
+from typing import Any, Final, NamedTuple
 
 from .config import Config
 from .event import Event, scrub_string
 from .history import _log_event, ActiveHistoryPeriod, get_logfile, History, HistoryWhat, quote_tab
+from .history_file_index import BlockWriter, index_path, IndexReader, Segment
 from .log_level import VERBOSE
 from .query import Columns, OperatorName, QueryFilter, QueryGET
 from .settings import Settings
 
+# New entries are written at the latest after this many seconds, or once this many are pending.
+_FLUSH_DELAY: Final = 1.0
+_MAX_PENDING_ENTRIES: Final = 1000
+# The number of entries per indexed block
+_BLOCK_LINES: Final = 256
+
+
+class _PendingEntry(NamedTuple):
+    line: bytes
+    history_time: float
+    host: str
+    event_id: int
+
 
 class FileHistory(History):
+    """The history in tab-separated files, one per history period
+
+    New entries are buffered for a short time and written in one go. The written blocks of entries
+    are indexed, see history_file_index.
+    """
+
     def __init__(
         self,
         settings: Settings,
@@ -36,9 +55,16 @@ class FileHistory(History):
         self._history_columns = history_columns
         self._lock = threading.Lock()
         self._active_history_period = ActiveHistoryPeriod()
+        self._pending: list[_PendingEntry] = []
+        self._flush_timer: threading.Timer | None = None
+        self._block: BlockWriter | None = None
+        self._index_reader = IndexReader()
 
     def flush(self) -> None:
-        _expire_logfiles(self._settings, self._config, self._logger, self._lock, True)
+        with self._lock:
+            self._write_pending()
+            self._close_block()
+            _expire_logfiles(self._settings, self._config, self._logger, True)
 
     def add(self, event: Event, what: HistoryWhat, who: str = "", addinfo: str = "") -> None:
         """Make a new entry in the event history.
@@ -52,8 +78,9 @@ class FileHistory(History):
         """
         _log_event(self._config, self._logger, event, what, who, addinfo)
         with self._lock:
+            now = time.time()
             columns = [
-                quote_tab(str(time.time())),
+                quote_tab(str(now)),
                 quote_tab(scrub_string(what)),
                 quote_tab(scrub_string(who)),
                 quote_tab(scrub_string(addinfo)),
@@ -63,14 +90,64 @@ class FileHistory(History):
                 for colname, defval in self._event_columns
             ]
 
-            with get_logfile(
-                self._config,
-                self._settings.paths.history_dir.value,
-                self._active_history_period,
-            ).open(mode="ab") as f:
-                f.write(b"\t".join(columns) + b"\n")
+            self._pending.append(
+                _PendingEntry(
+                    b"\t".join(columns) + b"\n",
+                    now,
+                    str(event.get("host", "")),
+                    event.get("id", 0),
+                )
+            )
+            if len(self._pending) >= _MAX_PENDING_ENTRIES:
+                self._write_pending()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(_FLUSH_DELAY, self._write_pending_in_background)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def _write_pending_in_background(self) -> None:
+        with self._lock:
+            try:
+                self._write_pending()
+            except Exception as e:
+                if self._settings.options.debug:
+                    raise
+                self._logger.warning("Error writing history entries: %s", e)
+
+    # protected by self._lock
+    def _write_pending(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        path = get_logfile(
+            self._config, self._settings.paths.history_dir.value, self._active_history_period
+        )
+        with path.open(mode="ab") as f:
+            offset = f.tell()
+            f.write(b"".join(entry.line for entry in pending))
+        if self._block is None or self._block.path != path or self._block.end != offset:
+            # Somebody else has written to the file, or it is a new one.
+            self._close_block()
+            self._block = BlockWriter(path, offset)
+        for entry in pending:
+            self._block.add(entry.line, entry.history_time, entry.host, entry.event_id)
+            if self._block.lines >= _BLOCK_LINES:
+                end = self._block.end
+                self._close_block()
+                self._block = BlockWriter(path, end)
+
+    # protected by self._lock
+    def _close_block(self) -> None:
+        if self._block is not None:
+            self._block.write()
+            self._block = None
 
     def get(self, query: QueryGET) -> Iterable[Sequence[object]]:
+        with self._lock:
+            self._write_pending()
         if not self._settings.paths.history_dir.value.exists():
             return []
 
@@ -79,8 +156,6 @@ class FileHistory(History):
         limit = query.limit
         self._logger.debug("Limit: %r", limit)
 
-        grep_pipeline = _grep_pipeline(filters)
-
         time_filters = [
             (f.operator_name, f.argument) for f in filters if f.column_name.split("_")[-1] == "time"
         ]
@@ -89,70 +164,80 @@ class FileHistory(History):
             _least_upper_bound_for_filters(time_filters),
         )
         self._logger.debug("time range: %r", time_range)
+        select_segment = _segment_filter(filters, time_range)
+        select_line = _line_filters(filters)
 
         # We do not want to open all files. So our strategy is:
         # look for "time" filters and first apply the filter to
         # the first entry and modification time of the file. Only
         # if at least one of both timestamps is accepted then we
-        # take that file into account.
+        # take that file into account. Within the file, the index
+        # tells us the blocks we have to read.
         # Use the later logfiles first, to get the newer log entries
         # first. When a limit is reached, the newer entries should
-        # be processed in most cases. We assume that now.
-        # To keep a consistent order of log entries, we should care
-        # about sorting the log lines in reverse, but that seems to
-        # already be done by the GUI, so we don't do that twice. Skipping
-        # this # will lead into some lines of a single file to be limited in
-        # wrong order. But this should be better than before.
+        # be processed in most cases.
         history_entries: list[Any] = []
-        for path in sorted(self._settings.paths.history_dir.value.glob("*.log"), reverse=True):
+        paths = sorted(self._settings.paths.history_dir.value.glob("*.log"), reverse=True)
+        self._index_reader.forget_others(set(paths))
+        for path in paths:
             if limit is not None and limit <= 0:
                 self._logger.debug("query limit reached")
                 break
             if not _intersects(time_range, _get_logfile_timespan(path)):
                 self._logger.debug("skipping history file %s because of time filters", path)
                 continue
-            tac = f"nl -b a {shlex.quote(str(path))} | tac"  # Process younger lines first
-            cmd = " | ".join([tac] + grep_pipeline)
-            self._logger.debug("preprocessing history file with command [%s]", cmd)
-            new_entries = parse_history_file(
-                self._history_columns, path, query.filter_row, cmd, limit, self._logger
-            )
+            try:
+                new_entries = parse_history_file(
+                    self._history_columns,
+                    path,
+                    self._index_reader.segments(path, path.stat().st_size),
+                    select_segment=select_segment,
+                    select_line=select_line,
+                    filter_row=query.filter_row,
+                    limit=limit,
+                    logger=self._logger,
+                )
+            except FileNotFoundError:
+                continue  # expired in the meantime
             history_entries += new_entries
             if limit is not None:
                 limit -= len(new_entries)
         return history_entries
 
     def housekeeping(self) -> None:
-        _expire_logfiles(self._settings, self._config, self._logger, self._lock, False)
+        with self._lock:
+            self._write_pending()
+            self._close_block()
+            _expire_logfiles(self._settings, self._config, self._logger, False)
 
     def close(self) -> None:
-        pass
-
-
-def _expire_logfiles(
-    settings: Settings, config: Config, logger: Logger, lock_history: threading.Lock, flush: bool
-) -> None:
-    """Delete old log files."""
-    with lock_history:
-        try:
-            days = config["history_lifetime"]
-            min_mtime = time.time() - days * 86400
-            logger.log(
-                VERBOSE,
-                "Expiring logfiles (Horizon: %d days -> %s)",
-                days,
-                _date_and_time(min_mtime),
-            )
-            for path in settings.paths.history_dir.value.glob("*.log"):
-                if flush or path.stat().st_mtime < min_mtime:
-                    logger.info(
-                        "Deleting log file %s (age %s)", path, _date_and_time(path.stat().st_mtime)
-                    )
-                    path.unlink()
-        except Exception as e:
-            if settings.options.debug:
-                raise
-            logger.warning("Error expiring log files: %s", e)
+        with self._lock:
+            self._write_pending()
+            self._close_block()
+
+
+def _expire_logfiles(settings: Settings, config: Config, logger: Logger, flush: bool) -> None:
+    """Delete old log files and their indices."""
+    try:
+        days = config["history_lifetime"]
+        min_mtime = time.time() - days * 86400
+        logger.log(
+            VERBOSE,
+            "Expiring logfiles (Horizon: %d days -> %s)",
+            days,
+            _date_and_time(min_mtime),
+        )
+        for path in settings.paths.history_dir.value.glob("*.log"):
+            if flush or path.stat().st_mtime < min_mtime:
+                logger.info(
+                    "Deleting log file %s (age %s)", path, _date_and_time(path.stat().st_mtime)
+                )
+                path.unlink()
+                index_path(path).unlink(missing_ok=True)
+    except Exception as e:
+        if settings.options.debug:
+            raise
+        logger.warning("Error expiring log files: %s", e)
 
 
 def _date_and_time(timestamp: float) -> str:
@@ -174,42 +259,64 @@ _GREPABLE_COLUMNS = {
 }
 
 
-def _grep_pipeline(filters: Iterable[QueryFilter]) -> list[str]:
+def _line_filters(filters: Iterable[QueryFilter]) -> list[Callable[[str], bool]]:
     """
-    Optimization: use grep in order to reduce amount of read lines based on some frequently used
-    filters. It's OK if the filters don't match 100% accurately on the right lines. If in doubt, you
-    can output more lines than necessary. This is only a kind of prefiltering.
+    Optimization: skip the lines which cannot match some frequently used filters before parsing
+    them. It's OK if the filters don't match 100% accurately on the right lines. If in doubt, you
+    can keep more lines than necessary. This is only a kind of prefiltering.
 
-    >>> _grep_pipeline([])
+    >>> _line_filters([])
     []
 
-    >>> _grep_pipeline([QueryFilter("event_core_host", '=', lambda x: True, '|| ping')])
-    ["grep -F -e '|| ping'"]
+    >>> [f("x || ping") for f in _line_filters([QueryFilter("event_core_host", '=', lambda x: True, '|| ping')])]
+    [True]
 
     """
     return [
-        command
+        line_filter
         for f in filters
         if f.column_name in _GREPABLE_COLUMNS
-        for command in [_grep_command(f.operator_name, str(f.argument))]
-        if command is not None
+        for line_filter in [_line_filter(f.operator_name, str(f.argument))]
+        if line_filter is not None
     ]
 
 
-def _grep_command(operator_name: OperatorName, argument: str) -> str | None:
+def _line_filter(operator_name: OperatorName, argument: str) -> Callable[[str], bool] | None:
     if operator_name == "=":
-        return f"grep -F {_grep_pattern(argument)}"
+        return lambda line: argument in line
     if operator_name == "=~":
-        return f"grep -F -i {_grep_pattern(argument)}"
-    if operator_name == "~":
-        return f"grep -E {_grep_pattern(argument)}"
-    if operator_name == "~~":
-        return f"grep -E -i {_grep_pattern(argument)}"
+        lower_argument = argument.lower()
+        return lambda line: lower_argument in line.lower()
+    # Regular expressions could be anchored to the column, not to the line.
     return None
 
 
-def _grep_pattern(argument: str) -> str:
-    return f"-e {shlex.quote(argument)}"
+def _segment_filter(
+    filters: Iterable[QueryFilter], time_range: tuple[float | None, float | None]
+) -> Callable[[Segment], bool]:
+    """Selects the segments which can contain matching entries, by their index entry"""
+    hosts: list[set[str]] = []
+    event_ids: list[set[int]] = []
+    for f in filters:
+        if f.column_name == "event_host" and f.operator_name in {"=", "=~"}:
+            hosts.append({str(f.argument).lower()})
+        elif f.column_name == "event_host" and f.operator_name == "in":
+            hosts.append({str(host).lower() for host in f.argument})
+        elif f.column_name == "event_id" and f.operator_name == "=" and isinstance(f.argument, int):
+            event_ids.append({f.argument})
+        elif f.column_name == "event_id" and f.operator_name == "in":
+            event_ids.append({eid for eid in f.argument if isinstance(eid, int)})
+
+    def select(segment: Segment) -> bool:
+        if segment.hosts is None or segment.event_ids is None:
+            return True  # not indexed
+        return (
+            _intersects(time_range, (segment.first_time, segment.last_time))
+            and all(not segment.hosts.isdisjoint(wanted) for wanted in hosts)
+            and all(not segment.event_ids.isdisjoint(wanted) for wanted in event_ids)
+        )
+
+    return select
 
 
 def _greatest_lower_bound_for_filters(
@@ -264,32 +371,34 @@ def _intersects(
 def parse_history_file(
     history_columns: Sequence[tuple[str, Any]],
     path: Path,
+    segments: Sequence[Segment],
+    *,
+    select_segment: Callable[[Segment], bool],
+    select_line: Sequence[Callable[[str], bool]],
     filter_row: Callable[[Sequence[Any]], bool],
-    cmd: str,
     limit: int | None,
     logger: Logger,
 ) -> list[Any]:
+    """The matching entries of the selected segments, the younger ones first"""
     entries: list[Any] = []
-    with subprocess.Popen(
-        cmd,
-        shell=True,  # nosec B602 # BNS:67522a
-        close_fds=True,
-        stdout=subprocess.PIPE,
-    ) as grep:
-        if grep.stdout is None:
-            raise Exception("Huh? stdout vanished...")
-
-        for line in grep.stdout:
-            if limit is not None and len(entries) > limit:
-                break
-            try:
-                parts: list[Any] = line.decode("utf-8").rstrip("\n").split("\t")
-                convert_history_line(history_columns, parts)
-                if filter_row(parts):
-                    entries.append(parts)
-            except Exception:
-                logger.exception("Invalid line '%s' in history file %s", line, path)
-
+    first_lines = itertools.accumulate((segment.lines for segment in segments), initial=1)
+    with path.open(mode="rb") as f:
+        for segment, first_line in reversed(list(zip(segments, first_lines))):
+            if not select_segment(segment):
+                continue
+            for number, line in reversed(list(enumerate(segment.read_lines(f), first_line))):
+                if limit is not None and len(entries) >= limit:
+                    return entries
+                try:
+                    text = line.decode("utf-8")
+                    if not all(line_filter(text) for line_filter in select_line):
+                        continue
+                    parts: list[Any] = [number, *text.split("\t")]
+                    convert_history_line(history_columns, parts)
+                    if filter_row(parts):
+                        entries.append(parts)
+                except Exception:
+                    logger.exception("Invalid line '%s' in history file %s", line, path)
     return entries
 
 
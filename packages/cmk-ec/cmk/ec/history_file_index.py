@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Sidecar index of the history files
+
+The history files are written in blocks of lines. For every block, the index file next to the
+history file (with the suffix ".idx") holds a JSON line with the offset, the size and the number
+of lines of the block, the range of its history times and the hosts and event ids of its entries.
+Queries only read the blocks which can contain the entries they are looking for.
+
+Parts of a history file without an index entry, i.e. written by older versions or the last block
+before a crash, are read in chunks of whole lines, without knowing anything about their entries.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Final
+
+_CHUNK_SIZE: Final = 4 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class Segment:
+    """Whole lines of a history file, the details are only known for indexed blocks"""
+
+    offset: int
+    length: int
+    lines: int
+    first_time: float | None = None
+    last_time: float | None = None
+    hosts: frozenset[str] | None = None  # in lower case
+    event_ids: frozenset[int] | None = None
+
+    def read_lines(self, f: BinaryIO) -> list[bytes]:
+        f.seek(self.offset)
+        return f.read(self.length).split(b"\n")[: self.lines]
+
+
+def index_path(path: Path) -> Path:
+    return path.with_suffix(".idx")
+
+
+class BlockWriter:
+    """Collects the index entry of the block being appended to a history file"""
+
+    def __init__(self, path: Path, offset: int) -> None:
+        self.path = path
+        self.offset = offset
+        self.length = 0
+        self.lines = 0
+        self._first_time = math.inf
+        self._last_time = -math.inf
+        self._hosts = set[str]()
+        self._event_ids = set[int]()
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.length
+
+    def add(self, line: bytes, history_time: float, host: str, event_id: int) -> None:
+        self.length += len(line)
+        self.lines += 1
+        self._first_time = min(self._first_time, history_time)
+        self._last_time = max(self._last_time, history_time)
+        self._hosts.add(host.lower())
+        self._event_ids.add(event_id)
+
+    def write(self) -> None:
+        """Append the index entry of the block to the index file"""
+        if not self.lines:
+            return
+        entry = {
+            "offset": self.offset,
+            "length": self.length,
+            "lines": self.lines,
+            "first_time": self._first_time,
+            "last_time": self._last_time,
+            "hosts": sorted(self._hosts),
+            "event_ids": sorted(self._event_ids),
+        }
+        with index_path(self.path).open(mode="a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+class IndexReader:
+    """Reads the segments of the history files
+
+    The index files are only appended to, so the parsed entries are kept and only the entries
+    appended since the last query are parsed.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # the inode and the parsed size of the index file, and its blocks
+        self._blocks: dict[Path, tuple[int, int, list[Segment]]] = {}
+
+    def segments(self, path: Path, size: int) -> list[Segment]:
+        """The segments of the first size bytes of the history file, in the order of the file"""
+        segments: list[Segment] = []
+        end = 0
+        for block in sorted(self._read_blocks(path), key=lambda block: block.offset):
+            if block.offset < end or block.offset + block.length > size:
+                continue
+            if block.offset > end:
+                segments += _unindexed_segments(path, end, block.offset)
+            segments.append(block)
+            end = block.offset + block.length
+        if end < size:
+            segments += _unindexed_segments(path, end, size)
+        return segments
+
+    def forget_others(self, paths: set[Path]) -> None:
+        with self._lock:
+            for path in self._blocks.keys() - paths:
+                del self._blocks[path]
+
+    def _read_blocks(self, path: Path) -> list[Segment]:
+        with self._lock:
+            try:
+                with index_path(path).open(mode="rb") as f:
+                    inode = os.fstat(f.fileno()).st_ino
+                    known_inode, parsed, blocks = self._blocks.get(path, (inode, 0, []))
+                    if known_inode != inode or os.fstat(f.fileno()).st_size < parsed:
+                        parsed, blocks = 0, []
+                    f.seek(parsed)
+                    data = f.read()
+            except FileNotFoundError:
+                self._blocks.pop(path, None)
+                return []
+            # An incomplete last line is still being written.
+            complete = data[: data.rfind(b"\n") + 1]
+            blocks = blocks + [
+                block for line in complete.splitlines() if (block := _parse_block(line))
+            ]
+            self._blocks[path] = (inode, parsed + len(complete), blocks)
+            return blocks
+
+
+def _parse_block(line: bytes) -> Segment | None:
+    try:
+        entry = json.loads(line)
+        return Segment(
+            offset=int(entry["offset"]),
+            length=int(entry["length"]),
+            lines=int(entry["lines"]),
+            first_time=float(entry["first_time"]),
+            last_time=float(entry["last_time"]),
+            hosts=frozenset(entry["hosts"]),
+            event_ids=frozenset(entry["event_ids"]),
+        )
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _unindexed_segments(path: Path, start: int, end: int) -> list[Segment]:
+    """Chunks of whole lines, without an incomplete line at the end"""
+    segments = []
+    with path.open(mode="rb") as f:
+        f.seek(start)
+        offset = start
+        while offset < end:
+            data = f.read(min(_CHUNK_SIZE, end - offset))
+            if not data.endswith(b"\n"):
+                data = (data + f.readline())[: end - offset]
+            if not (length := data.rfind(b"\n") + 1):
+                break
+            segments.append(Segment(offset, length, data.count(b"\n", 0, length)))
+            offset += length
+            f.seek(offset)
+    return segments
@@ -60,7 +60,14 @@ from .config import (
     Rule,
 )
 from .core_queries import Connection, HostInfo, query_hosts_scheduled_downtime_depth
-from .event import create_events_from_syslog_messages, Event, scrub_string
+from .datagram_receiver import DatagramReceiver
+from .event import (
+    create_event_from_syslog_message,
+    create_events_from_syslog_messages,
+    Event,
+    scrub_string,
+)
+from .event_store import EventStore, host_key, HostKey
 from .helpers import ECLock, parse_bytes_into_syslog_messages
 from .history import ActiveHistoryPeriod, get_logfile, History, HistoryWhat, quote_tab, TimedHistory
 from .history_file import FileHistory
@@ -79,10 +86,12 @@ from .query import (
     QueryREPLICATE,
     StatusTable,
 )
+from .rule_dispatch import RuleDispatch
 from .rule_matcher import compile_rule, match, MatchFailure, MatchResult, MatchSuccess, RuleMatcher
 from .rule_packs import load_active_config
 from .settings import create_settings, FileDescriptor, PortNumber, Settings
 from .snmp import SNMPTrapParser
+from .status_journal import PackedEventStatus, StatusJournal
 from .syslog import SyslogFacility, SyslogPriority
 from .timeperiod import TimePeriods
 
@@ -108,13 +117,6 @@ def setup_logging_handler(stream: IO[str]) -> None:
     logger.addHandler(handler)
 
 
-class PackedEventStatus(TypedDict):
-    next_event_id: int
-    events: list[Event]
-    rule_stats: dict[str, int]
-    interval_starts: dict[str, int]
-
-
 class SlaveStatus(TypedDict):
     last_master_down: float | None
     last_sync: float
@@ -395,6 +397,7 @@ class EventServer(ECServerThread):
         self._rules: list[Rule] = []
         self._rule_by_id: dict[str | None, Rule] = {}
         self._rule_hash: dict[int, dict[int, Any]] = {}
+        self._rule_dispatch = RuleDispatch([], None)
         self._hash_stats: list[list[int]] = []  # facility/priority
         for _unused_facility in range(32):
             self._hash_stats.append([0] * 8)
@@ -664,10 +667,30 @@ class EventServer(ECServerThread):
         return os.open(str(self.settings.paths.event_pipe.value), os.O_RDWR | os.O_NONBLOCK)
 
     def serve(self) -> None:
+        if self._syslog_udp is None:
+            self._serve(None)
+            return
+        # Drain the syslog UDP socket while we are busy processing, bursts would overflow it.
+        syslog_udp_receiver = DatagramReceiver(
+            "syslog-udp", self._syslog_udp, 4096, self._logger.getChild("syslog-udp")
+        )
+        syslog_udp_receiver.start()
+        try:
+            self._serve(syslog_udp_receiver)
+        finally:
+            syslog_udp_receiver.terminate()
+
+    def _serve(self, syslog_udp_receiver: DatagramReceiver | None) -> None:
         pipe = self.open_pipe()
         # We just read()/recvfrom() these, so we create no new FDs via them.
         pipe_and_datagram_sockets = [
-            f for f in (pipe, self._syslog_udp, self._snmp_trap_socket) if f is not None
+            f
+            for f in (
+                pipe,
+                None if syslog_udp_receiver is None else syslog_udp_receiver.fileno(),
+                self._snmp_trap_socket,
+            )
+            if f is not None
         ]
         # We use accept() on these FDs, so we must be careful to avoid creating too many additional
         # FDs. We use an arbitrary limit below (less than the usual 1024 FD_SETSIZE limit), so we
@@ -745,11 +768,15 @@ class EventServer(ECServerThread):
                 )
                 self.process_syslog_messages(messages, None)
 
-            # Read events from builtin syslog server
-            if self._syslog_udp is not None and self._syslog_udp in readable:
-                message, address = self._syslog_udp.recvfrom(4096)
-                self.process_syslog_messages(
-                    [message], parse_address("syslog socket (UDP)", address)
+            # Process the next batch of datagrams received by the builtin syslog server
+            if syslog_udp_receiver is not None and syslog_udp_receiver.fileno() in readable:
+                self.process_potential_event_instrumented(
+                    create_event_from_syslog_message(
+                        message,
+                        parse_address("syslog socket (UDP)", address),
+                        self._logger if self._config["debug_rules"] else None,
+                    )
+                    for message, address in syslog_udp_receiver.next_batch()
                 )
 
             # Read events from builtin snmptrap server
@@ -895,6 +922,7 @@ class EventServer(ECServerThread):
                             event["last_token"] = (
                                 last_token + new_tokens * secs_per_token
                             )  # not now! would be unfair
+                            self._event_status.update_event(event)
                             if event["count"] == 0:
                                 self._logger.info(
                                     "Rule %s/%s, event %d: again without allowed rate, dropping event",
@@ -949,6 +977,7 @@ class EventServer(ECServerThread):
                         self._logger.info(
                             "Cannot do rule action: rule %s not present anymore.", event["rule_id"]
                         )
+                    self._event_status.update_event(event)
 
             # Handle events with a limited lifetime
             elif "live_until" in event and now >= event["live_until"]:
@@ -1004,9 +1033,8 @@ class EventServer(ECServerThread):
                 # First look for case 1: rule that already have at least one hit
                 # and this events in the state "counting" exist.
                 events_to_delete: list[tuple[Event, HistoryWhat]] = []
-                events = self._event_status.events()
-                for event in events:
-                    if event["rule_id"] == rule["id"] and event["phase"] == "counting":
+                for event in self._event_status.events_of_rule(rule["id"]):
+                    if event["phase"] == "counting":
                         # time has elapsed. Now lets see if we have reached
                         # the necessary count:
                         if event["count"] < expect["count"]:  # no -> trigger alarm
@@ -1061,10 +1089,8 @@ class EventServer(ECServerThread):
             merge, reset_ack = merge  # type: ignore[unreachable]
 
         if merge != "never":
-            for event in self._event_status.events():
-                if event["rule_id"] == rule["id"] and (
-                    event["phase"] == "open" or (event["phase"] == "ack" and merge == "acked")
-                ):
+            for event in self._event_status.events_of_rule(rule["id"]):
+                if event["phase"] == "open" or (event["phase"] == "ack" and merge == "acked"):
                     merge_event = event
                     break
 
@@ -1083,6 +1109,7 @@ class EventServer(ECServerThread):
             # Better rewrite (again). Rule might have changed. Also we have changed
             # the text and the user might have his own text added via set_text.
             self.rewrite_event(rule, merge_event, MatchGroups(), set_first=False)
+            self._event_status.update_event(merge_event)
             self._history.add(merge_event, "COUNTFAILED")
         else:
             # Create artificial event from scratch. Make sure that all important
@@ -1122,6 +1149,7 @@ class EventServer(ECServerThread):
                 rule,
                 event,
             )
+            self._event_status.update_event(event)
             if rule.get("autodelete"):
                 event["phase"] = "closed"
                 self._event_status.remove_event(event, "AUTODELETE")
@@ -1191,6 +1219,9 @@ class EventServer(ECServerThread):
                         ):
                             count_unspecific += 1
 
+        self._rule_dispatch = RuleDispatch(
+            self._rules, self._rule_hash if self._config["rule_optimizer"] else None
+        )
         self._logger.info(
             "Compiled %d active rules (ignoring %d disabled rules)", count_rules, count_disabled
         )
@@ -1274,9 +1305,16 @@ class EventServer(ECServerThread):
         # Rule optimizer
         if self._config["rule_optimizer"]:
             self._hash_stats[event["facility"]][event["priority"]] += 1
-            rule_candidates = self._rule_hash.get(event["facility"], {}).get(event["priority"], [])
+        if self._config["debug_rules"]:
+            # Try all rules, so that the log tells why each one does not match.
+            rule_candidates = (
+                self._rule_hash.get(event["facility"], {}).get(event["priority"], [])
+                if self._config["rule_optimizer"]
+                else self._rules
+            )
         else:
-            rule_candidates = self._rules
+            # Leaving out rules that cannot match changes neither the first match nor skip_pack.
+            rule_candidates = self._rule_dispatch.candidates(event)
 
         skip_pack = None
         for rule in rule_candidates:
@@ -1383,6 +1421,7 @@ class EventServer(ECServerThread):
                             )
 
                         self._history.add(existing_event, "COUNTREACHED")
+                        self._event_status.update_event(existing_event)
 
                         if "delay" not in rule and rule.get("autodelete"):
                             existing_event["phase"] = "closed"
@@ -1413,6 +1452,7 @@ class EventServer(ECServerThread):
                             rule,
                             event,
                         )
+                        self._event_status.update_event(event)
                         if rule.get("autodelete"):
                             event["phase"] = "closed"
                             with self._event_status.lock:
@@ -1553,7 +1593,7 @@ class EventServer(ECServerThread):
             # not log.
 
     def get_hosts_with_active_event_limit(self) -> list[str]:
-        hosts = []
+        hosts: list[str] = []
         for (hostname, core_host), count in self._event_status.num_existing_events_by_host.items():
             host_config = self.host_config.get_config_for_host(core_host) if core_host else None
             if count >= self._get_host_event_limit(host_config)[0]:
@@ -2316,6 +2356,7 @@ class StatusServer(ECServerThread):
                 event["contact"] = contact
             if user:
                 event["owner"] = user
+            self._event_status.update_event(event)
             self._history.add(event, "UPDATE", user)
         if failures:
             raise MKClientError(" ".join(failures))
@@ -2338,6 +2379,7 @@ class StatusServer(ECServerThread):
             event["state"] = int(newstate)
             if user:
                 event["owner"] = user
+            self._event_status.update_event(event)
             self._history.add(event, "CHANGESTATE", user)
         if failures:
             raise MKClientError(" ".join(failures))
@@ -2379,6 +2421,7 @@ class StatusServer(ECServerThread):
             event: Event | None = self._event_status.event(int(event_id))
             if user and event is not None:
                 event["owner"] = user
+                self._event_status.update_event(event)
 
             # TODO: De-duplicate code from do_event_actions()
             if action_id == "@NOTIFY" and event is not None:
@@ -2565,6 +2608,8 @@ def run_eventd(
     # Now wait for termination of the server threads
     event_server.join()
     status_server.join()
+    # Write the history entries which are still buffered
+    history.close()
 
 
 # .
@@ -2603,6 +2648,9 @@ class EventStatus:
         self._history = history
         self._logger = logger
         self._connection = connection
+        self._journal = StatusJournal(
+            settings.paths.status_file.value, settings.paths.status_journal_file.value, logger
+        )
         self.flush()
 
     def reload_configuration(self, config: Config, history: History) -> None:
@@ -2610,13 +2658,12 @@ class EventStatus:
         self._history = history
 
     def flush(self) -> None:
-        # TODO: Improve types!
-        self._events: list[Event] = []
+        self._journal.require_snapshot()
+        self._events = EventStore()
         self._next_event_id = 1
         self._rule_stats: dict[str, int] = {}
         # needed for expecting rules
         self._interval_starts: dict[str, int] = {}
-        self._initialize_event_limit_status()
 
         # TODO: might introduce some performance counters, like:
         # - number of received messages
@@ -2624,14 +2671,20 @@ class EventStatus:
         # - number of rule misses
 
     def events(self) -> list[Event]:
-        # TODO: Improve type!
-        return self._events
+        """A snapshot of all events, the oldest one first"""
+        return self._events.all()
+
+    def events_of_rule(self, rule_id: str | None) -> list[Event]:
+        """A snapshot of the events of the rule, the oldest one first"""
+        return self._events.of_rule(rule_id)
+
+    def update_event(self, event: Event) -> None:
+        """To be called after changing an open event"""
+        self._events.update(event)
+        self._journal.event_changed(event)
 
     def event(self, eid: int) -> Event | None:
-        for event in self._events:
-            if event["id"] == eid:
-                return event
-        return None
+        return self._events.get(eid)
 
     def interval_start(self, rule_id: str, interval: ExpectInterval) -> int:
         """
@@ -2687,30 +2740,21 @@ class EventStatus:
     def pack_status(self) -> PackedEventStatus:
         return PackedEventStatus(
             next_event_id=self._next_event_id,
-            events=self._events,
+            events=self._events.all(),
             rule_stats=self._rule_stats,
             interval_starts=self._interval_starts,
         )
 
     def unpack_status(self, status: PackedEventStatus) -> None:
         self._next_event_id = status["next_event_id"]
-        self._events = status["events"]
+        self._events = EventStore(status["events"])
         self._rule_stats = status["rule_stats"]
         self._interval_starts = status["interval_starts"]
+        self._journal.require_snapshot()
 
-    def save_status(self) -> None:
-        now = time.time()
-        status = self.pack_status()
-        path = self.settings.paths.status_file.value
-        path_new = path.parent / (path.name + ".new")
-        # Believe it or not: cPickle is more than two times slower than repr()
-        with path_new.open(mode="wb") as f:
-            f.write((repr(status) + "\n").encode("utf-8"))
-            f.flush()
-            os.fsync(f.fileno())
-        path_new.rename(path)
-        elapsed = time.time() - now
-        self._logger.log(VERBOSE, "Saved event state to %s in %.3fms.", path, elapsed * 1000)
+    def save_status(self, *, snapshot: bool = False) -> None:
+        """Save the changes since the last save, or all events with snapshot=True"""
+        self._journal.save(self.pack_status(), snapshot=snapshot)
 
     def reset_counters(self, rule_id: str | None) -> None:
         if rule_id:
@@ -2722,20 +2766,20 @@ class EventStatus:
 
     def load_status(self, event_server: EventServer) -> None:
         path = self.settings.paths.status_file.value
-        if path.exists():
-            try:
-                status = ast.literal_eval(path.read_text(encoding="utf-8"))
-                self._next_event_id = status["next_event_id"]
-                self._events = status["events"]
-                self._rule_stats = status["rule_stats"]
-                self._interval_starts = status.get("interval_starts", {})
-                self._logger.info("Loaded event state from %s.", path)
-            except Exception:
-                self._logger.exception("Error loading event state from %s", path)
-                raise
+        try:
+            if (status := self._journal.load()) is None:
+                return
+            self._next_event_id = status["next_event_id"]
+            events: list[Event] = status["events"]
+            self._rule_stats = status["rule_stats"]
+            self._interval_starts = status.get("interval_starts", {})
+            self._logger.info("Loaded event state from %s.", path)
+        except Exception:
+            self._logger.exception("Error loading event state from %s", path)
+            raise
 
         # Add new columns and fix broken events
-        for event in self._events:
+        for event in events:
             event.setdefault("ipaddress", "")
             event.setdefault("host", HostName(""))
             event.setdefault("application", "")
@@ -2745,48 +2789,27 @@ class EventStatus:
                 event_server.add_core_host_to_event(event)
                 event["host_in_downtime"] = False
 
-        # core_host is needed to initialize the status
-        self._initialize_event_limit_status()
+        # core_host is needed to index the events
+        self._events = EventStore(events)
 
-    def _initialize_event_limit_status(self) -> None:
-        """
-        Called on Event Console initialization from status file to initialize
-        the current event limit state -> Sets internal counters which are
-        updated during runtime.
-        """
-        self.num_existing_events = len(self._events)
-
-        self.num_existing_events_by_host: dict[tuple[str, HostName | None], int] = {}
-        self.num_existing_events_by_rule: dict[Any, int] = {}
-        for event in self._events:
-            self._count_event_add(event)
+    @property
+    def num_existing_events(self) -> int:
+        return len(self._events)
 
-    def _count_event_add(self, event: Event) -> None:
-        host_key = (event["host"], event["core_host"])
-        if host_key not in self.num_existing_events_by_host:
-            self.num_existing_events_by_host[host_key] = 1
-        else:
-            self.num_existing_events_by_host[host_key] += 1
+    @property
+    def num_existing_events_by_host(self) -> Mapping[HostKey, int]:
+        return self._events.num_by_host()
 
-        if event["rule_id"] not in self.num_existing_events_by_rule:
-            self.num_existing_events_by_rule[event["rule_id"]] = 1
-        else:
-            self.num_existing_events_by_rule[event["rule_id"]] += 1
-
-    def _count_event_remove(self, event: Event) -> None:
-        host_key = (event["host"], event["core_host"])
-
-        self.num_existing_events -= 1
-        self.num_existing_events_by_host[host_key] -= 1
-        self.num_existing_events_by_rule[event["rule_id"]] -= 1
+    @property
+    def num_existing_events_by_rule(self) -> Mapping[str | None, int]:
+        return self._events.num_by_rule()
 
     def new_event(self, event: Event) -> None:
         self._perfcounters.count("events")
         event["id"] = self._next_event_id
         self._next_event_id += 1
-        self._events.append(event)
-        self.num_existing_events += 1
-        self._count_event_add(event)
+        self._events.add(event)
+        self._journal.event_changed(event)
         self._history.add(event, "NEW")
 
     def archive_event(self, event: Event) -> None:
@@ -2799,8 +2822,8 @@ class EventStatus:
     def remove_event(self, event: Event, delete_reason: HistoryWhat, user: str = "") -> None:
         try:
             self._events.remove(event)
+            self._journal.event_removed(event)
             self._history.add(event, delete_reason, user)
-            self._count_event_remove(event)
         except ValueError:
             self._logger.exception("Cannot remove event %d: not present", event["id"])
 
@@ -2809,8 +2832,8 @@ class EventStatus:
         match ty:
             case "overall":
                 self._logger.log(VERBOSE, "  Removing oldest event")
-                oldest_event = self._events[0]
-                self.remove_event(oldest_event, "AUTODELETE")
+                if (oldest_event := self._events.oldest()) is not None:
+                    self.remove_event(oldest_event, "AUTODELETE")
             case "by_rule":
                 if event["rule_id"] is not None:
                     self._logger.log(
@@ -2819,21 +2842,18 @@ class EventStatus:
                     self._remove_oldest_event_of_rule(event["rule_id"])
             case "by_host":
                 self._logger.log(VERBOSE, '  Removing oldest event of host "%s"', event["host"])
-                self._remove_oldest_event_of_host(event["host"])
+                self._remove_oldest_event_of_host(host_key(event))
 
     # protected by self.lock
     def _remove_oldest_event_of_rule(self, rule_id: str) -> None:
-        for event in self._events:
-            if event["rule_id"] == rule_id:
-                self.remove_event(event, "AUTODELETE")
-                return
+        if (oldest_event := self._events.oldest_of_rule(rule_id)) is not None:
+            self.remove_event(oldest_event, "AUTODELETE")
 
     # protected by self.lock
-    def _remove_oldest_event_of_host(self, hostname: str) -> None:
-        for event in self._events:
-            if event["host"] == hostname:
-                self.remove_event(event, "AUTODELETE")
-                return
+    def _remove_oldest_event_of_host(self, key: HostKey) -> None:
+        # Same key as the limit counts the events by
+        if (oldest_event := self._events.oldest_of_host(key)) is not None:
+            self.remove_event(oldest_event, "AUTODELETE")
 
     # protected by self.lock
     def get_num_existing_events_by(self, ty: LimitKind, event: Event) -> int:
@@ -2841,9 +2861,9 @@ class EventStatus:
             case "overall":
                 return self.num_existing_events
             case "by_rule":
-                return self.num_existing_events_by_rule.get(event["rule_id"], 0)
+                return self._events.num_of_rule(event["rule_id"])
             case "by_host":
-                return self.num_existing_events_by_host.get((event["host"], event["core_host"]), 0)
+                return self._events.num_of_host(host_key(event))
             case _ as unreachable:
                 assert_never(unreachable)
 
@@ -2861,10 +2881,17 @@ class EventStatus:
         """
         with self.lock:
             to_delete = []
-            for event in self._events:
-                if event["rule_id"] == rule["id"] and self.cancelling_match(
-                    match_groups, new_event, event, rule
-                ):
+            # Only events of the same host can be cancelled, but with debugging enabled we log
+            # why the others are not.
+            candidates = (
+                self._events.of_rule(rule["id"])
+                if self._config["debug_rules"]
+                else self._events.of_rule_and_host(
+                    rule["id"], self._cancelling_host(match_groups, new_event, rule)
+                )
+            )
+            for event in candidates:
+                if self.cancelling_match(match_groups, new_event, event, rule):
                     # Fill a few fields of the cancelled event with data from
                     # the cancelling event so that action scripts have useful
                     # values and the logfile entry if more relevant.
@@ -2912,11 +2939,8 @@ class EventStatus:
             for e in to_delete:
                 self.remove_event(e, "CANCELLED")
 
-    def cancelling_match(
-        self, match_groups: MatchGroups, new_event: Event, event: Event, rule: Rule
-    ) -> bool:
-        debug = self._config["debug_rules"]
-
+    @staticmethod
+    def _cancelling_host(match_groups: MatchGroups, new_event: Event, rule: Rule) -> HostName:
         # The match_groups of the canceling match only contain the *_ok match groups
         # Since the rewrite definitions are based on the positive match, we need to
         # create some missing keys. O.o
@@ -2931,7 +2955,14 @@ class EventStatus:
         host = new_event["host"]
         if "set_host" in rule:
             host = HostName(replace_groups(rule["set_host"], host, match_groups))
+        return host
 
+    def cancelling_match(
+        self, match_groups: MatchGroups, new_event: Event, event: Event, rule: Rule
+    ) -> bool:
+        debug = self._config["debug_rules"]
+
+        host = self._cancelling_host(match_groups, new_event, rule)
         if event["host"] != host:
             if debug:
                 self._logger.info(
@@ -3037,10 +3068,11 @@ class EventStatus:
                 preserve["contact"] = found["contact"]
         found.update(event)
         found.update(preserve)
+        self.update_event(found)
 
     def count_expected_event(self, event_server: EventServer, event: Event) -> None:
-        for ev in self._events:
-            if ev["rule_id"] == event["rule_id"] and ev["phase"] == "counting":
+        for ev in self._events.of_rule(event["rule_id"]):
+            if ev["phase"] == "counting":
                 self.count_event_up(ev, event)
                 return
 
@@ -3057,31 +3089,30 @@ class EventStatus:
         since the event has been created because the count was too
         low in the specified period of time.
         """
-        for ev in self._events:
-            if ev["rule_id"] == event["rule_id"]:
-                if ev["phase"] == "ack" and not count["count_ack"]:
-                    continue  # skip acknowledged events
+        for ev in self._events.of_rule(event["rule_id"]):
+            if ev["phase"] == "ack" and not count["count_ack"]:
+                continue  # skip acknowledged events
 
-                if count["separate_host"] and ev["host"] != event["host"]:
-                    continue  # treat events with separated hosts separately
+            if count["separate_host"] and ev["host"] != event["host"]:
+                continue  # treat events with separated hosts separately
 
-                if count["separate_application"] and ev["application"] != event["application"]:
-                    continue  # same for application
+            if count["separate_application"] and ev["application"] != event["application"]:
+                continue  # same for application
 
-                if count["separate_match_groups"] and ev["match_groups"] != event["match_groups"]:
-                    continue
+            if count["separate_match_groups"] and ev["match_groups"] != event["match_groups"]:
+                continue
 
-                count_duration = count.get("count_duration")
-                if count_duration is not None and ev["first"] + count_duration < event["time"]:
-                    # Counting has been discontinued on this event after a certain time
-                    continue
+            count_duration = count.get("count_duration")
+            if count_duration is not None and ev["first"] + count_duration < event["time"]:
+                # Counting has been discontinued on this event after a certain time
+                continue
 
-                if ev["host_in_downtime"] != event["host_in_downtime"]:
-                    continue  # treat events with different downtime states separately
+            if ev["host_in_downtime"] != event["host_in_downtime"]:
+                continue  # treat events with different downtime states separately
 
-                found = ev
-                self.count_event_up(found, event)
-                break
+            found = ev
+            self.count_event_up(found, event)
+            break
         else:
             event["count"] = 1
             event["phase"] = "counting"
@@ -3092,13 +3123,14 @@ class EventStatus:
         # NOTE: Suppression not needed anymore when https://github.com/python/mypy/pull/19696 has been merged.
         if found["phase"] == "counting" and found["count"] >= count["count"]:  # type: ignore[possibly-undefined]
             found["phase"] = "open"
+            self.update_event(found)
             return found  # do event action, return found copy of event
         return None  # do not do event action
 
     def delete_events_by(
         self, predicate: Callable[[Event], bool], user: str, get_rule: Callable[[str], Rule | None]
     ) -> None:
-        for event in self._events[:]:
+        for event in self._events.all():
             if predicate(event):
                 event["phase"] = "closed"
                 if user:
@@ -3112,7 +3144,7 @@ class EventStatus:
                         self.interval_start(rule_id, event_rule["expect"]["interval"])
 
     def get_events(self) -> Iterable[Event]:
-        return self._events
+        return self._events.all()
 
     def get_rule_stats(self) -> Iterable[tuple[str, int]]:
         return sorted(self._rule_stats.items(), key=lambda x: x[0])
@@ -3590,7 +3622,7 @@ def main(omd_root: Path, argv: Sequence[str]) -> None:
         os.close(pipe)  # Close pipe
 
         logger.log(VERBOSE, "Saving final event state")
-        event_status.save_status()
+        event_status.save_status(snapshot=True)
 
         logger.log(VERBOSE, "Cleaning up sockets")
         settings.paths.unix_socket.value.unlink()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Preselection of the rules whose text and host patterns can match an event
+
+Trying a rule on an event takes a few microseconds, which adds up with thousands of rules. The
+re module cannot tell all the alternatives of a combined pattern that match, so we index the
+patterns instead: by a trigram of a literal that every match of the pattern contains. The
+trigrams of the text and the host of an event then select the candidate rules, without looking
+at the others. Patterns without such a literal make their rules candidates for every event.
+"""
+
+from __future__ import annotations
+
+import re
+import string
+from collections import Counter
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Final
+
+from .config import Rule, TextPattern
+from .event import Event
+
+_NGRAM_LENGTH: Final = 3
+_LITERAL_ESCAPES: Final = frozenset(string.punctuation + " ")
+_QUANTIFIERS: Final = frozenset("*+?{")
+_REPETITIONS: Final = re.compile(r"\{\d*,?\d*\}")
+
+
+class RuleDispatch:
+    def __init__(
+        self,
+        rules: Sequence[Rule],
+        rule_hash: Mapping[int, Mapping[int, Sequence[Rule]]] | None,
+    ) -> None:
+        """The rule hash (of the rule optimizer) preselects the rules by facility and priority"""
+        self._rules = rules
+        self._rule_hash = rule_hash
+        texts: list[tuple[int, TextPattern | None]] = []
+        hosts: list[tuple[int, TextPattern | None]] = []
+        for index, rule in enumerate(rules):
+            if rule.get("invert_matching"):
+                texts.append((index, None))
+                hosts.append((index, None))
+                continue
+            # Cancelling events only need to match match_ok
+            texts.append((index, rule.get("match")))
+            if "match_ok" in rule:
+                texts.append((index, rule["match_ok"]))
+            hosts.append((index, rule.get("match_host")))
+        self._texts = _PatternIndex(texts, complete=False)
+        self._hosts = _PatternIndex(hosts, complete=True)
+
+        # The hash buckets of the rules as bit masks, see _bucket_bit()
+        self._buckets: list[int] | None = None
+        if rule_hash is not None:
+            position = {id(rule): index for index, rule in enumerate(rules)}
+            self._buckets = [0] * len(rules)
+            for facility, entries_by_priority in rule_hash.items():
+                for priority, entries in entries_by_priority.items():
+                    for rule in entries:
+                        self._buckets[position[id(rule)]] |= _bucket_bit(facility, priority)
+
+    def candidates(self, event: Event) -> Sequence[Rule]:
+        """The rules which can match the event, in their original order"""
+        text = event["text"]
+        host = event["host"]
+        if not (text.isascii() and host.isascii()):
+            # With IGNORECASE some non ASCII characters match ASCII ones, e.g. "ſ" matches "s".
+            return (
+                self._rules
+                if self._rule_hash is None
+                else self._rule_hash.get(event["facility"], {}).get(event["priority"], [])
+            )
+
+        indices = self._texts.matching(text.lower()) & self._hosts.matching(host.lower())
+        if self._buckets is not None:
+            bit = _bucket_bit(event["facility"], event["priority"])
+            indices = {index for index in indices if self._buckets[index] & bit}
+        return [self._rules[index] for index in sorted(indices)]
+
+
+def _bucket_bit(facility: int, priority: int) -> int:
+    return 1 << (facility * 8 + priority)
+
+
+class _PatternIndex:
+    def __init__(
+        self, patterns: Iterable[tuple[int, TextPattern | None]], *, complete: bool
+    ) -> None:
+        """Mirrors rule_matcher.match()"""
+        self._always = set[int]()
+        self._by_text: dict[str, set[int]] = {}
+        literals: list[tuple[int, str]] = []
+        for index, pattern in patterns:
+            if pattern is None:
+                self._always.add(index)
+            elif isinstance(pattern, str) and complete:
+                self._by_text.setdefault(pattern, set()).add(index)
+            elif (literal := _required_literal(pattern)) is None:
+                self._always.add(index)
+            else:
+                literals.append((index, literal))
+
+        # The fewer literals share a trigram, the fewer rules it selects, e.g. "12 " is a better
+        # choice than "ser" for "service12 failed".
+        frequencies = Counter(
+            ngram for _index, literal in literals for ngram in set(_ngrams(literal))
+        )
+        self._by_ngram: dict[str, set[int]] = {}
+        for index, literal in literals:
+            ngram = min(_ngrams(literal), key=frequencies.__getitem__)
+            self._by_ngram.setdefault(ngram, set()).add(index)
+
+    def matching(self, text: str) -> set[int]:
+        """The rules whose pattern may match the lower case text"""
+        by_ngram = self._by_ngram
+        return self._always.union(
+            self._by_text.get(text, ()),
+            *(by_ngram.get(ngram, ()) for ngram in _ngrams(text)),
+        )
+
+
+def _ngrams(text: str) -> Iterable[str]:
+    return (text[i : i + _NGRAM_LENGTH] for i in range(len(text) - _NGRAM_LENGTH + 1))
+
+
+def _required_literal(pattern: TextPattern) -> str | None:
+    """The longest lower case literal every match of the pattern contains, if long enough"""
+    if isinstance(pattern, str):  # Already in lower case, see compile_matching_value()
+        literal = pattern
+    elif pattern.flags & re.VERBOSE or not pattern.pattern.isascii():
+        return None
+    else:
+        literal = max(_required_literals(pattern.pattern), key=len, default="")
+    return literal if len(literal) >= _NGRAM_LENGTH else None
+
+
+def _required_literals(regex: str) -> Iterable[str]:
+    """The literals on the top level of the regular expression (conservatively)
+
+    Groups, character classes, escape sequences and optional characters end a literal. With an
+    alternative on the top level, nothing is required.
+    """
+    literals = []
+    current = ""
+    collecting = True
+    position = 0
+    while position < len(regex):
+        char = regex[position]
+        end = position + 1
+        literal: str | None = None
+        if char == "\\":
+            escaped = regex[end : end + 1]
+            if escaped in _LITERAL_ESCAPES:
+                literal = escaped
+            elif escaped in {"x", "u", "U", "N"} or escaped.isdigit():
+                # The following characters encode a character (or a back reference), so we stop
+                # collecting literals, but still have to look for alternatives.
+                collecting = False
+            end += 1
+        elif char == "|":
+            return []
+        elif char in "([":
+            if (group_end := _end_of_group_or_class(regex, position)) is None:
+                return []
+            end = group_end
+        elif char in _QUANTIFIERS:  # e.g. of a literal "{"
+            end = _end_of_quantifier(regex, position)
+        elif char not in ".^$":
+            literal = char
+
+        if not collecting:
+            literal = None
+        if (quantifier := regex[end : end + 1]) in _QUANTIFIERS:
+            if literal is not None and quantifier == "+":
+                current += literal.lower()
+            end = _end_of_quantifier(regex, end)
+            literals.append(current)
+            current = ""
+        elif literal is None:
+            literals.append(current)
+            current = ""
+        else:
+            current += literal.lower()
+        position = end
+    literals.append(current)
+    return literals
+
+
+def _end_of_group_or_class(regex: str, start: int) -> int | None:
+    depth = 0
+    position = start
+    while position < len(regex):
+        char = regex[position]
+        if char == "\\":
+            position += 2
+            continue
+        if char == "[":
+            # A "]" right after the opening "[" (or "[^") is a literal one
+            position += (
+                3
+                if regex.startswith("[^]", position)
+                else 2
+                if regex.startswith("[]", position)
+                else 1
+            )
+            while position < len(regex) and regex[position] != "]":
+                position += 2 if regex[position] == "\\" else 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        position += 1
+        if depth == 0:
+            return position
+    return None
+
+
+def _end_of_quantifier(regex: str, start: int) -> int:
+    end = start + 1
+    if regex[start] == "{" and (repetitions := _REPETITIONS.match(regex, start)):
+        end = repetitions.end()
+    # lazy or possessive
+    return end + 1 if regex[end : end + 1] in {"?", "+"} else end
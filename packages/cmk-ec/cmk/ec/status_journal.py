@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Persistence of the event status as a snapshot plus a journal of the changes since then
+
+Saving the status only appends the events changed since the last save to the journal, so it
+does not take longer with more open events. Once the journal has grown larger than the snapshot,
+both files are folded into a new snapshot in the background, without looking at (and locking) the
+status in memory.
+
+Both files are sequences of length-prefixed pickles. The snapshot holds the counters followed by
+the events in chunks, so that other threads get the GIL in between. The status files of older
+versions (the repr() of the status) can still be loaded.
+"""
+
+import ast
+import copyreg
+import io
+import os
+import pickle
+import struct
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from logging import Logger
+from pathlib import Path
+from typing import cast, Final, Literal, TypedDict
+
+from cmk.ccc.hostaddress import HostAddress
+
+from .event import Event
+from .log_level import VERBOSE
+
+_CHUNK_SIZE: Final = 1000
+_MIN_COMPACTION_SIZE: Final = 1024 * 1024
+_LENGTH: Final = struct.Struct("!I")
+# Host names are loaded as plain strings, just like from the status files of older versions.
+_DISPATCH_TABLE: Final = copyreg.dispatch_table | {HostAddress: lambda host: (str, (str(host),))}
+
+
+class PackedEventStatus(TypedDict):
+    next_event_id: int
+    events: list[Event]
+    rule_stats: dict[str, int]
+    interval_starts: dict[str, int]
+
+
+class _Counters(TypedDict):
+    next_event_id: int
+    rule_stats: dict[str, int]
+    interval_starts: dict[str, int]
+
+
+type _Record = (
+    tuple[Literal["event"], Event]
+    | tuple[Literal["removed"], int]
+    | tuple[Literal["counters"], _Counters]
+)
+
+
+class StatusJournal:
+    """Keeps track of the changed events and writes them to the status files
+
+    The changes must be recorded, and the status saved, while holding the lock of the event
+    status.
+    """
+
+    def __init__(self, snapshot_path: Path, journal_path: Path, logger: Logger) -> None:
+        self._snapshot_path = snapshot_path
+        self._journal_path = journal_path
+        self._compacting_path = journal_path.with_name(journal_path.name + ".compacting")
+        self._logger = logger
+        self._changes: dict[int, Event | None] = {}
+        self._snapshot_required = True
+        self._files_lock = threading.Lock()
+        self._compaction: threading.Thread | None = None
+        # Incremented with every snapshot, a compaction started before is obsolete then.
+        self._snapshot_generation = 0
+
+    def event_changed(self, event: Event) -> None:
+        self._changes[event["id"]] = event
+
+    def event_removed(self, event: Event) -> None:
+        self._changes[event["id"]] = None
+
+    def require_snapshot(self) -> None:
+        """The status has been replaced as a whole, the next save writes a snapshot"""
+        self._changes.clear()
+        self._snapshot_required = True
+
+    def save(self, status: PackedEventStatus, *, snapshot: bool) -> None:
+        try:
+            if snapshot or self._snapshot_required:
+                self._save_snapshot(status)
+            else:
+                self._save_changes(status)
+        except BaseException:
+            # The journal may end with a torn record now, behind which nothing can be loaded.
+            self._snapshot_required = True
+            raise
+        self._changes.clear()
+        self._snapshot_required = False
+
+    def _save_snapshot(self, status: PackedEventStatus) -> None:
+        now = time.time()
+        records = _snapshot_records(status)
+        # A running compaction is not waited for, we are holding the lock of the event status.
+        # It notices the new snapshot and drops its result.
+        with self._files_lock:
+            _write_atomically(self._snapshot_path, records)
+            self._snapshot_generation += 1
+            self._journal_path.unlink(missing_ok=True)
+            self._compacting_path.unlink(missing_ok=True)
+        self._logger.log(
+            VERBOSE,
+            "Saved event state to %s in %.3fms.",
+            self._snapshot_path,
+            (time.time() - now) * 1000,
+        )
+
+    def _save_changes(self, status: PackedEventStatus) -> None:
+        now = time.time()
+        records = [
+            _dump_record(("removed", eid) if event is None else ("event", event))
+            for eid, event in self._changes.items()
+        ]
+        records.append(_dump_record(("counters", _counters(status))))
+        with self._files_lock:
+            with self._journal_path.open(mode="ab") as f:
+                f.write(b"".join(records))
+                f.flush()
+                os.fsync(f.fileno())
+                journal_size = f.tell()
+            if self._compaction_required(journal_size):
+                self._start_compaction()
+        self._logger.log(
+            VERBOSE,
+            "Saved %d event state changes to %s in %.3fms.",
+            len(records) - 1,
+            self._journal_path,
+            (time.time() - now) * 1000,
+        )
+
+    def wait_for_compaction(self) -> None:
+        if self._compaction is not None:
+            self._compaction.join()
+
+    def _compaction_required(self, journal_size: int) -> bool:
+        if self._compaction is not None and self._compaction.is_alive():
+            return False
+        try:
+            snapshot_size = self._snapshot_path.stat().st_size
+        except FileNotFoundError:
+            snapshot_size = 0
+        return journal_size > max(snapshot_size, _MIN_COMPACTION_SIZE)
+
+    # protected by self._files_lock
+    def _start_compaction(self) -> None:
+        # A leftover of a failed compaction is folded first, the journal the next time.
+        if not self._compacting_path.exists():
+            self._journal_path.rename(self._compacting_path)
+        self._compaction = threading.Thread(
+            target=self._compact,
+            args=(self._snapshot_generation,),
+            name="compact-event-status",
+            daemon=True,
+        )
+        self._compaction.start()
+
+    def _compact(self, generation: int) -> None:
+        now = time.time()
+        try:
+            counters, events = _read_snapshot(self._snapshot_path.read_bytes())
+            counters = _replay(self._compacting_path.read_bytes(), counters, events)
+            records = _snapshot_records(PackedEventStatus(events=list(events.values()), **counters))
+            with self._files_lock:
+                if generation != self._snapshot_generation:
+                    return
+                _write_atomically(self._snapshot_path, records)
+                self._compacting_path.unlink()
+        except Exception:
+            if generation != self._snapshot_generation:
+                return  # The files have been replaced while reading them.
+            self._logger.exception("Error compacting event state in %s", self._snapshot_path)
+            return
+        self._logger.info(
+            "Compacted event state into %s in %.3fms.",
+            self._snapshot_path,
+            (time.time() - now) * 1000,
+        )
+
+    def load(self) -> PackedEventStatus | None:
+        """Load the snapshot and replay the journal, None if nothing has been saved yet"""
+        if not self._snapshot_path.exists():
+            return None
+        data = self._snapshot_path.read_bytes()
+        if data.startswith(b"{"):
+            self._logger.info("Converting event state of an older version")
+            status: PackedEventStatus = ast.literal_eval(data.decode("utf-8"))
+            return status
+
+        counters, events = _read_snapshot(data)
+        # After a crashed compaction or a torn write, subsequent changes would not be loaded.
+        self._snapshot_required = self._compacting_path.exists()
+        for path in (self._compacting_path, self._journal_path):
+            try:
+                journal = path.read_bytes()
+            except FileNotFoundError:
+                continue
+            try:
+                counters = _replay(journal, counters, events)
+            except _TornRecord as e:
+                self._logger.warning("Ignoring the end of %s: %s", path, e)
+                self._snapshot_required = True
+        self._changes.clear()
+        # The counters of a torn journal may be older than its events, never reuse an id.
+        counters["next_event_id"] = max(counters["next_event_id"], max(events, default=0) + 1)
+        return PackedEventStatus(events=list(events.values()), **counters)
+
+
+class _TornRecord(Exception):
+    pass
+
+
+def _counters(status: PackedEventStatus) -> _Counters:
+    return _Counters(
+        next_event_id=status["next_event_id"],
+        rule_stats=status["rule_stats"],
+        interval_starts=status["interval_starts"],
+    )
+
+
+def _dump_record(record: _Record | _Counters | Sequence[Event]) -> bytes:
+    buffer = io.BytesIO()
+    buffer.write(_LENGTH.pack(0))
+    pickler = pickle.Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = _DISPATCH_TABLE
+    pickler.dump(record)
+    buffer.seek(0)
+    buffer.write(_LENGTH.pack(len(buffer.getbuffer()) - _LENGTH.size))
+    return buffer.getvalue()
+
+
+def _load_records(data: bytes) -> Iterator[object]:
+    view = memoryview(data)
+    offset = 0
+    while offset < len(view):
+        if offset + _LENGTH.size > len(view):
+            raise _TornRecord(f"incomplete record length at offset {offset}")
+        (length,) = _LENGTH.unpack_from(view, offset)
+        offset += _LENGTH.size
+        if offset + length > len(view):
+            raise _TornRecord(f"incomplete record at offset {offset}")
+        yield pickle.loads(view[offset : offset + length])
+        offset += length
+
+
+def _snapshot_records(status: PackedEventStatus) -> Iterator[bytes]:
+    yield _dump_record(_counters(status))
+    events = status["events"]
+    for start in range(0, len(events), _CHUNK_SIZE):
+        yield _dump_record(events[start : start + _CHUNK_SIZE])
+
+
+def _read_snapshot(data: bytes) -> tuple[_Counters, dict[int, Event]]:
+    records = _load_records(data)
+    counters = cast(_Counters, next(records))
+    events: dict[int, Event] = {}
+    for chunk in records:
+        for event in cast(list[Event], chunk):
+            events[event["id"]] = event
+    return counters, events
+
+
+def _replay(journal: bytes, counters: _Counters, events: dict[int, Event]) -> _Counters:
+    """Apply the journal to the events, returns the latest counters"""
+    for record in _load_records(journal):
+        match cast(_Record, record):
+            case ("event", event):
+                # Changed events keep their place, i.e. their age.
+                events[event["id"]] = event
+            case ("removed", eid):
+                events.pop(eid, None)
+            case ("counters", latest):
+                counters = latest
+    return counters
+
+
+def _write_atomically(path: Path, records: Iterator[bytes]) -> None:
+    path_new = path.parent / (path.name + ".new")
+    with path_new.open(mode="wb") as f:
+        for record in records:
+            f.write(record)
+        f.flush()
+        os.fsync(f.fileno())
+    path_new.rename(path)
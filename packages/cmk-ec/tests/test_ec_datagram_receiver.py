@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import logging
+import select
+import socket
+from collections.abc import Iterator
+
+import pytest
+
+from cmk.ec.datagram_receiver import Datagram, DatagramReceiver
+
+
+@pytest.fixture(name="server_socket")
+def fixture_server_socket() -> Iterator[socket.socket]:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        yield sock
+
+
+def _received(receiver: DatagramReceiver, count: int) -> list[Datagram]:
+    datagrams: list[Datagram] = []
+    while len(datagrams) < count:
+        assert select.select([receiver], [], [], 10)[0], "nothing received"
+        datagrams += receiver.next_batch()
+    return datagrams
+
+
+def test_receive_in_order(server_socket: socket.socket) -> None:
+    receiver = DatagramReceiver("test", server_socket, 4096, logging.getLogger("cmk.mkeventd"))
+    assert receiver.next_batch() == []
+    receiver.start()
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as client:
+            client.bind(("127.0.0.1", 0))
+            client_address = client.getsockname()
+            for number in range(100):
+                client.sendto(b"message %d" % number, server_socket.getsockname())
+            datagrams = _received(receiver, 100)
+    finally:
+        receiver.terminate()
+
+    assert [data for data, _address in datagrams] == [b"message %d" % n for n in range(100)]
+    assert {address for _data, address in datagrams} == {client_address}
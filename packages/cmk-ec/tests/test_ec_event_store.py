@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import pytest
+
+from cmk.ccc.hostaddress import HostName
+from cmk.ec.event import Event
+from cmk.ec.event_store import EventStore
+
+from .helpers import new_event
+
+
+def _event(eid: int, rule_id: str, host: str) -> Event:
+    return new_event(Event(id=eid, rule_id=rule_id, host=HostName(host), core_host=None))
+
+
+def test_lookups() -> None:
+    events = [
+        _event(1, "a", "heute"),
+        _event(2, "b", "heute"),
+        _event(3, "a", "morgen"),
+        _event(4, "a", "heute"),
+    ]
+    store = EventStore(events)
+
+    assert len(store) == 4
+    assert store.all() == events
+    assert store.get(3) is events[2]
+    assert store.get(5) is None
+    assert store.of_rule("a") == [events[0], events[2], events[3]]
+    assert store.of_rule("c") == []
+    assert store.of_rule_and_host("a", HostName("heute")) == [events[0], events[3]]
+    assert store.num_by_rule() == {"a": 3, "b": 1}
+    assert store.num_by_host() == {(HostName("heute"), None): 3, (HostName("morgen"), None): 1}
+    assert store.oldest() is events[0]
+    assert store.oldest_of_rule("b") is events[1]
+    assert store.oldest_of_host((HostName("morgen"), None)) is events[2]
+
+
+def test_remove() -> None:
+    events = [_event(1, "a", "heute"), _event(2, "a", "morgen")]
+    store = EventStore(events)
+
+    store.remove(events[0])
+
+    assert store.all() == [events[1]]
+    assert store.oldest_of_host((HostName("heute"), None)) is None
+    assert store.num_by_host() == {(HostName("morgen"), None): 1}
+    with pytest.raises(ValueError):
+        store.remove(events[0])
+
+
+def test_snapshots_allow_removing_while_iterating() -> None:
+    store = EventStore(_event(eid, "a", "heute") for eid in range(5))
+
+    for event in store.of_rule("a"):
+        store.remove(event)
+
+    assert not store
+
+
+def test_update_keeps_the_age_order() -> None:
+    events = [_event(1, "a", "heute"), _event(2, "a", "morgen"), _event(3, "a", "morgen")]
+    store = EventStore(events)
+
+    events[0]["host"] = HostName("morgen")
+    store.update(events[0])
+
+    assert store.num_by_host() == {(HostName("morgen"), None): 3}
+    assert store.oldest_of_host((HostName("morgen"), None)) is events[0]
+    assert store.of_rule_and_host("a", HostName("morgen")) == events
+    assert store.of_rule_and_host("a", HostName("heute")) == []
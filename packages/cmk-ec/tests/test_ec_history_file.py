@@ -6,7 +6,7 @@
 
 import datetime
 import logging
-import shlex
+import time
 from pathlib import Path
 from typing import Any
 from zoneinfo import ZoneInfo
@@ -17,14 +17,10 @@ import cmk.ec.export as ec
 from cmk.ccc.hostaddress import HostName
 from cmk.ec.config import Config
 from cmk.ec.history import _current_history_period
-from cmk.ec.history_file import (
-    _grep_pipeline,
-    convert_history_line,
-    FileHistory,
-    parse_history_file,
-)
+from cmk.ec.history_file import convert_history_line, FileHistory, parse_history_file
+from cmk.ec.history_file_index import IndexReader
 from cmk.ec.main import StatusTableHistory
-from cmk.ec.query import QueryFilter, QueryGET, StatusTable
+from cmk.ec.query import QueryGET, StatusTable
 
 
 def test_file_add_get(history: FileHistory) -> None:
@@ -120,23 +116,84 @@ def test_history_parse(tmp_path: Path) -> None:
     """
     path = tmp_path / "history_test.log"
     path.write_text(values)
-    filter_ = QueryFilter(
-        column_name="event_id",
-        operator_name="=",
-        predicate=lambda _: True,
-        argument="1",
-    )
-    tac = f"nl -b a {shlex.quote(str(path))} | tac"
-    cmd = " | ".join([tac] + _grep_pipeline([filter_]))
 
     new_entries = parse_history_file(
         StatusTableHistory.columns,
         path,
-        lambda _: True,
-        cmd,
-        None,
-        logging.getLogger("cmk.mkeventd"),
+        IndexReader().segments(path, path.stat().st_size),
+        select_segment=lambda _: True,
+        select_line=[],
+        filter_row=lambda _: True,
+        limit=None,
+        logger=logging.getLogger("cmk.mkeventd"),
     )
 
     assert len(new_entries) == 4
+    assert new_entries[0][0] == 4
     assert new_entries[0][1] == 1666942292.3000507
+
+
+def _query(history: FileHistory, *headers: str) -> list[dict[str, Any]]:
+    logger = logging.getLogger("cmk.mkeventd")
+
+    def get_table(name: str) -> StatusTable:
+        assert name == "history"
+        return StatusTableHistory(logger, history)
+
+    column_names = get_table("history").column_names
+    query = QueryGET(get_table, ["GET history", *headers], logger)
+    return [dict(zip(column_names, row)) for row in history.get(query)]
+
+
+def _add_entries(history: FileHistory, hosts: list[str]) -> None:
+    for eid, host in enumerate(hosts, 1):
+        history.add(ec.Event(id=eid, host=HostName(host), text=f"text {eid}"), what="NEW")
+
+
+def test_pending_entries(history: FileHistory, settings: ec.Settings) -> None:
+    _add_entries(history, ["heute", "morgen"])
+    assert not list(settings.paths.history_dir.value.glob("*.log"))
+
+    assert [row["event_host"] for row in _query(history)] == ["morgen", "heute"]
+    (path,) = settings.paths.history_dir.value.glob("*.log")
+    assert len(path.read_text().splitlines()) == 2
+
+    history.close()
+    assert path.with_suffix(".idx").exists()
+
+
+def test_indexed_queries(history: FileHistory, settings: ec.Settings) -> None:
+    hosts = ["heute"] * 300 + ["morgen"] * 300 + ["heute"] * 10
+    _add_entries(history, hosts)
+    history.close()
+    (path,) = settings.paths.history_dir.value.glob("*.log")
+    # Some unindexed entries at the end, as after a crash
+    with path.open(mode="ab") as f:
+        f.write(path.read_bytes().splitlines(keepends=True)[0])
+
+    rows = _query(history, "Filter: event_host = MORGEN")
+    assert not rows
+    rows = _query(history, "Filter: event_host =~ MORGEN")
+    assert [row["history_line"] for row in rows] == list(range(600, 300, -1))
+    assert [row["event_id"] for row in rows] == list(range(600, 300, -1))
+
+    rows = _query(history, "Filter: event_host in gestern heute", "Limit: 3")
+    assert [row["history_line"] for row in rows] == [611, 610, 609]
+    assert [row["event_id"] for row in rows] == [1, 610, 609]
+
+    rows = _query(history, "Filter: event_id = 42")
+    assert [row["history_line"] for row in rows] == [42]
+
+    rows = _query(history, f"Filter: history_time > {time.time() + 10}")
+    assert not rows
+
+
+def test_flush_removes_index(history: FileHistory, settings: ec.Settings) -> None:
+    _add_entries(history, ["heute"])
+    history.close()
+    assert list(settings.paths.history_dir.value.glob("*.idx"))
+
+    history.flush()
+
+    assert not list(settings.paths.history_dir.value.iterdir())
+    assert not _query(history)
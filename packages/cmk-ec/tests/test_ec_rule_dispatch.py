@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import logging
+
+import pytest
+
+import cmk.ec.export as ec
+from cmk.ccc.hostaddress import HostName
+from cmk.ec.config import Config
+from cmk.ec.main import (
+    create_history,
+    EventServer,
+    EventStatus,
+    StatusTableEvents,
+    StatusTableHistory,
+)
+from cmk.ec.rule_dispatch import RuleDispatch
+from cmk.ec.rule_matcher import compile_rule
+
+from .helpers import new_event
+
+
+def _rule(rule_id: str, **conditions: object) -> ec.Rule:
+    rule = ec.Rule(
+        id=rule_id, pack="default", sl=ec.ServiceLevel(precedence="message", value=0), state=0
+    )
+    rule.update(conditions)  # type: ignore[typeddict-item]
+    return rule
+
+
+def _event(text: str, host: str = "heute", facility: int = 1, priority: int = 0) -> ec.Event:
+    return new_event(
+        ec.Event(
+            text=text, host=HostName(host), core_host=None, facility=facility, priority=priority
+        )
+    )
+
+
+def _dispatch(
+    rules: list[ec.Rule], rule_hash: dict[int, dict[int, list[ec.Rule]]] | None = None
+) -> RuleDispatch:
+    for rule in rules:
+        compile_rule(rule)
+    return RuleDispatch(rules, rule_hash)
+
+
+def _candidates(rules: list[ec.Rule], event: ec.Event) -> list[str]:
+    return [rule["id"] for rule in _dispatch(rules).candidates(event)]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        pytest.param("Disk 3 FAILED", ["failed", "no text", "alternative", "inverted"], id="regex"),
+        pytest.param("disk 3 recovered", ["no text", "alternative", "inverted"], id="no regex"),
+        pytest.param("the Kernel panics", ["literal", "no text", "alternative", "inverted"]),
+        pytest.param("Link up", ["no text", "alternative", "cancelling", "inverted"]),
+    ],
+)
+def test_text_candidates(text: str, expected: list[str]) -> None:
+    rules = [
+        _rule("literal", match="kernel panic"),
+        _rule("failed", match=r"disk (\d+) failed"),
+        _rule("no text"),
+        _rule("alternative", match="foo|bar"),
+        _rule("cancelling", match="link down", match_ok="link up"),
+        _rule("inverted", match="something", invert_matching=True),
+    ]
+    assert _candidates(rules, _event(text)) == expected
+
+
+def test_host_candidates() -> None:
+    rules = [
+        _rule("literal", match_host="Heute"),
+        _rule("regex", match_host=r"^mor.+$"),
+        _rule("any host"),
+    ]
+    dispatch = _dispatch(rules)
+
+    def candidates(host: str) -> list[str]:
+        return [rule["id"] for rule in dispatch.candidates(_event("", host=host))]
+
+    assert candidates("heute") == ["literal", "any host"]
+    assert candidates("heute2") == ["any host"]
+    assert candidates("MORGEN") == ["regex", "any host"]
+
+
+def test_non_ascii_events_get_all_rules() -> None:
+    # "ſ" matches "s" when ignoring the case.
+    rules = [_rule("disk", match="^di[s]k failed")]
+    assert _candidates(rules, _event("diſk failed")) == ["disk"]
+
+
+def test_candidates_of_the_rule_hash_bucket() -> None:
+    kernel = _rule("kernel", match="panic", match_facility=0)
+    everywhere = _rule("everywhere", match="panic")
+    dispatch = _dispatch([kernel, everywhere], {0: {0: [kernel, everywhere]}, 1: {0: [everywhere]}})
+
+    assert dispatch.candidates(_event("panic", facility=0)) == [kernel, everywhere]
+    assert dispatch.candidates(_event("panic", facility=1)) == [everywhere]
+    assert dispatch.candidates(_event("panic", facility=2)) == []
+
+
+@pytest.mark.parametrize("rule_optimizer", [True, False])
+def test_first_match_after_skipping_a_pack(
+    event_server: EventServer,
+    event_status: EventStatus,
+    settings: ec.Settings,
+    config: Config,
+    rule_optimizer: bool,
+) -> None:
+    config_rule_packs = config | {
+        "rule_optimizer": rule_optimizer,
+        "rule_packs": [
+            ec.ECRulePackSpec(
+                id="skipped",
+                title="",
+                disabled=False,
+                rules=[
+                    _rule("skip", match="noise", drop="skip_pack"),
+                    _rule("skipped", match="disk"),
+                ],
+            ),
+            ec.default_rule_pack([_rule("other", match="unrelated"), _rule("first", match="disk")]),
+        ],
+    }
+    history = create_history(
+        settings,
+        config_rule_packs,
+        logging.getLogger("cmk.mkeventd"),
+        StatusTableEvents.columns,
+        StatusTableHistory.columns,
+    )
+    event_server.reload_configuration(config_rule_packs, history=history)
+
+    event_server.process_potential_event(_event("noise from disk"))
+
+    assert [event["rule_id"] for event in event_status.events()] == ["first"]
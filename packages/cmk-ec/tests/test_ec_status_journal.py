@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import logging
+from pathlib import Path
+
+import pytest
+
+import cmk.ec.export as ec
+from cmk.ccc.hostaddress import HostName
+from cmk.ec.event import Event
+from cmk.ec.main import EventServer, EventStatus
+from cmk.ec.status_journal import PackedEventStatus, StatusJournal
+
+from .helpers import new_event
+
+
+@pytest.fixture(name="state_dir", autouse=True)
+def fixture_state_dir(settings: ec.Settings) -> None:
+    settings.paths.status_file.value.parent.mkdir(parents=True, exist_ok=True)
+
+
+def _new_event(host: str) -> Event:
+    return new_event(Event(host=HostName(host), core_host=None))
+
+
+def _reloaded_events(event_status: EventStatus, event_server: EventServer) -> list[Event]:
+    event_status.flush()
+    event_status.load_status(event_server)
+    return event_status.events()
+
+
+def test_save_changes_after_snapshot(
+    event_status: EventStatus, event_server: EventServer, settings: ec.Settings
+) -> None:
+    for host in ("heute", "morgen", "gestern"):
+        event_status.new_event(_new_event(host))
+    event_status.save_status()
+    assert not settings.paths.status_journal_file.value.exists()
+
+    heute, morgen, _gestern = event_status.events()
+    event_status.remove_event(morgen, "DELETE")
+    heute["comment"] = "Kommentar"
+    event_status.update_event(heute)
+    event_status.new_event(_new_event("uebermorgen"))
+    event_status.save_status()
+    assert settings.paths.status_journal_file.value.exists()
+
+    expected = event_status.events()
+    assert _reloaded_events(event_status, event_server) == expected
+    assert event_status.pack_status()["next_event_id"] == 5
+
+
+def test_snapshot(
+    event_status: EventStatus, event_server: EventServer, settings: ec.Settings
+) -> None:
+    event_status.new_event(_new_event("heute"))
+    event_status.save_status()
+    event_status.new_event(_new_event("morgen"))
+    event_status.save_status()
+
+    event_status.save_status(snapshot=True)
+
+    assert not settings.paths.status_journal_file.value.exists()
+    expected = event_status.events()
+    assert _reloaded_events(event_status, event_server) == expected
+
+
+def test_load_status_of_older_versions(
+    event_status: EventStatus, event_server: EventServer, settings: ec.Settings
+) -> None:
+    event = _new_event("heute") | {"id": 41}
+    settings.paths.status_file.value.write_text(
+        repr(
+            {
+                "next_event_id": 42,
+                "events": [event],
+                "rule_stats": {"815": 1},
+                "interval_starts": {},
+            }
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+    assert _reloaded_events(event_status, event_server) == [event]
+    assert event_status.pack_status()["rule_stats"] == {"815": 1}
+
+
+def test_torn_journal(
+    event_status: EventStatus, event_server: EventServer, settings: ec.Settings
+) -> None:
+    event_status.new_event(_new_event("heute"))
+    event_status.save_status()
+    event_status.new_event(_new_event("morgen"))
+    event_status.save_status()
+    journal = settings.paths.status_journal_file.value
+    journal.write_bytes(journal.read_bytes()[:-3])
+
+    # The counters of the torn record are lost, but not the event before them.
+    assert [e["host"] for e in _reloaded_events(event_status, event_server)] == ["heute", "morgen"]
+
+    # Changes appended after the torn record could not be loaded, so they go into a snapshot.
+    event_status.new_event(_new_event("gestern"))
+    event_status.save_status()
+    assert not journal.exists()
+    assert [e["id"] for e in _reloaded_events(event_status, event_server)] == [1, 2, 3]
+
+
+def test_compaction(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("cmk.ec.status_journal._MIN_COMPACTION_SIZE", 0)
+    journal = StatusJournal(
+        tmp_path / "status", tmp_path / "status.journal", logging.getLogger("cmk.mkeventd")
+    )
+    events = [new_event(Event(id=eid)) for eid in range(1, 4)]
+    status = PackedEventStatus(next_event_id=4, events=events, rule_stats={}, interval_starts={})
+    journal.save(status, snapshot=False)
+
+    # Changing all events makes the journal larger than the snapshot.
+    for event in events:
+        event["count"] = 2
+        journal.event_changed(event)
+    journal.save(status, snapshot=False)
+    journal.wait_for_compaction()
+
+    assert not (tmp_path / "status.journal").exists()
+    assert not (tmp_path / "status.journal.compacting").exists()
+    assert (
+        StatusJournal(
+            tmp_path / "status", tmp_path / "status.journal", logging.getLogger("cmk.mkeventd")
+        ).load()
+        == status
+    )
+
+
+def test_failed_save(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    journal = StatusJournal(
+        tmp_path / "status", tmp_path / "status.journal", logging.getLogger("cmk.mkeventd")
+    )
+    events = [new_event(Event(id=eid)) for eid in range(1, 3)]
+    status = PackedEventStatus(next_event_id=3, events=events, rule_stats={}, interval_starts={})
+    journal.save(status, snapshot=False)
+
+    events[0]["count"] = 2
+    journal.event_changed(events[0])
+
+    def fail(_fd: int) -> None:
+        raise OSError("No space left on device")
+
+    with monkeypatch.context() as m:
+        m.setattr("cmk.ec.status_journal.os.fsync", fail)
+        with pytest.raises(OSError):
+            journal.save(status, snapshot=False)
+
+    # The next save does not append behind a possibly torn record.
+    journal.save(status, snapshot=False)
+    assert not (tmp_path / "status.journal").exists()
+    assert (
+        StatusJournal(
+            tmp_path / "status", tmp_path / "status.journal", logging.getLogger("cmk.mkeventd")
+        ).load()
+        == status
+    )
+
+
+def test_snapshot_during_compaction(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("cmk.ec.status_journal._MIN_COMPACTION_SIZE", 0)
+    journal = StatusJournal(
+        tmp_path / "status", tmp_path / "status.journal", logging.getLogger("cmk.mkeventd")
+    )
+    events = [new_event(Event(id=eid)) for eid in range(1, 4)]
+    status = PackedEventStatus(next_event_id=4, events=events, rule_stats={}, interval_starts={})
+    journal.save(status, snapshot=False)
+    for event in events:
+        event["count"] = 2
+        journal.event_changed(event)
+    journal.save(status, snapshot=False)
+
+    # The snapshot is newer than whatever the compaction comes up with.
+    status = PackedEventStatus(
+        next_event_id=5,
+        events=[*events, new_event(Event(id=4))],
+        rule_stats={},
+        interval_starts={},
+    )
+    journal.save(status, snapshot=True)
+    journal.wait_for_compaction()
+
+    assert (
+        StatusJournal(
+            tmp_path / "status", tmp_path / "status.journal", logging.getLogger("cmk.mkeventd")
+        ).load()
+        == status
+    )
@@ -12,11 +12,12 @@ import json
 import os
 import re
 import select
+import selectors
 import socket
 import ssl
 import threading
 import time
-from collections.abc import Callable, Iterator, Mapping, Sequence
+from collections.abc import Callable, Generator, Iterator, Mapping, Sequence
 from dataclasses import dataclass, field
 from enum import Enum
 from functools import cache
@@ -482,6 +483,9 @@ QueryTypes = str | Query
 OnlySites = list[SiteId] | None
 DeadSite = dict[str, str | int | Exception | SiteConfiguration]
 
+# Size of the pieces streamed responses are read in
+_STREAMING_CHUNK_SIZE = 64 * 1024
+
 # .
 #   .--SingleSiteConn------------------------------------------------------.
 #   |  ____  _             _      ____  _ _        ____                    |
@@ -810,20 +814,7 @@ class SingleSiteConnection(Helpers):
             if code == "200":
                 return data
 
-            error_info = data.decode("utf-8")
-            if code == "404":
-                raise MKLivestatusTableNotFoundError(f"Not Found ({code}): {error_info!r}")
-
-            if code == "413":
-                raise MKLivestatusPayloadTooLargeError(error_info)
-
-            if code == "495":
-                raise MKLivestatusCertificateError(error_info)
-
-            if code == "502":
-                raise MKLivestatusBadGatewayError(error_info)
-
-            raise MKLivestatusQueryError(f"{code}: {error_info}")
+            raise _response_error(code, data.decode("utf-8"))
 
         except (MKLivestatusSocketClosed, OSError) as e:
             # In case of an IO error or the other side having
@@ -870,6 +861,53 @@ class SingleSiteConnection(Helpers):
             # FIXME: ? self.disconnect()
             raise MKLivestatusSocketError("Unhandled exception: %s" % e)
 
+    def receive_rows(self, query: str, json_format: bool) -> Generator[LivestatusRow]:
+        """Yield the rows of a response while they arrive
+
+        Livestatus writes one row per line, so we only need to hold a chunk of the response
+        and the line that is just being received. In case the rows are not consumed
+        completely, the connection is closed.
+        """
+        try:
+            header = self.receive_data(16)
+        except (MKLivestatusSocketClosed, OSError):
+            # Like receive_raw_response: The server may have closed the keepalive connection.
+            # Nothing has been received yet, so we can safely try again (once).
+            self.disconnect()
+            self.connect()
+            self.send_query(query, False)
+            header = self.receive_data(16)
+
+        code = header[0:3].decode("ascii")
+        try:
+            remaining = int(header[4:15].lstrip())
+        except ValueError:
+            self.disconnect()
+            raise MKLivestatusSocketError(f"Malformed response header {header!r}")
+
+        if code != "200":
+            error = _response_error(code, self.receive_data(remaining, 30).decode("utf-8"))
+            self.disconnect()
+            raise error
+
+        decode = json.loads if json_format else ast.literal_eval
+        complete = False
+        try:
+            pending = b""
+            first = True
+            while remaining:
+                chunk = self.receive_data(min(remaining, _STREAMING_CHUNK_SIZE), 30)
+                remaining -= len(chunk)
+                *lines, pending = (pending + chunk).split(b"\n")
+                for line in lines:
+                    yield from _parse_rows(line, first, decode)
+                    first = False
+            yield from _parse_rows(pending, first, decode)
+            complete = True
+        finally:
+            if not complete:
+                self.disconnect()
+
     def parse_raw_response(self, raw_response: bytes, query: Query) -> LivestatusResponse:
         data = raw_response.decode("utf-8")
         try:
@@ -913,6 +951,33 @@ class SingleSiteConnection(Helpers):
                 row.insert(0, b"")
         return response
 
+    def query_iter(self, query: QueryTypes, add_headers: str = "") -> Generator[LivestatusRow]:
+        """Like query(), but yield the rows while they arrive
+
+        Use this for big tables like the log or statehist: The response never has to be held
+        in memory as a whole, and processing can start with the first row.
+        """
+        # Normalize argument types
+        normalized_query = Query(query) if not isinstance(query, Query) else query
+
+        if self.limit is not None:
+            normalized_query = Query(
+                "%sLimit: %d\n" % (normalized_query, self.limit),
+                normalized_query.suppress_exceptions,
+            )
+
+        with _livestatus_output_format_switcher(normalized_query, self):
+            str_query = self.build_query(normalized_query, add_headers)
+
+        self.send_query(str_query)
+        try:
+            for row in self.receive_rows(str_query, normalized_query.supports_json_format()):
+                if self.prepend_site:
+                    row.insert(0, b"")
+                yield row
+        except (OSError, UnicodeDecodeError) as e:
+            raise MKLivestatusSocketError("Unhandled exception: %s" % e)
+
     def command(
         self,
         command: str,
@@ -1008,6 +1073,8 @@ class MultiSiteConnection(Helpers):
         self.prepend_site = False
         self.only_sites: OnlySites = None
         self.limit: int | None = None
+        self.response_deadline: float | None = None
+        self.partial_results = True
         self.parallelize = True
         self._only_sites_postprocess = only_sites_postprocess
 
@@ -1181,6 +1248,16 @@ class MultiSiteConnection(Helpers):
         """Impose Limit on number of returned datasets (distributed among sites)"""
         self.limit = limit
 
+    def set_response_deadline(self, seconds: float | None, partial_results: bool = True) -> None:
+        """Limit the time to wait for the sites to answer parallelized queries
+
+        Sites that have not started to answer in time are disconnected and marked as dead.
+        With partial_results the query returns the rows of the other sites, otherwise it fails.
+        In case None is given, the limitation is removed.
+        """
+        self.response_deadline = seconds
+        self.partial_results = partial_results
+
     def dead_sites(self) -> dict[SiteId, DeadSite]:
         return self.deadsites
 
@@ -1222,6 +1299,37 @@ class MultiSiteConnection(Helpers):
                 return self.query_parallel(normalized_query, normalized_add_headers)
             return self.query_non_parallel(normalized_query, normalized_add_headers)
 
+    def query_iter(self, query: QueryTypes, add_headers: str = "") -> Generator[LivestatusRow]:
+        """Like query(), but yield the rows while they arrive
+
+        The sites are queried one after the other. The semantics of Limit: are the same as in
+        query_parallel(). Sites failing during the query are marked as dead, the rows they
+        have sent until then have already been yielded.
+        """
+        normalized_query = Query(query) if not isinstance(query, Query) else query
+        limit_header = "Limit: %d\n" % self.limit if self.limit is not None else ""
+        for connected_site in list(self.connections):
+            if self.only_sites is not None and connected_site.id not in self.only_sites:
+                continue
+            try:
+                for row in connected_site.connection.query_iter(
+                    normalized_query, add_headers + limit_header
+                ):
+                    if self.prepend_site:
+                        row.insert(0, connected_site.id)
+                    yield row
+            except normalized_query.suppress_exceptions:
+                continue
+            except LivestatusTestingError:
+                raise
+            except Exception as e:
+                connected_site.connection.disconnect()
+                self.deadsites[connected_site.id] = {
+                    "exception": e,
+                    "site": connected_site.config,
+                }
+                self.connections.remove(connected_site)
+
     def query_non_parallel(self, query: Query, add_headers: str = "") -> LivestatusResponse:
         result = LivestatusResponse([])
         stillalive = []
@@ -1278,11 +1386,9 @@ class MultiSiteConnection(Helpers):
                 limit_header="Limit: %d\n" % self.limit if self.limit is not None else "",
             )
 
-            # Then retrieve all raw responses. We will be as slow as the slowest of all connections.
-            site_responses = self._retrieve_responses(query, retrieve_responses, stillalive)
-
-            # Convert responses to python format
-            result = self._parse_responses(query, site_responses, stillalive)
+            # Then retrieve and parse the responses in the order the sites answer. We will be
+            # as slow as the slowest of all connections, but the others are done by then.
+            result = self._receive_responses(query, retrieve_responses, stillalive)
 
         self.connections = stillalive
         return LivestatusResponse(result)
@@ -1315,14 +1421,17 @@ class MultiSiteConnection(Helpers):
                     }
         return retrieve_responses
 
-    def _retrieve_responses(
+    def _receive_responses(
         self,
         query: Query,
         retrieve_responses: list[tuple[str, trace.Span, ConnectedSite]],
         stillalive: ConnectedSites,
-    ) -> list[tuple[ConnectedSite, bytes]]:
-        site_responses: list[tuple[ConnectedSite, bytes]] = []
-        for str_query, request_span, connected_site in retrieve_responses:
+    ) -> list[LivestatusRow]:
+        rows_per_site: dict[SiteId, list[LivestatusRow]] = {}
+        answered: set[SiteId] = set()
+        for str_query, request_span, connected_site in self._in_order_of_arrival(
+            retrieve_responses
+        ):
             with tracer.span(
                 f"receive_from_site[{connected_site.id}]",
                 kind=trace.SpanKind.CONSUMER,
@@ -1333,17 +1442,15 @@ class MultiSiteConnection(Helpers):
                 },
             ):
                 try:
-                    site_responses.append(
-                        (
-                            connected_site,
-                            connected_site.connection.receive_raw_response(
-                                str_query, query.suppress_exceptions
-                            ),
-                        )
+                    rows = connected_site.connection.parse_raw_response(
+                        connected_site.connection.receive_raw_response(
+                            str_query, query.suppress_exceptions
+                        ),
+                        query,
                     )
                 except query.suppress_exceptions:
                     # Mostly handles exception types MKLivestatusTableNotFoundError
-                    stillalive.append(connected_site)
+                    answered.add(connected_site.id)
                     continue
                 except LivestatusTestingError:
                     raise
@@ -1353,35 +1460,73 @@ class MultiSiteConnection(Helpers):
                         "exception": e,
                         "site": connected_site.config,
                     }
-        return site_responses
+                    continue
 
-    def _parse_responses(
-        self,
-        query: Query,
-        site_responses: list[tuple[ConnectedSite, bytes]],
-        stillalive: ConnectedSites,
-    ) -> list[LivestatusRow]:
-        result: list[LivestatusRow] = []
-        for connected_site, raw_response in site_responses:
-            try:
-                rows = connected_site.connection.parse_raw_response(raw_response, query)
-                stillalive.append(connected_site)
-                if self.prepend_site:
-                    for row in rows:
-                        row.insert(0, connected_site.id)
-                result.extend(rows)
-            except query.suppress_exceptions:
-                stillalive.append(connected_site)
-                continue
-            except LivestatusTestingError:
-                raise
-            except Exception as e:
-                connected_site.connection.disconnect()
-                self.deadsites[connected_site.id] = {
-                    "exception": e,
-                    "site": connected_site.config,
-                }
-        return result
+            answered.add(connected_site.id)
+            if self.prepend_site:
+                for row in rows:
+                    row.insert(0, connected_site.id)
+            rows_per_site[connected_site.id] = rows
+
+        # Keep the order of the sites, no matter which one answered first
+        stillalive.extend(c for _q, _s, c in retrieve_responses if c.id in answered)
+        return [
+            row
+            for _q, _s, connected_site in retrieve_responses
+            for row in rows_per_site.get(connected_site.id, [])
+        ]
+
+    def _in_order_of_arrival(
+        self, retrieve_responses: list[tuple[str, trace.Span, ConnectedSite]]
+    ) -> Iterator[tuple[str, trace.Span, ConnectedSite]]:
+        """Yield the sites as soon as their response starts to arrive
+
+        Sites that have not answered until the response deadline are disconnected.
+        """
+        deadline = None if self.response_deadline is None else time.time() + self.response_deadline
+        with selectors.DefaultSelector() as selector:
+            for entry in retrieve_responses:
+                if (site_socket := entry[2].connection.socket) is None:
+                    yield entry  # Let the receiving report the problem
+                    continue
+                try:
+                    selector.register(site_socket, selectors.EVENT_READ, entry)
+                except KeyError:
+                    # Sites sharing a persisted connection are answered one after the other
+                    yield entry
+
+            while selector.get_map():
+                keys = list(selector.get_map().values())
+                # SSL sockets may have buffered data the selector can not see
+                ready = [key for key in keys if _has_pending_data(key.fileobj)] or [
+                    key
+                    for key, _events in selector.select(
+                        None if deadline is None else max(deadline - time.time(), 0.0)
+                    )
+                ]
+                if not ready:
+                    self._give_up_on_sites([key.data for key in keys])
+                    return
+                for key in ready:
+                    # The receiving may replace the socket, so stop watching it beforehand
+                    selector.unregister(key.fileobj)
+                    yield key.data
+
+    def _give_up_on_sites(self, pending: list[tuple[str, trace.Span, ConnectedSite]]) -> None:
+        for _str_query, _span, connected_site in pending:
+            # The response may still arrive. Don't let it mix up with the next query.
+            connected_site.connection.disconnect()
+            self.deadsites[connected_site.id] = {
+                "exception": MKLivestatusSocketError(
+                    f"No response within {self.response_deadline} seconds"
+                ),
+                "site": connected_site.config,
+            }
+        if not self.partial_results:
+            raise MKLivestatusSocketError(
+                "No response within %s seconds from site(s) %s"
+                % (self.response_deadline, ", ".join(c.id for _q, _s, c in pending))
+            )
 
     def command(self, command: str, sitename: SiteId | None = SiteId("local")) -> None:
         if sitename in self.deadsites:
@@ -1515,6 +1660,48 @@ def _combine_query(query: str, headers: str | list[str]) -> str:
     return query + "\n" + headers
 
 
+def _parse_rows(line: bytes, first: bool, decode: Callable[[str], Any]) -> LivestatusResponse:
+    """Parse a line of a response in JSON or Python format
+
+    The response is a list of rows. Livestatus puts every row on a line of its own,
+    but we also accept lines with several rows:
+
+        [[row 1],
+        [row 2], [row 3]]
+    """
+    text = line.decode("utf-8").strip()
+    if first:
+        text = text.removeprefix("[")
+    # All lines but the last one end with a comma, the last one closes the list.
+    text = text[:-1] if text.endswith(",") else text.removesuffix("]")
+    if not text:
+        return LivestatusResponse([])
+    try:
+        return LivestatusResponse(list(decode(f"[{text}]")))
+    except (ValueError, SyntaxError):
+        raise MKLivestatusQueryError("Malformed raw response output")
+
+
+def _response_error(code: str, error_info: str) -> MKLivestatusException:
+    if code == "404":
+        return MKLivestatusTableNotFoundError(f"Not Found ({code}): {error_info!r}")
+
+    if code == "413":
+        return MKLivestatusPayloadTooLargeError(error_info)
+
+    if code == "495":
+        return MKLivestatusCertificateError(error_info)
+
+    if code == "502":
+        return MKLivestatusBadGatewayError(error_info)
+
+    return MKLivestatusQueryError(f"{code}: {error_info}")
+
+
+def _has_pending_data(sock: object) -> bool:
+    return isinstance(sock, ssl.SSLSocket) and sock.pending() > 0
+
+
 def is_socket_readable(sock: socket.socket, select_timeout: float = 1.0) -> bool:
     # SSL sockets may not return any fileno in the select, since the data lingers around in pending
     # https://stackoverflow.com/questions/3187565/select-and-ssl-in-python
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+"""Benchmark: Parsing of agent output
+
+Parses a recorded agent output, inflated by a large logwatch section and piggybacked
+data, with and without a section selection. No site is needed:
+
+$ pytest tests/performance/components/test_agent_parser.py --benchmark-group-by=param:selection
+"""
+
+import logging
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from cmk.ccc.hostaddress import HostName
+from cmk.ccc.translations import TranslationOptions
+from cmk.checkengine.parser import AgentParser, NO_SELECTION, SectionNameCollection, SectionStore
+from cmk.checkengine.plugins import SectionName
+from cmk.helper_interface import AgentRawData
+
+_RECORDED_OUTPUT = (
+    Path(__file__).parents[2] / "integration/cmk/base/test-files/linux-agent-output"
+).read_bytes()
+
+
+def _agent_output() -> AgentRawData:
+    logwatch = b"<<<logwatch>>>\n[[[/var/log/messages]]]\n" + b"".join(
+        b"W Oct 18 12:00:%02d myhost kernel: message number %d\n" % (i % 60, i)
+        for i in range(100000)
+    )
+    piggyback = b"".join(
+        b"<<<<piggy%03d>>>>\n%s<<<<>>>>\n" % (i, _RECORDED_OUTPUT) for i in range(10)
+    )
+    return AgentRawData(_RECORDED_OUTPUT + logwatch + piggyback)
+
+
+@pytest.mark.parametrize(
+    "selection",
+    [
+        pytest.param(NO_SELECTION, id="all"),
+        pytest.param(frozenset({SectionName("uptime"), SectionName("df")}), id="uptime_df"),
+    ],
+)
+def test_parse_agent_output(
+    benchmark: BenchmarkFixture, tmp_path: Path, selection: SectionNameCollection
+) -> None:
+    logger = logging.getLogger("test")
+    parser = AgentParser(
+        HostName("myhost"),
+        SectionStore(tmp_path / "store", logger=logger),
+        host_check_interval=0,
+        keep_outdated=True,
+        translation=TranslationOptions(),
+        encoding_fallback="ascii",
+        logger=logger,
+    )
+    raw_data = _agent_output()
+
+    benchmark.pedantic(  # type: ignore[no-untyped-call]
+        parser.parse, args=(raw_data,), kwargs={"selection": selection}, rounds=5, iterations=1
+    )
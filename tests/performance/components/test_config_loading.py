@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+"""Benchmark: Loading the Checkmk configuration files
+
+Compares executing all configuration files of a site with many folders to loading
+the precompiled configuration bundle. No site is needed:
+
+$ pytest tests/performance/components/test_config_loading.py
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+import cmk.utils.paths
+from cmk.base import config
+from cmk.utils.host_storage import StorageFormat
+
+_NUM_FOLDERS = 200
+_NUM_HOSTS_PER_FOLDER = 50
+_NUM_RULES_PER_FOLDER = 20
+
+
+def _write_folder(folder: Path, name: str) -> None:
+    folder.mkdir(parents=True)
+    hosts = [f"{name}-host{i}" for i in range(_NUM_HOSTS_PER_FOLDER)]
+    (folder / "hosts.mk").write_text(
+        f"all_hosts += {hosts!r}\n"
+        f"host_tags.update({ {h: {'site': 'heute', 'address_family': 'ip-v4-only'} for h in hosts}!r})\n"
+        f"ipaddresses.update({ {h: f'10.0.0.{i % 250}' for i, h in enumerate(hosts)}!r})\n"
+    )
+    (folder / "rules.mk").write_text(
+        "checkgroup_parameters.setdefault('filesystem', [])\n"
+        "checkgroup_parameters['filesystem'] = [\n"
+        + "".join(
+            f"{{'id': '{name}-{i}', 'value': {{'levels': (80.0, 90.0)}},"
+            f" 'condition': {{'host_folder': '/%s/' % FOLDER_PATH,"
+            f" 'service_description': [{{'$regex': '/mnt/{i}$'}}]}}}},\n"
+            for i in range(_NUM_RULES_PER_FOLDER)
+        )
+        + "] + checkgroup_parameters['filesystem']\n"
+    )
+
+
+@pytest.fixture(name="site_config", scope="module")
+def fixture_site_config(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    root = tmp_path_factory.mktemp("site")
+    (root / "main.mk").write_text("")
+    for index in range(_NUM_FOLDERS):
+        _write_folder(root / "conf.d" / "wato" / f"folder{index}", f"folder{index}")
+    # Files modified just now are always hashed. Let them look like an older configuration.
+    for path in root.rglob("*.mk"):
+        os.utime(path, (0, 0))
+    return root
+
+
+@pytest.fixture(autouse=True)
+def patch_paths(monkeypatch: pytest.MonkeyPatch, site_config: Path, tmp_path: Path) -> None:
+    monkeypatch.setattr(cmk.utils.paths, "main_config_file", site_config / "main.mk")
+    monkeypatch.setattr(cmk.utils.paths, "check_mk_config_dir", site_config / "conf.d")
+    monkeypatch.setattr(cmk.utils.paths, "final_config_file", site_config / "final.mk")
+    monkeypatch.setattr(cmk.utils.paths, "local_config_file", site_config / "local.mk")
+    monkeypatch.setattr(cmk.utils.paths, "tmp_dir", tmp_path)
+
+
+def test_load_config_files(benchmark: BenchmarkFixture) -> None:
+    def load() -> None:
+        config.load_default_config()
+        config._load_config(StorageFormat.STANDARD, with_conf_d=True)
+
+    benchmark.pedantic(load, rounds=5, iterations=1)  # type: ignore[no-untyped-call]
+
+
+def test_load_config_bundle(benchmark: BenchmarkFixture) -> None:
+    def load() -> None:
+        config.load_default_config()
+        config._load_config_bundled(StorageFormat.STANDARD, with_conf_d=True)
+
+    load()
+    assert list(
+        config.ConfigBundleStore.make_config_bundle_store_path(cmk.utils.paths.tmp_dir).glob(
+            "*.pkl"
+        )
+    )
+    benchmark.pedantic(load, rounds=5, iterations=1)  # type: ignore[no-untyped-call]
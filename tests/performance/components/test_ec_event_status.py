@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+"""Benchmark: Replaying a large syslog burst through the Event Console
+
+Opens an event for each message of a burst from many hosts, then cancels all of them again with
+the corresponding OK messages. Every message looks up the open events of its rule and host, and
+every cancellation removes one of many open events. No site is needed:
+
+$ pytest tests/performance/components/test_ec_event_status.py
+"""
+
+import logging
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from pytest_benchmark.fixture import BenchmarkFixture
+
+import cmk.ec.export as ec
+from cmk.ccc.site import SiteId
+from cmk.ec.helpers import ECLock
+from cmk.ec.main import (
+    create_history,
+    default_slave_status_master,
+    EventServer,
+    EventStatus,
+    make_config,
+    StatusTableEvents,
+    StatusTableHistory,
+)
+from cmk.ec.perfcounters import Perfcounters
+from cmk.ec.settings import create_settings
+
+_NUM_HOSTS = 500
+_NUM_EVENTS_PER_HOST = 40
+_BATCH_SIZE = 500
+
+
+class _CoreWithoutHosts:
+    def query(self, query: str) -> Sequence[Sequence[Any]]:
+        return [[0]] if query.startswith("GET status\n") else []
+
+
+def _make_event_server(omd_root: Path) -> EventServer:
+    settings = create_settings("1.2.3i45", omd_root, ["mkeventd"])
+    limit = ec.EventLimit(action="stop", limit=_NUM_HOSTS * _NUM_EVENTS_PER_HOST)
+    config = make_config(ec.default_config()) | {
+        "archive_mode": "file",
+        "event_limit": ec.EventLimits(by_host=limit, by_rule=limit, overall=limit),
+    }
+    history = create_history(
+        settings,
+        config,
+        logging.getLogger("cmk.mkeventd"),
+        StatusTableEvents.columns,
+        StatusTableHistory.columns,
+    )
+    perfcounters = Perfcounters(logging.getLogger("cmk.mkeventd.lock.perfcounters"))
+    event_server = EventServer(
+        logging.getLogger("cmk.mkeventd.EventServer"),
+        settings,
+        config,
+        default_slave_status_master(),
+        perfcounters,
+        ECLock(logging.getLogger("cmk.mkeventd.configuration")),
+        history,
+        EventStatus(
+            settings,
+            config,
+            perfcounters,
+            history,
+            logging.getLogger("cmk.mkeventd.EventStatus"),
+            _CoreWithoutHosts(),
+        ),
+        StatusTableEvents.columns,
+        _CoreWithoutHosts(),
+        SiteId("heute"),
+        create_pipes_and_sockets=False,
+    )
+    rule = ec.Rule(
+        id="disk",
+        match=r"disk (\d+) failed",
+        match_ok=r"disk (\d+) recovered",
+        state=2,
+        sl=ec.ServiceLevel(precedence="message", value=0),
+        actions=[],
+        autodelete=False,
+        disabled=False,
+    )
+    event_server.reload_configuration(
+        config | {"rule_packs": [ec.default_rule_pack([rule])]}, history=history
+    )
+    return event_server
+
+
+def _burst(text: str) -> list[bytes]:
+    return [
+        f"<78>Oct 18 12:00:00 host{host} app[4711]: disk {disk} {text}".encode()
+        for disk in range(_NUM_EVENTS_PER_HOST)
+        for host in range(_NUM_HOSTS)
+    ]
+
+
+def _replay(event_server: EventServer, messages: Sequence[bytes]) -> None:
+    for start in range(0, len(messages), _BATCH_SIZE):
+        event_server.process_syslog_messages(messages[start : start + _BATCH_SIZE], None)
+
+
+def _open_and_cancel(omd_root: Path, problems: Sequence[bytes], recoveries: Sequence[bytes]) -> int:
+    event_server = _make_event_server(omd_root)
+    _replay(event_server, problems)
+    num_opened = len(event_server._event_status.events())
+    _replay(event_server, recoveries)
+    assert not event_server._event_status.events()
+    return num_opened
+
+
+def test_replay_syslog_burst(benchmark: BenchmarkFixture, tmp_path: Path) -> None:
+    problems, recoveries = _burst("failed"), _burst("recovered")
+    num_opened = benchmark.pedantic(  # type: ignore[no-untyped-call]
+        _open_and_cancel, args=(tmp_path, problems, recoveries), rounds=3, iterations=1
+    )
+    assert num_opened == len(problems)
+    benchmark.extra_info["messages"] = len(problems) + len(recoveries)
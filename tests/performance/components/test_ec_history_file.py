@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+"""Benchmark: Writing and querying a large Event Console history file
+
+Writes the history entries of many events from many hosts, then queries the history of a single
+host and of a single event, like the "Event Console history" views do. No site is needed:
+
+$ pytest tests/performance/components/test_ec_history_file.py
+"""
+
+import logging
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+import cmk.ec.export as ec
+from cmk.ccc.hostaddress import HostName
+from cmk.ec.history import History
+from cmk.ec.main import create_history, make_config, StatusTableEvents, StatusTableHistory
+from cmk.ec.query import QueryGET, StatusTable
+from cmk.ec.settings import create_settings
+
+_NUM_HOSTS = 1000
+_NUM_EVENTS_PER_HOST = 100
+
+
+def _make_history(omd_root: Path) -> History:
+    return create_history(
+        create_settings("1.2.3i45", omd_root, ["mkeventd"]),
+        make_config(ec.default_config()) | {"archive_mode": "file"},
+        logging.getLogger("cmk.mkeventd"),
+        StatusTableEvents.columns,
+        StatusTableHistory.columns,
+    )
+
+
+def _add_entries(history: History) -> None:
+    for eid in range(_NUM_HOSTS * _NUM_EVENTS_PER_HOST):
+        host = HostName(f"host{eid % _NUM_HOSTS}")
+        history.add(ec.Event(id=eid, host=host, text=f"service {eid} failed"), what="NEW")
+    history.close()
+
+
+@pytest.fixture(name="filled_history")
+def fixture_filled_history(tmp_path: Path) -> History:
+    history = _make_history(tmp_path)
+    _add_entries(history)
+    return history
+
+
+def _query(history: History, *headers: str) -> int:
+    logger = logging.getLogger("cmk.mkeventd")
+
+    def get_table(name: str) -> StatusTable:
+        return StatusTableHistory(logger, history)
+
+    return len(list(history.get(QueryGET(get_table, ["GET history", *headers], logger))))
+
+
+def test_add_entries(benchmark: BenchmarkFixture, tmp_path: Path) -> None:
+    rounds = iter(range(3))
+    benchmark.pedantic(  # type: ignore[no-untyped-call]
+        _add_entries,
+        setup=lambda: ((_make_history(tmp_path / str(next(rounds))),), {}),
+        rounds=3,
+        iterations=1,
+    )
+
+
+def test_query_host(benchmark: BenchmarkFixture, filled_history: History) -> None:
+    entries = benchmark.pedantic(  # type: ignore[no-untyped-call]
+        _query,
+        args=(filled_history, "Filter: event_host in host42"),
+        rounds=3,
+        iterations=1,
+    )
+    assert entries == _NUM_EVENTS_PER_HOST
+
+
+def test_query_event(benchmark: BenchmarkFixture, filled_history: History) -> None:
+    entries = benchmark.pedantic(  # type: ignore[no-untyped-call]
+        _query,
+        args=(filled_history, "Filter: event_id = 4242"),
+        rounds=3,
+        iterations=1,
+    )
+    assert entries == 1
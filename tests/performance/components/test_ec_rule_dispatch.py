@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+"""Benchmark: Matching syslog messages against thousands of Event Console rules
+
+Every message is matched by one of many rules with distinct text patterns, which drops it, so
+only the rule matching is measured. No site is needed:
+
+$ pytest tests/performance/components/test_ec_rule_dispatch.py
+"""
+
+import logging
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from pytest_benchmark.fixture import BenchmarkFixture
+
+import cmk.ec.export as ec
+from cmk.ccc.site import SiteId
+from cmk.ec.helpers import ECLock
+from cmk.ec.main import (
+    create_history,
+    default_slave_status_master,
+    EventServer,
+    EventStatus,
+    make_config,
+    StatusTableEvents,
+    StatusTableHistory,
+)
+from cmk.ec.perfcounters import Perfcounters
+from cmk.ec.settings import create_settings
+
+_NUM_RULES = 2000
+_NUM_MESSAGES = 10000
+_BATCH_SIZE = 500
+
+
+class _CoreWithoutHosts:
+    def query(self, query: str) -> Sequence[Sequence[Any]]:
+        return [[0]] if query.startswith("GET status\n") else []
+
+
+def _make_event_server(omd_root: Path) -> EventServer:
+    settings = create_settings("1.2.3i45", omd_root, ["mkeventd"])
+    config = make_config(ec.default_config()) | {"archive_mode": "file"}
+    history = create_history(
+        settings,
+        config,
+        logging.getLogger("cmk.mkeventd"),
+        StatusTableEvents.columns,
+        StatusTableHistory.columns,
+    )
+    perfcounters = Perfcounters(logging.getLogger("cmk.mkeventd.lock.perfcounters"))
+    event_server = EventServer(
+        logging.getLogger("cmk.mkeventd.EventServer"),
+        settings,
+        config,
+        default_slave_status_master(),
+        perfcounters,
+        ECLock(logging.getLogger("cmk.mkeventd.configuration")),
+        history,
+        EventStatus(
+            settings,
+            config,
+            perfcounters,
+            history,
+            logging.getLogger("cmk.mkeventd.EventStatus"),
+            _CoreWithoutHosts(),
+        ),
+        StatusTableEvents.columns,
+        _CoreWithoutHosts(),
+        SiteId("heute"),
+        create_pipes_and_sockets=False,
+    )
+    rules = [
+        ec.Rule(
+            id=f"service{number}",
+            match=rf"service{number} (\d+) failed" if number % 2 else f"service{number} crashed",
+            match_host=f"host{number % 100}" if number % 3 else r"^host\d+$",
+            state=2,
+            sl=ec.ServiceLevel(precedence="message", value=0),
+            drop=True,
+            disabled=False,
+        )
+        for number in range(_NUM_RULES)
+    ]
+    event_server.reload_configuration(
+        config | {"rule_packs": [ec.default_rule_pack(rules)]}, history=history
+    )
+    return event_server
+
+
+def _messages() -> list[bytes]:
+    return [
+        f"<78>Oct 18 12:00:00 host{number % 100} app[4711]: service{number} 42 failed".encode()
+        if number % 2
+        else f"<78>Oct 18 12:00:00 host{number % 100} app[4711]: service{number} crashed".encode()
+        for number in (message * 7919 % _NUM_RULES for message in range(_NUM_MESSAGES))
+    ]
+
+
+def _match(event_server: EventServer, messages: Sequence[bytes]) -> None:
+    for start in range(0, len(messages), _BATCH_SIZE):
+        event_server.process_syslog_messages(messages[start : start + _BATCH_SIZE], None)
+
+
+def test_match_rules(benchmark: BenchmarkFixture, tmp_path: Path) -> None:
+    event_server = _make_event_server(tmp_path)
+    messages = _messages()
+    benchmark.pedantic(  # type: ignore[no-untyped-call]
+        _match, args=(event_server, messages), rounds=3, iterations=1
+    )
+    assert event_server._perfcounters._counters["rule_hits"] == 3 * len(messages)
+    assert not event_server._event_status.events()
+    benchmark.extra_info["messages"] = len(messages)
+    benchmark.extra_info["rules"] = _NUM_RULES
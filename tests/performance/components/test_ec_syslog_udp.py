@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+"""Benchmark: Receiving a burst of syslog messages via UDP
+
+A load generator sends the burst at a fixed rate to the builtin syslog server of a running Event
+Console, which has some rules to match the messages against. The messages the kernel had to
+drop are reported in extra_info. No site is needed:
+
+$ pytest tests/performance/components/test_ec_syslog_udp.py
+"""
+
+import logging
+import socket
+import time
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+import cmk.ec.export as ec
+from cmk.ccc.site import SiteId
+from cmk.ec.helpers import ECLock
+from cmk.ec.main import (
+    create_history,
+    default_slave_status_master,
+    EventServer,
+    EventStatus,
+    make_config,
+    StatusTableEvents,
+    StatusTableHistory,
+)
+from cmk.ec.perfcounters import Perfcounters
+from cmk.ec.settings import create_settings
+
+_NUM_RULES = 200
+_NUM_MESSAGES = 50000
+_RATE = 10000  # messages per second
+
+
+class _CoreWithoutHosts:
+    def query(self, query: str) -> Sequence[Sequence[Any]]:
+        return [[0]] if query.startswith("GET status\n") else []
+
+
+@pytest.fixture(name="event_server")
+def fixture_event_server(tmp_path: Path) -> Iterator[tuple[EventServer, tuple[str, int]]]:
+    syslog_udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    syslog_udp.bind(("127.0.0.1", 0))
+    address = syslog_udp.getsockname()
+    settings = create_settings(
+        "1.2.3i45", tmp_path, ["mkeventd", "--syslog", "--syslog-fd", str(syslog_udp.detach())]
+    )
+    settings.paths.event_pipe.value.parent.mkdir(parents=True)
+    settings.paths.spool_dir.value.mkdir(parents=True)
+    config = make_config(ec.default_config()) | {"archive_mode": "file"}
+    history = create_history(
+        settings,
+        config,
+        logging.getLogger("cmk.mkeventd"),
+        StatusTableEvents.columns,
+        StatusTableHistory.columns,
+    )
+    perfcounters = Perfcounters(logging.getLogger("cmk.mkeventd.lock.perfcounters"))
+    event_server = EventServer(
+        logging.getLogger("cmk.mkeventd.EventServer"),
+        settings,
+        config,
+        default_slave_status_master(),
+        perfcounters,
+        ECLock(logging.getLogger("cmk.mkeventd.configuration")),
+        history,
+        EventStatus(
+            settings,
+            config,
+            perfcounters,
+            history,
+            logging.getLogger("cmk.mkeventd.EventStatus"),
+            _CoreWithoutHosts(),
+        ),
+        StatusTableEvents.columns,
+        _CoreWithoutHosts(),
+        SiteId("heute"),
+    )
+    rules = [
+        ec.Rule(
+            id=f"service{number}",
+            match=rf"service{number} (\d+) failed",
+            state=2,
+            sl=ec.ServiceLevel(precedence="message", value=0),
+            drop=True,
+            disabled=False,
+        )
+        for number in range(_NUM_RULES)
+    ]
+    event_server.reload_configuration(
+        config | {"rule_packs": [ec.default_rule_pack(rules)]}, history=history
+    )
+    event_server.start()
+    try:
+        yield event_server, address
+    finally:
+        event_server.terminate()
+        event_server.join()
+
+
+def _num_processed(event_server: EventServer) -> int:
+    return event_server._perfcounters._counters["messages"]
+
+
+def _send_burst(event_server: EventServer, address: tuple[str, int]) -> int:
+    """Send the burst and wait until the event server is done, returns the number of drops"""
+    already_processed = _num_processed(event_server)
+    start = time.monotonic()
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as client:
+        for number in range(_NUM_MESSAGES):
+            client.sendto(
+                b"<78>Oct 18 12:00:00 host%d app[4711]: service%d 42 failed"
+                % (number % 100, number % _NUM_RULES),
+                address,
+            )
+            if number % 100 == 0 and (ahead := number / _RATE - (time.monotonic() - start)) > 0:
+                time.sleep(ahead)
+    processed = -1
+    while processed != (processed := _num_processed(event_server) - already_processed):
+        time.sleep(1)
+    return _NUM_MESSAGES - processed
+
+
+def test_receive_syslog_burst(
+    benchmark: BenchmarkFixture, event_server: tuple[EventServer, tuple[str, int]]
+) -> None:
+    drops = benchmark.pedantic(  # type: ignore[no-untyped-call]
+        _send_burst, args=event_server, rounds=3, iterations=1
+    )
+    benchmark.extra_info["messages"] = _NUM_MESSAGES
+    benchmark.extra_info["drops"] = drops
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+"""Benchmark: Forwarding the piggyback data of a large source to another site
+
+Publishes the data of all piggybacked hosts of a source on a channel that delivers to an
+in-memory stand-in for the message broker, then lets the receiving side store it. Compares
+one message per piggybacked host to combined payloads. No site is needed:
+
+$ pytest tests/performance/components/test_piggyback_hub.py
+"""
+
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from unittest.mock import Mock
+
+import pika
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from cmk.ccc.hostaddress import HostName
+from cmk.messaging import AppName, Channel, DeliveryTag, RoutingKey
+from cmk.piggyback.backend import PiggybackMessage, PiggybackMetaData
+from cmk.piggyback.hub._payload import make_payloads, PiggybackPayload, save_payload_on_message
+
+_NUM_PIGGYBACKED_HOSTS = 5000
+_RAW_DATA = b"<<<section>>>\n" + b"some line of agent output\n" * 80
+
+
+class _BrokerStandIn:
+    def __init__(self) -> None:
+        self.bodies: list[bytes] = []
+
+    def queue_declare(self, queue: str, *, arguments: object = None) -> None:
+        pass
+
+    def queue_bind(
+        self, queue: str, exchange: str, routing_key: str, arguments: None = None
+    ) -> None:
+        pass
+
+    def basic_publish(
+        self,
+        exchange: str,
+        routing_key: str,
+        body: bytes,
+        properties: pika.BasicProperties | None,
+    ) -> None:
+        self.bodies.append(body)
+
+    def basic_consume(self, queue: str, on_message_callback: object, auto_ack: bool) -> None:
+        pass
+
+    def start_consuming(self) -> None:
+        pass
+
+    def basic_ack(self, delivery_tag: int, multiple: bool) -> None:
+        pass
+
+
+@pytest.fixture(name="messages", scope="module")
+def fixture_messages() -> Sequence[PiggybackMessage]:
+    return [
+        PiggybackMessage(
+            meta=PiggybackMetaData(
+                source=HostName("vcenter"),
+                piggybacked=HostName(f"vm{i}"),
+                last_update=1640000020,
+                last_contact=1640000000,
+            ),
+            raw_data=_RAW_DATA,
+        )
+        for i in range(_NUM_PIGGYBACKED_HOSTS)
+    ]
+
+
+def _forward(
+    messages: Sequence[PiggybackMessage],
+    make: Callable[[Sequence[PiggybackMessage]], Sequence[PiggybackPayload]],
+    omd_root: Path,
+) -> int:
+    broker = _BrokerStandIn()
+    channel = Channel(AppName("piggyback-hub"), broker, PiggybackPayload)
+    for payload in make(messages):
+        channel.publish_for_site("remote", payload, routing=RoutingKey("payload"))
+
+    on_message = save_payload_on_message(Mock(), omd_root)
+    for body in broker.bodies:
+        on_message(Mock(), DeliveryTag(0), PiggybackPayload.model_validate_json(body))
+    return len(broker.bodies)
+
+
+def _one_payload_per_message(messages: Sequence[PiggybackMessage]) -> Sequence[PiggybackPayload]:
+    return [PiggybackPayload.from_message(m) for m in messages]
+
+
+@pytest.mark.parametrize(
+    "make",
+    [_one_payload_per_message, make_payloads],
+    ids=["per-message", "combined"],
+)
+def test_forward_payloads(
+    benchmark: BenchmarkFixture,
+    messages: Sequence[PiggybackMessage],
+    make: Callable[[Sequence[PiggybackMessage]], Sequence[PiggybackPayload]],
+    tmp_path: Path,
+) -> None:
+    num_published = benchmark.pedantic(  # type: ignore[no-untyped-call]
+        _forward, args=(messages, make, tmp_path), rounds=5, iterations=1
+    )
+    benchmark.extra_info["broker_messages"] = num_published
+    benchmark.extra_info["payload_mb"] = len(messages) * len(_RAW_DATA) / 1e6
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+"""Benchmark: Looking up and cleaning up piggyback data of a large source
+
+A single source (think vCenter or a Kubernetes cluster) feeds 50k piggybacked hosts, a few
+other sources feed some more. Compares scanning the piggyback directories to using the index.
+No site is needed:
+
+$ pytest tests/performance/components/test_piggyback_index.py
+"""
+
+import time
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from cmk.ccc.hostaddress import HostName
+from cmk.piggyback.backend import _storage, cleanup_piggyback_files, store_piggyback_raw_data
+from cmk.piggyback.backend._paths import index_dir
+
+_NUM_PIGGYBACKED_HOSTS = 50000
+_NUM_SMALL_SOURCES = 10
+_NUM_HOSTS_PER_SMALL_SOURCE = 100
+
+_BIG_SOURCE = HostName("vcenter")
+_SMALL_SOURCE = HostName("small-source0")
+
+
+@pytest.fixture(name="omd_root", scope="module")
+def fixture_omd_root(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    omd_root = tmp_path_factory.mktemp("site")
+    now = time.time()
+    store_piggyback_raw_data(
+        _BIG_SOURCE,
+        {HostName(f"vm{i}"): (b"<<<section>>>", b"data") for i in range(_NUM_PIGGYBACKED_HOSTS)},
+        message_timestamp=now,
+        contact_timestamp=now,
+        omd_root=omd_root,
+    )
+    for index in range(_NUM_SMALL_SOURCES):
+        store_piggyback_raw_data(
+            HostName(f"small-source{index}"),
+            {
+                HostName(f"pod{index}-{i}"): (b"<<<section>>>", b"data")
+                for i in range(_NUM_HOSTS_PER_SMALL_SOURCE)
+            },
+            message_timestamp=now,
+            contact_timestamp=now,
+            omd_root=omd_root,
+        )
+    # Complete the index
+    cleanup_piggyback_files(3600, (), omd_root)
+    return omd_root
+
+
+@pytest.fixture(name="indexed", params=[False, True], ids=["scan", "index"])
+def fixture_indexed(request: pytest.FixtureRequest, omd_root: Path) -> bool:
+    marker = index_dir(omd_root) / ".complete"
+    if request.param:
+        marker.touch()
+    else:
+        marker.unlink(missing_ok=True)
+    return bool(request.param)
+
+
+def test_piggybacked_hosts_for_small_source(
+    benchmark: BenchmarkFixture, omd_root: Path, indexed: bool
+) -> None:
+    hosts = benchmark.pedantic(  # type: ignore[no-untyped-call]
+        _storage._get_piggybacked_hosts_for_source,
+        args=(omd_root, _SMALL_SOURCE),
+        rounds=5,
+        iterations=1,
+    )
+    assert len(hosts) == _NUM_HOSTS_PER_SMALL_SOURCE
+
+
+def test_piggybacked_hosts_for_big_source(
+    benchmark: BenchmarkFixture, omd_root: Path, indexed: bool
+) -> None:
+    hosts = benchmark.pedantic(  # type: ignore[no-untyped-call]
+        _storage._get_piggybacked_hosts_for_source,
+        args=(omd_root, _BIG_SOURCE),
+        rounds=5,
+        iterations=1,
+    )
+    assert len(hosts) == _NUM_PIGGYBACKED_HOSTS
+
+
+def test_cleanup_piggyback_files(
+    benchmark: BenchmarkFixture, omd_root: Path, indexed: bool
+) -> None:
+    def cleanup() -> None:
+        cleanup_piggyback_files(3600, (), omd_root)
+        if not indexed:
+            # The scan also completes the index. Don't let it spoil the next round.
+            (index_dir(omd_root) / ".complete").unlink()
+
+    benchmark.pedantic(cleanup, rounds=5, iterations=1)  # type: ignore[no-untyped-call]
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+"""Benchmark: Host matching of the RulesetOptimizer
+
+Compares the bitmap index based evaluation of host conditions with the evaluation
+host by host, and the update of single hosts with recomputing everything. No site
+is needed:
+
+$ pytest tests/performance/components/test_ruleset_matcher.py --benchmark-group-by=param:hosts
+"""
+
+from collections.abc import Callable, Sequence
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from cmk.ccc.hostaddress import HostName
+from cmk.utils.labels import Labels
+from cmk.utils.rulesets.ruleset_matcher import (
+    RuleConditionsSpec,
+    RulesetMatcher,
+    RulesetOptimizer,
+    RuleSpec,
+)
+from cmk.utils.tags import TagGroupID, TagID
+
+_CONDITIONS: Sequence[RuleConditionsSpec] = [
+    {"host_tags": {TagGroupID("criticality"): TagID("prod")}},
+    {"host_tags": {TagGroupID("networking"): {"$ne": TagID("lan")}}},
+    {
+        "host_tags": {
+            TagGroupID("criticality"): {"$or": [TagID("prod"), TagID("critical")]},
+            TagGroupID("networking"): {"$nor": [TagID("wan"), TagID("dmz")]},
+        },
+        "host_label_groups": [("and", [("and", "os:linux")])],
+    },
+    {
+        "host_name": [HostName("host00001"), {"$regex": "host001"}],
+        "host_tags": {TagGroupID("criticality"): TagID("test")},
+    },
+    {
+        "host_name": {"$nor": [{"$regex": "host002"}]},
+        "host_label_groups": [
+            ("and", [("and", "os:windows"), ("or", "env:b")]),
+            ("not", [("and", "env:c")]),
+        ],
+        "host_folder": "/sub/",
+    },
+]
+
+
+def _labels_of_host(host_name: HostName) -> Labels:
+    i = int(host_name[4:])
+    return {"os": ("linux", "windows")[i % 2], "env": ("a", "b", "c")[i % 3]}
+
+
+def _make_optimizer(num_hosts: int) -> RulesetOptimizer:
+    host_tags = {
+        HostName(f"host{i:05}"): {
+            TagGroupID("criticality"): TagID(("prod", "test", "critical")[i % 3]),
+            TagGroupID("networking"): TagID(("lan", "wan", "dmz", "none")[i % 4]),
+        }
+        for i in range(num_hosts)
+    }
+    matcher = RulesetMatcher(
+        host_tags=host_tags,
+        host_paths={hn: "/sub/" if i % 2 else "/" for i, hn in enumerate(host_tags)},
+        all_configured_hosts=frozenset(host_tags),
+        clusters_of={},
+        nodes_of={},
+    )
+    return matcher.ruleset_optimizer
+
+
+def _match_by_bitmap_index(optimizer: RulesetOptimizer) -> Callable[[], None]:
+    def _run() -> None:
+        optimizer.clear_caches()
+        for condition in _CONDITIONS:
+            optimizer._all_matching_hosts(condition, False, _labels_of_host)
+
+    return _run
+
+
+def _match_by_iteration(optimizer: RulesetOptimizer) -> Callable[[], None]:
+    def _run() -> None:
+        for condition in _CONDITIONS:
+            optimizer._match_hosts_by_iteration(
+                optimizer._get_hosts_within_folder(condition.get("host_folder", "/"), False),
+                condition.get("host_name"),
+                condition.get("host_tags", {}),
+                condition.get("host_label_groups", []),
+                _labels_of_host,
+            )
+
+    return _run
+
+
+@pytest.mark.parametrize("hosts", [1_000, 10_000, 80_000])
+@pytest.mark.parametrize(
+    "method",
+    [
+        pytest.param(_match_by_bitmap_index, id="bitmap_index"),
+        pytest.param(_match_by_iteration, id="iteration"),
+    ],
+)
+def test_all_matching_hosts(
+    benchmark: BenchmarkFixture,
+    hosts: int,
+    method: Callable[[RulesetOptimizer], Callable[[], None]],
+) -> None:
+    optimizer = _make_optimizer(hosts)
+    benchmark.pedantic(  # type: ignore[no-untyped-call]
+        method(optimizer),
+        rounds=5,
+        iterations=1,
+        warmup_rounds=1,
+    )
+
+
+def test_bitmap_index_equals_iteration() -> None:
+    optimizer = _make_optimizer(1_000)
+    for condition in _CONDITIONS:
+        assert optimizer._all_matching_hosts(
+            condition, False, _labels_of_host
+        ) == optimizer._match_hosts_by_iteration(
+            optimizer._get_hosts_within_folder(condition.get("host_folder", "/"), False),
+            condition.get("host_name"),
+            condition.get("host_tags", {}),
+            condition.get("host_label_groups", []),
+            _labels_of_host,
+        )
+
+
+def _service_ruleset(num_rules: int) -> Sequence[RuleSpec[int]]:
+    return [
+        {
+            "id": str(i),
+            "value": i,
+            "condition": {
+                "service_description": (
+                    [{"$regex": f"Interface .*{i}$"}] if i % 2 else [f"Filesystem /mnt/{i}"]
+                )
+            },
+        }
+        for i in range(num_rules)
+    ]
+
+
+_SERVICE_NAMES = [
+    *(f"Interface {i}" for i in range(200)),
+    *(f"Filesystem /mnt/{i}" for i in range(200)),
+    "CPU load",
+    "Memory",
+]
+
+
+def _service_values_by_combined_matcher(
+    matcher: RulesetMatcher, ruleset: Sequence[RuleSpec[int]]
+) -> Callable[[], None]:
+    def _run() -> None:
+        matcher.ruleset_optimizer.clear_ruleset_caches()
+        for service_name in _SERVICE_NAMES:
+            matcher.get_service_values_all(
+                HostName("host00000"), service_name, {}, ruleset, _labels_of_host
+            )
+
+    return _run
+
+
+def _service_values_by_rule(
+    matcher: RulesetMatcher, ruleset: Sequence[RuleSpec[int]]
+) -> Callable[[], None]:
+    def _run() -> None:
+        matcher.ruleset_optimizer.clear_ruleset_caches()
+        for service_name in _SERVICE_NAMES:
+            [
+                value
+                for value, hosts, _label_groups, _label_groups_cache_id, (negate, pattern) in (
+                    matcher.ruleset_optimizer.get_service_ruleset(
+                        HostName("host00000"), ruleset, _labels_of_host
+                    )
+                )
+                if HostName("host00000") in hosts
+                and (pattern.match(service_name) is not None) is not negate
+            ]
+
+    return _run
+
+
+@pytest.mark.parametrize("rules", [10, 100, 1_000])
+@pytest.mark.parametrize(
+    "method",
+    [
+        pytest.param(_service_values_by_combined_matcher, id="combined_matcher"),
+        pytest.param(_service_values_by_rule, id="by_rule"),
+    ],
+)
+def test_get_service_values_all(
+    benchmark: BenchmarkFixture,
+    rules: int,
+    method: Callable[[RulesetMatcher, Sequence[RuleSpec[int]]], Callable[[], None]],
+) -> None:
+    matcher = _make_optimizer(1)._ruleset_matcher
+    benchmark.pedantic(  # type: ignore[no-untyped-call]
+        method(matcher, _service_ruleset(rules)),
+        rounds=5,
+        iterations=1,
+        warmup_rounds=1,
+    )
+
+
+def _host_rulesets() -> Sequence[Sequence[RuleSpec[int]]]:
+    return [
+        [{"id": f"{i}-{j}", "value": j, "condition": condition} for j in range(10)]
+        for i, condition in enumerate(_CONDITIONS)
+    ]
+
+
+def _update_single_host(matcher: RulesetMatcher) -> Callable[[], None]:
+    optimizer = matcher.ruleset_optimizer
+    host_tags = {hn: dict(tags) for hn, tags in optimizer._host_tags.items()}
+
+    def _run() -> None:
+        matcher.update_hosts(
+            [HostName("host00001")],
+            host_tags=host_tags,
+            host_paths=optimizer._host_paths,
+            labels_of_host=_labels_of_host,
+        )
+
+    return _run
+
+
+def _recompute_all_hosts(matcher: RulesetMatcher) -> Callable[[], None]:
+    def _run() -> None:
+        matcher.clear_caches()
+        matcher.ruleset_optimizer.clear_ruleset_caches()
+        for ruleset in _host_rulesets():
+            matcher.get_host_values_all(HostName("host00001"), ruleset, _labels_of_host)
+
+    return _run
+
+
+@pytest.mark.parametrize("hosts", [10_000])
+@pytest.mark.parametrize(
+    "method",
+    [
+        pytest.param(_update_single_host, id="update_single_host"),
+        pytest.param(_recompute_all_hosts, id="recompute_all"),
+    ],
+)
+def test_update_hosts(
+    benchmark: BenchmarkFixture,
+    hosts: int,
+    method: Callable[[RulesetMatcher], Callable[[], None]],
+) -> None:
+    matcher = _make_optimizer(hosts)._ruleset_matcher
+    for ruleset in _host_rulesets():
+        matcher.get_host_values_all(HostName("host00001"), ruleset, _labels_of_host)
+    benchmark.pedantic(  # type: ignore[no-untyped-call]
+        method(matcher),
+        rounds=5,
+        iterations=1,
+        warmup_rounds=1,
+    )
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+"""Benchmark: Fetching SNMP tables from stored walks
+
+Walks all columns of a large interface table and gets some scalars, like a fetcher
+simulating a device from a stored walk. No site is needed:
+
+$ pytest tests/performance/components/test_stored_walk.py
+"""
+
+import logging
+from pathlib import Path
+
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from cmk.ccc.hostaddress import HostAddress, HostName
+from cmk.fetchers.snmp_backend import StoredWalkSNMPBackend
+from cmk.snmplib import SNMPBackendEnum, SNMPHostConfig, SNMPVersion
+
+_NUM_INTERFACES = 5000
+_NUM_COLUMNS = 20
+
+
+def _write_walk(path: Path) -> None:
+    with path.open("w") as f:
+        f.write(".1.3.6.1.2.1.1.1.0 Linux device\n.1.3.6.1.2.1.1.2.0 .1.3.6.1.4.1.8072.3.2.10\n")
+        for column in range(1, _NUM_COLUMNS + 1):
+            for index in range(1, _NUM_INTERFACES + 1):
+                f.write(f'.1.3.6.1.2.1.2.2.1.{column}.{index} "value {column} {index}"\n')
+
+
+def test_fetch_from_stored_walk(benchmark: BenchmarkFixture, tmp_path: Path) -> None:
+    _write_walk(tmp_path / "walkhost")
+    backend = StoredWalkSNMPBackend(
+        SNMPHostConfig(
+            is_ipv6_primary=False,
+            hostname=HostName("walkhost"),
+            ipaddress=HostAddress("127.0.0.1"),
+            credentials="public",
+            port=161,
+            bulkwalk_enabled=True,
+            snmp_version=SNMPVersion.V2C,
+            bulk_walk_size_of=10,
+            timing={},
+            oid_range_limits={},
+            snmpv3_contexts=[],
+            character_encoding=None,
+            snmp_backend=SNMPBackendEnum.STORED_WALK,
+        ),
+        logging.getLogger("test"),
+        tmp_path / "walkhost",
+    )
+
+    def fetch() -> None:
+        backend.get(".1.3.6.1.2.1.1.1.0", context="")
+        backend.get(".1.3.6.1.2.1.1.2.0", context="")
+        for column in (1, 2, 7, 8, 10, 16):
+            backend.walk(f".1.3.6.1.2.1.2.2.1.{column}", context="")
+
+    benchmark.pedantic(fetch, rounds=5, iterations=1)  # type: ignore[no-untyped-call]
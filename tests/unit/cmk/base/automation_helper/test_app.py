@@ -27,8 +27,10 @@ from cmk.base.automation_helper._app import (
     _reloader_task,
     _State,
     AutomationEngine,
+    CacheStatisticsResponse,
     HealthCheckResponse,
     make_application,
+    PreloadedConfig,
 )
 from cmk.base.automation_helper._cache import Cache, CacheError
 from cmk.base.automation_helper._config import ReloaderConfig
@@ -38,6 +40,7 @@ from cmk.ccc.site import SiteId
 from cmk.ccc.version import edition, Version
 from cmk.checkengine.plugins import AgentBasedPlugins
 from cmk.utils import paths
+from cmk.utils.caching import cache_manager
 from cmk.utils.labels import Labels
 from tests.testlib.common.utils import wait_until
 from tests.unit.cmk.base.empty_config import EMPTY_CONFIG
@@ -114,11 +117,13 @@ def _make_test_client(
         LoadingResult,
     ],
     clear_caches_before_each_call: Callable[[ConfigCache], None],
+    *,
     reloader_config: ReloaderConfig = ReloaderConfig(
         active=True,
         poll_interval=1.0,
         cooldown_interval=5.0,
     ),
+    preloaded: PreloadedConfig | None = None,
 ) -> TestClient:
     return TestClient(
         make_application(
@@ -127,6 +132,7 @@ def _make_test_client(
             reloader_config=reloader_config,
             reload_config=reload_config,
             clear_caches_before_each_call=clear_caches_before_each_call,
+            preloaded=preloaded,
         )
     )
 
@@ -151,8 +157,10 @@ def test_reloader_is_running(mocker: MockerFixture, cache: Cache) -> None:
         assert now > current_last_reload_at
         cache.store_last_detected_change(now)
         wait_until(
-            lambda: HealthCheckResponse.model_validate(client.get("/health").json()).last_reload_at
-            > current_last_reload_at,
+            lambda: (
+                HealthCheckResponse.model_validate(client.get("/health").json()).last_reload_at
+                > current_last_reload_at
+            ),
             timeout=0.25,
             interval=0.025,
         )
@@ -252,6 +260,48 @@ def test_automation_reloads_if_necessary(mocker: MockerFixture, cache: Cache) ->
     mock_clear_caches_before_each_call.assert_called_once()
 
 
+def test_preloaded_automation_does_not_reload(mocker: MockerFixture, cache: Cache) -> None:
+    mock_reload_config = mocker.MagicMock()
+    with _make_test_client(
+        _DummyAutomationEngineSuccess(),
+        cache,
+        mock_reload_config,
+        mocker.MagicMock(),
+        reloader_config=ReloaderConfig(active=False, poll_interval=1.0, cooldown_interval=5.0),
+        preloaded=PreloadedConfig(
+            plugins=mocker.MagicMock(),
+            loading_result=mocker.MagicMock(),
+            loaded_at=1,
+        ),
+    ) as client:
+        cache.store_last_detected_change(time.time())
+        response = client.post("/automation", json=_EXAMPLE_AUTOMATION_PAYLOAD)
+
+    # The supervisor reloads the configuration and replaces the worker
+    assert AutomationResponse.model_validate(response.json()).stdout == "stdout_success"
+    mock_reload_config.assert_not_called()
+
+
+def test_cache_statistics(cache: Cache) -> None:
+    cache_manager.obtain_cache("test_cache_statistics")["key"] = "value"
+    with _make_test_client(
+        _DummyAutomationEngineSuccess(),
+        cache,
+        lambda plugins, get_builtin_host_labels: LoadingResult(
+            loaded_config=EMPTY_CONFIG,
+            config_cache=ConfigCache(EMPTY_CONFIG, get_builtin_host_labels),
+        ),
+        lambda ruleset_matcher: None,
+    ) as client:
+        resp = client.get("/cache-statistics")
+
+    assert resp.status_code == 200
+    assert (
+        CacheStatisticsResponse.model_validate(resp.json()).caches["test_cache_statistics"].size
+        == 1
+    )
+
+
 def test_health_check(cache: Cache) -> None:
     loaded_config = EMPTY_CONFIG
     with _make_test_client(
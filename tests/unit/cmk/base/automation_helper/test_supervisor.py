@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import gc
+import os
+import time
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI
+
+from cmk.base.automation_helper._app import PreloadedConfig
+from cmk.base.automation_helper._cache import Cache
+from cmk.base.automation_helper._config import ServerConfig
+from cmk.base.automation_helper._supervisor import (
+    _exit_status,
+    _memory_usage,
+    _stop_processes,
+    _Supervisor,
+)
+from cmk.checkengine.plugins import AgentBasedPlugins
+
+
+def _make_supervisor(
+    tmp_path: Path,
+    preloaded: list[PreloadedConfig],
+    watch: Callable[[], AbstractContextManager[None]] = nullcontext,
+) -> _Supervisor:
+    def load(plugins: AgentBasedPlugins | None) -> PreloadedConfig:
+        if not preloaded:
+            raise RuntimeError("broken configuration")
+        return preloaded.pop(0)
+
+    return _Supervisor(
+        ServerConfig(
+            unix_socket_path=tmp_path / "automation-helper.sock",
+            unix_socket_permissions=0o600,
+            pid_file=tmp_path / "automation-helper.pid",
+            access_log=tmp_path / "access.log",
+            error_log=tmp_path / "error.log",
+            num_workers=2,
+            preload=True,
+        ),
+        -1,
+        load=load,
+        make_application=lambda preloaded: FastAPI(),
+        configure_worker=lambda: None,
+        watch=watch,
+    )
+
+
+def _preloaded_config(loaded_at: float) -> PreloadedConfig:
+    return PreloadedConfig(
+        plugins=Mock(),
+        loading_result=Mock(),
+        loaded_at=loaded_at,
+    )
+
+
+@pytest.fixture(name="unfreeze_gc", autouse=True)
+def fixture_unfreeze_gc() -> Iterator[None]:
+    yield
+    gc.unfreeze()
+
+
+def test_preload_freezes_loaded_objects(tmp_path: Path) -> None:
+    supervisor = _make_supervisor(tmp_path, [_preloaded_config(1)])
+
+    assert supervisor._preload()
+    assert gc.get_freeze_count() > 0
+
+
+def test_preload_keeps_previous_config_on_error(tmp_path: Path) -> None:
+    first = _preloaded_config(1)
+    supervisor = _make_supervisor(tmp_path, [first])
+    assert supervisor._preload()
+
+    assert not supervisor._preload()
+    assert supervisor._preloaded is first
+
+
+def test_reload_required(tmp_path: Path, cache: Cache) -> None:
+    supervisor = _make_supervisor(tmp_path, [_preloaded_config(1)])
+    supervisor._preload()
+    assert not supervisor._reload_required(cache, cooldown_interval=0)
+
+    cache.store_last_detected_change(time.time())
+    assert not supervisor._reload_required(cache, cooldown_interval=3600)
+    assert supervisor._reload_required(cache, cooldown_interval=0)
+
+    # Don't retry until the next change, even if loading failed
+    supervisor._preload()
+    assert not supervisor._reload_required(cache, cooldown_interval=0)
+
+
+def test_memory_usage() -> None:
+    assert _memory_usage(os.getpid()).startswith("RSS ")
+
+
+def test_watcher_runs_in_own_process(tmp_path: Path) -> None:
+    watcher_pid_file = tmp_path / "watcher.pid"
+
+    @contextmanager
+    def watch() -> Iterator[None]:
+        watcher_pid_file.write_text(f"{os.getpid()}\n")
+        yield
+
+    supervisor = _make_supervisor(tmp_path, [], watch=watch)
+    pid = supervisor._start_watcher()
+    try:
+        deadline = time.time() + 10
+        while not watcher_pid_file.exists() or not watcher_pid_file.read_text().endswith("\n"):
+            assert time.time() < deadline
+            time.sleep(0.01)
+        assert int(watcher_pid_file.read_text()) == pid
+        assert _exit_status(pid) is None
+    finally:
+        _stop_processes([pid])
+    assert _exit_status(pid) == 0
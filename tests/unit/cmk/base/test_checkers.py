@@ -4,12 +4,17 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 
+import os
+import signal
+import threading
 import time
 from collections.abc import Iterable, Mapping
+from pathlib import Path
 from typing import Literal
 
 import pytest
 
+import cmk.ccc.resulttype as result
 from cmk.agent_based.prediction_backend import (
     InjectedParameters,
     PredictionInfo,
@@ -18,13 +23,19 @@ from cmk.agent_based.prediction_backend import (
 from cmk.agent_based.v1 import Metric, Result, State
 from cmk.agent_based.v2 import CheckResult
 from cmk.base import checkers
+from cmk.base.sources import Source
+from cmk.ccc.cpu_tracking import Snapshot
+from cmk.ccc.exceptions import MKTimeout
 from cmk.ccc.hostaddress import HostName
 from cmk.checkengine.checkerplugin import ConfiguredService
 from cmk.checkengine.checkresults import ServiceCheckResult, SubmittableServiceCheckResult
 from cmk.checkengine.fetcher import HostKey
 from cmk.checkengine.parameters import TimespecificParameters, TimespecificParameterSet
 from cmk.checkengine.plugins import CheckPluginName
-from cmk.helper_interface import SourceType
+from cmk.fetchers import Fetcher, Mode, PlainFetcherTrigger, StoredSecrets
+from cmk.fetchers.filecache import FileCache, FileCacheOptions, NoCache
+from cmk.helper_interface import AgentRawData, FetcherError, FetcherType, SourceInfo, SourceType
+from cmk.snmplib import SNMPRawData
 from cmk.utils.servicename import ServiceName
 
 
@@ -242,3 +253,136 @@ def test_prediction_injection() -> None:
             ("my_reference_metric", *prediction),
         )
     }
+
+
+class _SlowFetcher(Fetcher[AgentRawData]):
+    def __init__(self, delay: float, raw_data: AgentRawData | None) -> None:
+        self.delay = delay
+        self.raw_data = raw_data
+        self.closed = threading.Event()
+
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed.set()
+
+    def _fetch_from_io(self, mode: Mode) -> AgentRawData:
+        # Closing the fetcher aborts the fetch, like killing a special agent.
+        self.closed.wait(self.delay)
+        if self.raw_data is None:
+            raise FetcherError("no data")
+        return self.raw_data
+
+
+class _SlowSource(Source[AgentRawData]):
+    def __init__(self, ident: str, delay: float, raw_data: AgentRawData | None) -> None:
+        self.ident = ident
+        self.delay = delay
+        self.raw_data = raw_data
+        self.fetchers: list[_SlowFetcher] = []
+
+    def source_info(self) -> SourceInfo:
+        return SourceInfo(HostName("host"), None, self.ident, FetcherType.PROGRAM, SourceType.HOST)
+
+    def fetcher(self) -> Fetcher[AgentRawData]:
+        self.fetchers.append(_SlowFetcher(self.delay, self.raw_data))
+        return self.fetchers[-1]
+
+    def file_cache(
+        self, *, simulation: bool, file_cache_options: FileCacheOptions
+    ) -> FileCache[AgentRawData]:
+        return NoCache()
+
+
+def _fetch_slow_sources(
+    max_concurrent_fetches: int,
+) -> tuple[float, list[result.Result[AgentRawData | SNMPRawData, Exception]]]:
+    sources = [
+        _SlowSource("slow", 0.3, AgentRawData(b"<<<slow>>>")),
+        _SlowSource("broken", 0.1, None),
+        _SlowSource("fast", 0.0, AgentRawData(b"<<<fast>>>")),
+    ]
+    start = time.monotonic()
+    fetched = checkers._fetch_all(
+        PlainFetcherTrigger(),
+        sources,
+        FileCacheOptions(),
+        Mode.CHECKING,
+        StoredSecrets(path=Path("/dev/null"), secrets={}),
+        simulation=False,
+        max_concurrent_fetches=max_concurrent_fetches,
+    )
+    elapsed = time.monotonic() - start
+
+    assert [source_info.ident for source_info, _raw_data, _duration in fetched] == [
+        "slow",
+        "broken",
+        "fast",
+    ]
+    assert sum(
+        (duration for _source_info, _raw_data, duration in fetched), Snapshot.null()
+    ).process.elapsed == pytest.approx(elapsed, abs=0.05)
+    return elapsed, [raw_data for _source_info, raw_data, _duration in fetched]
+
+
+def test_fetch_all_sequentially() -> None:
+    elapsed, raw_data = _fetch_slow_sources(max_concurrent_fetches=1)
+
+    assert elapsed >= 0.4
+    assert raw_data[0] == result.OK(b"<<<slow>>>")
+    assert raw_data[1].is_error()
+    assert raw_data[2] == result.OK(b"<<<fast>>>")
+
+
+def test_fetch_all_concurrently() -> None:
+    elapsed, raw_data = _fetch_slow_sources(max_concurrent_fetches=3)
+
+    assert elapsed < 0.4
+    assert raw_data[0] == result.OK(b"<<<slow>>>")
+    assert raw_data[1].is_error()
+    assert raw_data[2] == result.OK(b"<<<fast>>>")
+
+
+def test_fetch_all_concurrently_timeout() -> None:
+    hanging = _SlowSource("hanging", 60.0, AgentRawData(b"<<<hanging>>>"))
+
+    def raise_timeout(_signum: int, _frame: object) -> None:
+        raise MKTimeout("Timed out")
+
+    previous_handler = signal.signal(signal.SIGALRM, raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, 0.1)
+    start = time.monotonic()
+    try:
+        with pytest.raises(MKTimeout):
+            checkers._fetch_all(
+                PlainFetcherTrigger(),
+                [hanging, _SlowSource("fast", 0.0, AgentRawData(b"<<<fast>>>"))],
+                FileCacheOptions(),
+                Mode.CHECKING,
+                StoredSecrets(path=Path("/dev/null"), secrets={}),
+                simulation=False,
+                max_concurrent_fetches=2,
+            )
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+    assert time.monotonic() - start < 10
+    (fetcher,) = hanging.fetchers
+    assert fetcher.closed.is_set()
+
+
+def test_share_out() -> None:
+    total = Snapshot(os.times_result((1.0, 0.5, 0.0, 0.0, 3.0)))
+    measured = [
+        Snapshot(os.times_result((2.0, 0.0, 0.0, 0.0, 3.0))),
+        Snapshot(os.times_result((2.0, 0.0, 0.0, 0.0, 1.0))),
+    ]
+
+    shares = checkers._share_out(total, measured)
+
+    assert [tuple(s.process) for s in shares] == [
+        (0.5, 0.25, 0.0, 0.0, 2.25),
+        (0.5, 0.25, 0.0, 0.0, 0.75),
+    ]
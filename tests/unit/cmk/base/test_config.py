@@ -8,6 +8,7 @@
 
 
 import itertools
+import os
 import re
 import shutil
 import socket
@@ -76,6 +77,7 @@ from cmk.snmplib import SNMPBackendEnum
 from cmk.utils.ip_lookup import IPStackConfig
 from cmk.utils.rulesets import RuleSetName
 from cmk.utils.rulesets.ruleset_matcher import BundledHostRulesetMatcher, RulesetMatcher, RuleSpec
+from cmk.utils.servicename import ServiceName
 from cmk.utils.tags import TagGroupID, TagID
 from tests.testlib.unit.base_configuration_scenario import Scenario
 
@@ -2822,6 +2824,94 @@ def test_explicit_setting_loading(patch_omd_site: None) -> None:
             shutil.rmtree(wato_main_folder / foldername, ignore_errors=True)
 
 
+def test_config_cache_update_hosts(monkeypatch: MonkeyPatch) -> None:
+    host1, host2 = HostName("host1"), HostName("host2")
+    ts = Scenario()
+    ts.add_host(host1, host_path="/wato/a/hosts.mk")
+    ts.add_host(host2, host_path="/wato/a/hosts.mk")
+    ts.set_ruleset(
+        "datasource_programs",
+        [
+            {"id": "1", "condition": {"host_folder": "/wato/b/"}, "value": "folder b"},
+            {
+                "id": "2",
+                "condition": {"host_tags": {TagGroupID("criticality"): TagID("test")}},
+                "value": "test",
+            },
+            {
+                "id": "3",
+                "condition": {"host_label_groups": [("and", [("and", "env:x")])]},
+                "value": "env x",
+            },
+        ],
+    )
+    config_cache = ts.apply(monkeypatch)
+    assert config_cache.datasource_programs(host1) == []
+
+    config.host_paths[host1] = "/wato/b/hosts.mk"
+    config.host_tags[host1] = {
+        **config.host_tags[host1],
+        TagGroupID("criticality"): TagID("test"),
+    }
+    config.host_labels[host1] = {"env": "x"}
+    config_cache.update_hosts([host1])
+
+    assert config_cache.host_path(host1) == "/wato/b/"
+    assert config_cache.host_tags.tags(host1)[TagGroupID("criticality")] == TagID("test")
+    assert config_cache.label_manager.labels_of_host(host1)["env"] == "x"
+    assert config_cache.datasource_programs(host1) == ["folder b", "test", "env x"]
+    assert config_cache.datasource_programs(host2) == []
+
+
+def test_config_cache_update_hosts_service_name_translations(monkeypatch: MonkeyPatch) -> None:
+    host1 = HostName("host1")
+    ts = Scenario()
+    ts.add_host(host1)
+    ts.set_ruleset(
+        "service_description_translation",
+        [
+            {
+                "id": "1",
+                "condition": {"host_label_groups": [("and", [("and", "env:x")])]},
+                "value": {"case": "upper"},
+            },
+        ],
+    )
+    config_cache = ts.apply(monkeypatch)
+    final_service_name_config = make_final_service_name_config(
+        config_cache._loaded_config, config_cache.ruleset_matcher
+    )
+
+    def service_name() -> ServiceName:
+        return final_service_name_config(
+            host1, "Interface 1", config_cache.label_manager.labels_of_host
+        )
+
+    assert service_name() == "Interface 1"
+
+    config.host_labels[host1] = {"env": "x"}
+    config_cache.update_hosts([host1])
+
+    assert service_name() == "INTERFACE 1"
+
+
+def test_config_cache_update_folders(monkeypatch: MonkeyPatch) -> None:
+    host1 = HostName("host1")
+    ts = Scenario()
+    ts.add_host(host1, host_path="/wato/a/hosts.mk")
+    ts.set_ruleset(
+        "datasource_programs",
+        [{"id": "1", "condition": {"host_folder": "/wato/b/"}, "value": "folder b"}],
+    )
+    config_cache = ts.apply(monkeypatch)
+    assert config_cache.datasource_programs(host1) == []
+
+    config.host_paths[host1] = "/wato/b/hosts.mk"
+    config_cache.update_folders(["/wato/b/"])
+
+    assert config_cache.datasource_programs(host1) == ["folder b"]
+
+
 @pytest.fixture(name="config_path")
 def fixture_config_path() -> Path:
     return Path(VersionedConfigPath(cmk.utils.paths.omd_root, 13))
@@ -2873,6 +2963,88 @@ class TestPackedConfigStore:
         assert store.read() == {"abc": 1}
 
 
+def test_load_config_from_bundle(monkeypatch: MonkeyPatch, patch_omd_site: None) -> None:
+    main_mk_file = cmk.utils.paths.main_config_file
+    get_builtin_host_labels = make_app(edition(cmk.utils.paths.omd_root)).get_builtin_host_labels
+    try:
+        main_mk_file.write_text(
+            "ipaddresses.update({'bundled-host': '127.0.0.1'})\nbundle_test_var = 1\n"
+        )
+        config.load(discovery_rulesets=(), get_builtin_host_labels=get_builtin_host_labels)
+        assert list(
+            config.ConfigLoadBundleStore.make_config_bundle_store_path(
+                cmk.utils.paths.tmp_dir
+            ).glob("*.pkl")
+        )
+
+        with monkeypatch.context() as m:
+            m.setattr(config, "_load_config", lambda *a, **kw: pytest.fail("not bundled"))
+            del config.__dict__["bundle_test_var"]
+            config.load(discovery_rulesets=(), get_builtin_host_labels=get_builtin_host_labels)
+
+        assert config.ipaddresses == {HostName("bundled-host"): HostAddress("127.0.0.1")}
+        # Mypy does not understand that we add some new member for testing
+        assert config.bundle_test_var == 1  # type: ignore[attr-defined]
+
+        main_mk_file.write_text("bundle_test_var = 2\n")
+        config.load(discovery_rulesets=(), get_builtin_host_labels=get_builtin_host_labels)
+
+        assert config.ipaddresses == {}
+        assert config.bundle_test_var == 2  # type: ignore[attr-defined]
+    finally:
+        main_mk_file.unlink()
+        config.__dict__.pop("bundle_test_var", None)
+
+
+class TestConfigLoadBundleStore:
+    @pytest.fixture()
+    def store(self, tmp_path: Path) -> config.ConfigLoadBundleStore:
+        return config.ConfigLoadBundleStore(tmp_path / "bundles")
+
+    @pytest.fixture()
+    def config_file(self, tmp_path: Path) -> Path:
+        config_file = tmp_path / "main.mk"
+        config_file.write_text("a = 1\n")
+        return config_file
+
+    def test_read_not_existing_bundle(self, store: config.ConfigLoadBundleStore) -> None:
+        assert store.read("0123") is None
+
+    def test_write(self, store: config.ConfigLoadBundleStore) -> None:
+        store.write("0123", {"abc": 1})
+        assert store.read("0123") == {"abc": 1}
+
+    def test_write_unpicklable(self, store: config.ConfigLoadBundleStore) -> None:
+        store.write("0123", {"abc": lambda: 1})
+        assert store.read("0123") is None
+
+    def test_digest_of_missing_file(
+        self, store: config.ConfigLoadBundleStore, tmp_path: Path
+    ) -> None:
+        assert store.digest([tmp_path / "missing.mk"], salt=b"") is None
+
+    def test_digest_depends_on_contents(
+        self, store: config.ConfigLoadBundleStore, config_file: Path
+    ) -> None:
+        digest = store.digest([config_file], salt=b"")
+        assert digest is not None
+        assert store.digest([config_file], salt=b"") == digest
+        assert store.digest([config_file], salt=b"other") != digest
+
+        config_file.write_text("a = 2\n")
+        assert store.digest([config_file], salt=b"") not in {None, digest}
+
+    def test_digest_remembered_for_settled_files(
+        self, store: config.ConfigLoadBundleStore, config_file: Path
+    ) -> None:
+        assert store.digest([config_file], salt=b"") is not None
+        assert not list(store.path.glob("*.digest"))
+
+        os.utime(config_file, (0, 0))
+        assert store.digest([config_file], salt=b"") is not None
+        assert len(list(store.path.glob("*.digest"))) == 1
+
+
 def test__extract_check_plugins(monkeypatch: MonkeyPatch) -> None:
     duplicate_legacy_plugin = LegacyCheckDefinition(
         name="duplicate_plugin",
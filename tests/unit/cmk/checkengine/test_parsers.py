@@ -9,7 +9,6 @@
 # mypy: disable-error-code="type-arg"
 
 
-import copy
 import itertools
 import logging
 import time
@@ -27,7 +26,7 @@ from cmk.checkengine.parser import (
     SectionStore,
     SNMPParser,
 )
-from cmk.checkengine.parser._agent import ParserState
+from cmk.checkengine.parser._agent import HostSectionParser, ParserState
 from cmk.checkengine.parser._markers import PiggybackMarker, SectionMarker
 from cmk.checkengine.plugins import SectionName
 from cmk.helper_interface import AgentRawData
@@ -540,15 +539,7 @@ class TestAgentParser:
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         monkeypatch.setattr(time, "time", lambda c=itertools.count(1000, 50): next(c))
-        monkeypatch.setattr(
-            SectionStore,
-            "load",
-            lambda self: {
-                SectionName("persisted"): (42, 69, [["content"]]),
-            },
-        )
-        # Patch IO:
-        monkeypatch.setattr(SectionStore, "store", lambda self, sections: None)
+        store.store({SectionName("persisted"): (42, 69, [["content"]])})
 
         raw_data = AgentRawData(
             b"\n".join(
@@ -573,6 +564,7 @@ class TestAgentParser:
         assert ahs.piggybacked_raw_data == {}
         assert store.load() == {
             SectionName("persisted"): (42, 69, [["content"]]),
+            SectionName("section"): (1000, 1050, [["first", "line"], ["second", "line"]]),
         }
 
     def test_section_filtering_and_merging_host(
@@ -673,6 +665,63 @@ class TestAgentParser:
         }
         assert not store.load()
 
+    def test_deselected_section_content_is_skipped(
+        self, parser: AgentParser, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        processed: list[Sequence[bytes]] = []
+        orig_do_bulk_action = HostSectionParser.do_bulk_action
+
+        def do_bulk_action(self_: HostSectionParser, lines: Sequence[bytes]) -> None:
+            processed.append(lines)
+            orig_do_bulk_action(self_, lines)
+
+        monkeypatch.setattr(HostSectionParser, "do_bulk_action", do_bulk_action)
+        raw_data = AgentRawData(
+            b"\n".join(
+                (
+                    b"<<<deselected>>>",
+                    b"1st line",
+                    b"<<<selected>>>",
+                    b"2nd line",
+                    b"<<<deselected>>>",
+                    b"3rd line",
+                )
+            )
+        )
+
+        ahs = parser.parse(raw_data, selection=frozenset({SectionName("selected")}))
+
+        assert ahs.sections == {SectionName("selected"): [["2nd", "line"]]}
+        assert processed == [[b"2nd line"]]
+
+    def test_line_endings_and_header_like_lines(self, parser: AgentParser) -> None:
+        raw_data = AgentRawData(
+            b"\r\n".join(
+                (
+                    b"<<<section>>>",
+                    b"1st line",
+                    b"",
+                    b"  ",
+                    b"<<<not a header",
+                    b"2nd line  ",
+                    b"<<<section:nostrip()>>>",
+                    b" 3rd line ",
+                    b"",
+                )
+            )
+        )
+
+        ahs = parser.parse(raw_data, selection=NO_SELECTION)
+
+        assert ahs.sections == {
+            SectionName("section"): [
+                ["1st", "line"],
+                ["<<<not", "a", "header"],
+                ["2nd", "line"],
+                ["3rd", "line"],
+            ],
+        }
+
     def test_section_lines_are_correctly_ordered_with_different_separators(
         self, parser: AgentParser, store: SectionStore[Sequence[AgentRawDataSectionElem]]
     ) -> None:
@@ -915,16 +964,10 @@ class TestSNMPParser:
         assert ahs.piggybacked_raw_data == {}
 
 
-class MockStore(SectionStore):
-    def __init__(self, path: str | Path, sections: object, *, logger: logging.Logger) -> None:
-        super().__init__(path, logger=logger)
-        self._sections = sections
-
-    def store(self, sections):
-        self._sections = copy.copy(sections)
-
-    def load(self):
-        return copy.copy(self._sections)
+def _make_store(path: Path, sections, *, logger: logging.Logger) -> SectionStore:
+    section_store = SectionStore(path, logger=logger)
+    section_store.store(sections)
+    return section_store
 
 
 class TestAgentPersistentSectionHandling:
@@ -932,8 +975,10 @@ class TestAgentPersistentSectionHandling:
     def logger(self):
         return logging.getLogger("test")
 
-    def test_update_with_empty_store_and_empty_raw_data(self, logger: logging.Logger) -> None:
-        section_store = MockStore("/dev/null", {}, logger=logger)
+    def test_update_with_empty_store_and_empty_raw_data(
+        self, logger: logging.Logger, tmp_path: Path
+    ) -> None:
+        section_store = _make_store(tmp_path / "store", {}, logger=logger)
         raw_data = AgentRawData(b"")
         parser = AgentParser(
             HostName("testhost"),
@@ -951,9 +996,11 @@ class TestAgentPersistentSectionHandling:
         assert not ahs.piggybacked_raw_data
         assert section_store.load() == {}
 
-    def test_update_with_store_and_empty_raw_data(self, logger: logging.Logger) -> None:
-        section_store = MockStore(
-            "/dev/null",
+    def test_update_with_store_and_empty_raw_data(
+        self, logger: logging.Logger, tmp_path: Path
+    ) -> None:
+        section_store = _make_store(
+            tmp_path / "store",
             {SectionName("stored"): (0, 0, [])},
             logger=logger,
         )
@@ -974,9 +1021,11 @@ class TestAgentPersistentSectionHandling:
         assert not ahs.piggybacked_raw_data
         assert section_store.load() == {SectionName("stored"): (0, 0, [])}
 
-    def test_update_with_empty_store_and_raw_data(self, logger: logging.Logger) -> None:
+    def test_update_with_empty_store_and_raw_data(
+        self, logger: logging.Logger, tmp_path: Path
+    ) -> None:
         raw_data = AgentRawData(b"<<<fresh>>>")
-        section_store = MockStore("/dev/null", {}, logger=logger)
+        section_store = _make_store(tmp_path / "store", {}, logger=logger)
         parser = AgentParser(
             HostName("testhost"),
             section_store,
@@ -993,9 +1042,11 @@ class TestAgentPersistentSectionHandling:
         assert not ahs.piggybacked_raw_data
         assert section_store.load() == {}
 
-    def test_update_with_store_and_non_persisting_raw_data(self, logger: logging.Logger) -> None:
-        section_store = MockStore(
-            "/dev/null",
+    def test_update_with_store_and_non_persisting_raw_data(
+        self, logger: logging.Logger, tmp_path: Path
+    ) -> None:
+        section_store = _make_store(
+            tmp_path / "store",
             {SectionName("stored"): (0, 0, [])},
             logger=logger,
         )
@@ -1020,11 +1071,11 @@ class TestAgentPersistentSectionHandling:
         assert section_store.load() == {SectionName("stored"): (0, 0, [])}
 
     def test_update_with_store_and_persisting_raw_data(
-        self, logger: logging.Logger, monkeypatch: pytest.MonkeyPatch
+        self, logger: logging.Logger, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         monkeypatch.setattr(time, "time", lambda c=itertools.count(1000, 50): next(c))
-        section_store = MockStore(
-            "/dev/null",
+        section_store = _make_store(
+            tmp_path / "store",
             {SectionName("stored"): (0, 0, [["canned", "section"]])},
             logger=logger,
         )
@@ -1054,9 +1105,9 @@ class TestAgentPersistentSectionHandling:
             SectionName("fresh"): (1000, 10, [["hello", "section"]]),
         }
 
-    def test_update_store_with_newest(self, logger: logging.Logger) -> None:
-        section_store = MockStore(
-            "/dev/null",
+    def test_update_store_with_newest(self, logger: logging.Logger, tmp_path: Path) -> None:
+        section_store = _make_store(
+            tmp_path / "store",
             {SectionName("section"): (0, 0, [["oldest"]])},
             logger=logger,
         )
@@ -1078,13 +1129,13 @@ class TestAgentPersistentSectionHandling:
         assert section_store.load() == {SectionName("section"): (0, 0, [["oldest"]])}
 
     def test_keep_outdated_false(
-        self, logger: logging.Logger, monkeypatch: pytest.MonkeyPatch
+        self, logger: logging.Logger, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         monkeypatch.setattr(time, "time", lambda c=itertools.count(1000, 50): next(c))
 
         raw_data = AgentRawData(b"<<<another_section>>>")
-        section_store = MockStore(
-            "/dev/null",
+        section_store = _make_store(
+            tmp_path / "store",
             {SectionName("section"): (500, 600, [])},
             logger=logger,
         )
@@ -1105,13 +1156,13 @@ class TestAgentPersistentSectionHandling:
         assert section_store.load() == {}
 
     def test_keep_outdated_true(
-        self, logger: logging.Logger, monkeypatch: pytest.MonkeyPatch
+        self, logger: logging.Logger, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         monkeypatch.setattr(time, "time", lambda c=itertools.count(1000, 50): next(c))
 
         raw_data = AgentRawData(b"<<<another_section>>>")
-        section_store = MockStore(
-            "/dev/null",
+        section_store = _make_store(
+            tmp_path / "store",
             {SectionName("section"): (500, 600, [])},
             logger=logger,
         )
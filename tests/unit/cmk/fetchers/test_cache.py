@@ -5,8 +5,13 @@
 
 import json
 import logging
+import pickle
+from pathlib import Path
+
+import pytest
 
 from cmk.checkengine.parser import SectionStore
+from cmk.checkengine.plugins import SectionName
 from cmk.fetchers import Mode
 from cmk.fetchers.filecache import MaxAge
 
@@ -23,6 +28,66 @@ class TestSectionStore:
             str,
         )
 
+    @pytest.fixture
+    def section_store(self, tmp_path: Path) -> SectionStore[list[list[str]]]:
+        return SectionStore(tmp_path / "store", logger=logging.getLogger("test"))
+
+    def test_store_and_load(self, section_store: SectionStore[list[list[str]]]) -> None:
+        sections = {
+            SectionName("one"): (1, 2, [["a", "b"], ["ä"]]),
+            SectionName("two"): (3, 4, []),
+        }
+        section_store.store(sections)
+        assert section_store.load() == sections
+
+    def test_store_nothing_removes_file(self, section_store: SectionStore[list[list[str]]]) -> None:
+        section_store.store({SectionName("one"): (1, 2, [])})
+        section_store.store({})
+        assert not section_store.path.exists()
+        assert section_store.load() == {}
+
+    def test_load_pickled_sections(self, section_store: SectionStore[list[list[str]]]) -> None:
+        section_store.path.write_bytes(pickle.dumps({"one": (1, 2, [["a"]])}))
+        assert section_store.load() == {SectionName("one"): (1, 2, [["a"]])}
+
+    def test_update_unchanged_does_not_write(
+        self, section_store: SectionStore[list[list[str]]]
+    ) -> None:
+        section_store.store({SectionName("one"): (1, 100, [["a"]])})
+        mtime = section_store.path.stat().st_mtime_ns
+        assert section_store.update(
+            {SectionName("one"): [["a"]], SectionName("two"): [["live"]]},
+            {},
+            {SectionName("one"): 100},
+            lambda valid_until, now: valid_until < now,
+            now=50,
+            keep_outdated=False,
+        ) == {SectionName("one"): [["a"]], SectionName("two"): [["live"]]}
+        assert section_store.path.stat().st_mtime_ns == mtime
+        assert section_store.load() == {SectionName("one"): (1, 100, [["a"]])}
+
+    def test_update_drops_outdated_without_decoding(
+        self, section_store: SectionStore[list[list[str]]], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        section_store.store(
+            {SectionName("old"): (1, 10, [["old"]]), SectionName("new"): (1, 100, [["new"]])}
+        )
+        decoded = []
+        monkeypatch.setattr(
+            section_store, "_decode", lambda payload: decoded.append(payload) or json.loads(payload)
+        )
+        assert section_store.update(
+            {},
+            {},
+            {},
+            lambda valid_until, now: valid_until < now,
+            now=50,
+            keep_outdated=False,
+        ) == {SectionName("new"): [["new"]]}
+        assert decoded == [b'[["new"]]']
+        monkeypatch.undo()
+        assert section_store.load() == {SectionName("new"): (1, 100, [["new"]])}
+
 
 class TestMaxAge:
     def test_repr(self) -> None:
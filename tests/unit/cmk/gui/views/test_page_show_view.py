@@ -7,9 +7,23 @@
 
 from collections.abc import Iterable
 
+import pytest
+
+from cmk.gui.type_defs import Row, Rows
 from cmk.gui.view import View
-from cmk.gui.views.page_show_view import _get_needed_regular_columns
-from cmk.gui.visuals.filter import Filter
+from cmk.gui.views.page_show_view import (
+    _get_needed_regular_columns,
+    _push_down_filters,
+    _sort_data,
+)
+from cmk.gui.views.sorter import Sorter, SorterEntry
+from cmk.gui.views.sorter.helpers import (
+    cmp_simple_number,
+    cmp_simple_string,
+    key_simple_number,
+    key_simple_string,
+)
+from cmk.gui.visuals.filter import Filter, filter_registry
 from cmk.gui.visuals.filter.components import FilterComponent
 
 
@@ -72,3 +86,89 @@ def test_get_needed_regular_columns(view: View) -> None:
             "some_column",
         ]
     )
+
+
+def test_push_down_filters(request_context: None) -> None:
+    headers, client_side_filters = _push_down_filters(
+        {
+            "svc_service_level": {"svc_service_level_lower": "1", "svc_service_level_upper": "2"},
+            "has_inv": {"is_has_inv": "1"},
+            "hostregex": {"host_regex": "abc"},
+        },
+        [filter_registry[ident] for ident in ["svc_service_level", "has_inv", "hostregex"]],
+    )
+    assert headers == "Filter: service_custom_variables ~ EC_SL ^(1|2)$\n"
+    assert [f.ident for f in client_side_filters] == ["has_inv"]
+
+
+def test_push_down_filters_without_value(request_context: None) -> None:
+    headers, client_side_filters = _push_down_filters(
+        {"has_inv": {"is_has_inv": ""}},
+        [filter_registry["has_inv"]],
+    )
+    assert headers == ""
+    assert not client_side_filters
+
+
+def _number_sorter(with_key: bool) -> Sorter:
+    def sort_key(row: Row, **_kwargs: object) -> object:
+        return key_simple_number("number", row)
+
+    return Sorter(
+        ident="number",
+        title="Number",
+        columns=["number"],
+        sort_function=lambda r1, r2, **_kwargs: cmp_simple_number("number", r1, r2),
+        sort_key=sort_key if with_key else None,
+    )
+
+
+def _name_sorter(with_key: bool) -> Sorter:
+    def sort_key(row: Row, **_kwargs: object) -> object:
+        return key_simple_string("name", row)
+
+    return Sorter(
+        ident="name",
+        title="Name",
+        columns=["name"],
+        sort_function=lambda r1, r2, **_kwargs: cmp_simple_string("name", r1, r2),
+        sort_key=sort_key if with_key else None,
+    )
+
+
+def _rows() -> Rows:
+    return [
+        {"name": name, "number": number, "JOIN": {"x": {"number": number}} if number % 2 else {}}
+        for name, number in [("b", 2), ("A", 1), ("a", 2), ("c", 1), ("B", 3), ("a", 1)]
+    ]
+
+
+@pytest.mark.parametrize("name_key", [True, False])
+@pytest.mark.parametrize("number_key", [True, False])
+@pytest.mark.parametrize("negate_number", [True, False])
+def test_sort_data_key_and_cmp_agree(name_key: bool, number_key: bool, negate_number: bool) -> None:
+    sorters = [
+        SorterEntry(_number_sorter(number_key), negate_number, None, None),
+        SorterEntry(_name_sorter(name_key), False, None, None),
+    ]
+    data = _rows()
+    _sort_data(data, sorters)
+    numbers = [3, 2, 2, 1, 1, 1] if negate_number else [1, 1, 1, 2, 2, 3]
+    names = {1: ["A", "a", "c"], 2: ["a", "b"], 3: ["B"]}
+    expected = [(name, number) for number in dict.fromkeys(numbers) for name in names[number]]
+    assert [(r["name"], r["number"]) for r in data] == expected
+
+
+@pytest.mark.parametrize("with_key", [True, False])
+def test_sort_data_join_columns(with_key: bool) -> None:
+    data = _rows()
+    _sort_data(data, [SorterEntry(_number_sorter(with_key), True, "x", None)])
+    # Rows without the joined row come last, in their original order
+    assert [(r["name"], r["number"]) for r in data] == [
+        ("B", 3),
+        ("A", 1),
+        ("c", 1),
+        ("a", 1),
+        ("b", 2),
+        ("a", 2),
+    ]
@@ -22,7 +22,7 @@ from cmk.gui.bi import _filters as bi_filters
 from cmk.gui.type_defs import Rows, VisualContext
 from cmk.gui.utils.output_funnel import output_funnel
 from cmk.gui.visuals import _filters as filters
-from cmk.gui.visuals.filter import filter_registry
+from cmk.gui.visuals.filter import filter_pushdown_registry, filter_registry
 from cmk.inventory.structured_data import deserialize_tree
 from cmk.livestatus_client.testing import MockLiveStatusConnection
 from cmk.utils import paths
@@ -1238,6 +1238,42 @@ def test_filters_filter_table(
             assert filt.filter_table(context, test.rows) == test.expected_rows
 
 
+@pytest.mark.parametrize(
+    "ident, request_vars, expected_headers",
+    [
+        (
+            "svc_service_level",
+            [("svc_service_level_lower", "1"), ("svc_service_level_upper", "3")],
+            "Filter: service_custom_variables ~ EC_SL ^(1|2|3)$\n",
+        ),
+        (
+            "hst_service_level",
+            [("hst_service_level_upper", "2")],
+            "Filter: host_custom_variables ~ EC_SL ^(2)$\n",
+        ),
+        ("hst_service_level", [], ""),
+        (
+            "hst_service_level",
+            [("hst_service_level_lower", "3"), ("hst_service_level_upper", "2")],
+            None,
+        ),
+    ],
+)
+def test_filters_pushdown(
+    ident: str,
+    request_vars: Sequence[tuple[str, str]],
+    expected_headers: str | None,
+    request_context: None,
+) -> None:
+    context: VisualContext = {ident: dict(request_vars)}
+    assert filter_pushdown_registry[ident].filter_headers(context) == expected_headers
+
+
+@pytest.mark.parametrize("ident", filter_pushdown_registry.keys())
+def test_pushed_down_filters_use_filter_table(ident: str) -> None:
+    assert filter_registry[ident].uses_filter_table()
+
+
 @pytest.mark.parametrize(
     "test",
     [
@@ -449,6 +449,7 @@ def test_automation_get_config_sync_state(request_context: None) -> None:
             ),
         },
         0,
+        True,
     )
 
 
@@ -559,6 +560,43 @@ def test_get_config_sync_file_infos() -> None:
     }
 
 
+def test_config_sync_file_hash_cache(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    hashed_files = []
+    create_hash = activate_changes._create_config_sync_file_hash
+
+    def _create_hash(file_path: str) -> str:
+        hashed_files.append(os.path.basename(file_path))
+        return create_hash(file_path)
+
+    monkeypatch.setattr(activate_changes, "_create_config_sync_file_hash", _create_hash)
+
+    old_file = tmp_path / "old"
+    old_file.write_text("abc")
+    os.utime(old_file, (0, 0))
+    new_file = tmp_path / "new"
+    new_file.write_text("def")
+    cache_path = tmp_path / "cache" / "hashes.pkl"
+
+    hash_cache = activate_changes.ConfigSyncFileHashCache(cache_path)
+    for path in (old_file, new_file):
+        assert hash_cache.file_hash(str(path), path.stat()) == create_hash(str(path))
+    hash_cache.save()
+    assert hashed_files == ["old", "new"]
+
+    # Recently modified files are hashed again, because they may change unnoticed
+    hashed_files.clear()
+    hash_cache = activate_changes.ConfigSyncFileHashCache(cache_path)
+    for path in (old_file, new_file):
+        assert hash_cache.file_hash(str(path), path.stat()) == create_hash(str(path))
+    assert hashed_files == ["new"]
+
+    hashed_files.clear()
+    old_file.write_text("abcd")
+    os.utime(old_file, (0, 0))
+    assert hash_cache.file_hash(str(old_file), old_file.stat()) == create_hash(str(old_file))
+    assert hashed_files == ["old"]
+
+
 def _create_get_config_sync_file_infos_test_config(base_dir: Path) -> None:
     base_dir.joinpath("etc/d1").mkdir(parents=True, exist_ok=True)
 
@@ -821,7 +859,25 @@ def test_get_sync_archive(tmp_path: Path) -> None:
         )
 
 
-def _get_test_sync_archive(tmp_path: Path) -> bytes:
+def test_get_sync_archive_compressed(tmp_path: Path) -> None:
+    sync_archive = _get_test_sync_archive(tmp_path, compress=True)
+    assert sync_archive.startswith(b"\x1f\x8b")
+    with tarfile.open(mode="r:gz", fileobj=io.BytesIO(sync_archive)) as f:
+        assert "etc/abc" in f.getnames()
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_unpack_sync_archive(tmp_path: Path, compress: bool) -> None:
+    target_dir = tmp_path / "remote"
+    target_dir.mkdir()
+    activate_changes._unpack_sync_archive(
+        _get_test_sync_archive(tmp_path / "central", compress=compress), target_dir
+    )
+    assert target_dir.joinpath("etc/abc").read_text(encoding="utf-8") == "gä"
+    assert target_dir.joinpath("working-symlink").readlink() == Path("ding")
+
+
+def _get_test_sync_archive(tmp_path: Path, compress: bool = False) -> bytes:
     tmp_path.joinpath("etc").mkdir(parents=True, exist_ok=True)
     with tmp_path.joinpath("etc/abc").open("w", encoding="utf-8") as f:
         f.write("gä")
@@ -849,6 +905,7 @@ def _get_test_sync_archive(tmp_path: Path) -> bytes:
             "working-symlink",
         ],
         tmp_path,
+        compress=compress,
     )
 
 
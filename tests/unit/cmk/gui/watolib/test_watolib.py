@@ -146,6 +146,7 @@ def test_registered_configvars() -> None:
         "log_messages",
         "log_rulehits",
         "login_screen",
+        "max_concurrent_fetches",
         "mkeventd_connect_timeout",
         "mkeventd_notify_contactgroup",
         "mkeventd_notify_facility",
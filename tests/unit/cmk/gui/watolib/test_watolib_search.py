@@ -314,6 +314,103 @@ class TestIndexBuilderAndSearcher:
             ("Localization-dependent", [SearchResult(title="localization_dependent", url="")]),
         ]
 
+    @pytest.mark.parametrize(
+        "query, expected_titles",
+        [
+            pytest.param("change_dep", ["change_dependent"], id="n-grams"),
+            pytest.param("dependent", ["change_dependent", "localization_dependent"], id="shared"),
+            pytest.param("loc dep", ["localization_dependent"], id="space"),
+            pytest.param("ch", ["change_dependent"], id="too short for n-grams"),
+            pytest.param("[cl]*_dep", ["change_dependent", "localization_dependent"], id="class"),
+            pytest.param("[^c]*_dep", ["localization_dependent"], id="negated class"),
+            pytest.param("change\\_dep", ["change_dependent"], id="escape"),
+            pytest.param("dependentx", [], id="no n-gram match"),
+            pytest.param("dependent change", [], id="no glob match"),
+        ],
+    )
+    @pytest.mark.usefixtures("with_admin_login")
+    def test_search_query(
+        self,
+        index_builder: IndexBuilder,
+        index_searcher: IndexSearcher,
+        query: str,
+        expected_titles: list[str],
+    ) -> None:
+        index_builder.build_full_index(UserPermissions({}, {}, {}, []))
+        assert (
+            sorted(
+                result.title
+                for _topic, results in index_searcher.search(query, Config())
+                for result in results
+            )
+            == expected_titles
+        )
+
+    @pytest.mark.usefixtures("with_admin_login")
+    def test_search_max_results_per_topic(
+        self,
+        monkeypatch: MonkeyPatch,
+        match_item_generator_registry: MatchItemGeneratorRegistry,
+        index_builder: IndexBuilder,
+        clean_redis_client: "Redis",
+    ) -> None:
+        def many_match_items(user_permissions: UserPermissions) -> MatchItems:
+            for idx in range(20):
+                yield MatchItem(
+                    title=f"change_dependent {idx}",
+                    topic="Change-dependent",
+                    url="",
+                    match_texts=[f"change_dependent {idx}"],
+                )
+
+        monkeypatch.setattr(
+            match_item_generator_registry["change_dependent"],
+            "generate_match_items",
+            many_match_items,
+        )
+        index_builder.build_full_index(UserPermissions({}, {}, {}, []))
+
+        assert self._evaluate_search_results_by_topic(
+            IndexSearcher(clean_redis_client, PermissionsHandler(), max_results_per_topic=3).search(
+                "change_dependent", Config()
+            )
+        ) == [
+            (
+                "Change-dependent",
+                [SearchResult(title=f"change_dependent {idx}", url="") for idx in range(3)],
+            ),
+        ]
+
+    @pytest.mark.usefixtures("with_admin_login")
+    def test_search_duplicate_match_texts(
+        self,
+        monkeypatch: MonkeyPatch,
+        match_item_generator_registry: MatchItemGeneratorRegistry,
+        index_builder: IndexBuilder,
+        index_searcher: IndexSearcher,
+    ) -> None:
+        def duplicate_match_items(user_permissions: UserPermissions) -> MatchItems:
+            for idx in range(3):
+                yield MatchItem(
+                    title=f"change_dependent {idx}",
+                    topic="Change-dependent",
+                    url="",
+                    match_texts=["change_dependent"],
+                )
+
+        monkeypatch.setattr(
+            match_item_generator_registry["change_dependent"],
+            "generate_match_items",
+            duplicate_match_items,
+        )
+        index_builder.build_full_index(UserPermissions({}, {}, {}, []))
+
+        assert self._evaluate_search_results_by_topic(
+            index_searcher.search("change_dependent", Config())
+        ) == [
+            ("Change-dependent", [SearchResult(title="change_dependent 2", url="")]),
+        ]
+
     @staticmethod
     def _evaluate_search_results_by_topic(
         results_by_topic: SearchResultsByTopic,
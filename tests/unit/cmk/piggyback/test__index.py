@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+from pathlib import Path
+
+from cmk.piggyback.backend import _index
+from cmk.piggyback.backend._paths import index_dir
+
+
+def test_record_updates(tmp_path: Path) -> None:
+    _index.record_updates(tmp_path, "source", {"host1": 1, "host2": 2})
+    _index.record_updates(tmp_path, "source", {"host2": 3})
+    _index.record_updates(tmp_path, "other", {"host1": 4})
+
+    assert _index.load_manifest(tmp_path, "source") == {"host1": 1, "host2": 3}
+    assert _index.indexed_sources(tmp_path) == ["other", "source"]
+
+
+def test_record_updates_compacts(tmp_path: Path) -> None:
+    hosts = {f"host{i}": 1 for i in range(200)}
+    for timestamp in range(10):
+        _index.record_updates(tmp_path, "source", dict.fromkeys(hosts, timestamp))
+
+    assert _index.load_manifest(tmp_path, "source") == dict.fromkeys(hosts, 9)
+    compacted_size = len(b"".join(_index._serialize_entry(h, 9) for h in hosts))
+    assert (index_dir(tmp_path) / "source").stat().st_size < 3 * compacted_size
+
+
+def test_load_manifest_incomplete_entry(tmp_path: Path) -> None:
+    _index.record_updates(tmp_path, "source", {"host1": 1})
+    with (index_dir(tmp_path) / "source").open("ab") as f:
+        f.write(b'["host2",')
+
+    assert _index.load_manifest(tmp_path, "source") == {"host1": 1}
+
+
+def test_edit_manifest(tmp_path: Path) -> None:
+    _index.record_updates(tmp_path, "source", {"host1": 1, "host2": 2})
+
+    with _index.edit_manifest(tmp_path, "source") as manifest:
+        del manifest["host1"]
+    assert _index.load_manifest(tmp_path, "source") == {"host2": 2}
+
+    with _index.edit_manifest(tmp_path, "source") as manifest:
+        manifest.clear()
+    assert not _index.indexed_sources(tmp_path)
+
+
+def test_is_complete(tmp_path: Path) -> None:
+    assert not _index.is_complete(tmp_path)
+    _index.mark_complete(tmp_path)
+    assert _index.is_complete(tmp_path)
+    assert not _index.indexed_sources(tmp_path)
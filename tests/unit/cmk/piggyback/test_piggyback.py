@@ -5,11 +5,14 @@
 
 
 import pprint
+import time
 
 import cmk.utils.log
 import cmk.utils.paths
 from cmk.ccc.hostaddress import HostAddress
 from cmk.piggyback import backend
+from cmk.piggyback.backend import _storage
+from cmk.piggyback.backend._paths import payload_dir
 
 _TEST_HOST_NAME = HostAddress("test-host")
 
@@ -222,6 +225,84 @@ def test_get_source_and_piggyback_hosts() -> None:
     }
 
 
+def test_cleanup_piggyback_files_indexed() -> None:
+    now = time.time()
+    omd_root = cmk.utils.paths.omd_root
+    source = HostAddress("source1")
+    backend.store_piggyback_raw_data(
+        source,
+        {HostAddress("old-host"): _PAYLOAD, HostAddress("new-host"): _PAYLOAD},
+        message_timestamp=_REF_TIME,
+        contact_timestamp=_REF_TIME,
+        omd_root=omd_root,
+    )
+    backend.store_piggyback_raw_data(
+        source,
+        {HostAddress("new-host"): _PAYLOAD},
+        message_timestamp=now,
+        contact_timestamp=now,
+        omd_root=omd_root,
+    )
+
+    # The first cleanup has to scan the directories and completes the index
+    backend.cleanup_piggyback_files(3600, (), omd_root)
+    assert not backend.get_messages_for(HostAddress("old-host"), omd_root)
+    assert _storage._get_piggybacked_hosts_for_source(omd_root, source) == [HostAddress("new-host")]
+
+    backend.store_piggyback_raw_data(
+        source,
+        {HostAddress("old-host"): _PAYLOAD},
+        message_timestamp=_REF_TIME,
+        contact_timestamp=now,
+        omd_root=omd_root,
+    )
+    assert _storage._get_piggybacked_hosts_for_source(omd_root, source) == [
+        HostAddress("new-host"),
+        HostAddress("old-host"),
+    ]
+
+    backend.cleanup_piggyback_files(3600, (), omd_root)
+    assert not backend.get_messages_for(HostAddress("old-host"), omd_root)
+    assert _storage._get_piggybacked_hosts_for_source(omd_root, source) == [HostAddress("new-host")]
+    assert backend.get_all_current_piggyback_sources(omd_root) == {source}
+    assert sorted(p.name for p in payload_dir(omd_root).iterdir()) == ["new-host"]
+
+
+def test_get_piggybacked_hosts_for_source_vanished_file() -> None:
+    omd_root = cmk.utils.paths.omd_root
+    source = HostAddress("source1")
+    backend.cleanup_piggyback_files(3600, (), omd_root)
+    backend.store_piggyback_raw_data(
+        source,
+        {_TEST_HOST_NAME: _PAYLOAD},
+        message_timestamp=_REF_TIME,
+        contact_timestamp=_REF_TIME,
+        omd_root=omd_root,
+    )
+    assert _storage._get_piggybacked_hosts_for_source(omd_root, source) == [_TEST_HOST_NAME]
+
+    _storage._get_piggybacked_file_path(source, _TEST_HOST_NAME, omd_root).unlink()
+    assert not _storage._get_piggybacked_hosts_for_source(omd_root, source)
+    assert not backend.get_all_current_piggyback_sources(omd_root)
+
+
+def test_move_for_host_rename_updates_index() -> None:
+    omd_root = cmk.utils.paths.omd_root
+    source = HostAddress("source1")
+    backend.cleanup_piggyback_files(3600, (), omd_root)
+    backend.store_piggyback_raw_data(
+        source,
+        {HostAddress("old-name"): _PAYLOAD},
+        message_timestamp=_REF_TIME,
+        contact_timestamp=_REF_TIME,
+        omd_root=omd_root,
+    )
+
+    backend.move_for_host_rename(omd_root, "old-name", "new-name")
+
+    assert _storage._get_piggybacked_hosts_for_source(omd_root, source) == [HostAddress("new-name")]
+
+
 class TestPiggybackMetaData:
     def test_serialization_roundtrip(self) -> None:
         pmd = backend.PiggybackMetaData(
@@ -42,3 +42,74 @@ def test__on_message() -> None:
     ]
     actual_payload = get_messages_for(HostName("target"), cmk.utils.paths.omd_root)
     assert actual_payload == expected_payload
+
+
+def _message(
+    source: str, piggybacked: str, last_update: int, raw_data: bytes = b"data"
+) -> PiggybackMessage:
+    return PiggybackMessage(
+        meta=PiggybackMetaData(
+            source=HostName(source),
+            piggybacked=HostName(piggybacked),
+            last_update=last_update,
+            last_contact=1640000000,
+        ),
+        raw_data=raw_data,
+    )
+
+
+def test_make_payloads() -> None:
+    assert payload.make_payloads(
+        [
+            _message("source1", "host1", 1640000020),
+            _message("source2", "host1", 1640000020),
+            _message("source1", "host2", 1640000020),
+            _message("source1", "host3", 1640000030),
+        ]
+    ) == [
+        payload.PiggybackPayload(
+            source_host=HostName("source1"),
+            raw_data={HostName("host1"): (b"data",), HostName("host2"): (b"data",)},
+            message_timestamp=1640000020,
+            contact_timestamp=1640000000,
+        ),
+        payload.PiggybackPayload(
+            source_host=HostName("source2"),
+            raw_data={HostName("host1"): (b"data",)},
+            message_timestamp=1640000020,
+            contact_timestamp=1640000000,
+        ),
+        payload.PiggybackPayload(
+            source_host=HostName("source1"),
+            raw_data={HostName("host3"): (b"data",)},
+            message_timestamp=1640000030,
+            contact_timestamp=1640000000,
+        ),
+    ]
+
+
+def test_make_payloads_max_size() -> None:
+    payloads = payload.make_payloads(
+        [_message("source", f"host{i}", 1640000020, b"x" * 40) for i in range(5)],
+        max_size=100,
+    )
+    assert [list(p.raw_data) for p in payloads] == [
+        ["host0", "host1"],
+        ["host2", "host3"],
+        ["host4"],
+    ]
+
+
+def test_make_payloads_roundtrip() -> None:
+    messages = [_message("source", f"host{i}", 1640000020, b"line1\nline2\n") for i in range(3)]
+    on_message = payload.save_payload_on_message(
+        logging.getLogger("test"), cmk.utils.paths.omd_root
+    )
+
+    for received in payload.make_payloads(messages):
+        on_message(Mock(), DeliveryTag(0), received)
+
+    for message in messages:
+        (stored,) = get_messages_for(message.meta.piggybacked, cmk.utils.paths.omd_root)
+        assert stored.meta == message.meta
+        assert stored.raw_data == b"line1\nline2\n\n"
@@ -111,6 +111,45 @@ def test_get_snmp_table(
     assert get_all_snmp_tables(snmp_info) == expected_values
 
 
+def test_get_snmp_table_walks_missing_columns_at_once() -> None:
+    walked: list[Sequence[str]] = []
+
+    class Backend(SNMPTestBackend):
+        def walk_columns(self, /, oids, *, context, **kw):
+            walked.append(oids)
+            return super().walk_columns(oids, context=context, **kw)
+
+    tree = BackendSNMPTree(
+        base=".1.2",
+        oids=[
+            BackendOIDSpec("1", "string", False),
+            BackendOIDSpec(SpecialColumn.END, "string", False),
+            BackendOIDSpec("2", "string", True),
+            BackendOIDSpec("3", "string", False),
+            BackendOIDSpec("1", "string", False),
+        ],
+    )
+    walk_cache = {(".1.2.3", "f3a8901547f4c88fd9947f9e401ce2", False): [(".1.2.3.1", b"cached")]}
+
+    assert get_snmp_table(
+        section_name=SNMPSectionName("unit_test"),
+        tree=tree,
+        walk_cache=walk_cache,
+        backend=Backend(SNMPConfig, logger),
+        log=logger.debug,
+    ) == [
+        ["C0FEFE", "1", "C0FEFE", "cached", "C0FEFE"],
+        ["C0FEFE", "2", "C0FEFE", "", "C0FEFE"],
+        ["C0FEFE", "3", "C0FEFE", "", "C0FEFE"],
+    ]
+    assert walked == [[".1.2.1", ".1.2.2"]]
+    assert set(walk_cache) == {
+        (".1.2.1", "f3a8901547f4c88fd9947f9e401ce2", False),
+        (".1.2.2", "f3a8901547f4c88fd9947f9e401ce2", True),
+        (".1.2.3", "f3a8901547f4c88fd9947f9e401ce2", False),
+    }
+
+
 @pytest.mark.parametrize(
     "encoding, columns, expected",
     [
@@ -14,7 +14,11 @@ import pytest
 from pytest import MonkeyPatch
 
 from cmk.ccc.hostaddress import HostName
+from cmk.utils.labels import Labels
 from cmk.utils.rulesets.ruleset_matcher import (
+    matches_host_name,
+    matches_host_tags,
+    matches_labels,
     matches_tag_condition,
     RuleConditionsSpec,
     RulesetMatcher,
@@ -706,6 +710,81 @@ def test_ruleset_matcher_get_service_ruleset_values_labels(
     )
 
 
+service_description_ruleset: Sequence[RuleSpec[str]] = [
+    {"id": "1", "value": "prefix", "condition": {"service_description": ["CPU"]}},
+    {
+        "id": "2",
+        "value": "regex",
+        "condition": {"service_description": [{"$regex": "Interface [0-9]+$"}]},
+    },
+    {
+        "id": "3",
+        "value": "negated",
+        "condition": {"service_description": {"$nor": ["CPU", "Memory"]}},
+    },
+    {"id": "4", "value": "disabled", "condition": {}, "options": {"disabled": True}},
+    {
+        "id": "5",
+        "value": "backreference",
+        "condition": {"service_description": [{"$regex": "(.)\\1"}]},
+    },
+    {"id": "6", "value": "case insensitive", "condition": {"service_description": ["(?i)cpu"]}},
+    {"id": "7", "value": "unconditional", "condition": {}},
+]
+
+
+@pytest.mark.parametrize(
+    "service_description, expected_result",
+    [
+        (
+            ServiceName("CPU load"),
+            ["prefix", "case insensitive", "unconditional"],
+        ),
+        (
+            ServiceName("Interface 12"),
+            ["regex", "negated", "unconditional"],
+        ),
+        (
+            ServiceName("Interface 12a"),
+            ["negated", "unconditional"],
+        ),
+        (
+            ServiceName("Memory"),
+            ["unconditional"],
+        ),
+        (
+            ServiceName("MMU"),
+            ["negated", "backreference", "unconditional"],
+        ),
+        (
+            ServiceName("cpu"),
+            ["negated", "case insensitive", "unconditional"],
+        ),
+    ],
+)
+def test_ruleset_matcher_get_service_values_all_service_description(
+    service_description: ServiceName, expected_result: Sequence[str]
+) -> None:
+    matcher = RulesetMatcher(
+        host_tags={HostName("host1"): {}},
+        host_paths={},
+        all_configured_hosts=frozenset((HostName("host1"),)),
+        clusters_of={},
+        nodes_of={},
+    )
+    for _repetition in range(2):  # the second time around, the result is cached
+        assert (
+            matcher.get_service_values_all(
+                HostName("host1"),
+                service_description,
+                {},
+                service_description_ruleset,
+                lambda hn: {},
+            )
+            == expected_result
+        )
+
+
 @pytest.mark.parametrize(
     "taggroud_id, tag_condition, expected_result",
     [
@@ -883,6 +962,189 @@ def test_ruleset_matcher_get_host_values_changed_labels() -> None:
     assert matcher.get_host_values_all(HostName("host1"), rules, those_labels) == ["value_that"]
 
 
+def _many_hosts_tags() -> Mapping[HostName, Mapping[TagGroupID, TagID]]:
+    return {
+        HostName(f"host{i:03}"): {
+            TagGroupID("criticality"): TagID(("prod", "test", "critical")[i % 3]),
+            TagGroupID("networking"): TagID(("lan", "wan", "dmz", "none")[i % 4]),
+            **({TagGroupID("snmp_ds"): TagID("snmp-v2")} if i % 5 == 0 else {}),
+        }
+        for i in range(300)
+    }
+
+
+def _many_hosts_labels(host_name: HostName) -> Labels:
+    i = int(host_name[4:])
+    if i % 7 == 0:
+        return {}
+    return {"os": ("linux", "windows")[i % 2], "env": ("a", "b", "c")[i % 3]}
+
+
+@pytest.mark.parametrize(
+    "condition",
+    [
+        pytest.param({"host_tags": {TagGroupID("criticality"): TagID("prod")}}, id="tag"),
+        pytest.param(
+            {"host_tags": {TagGroupID("networking"): {"$ne": TagID("lan")}}},
+            id="tag ne",
+        ),
+        pytest.param(
+            {
+                "host_tags": {
+                    TagGroupID("criticality"): {"$or": [TagID("prod"), TagID("critical")]},
+                    TagGroupID("networking"): {"$nor": [TagID("wan"), TagID("dmz")]},
+                }
+            },
+            id="tag or nor",
+        ),
+        pytest.param(
+            {"host_tags": {TagGroupID("snmp_ds"): {"$ne": TagID("snmp-v2")}}},
+            id="tag ne of missing tag group",
+        ),
+        pytest.param(
+            {
+                "host_label_groups": [
+                    ("and", [("and", "os:linux"), ("or", "env:b")]),
+                    ("not", [("and", "env:c")]),
+                ]
+            },
+            id="labels",
+        ),
+        pytest.param(
+            {"host_label_groups": [("and", [("not", "os:linux")]), ("or", [("and", "env:a")])]},
+            id="labels without and",
+        ),
+        pytest.param(
+            {
+                "host_name": [HostName("host001"), {"$regex": "host1[0-4]"}],
+                "host_tags": {TagGroupID("criticality"): TagID("test")},
+            },
+            id="hosts and tags",
+        ),
+        pytest.param(
+            {
+                "host_name": {"$nor": [{"$regex": "host2"}]},
+                "host_tags": {TagGroupID("networking"): TagID("wan")},
+                "host_label_groups": [("and", [("and", "os:windows")])],
+                "host_folder": "/sub/",
+            },
+            id="negated hosts, tags, labels and folder",
+        ),
+    ],
+)
+def test_ruleset_matcher_get_host_values_many_hosts(condition: RuleConditionsSpec) -> None:
+    # Enough hosts to use the bitmap index instead of matching host by host
+    host_tags = _many_hosts_tags()
+    host_paths = {hn: "/sub/" if i % 2 else "/" for i, hn in enumerate(sorted(host_tags))}
+    matcher = RulesetMatcher(
+        host_tags=host_tags,
+        host_paths=host_paths,
+        all_configured_hosts=frozenset(host_tags),
+        clusters_of={},
+        nodes_of={},
+    )
+    rules: Sequence[RuleSpec[str]] = [{"id": "1", "value": "match", "condition": condition}]
+
+    for host_name, tags_of_host in host_tags.items():
+        expected = (
+            host_paths[host_name].startswith(condition.get("host_folder", "/"))
+            and matches_host_tags(set(tags_of_host.items()), condition.get("host_tags", {}))
+            and matches_labels(
+                _many_hosts_labels(host_name), condition.get("host_label_groups", [])
+            )
+            and matches_host_name(condition.get("host_name"), host_name)
+        )
+        assert matcher.get_host_values_all(host_name, rules, _many_hosts_labels) == (
+            ["match"] if expected else []
+        )
+
+
+def test_ruleset_matcher_update_hosts() -> None:
+    rules: Sequence[RuleSpec[str]] = [
+        {
+            "id": "1",
+            "value": "prod",
+            "condition": {"host_tags": {TagGroupID("criticality"): TagID("prod")}},
+        },
+        {"id": "2", "value": "sub", "condition": {"host_folder": "/sub/"}},
+        {
+            "id": "3",
+            "value": "linux",
+            "condition": {"host_label_groups": [("and", [("and", "os:linux")])]},
+        },
+        {
+            "id": "4",
+            "value": "wan in sub",
+            "condition": {
+                "host_tags": {TagGroupID("networking"): TagID("wan")},
+                "host_folder": "/sub/",
+            },
+        },
+    ]
+    host_tags = dict(_many_hosts_tags())
+    host_paths = {hn: "/sub/" if i % 2 else "/" for i, hn in enumerate(sorted(host_tags))}
+    host_labels = {hn: _many_hosts_labels(hn) for hn in host_tags}
+
+    def make_matcher() -> RulesetMatcher:
+        return RulesetMatcher(
+            host_tags=host_tags,
+            host_paths=host_paths,
+            all_configured_hosts=frozenset(host_tags),
+            clusters_of={},
+            nodes_of={},
+        )
+
+    def values(matcher: RulesetMatcher) -> Mapping[HostName, tuple[Sequence[str], Sequence[str]]]:
+        return {
+            hn: (
+                matcher.get_host_values_all(hn, rules, host_labels.__getitem__),
+                matcher.get_service_values_all(hn, "svc", {}, rules, host_labels.__getitem__),
+            )
+            for hn in host_tags
+        }
+
+    matcher = make_matcher()
+    values(matcher)
+
+    changed_hosts = {HostName("host001"), HostName("host002"), HostName("host150")}
+    for hn in changed_hosts:
+        host_tags[hn] = {
+            TagGroupID("criticality"): TagID("prod"),
+            TagGroupID("networking"): TagID("wan"),
+        }
+        host_paths[hn] = "/" if host_paths[hn] == "/sub/" else "/sub/"
+        host_labels[hn] = {"os": "linux"} if host_labels[hn].get("os") != "linux" else {}
+
+    matcher.update_hosts(
+        changed_hosts,
+        host_tags=host_tags,
+        host_paths=host_paths,
+        labels_of_host=host_labels.__getitem__,
+    )
+
+    assert values(matcher) == values(make_matcher())
+
+
+def test_ruleset_matcher_invalidate_rulesets() -> None:
+    matcher = RulesetMatcher(
+        host_tags={HostName("host1"): {}},
+        host_paths={},
+        all_configured_hosts=frozenset((HostName("host1"),)),
+        clusters_of={},
+        nodes_of={},
+    )
+    rules: list[RuleSpec[str]] = [{"id": "1", "value": "first", "condition": {}}]
+    assert matcher.get_host_values_all(HostName("host1"), rules, lambda hn: {}) == ["first"]
+
+    rules.append({"id": "2", "value": "second", "condition": {}})
+    matcher.invalidate_rulesets([rules])
+
+    assert matcher.get_host_values_all(HostName("host1"), rules, lambda hn: {}) == [
+        "first",
+        "second",
+    ]
+
+
 class TestSingleRulesetMatcher:
     @staticmethod
     def _make_matcher() -> RulesetMatcher:
@@ -3,6 +3,8 @@
 # This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
 # conditions defined in the file COPYING, which is part of this source code package.
 
+import pytest
+
 import cmk.utils.caching
 
 
@@ -45,3 +47,86 @@ def test_populated() -> None:
     assert cache.is_populated()
     cache.clear()
     assert not cache.is_populated()
+
+
+def test_statistics() -> None:
+    mgr = cmk.utils.caching.CacheManager()
+    mgr.set_limits({}, collect_statistics=True)
+    cache = mgr.obtain_cache("test")
+    cache["a"] = 1
+
+    assert cache["a"] == 1
+    assert cache.get("b") is None
+    assert cache.setdefault("a", 2) == 1
+    with pytest.raises(KeyError):
+        _ = cache["c"]
+
+    assert mgr.statistics() == {
+        "test": cmk.utils.caching.CacheStatistics(
+            size=1, maxsize=None, hits=2, misses=2, evictions=0
+        )
+    }
+
+
+def test_no_statistics_by_default() -> None:
+    mgr = cmk.utils.caching.CacheManager()
+    cache = mgr.obtain_cache("test")
+    cache["a"] = 1
+
+    assert cache["a"] == 1
+    assert type(cache) is cmk.utils.caching.DictCache
+    assert mgr.statistics() == {
+        "test": cmk.utils.caching.CacheStatistics(
+            size=1, maxsize=None, hits=None, misses=None, evictions=0
+        )
+    }
+
+
+def test_limits_only_apply_to_configured_caches() -> None:
+    mgr = cmk.utils.caching.CacheManager()
+    mgr.set_limits({"bounded": cmk.utils.caching.CacheLimits(maxsize=2)})
+
+    assert isinstance(mgr.obtain_cache("bounded"), cmk.utils.caching.BoundedDictCache)
+    assert not isinstance(mgr.obtain_cache("unbounded"), cmk.utils.caching.BoundedDictCache)
+
+
+def test_lru_eviction() -> None:
+    cache = cmk.utils.caching.BoundedDictCache(maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1  # "b" is now the least recently used entry
+    assert cache.setdefault("c", 3) == 3
+
+    assert list(cache.items()) == [("a", 1), ("c", 3)]
+    assert cache.statistics() == cmk.utils.caching.CacheStatistics(
+        size=2, maxsize=2, hits=1, misses=1, evictions=1
+    )
+
+
+def test_setdefault_statistics() -> None:
+    cache = cmk.utils.caching.BoundedDictCache(maxsize=2)
+    assert cache.setdefault("a", 1) == 1
+    assert cache.setdefault("a", 2) == 1
+    assert cache.statistics() == cmk.utils.caching.CacheStatistics(
+        size=1, maxsize=2, hits=1, misses=1, evictions=0
+    )
+
+
+def test_ttl_eviction(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 1000.0
+    monkeypatch.setattr("cmk.utils.caching.time.monotonic", lambda: now)
+    cache = cmk.utils.caching.BoundedDictCache(ttl=10)
+    cache["a"] = 1
+
+    now += 5
+    assert "a" in cache
+    assert cache["a"] == 1
+
+    now += 10
+    assert "a" not in cache
+    with pytest.raises(KeyError):
+        _ = cache["a"]
+    assert cache.setdefault("a", 2) == 2
+    assert cache.statistics() == cmk.utils.caching.CacheStatistics(
+        size=1, maxsize=None, hits=1, misses=2, evictions=1
+    )
@@ -7,8 +7,10 @@
 import errno
 import socket
 import ssl
+import threading
+import time
 from collections.abc import Sequence
-from contextlib import closing
+from contextlib import closing, suppress
 from pathlib import Path
 
 import pytest
@@ -335,3 +337,148 @@ def test_livestatus_lql(
     result: str,
 ) -> None:
     assert livestatus.livestatus_lql(*args) == result
+
+
+def _serve_livestatus(sock_path: Path, response: bytes, delay: float) -> None:
+    server = socket.socket(socket.AF_UNIX)
+    server.bind(str(sock_path))
+    server.listen(1)
+
+    def serve() -> None:
+        with closing(server), closing(server.accept()[0]) as connection:
+            query = b""
+            while not query.endswith(b"\n\n"):
+                query += connection.recv(4096)
+            time.sleep(delay)
+            # The client may have given up already
+            with suppress(OSError):
+                connection.sendall(b"200 %11d\n%s" % (len(response), response))
+                connection.recv(4096)  # wait for the client to hang up
+
+    threading.Thread(target=serve, daemon=True).start()
+
+
+def _site_config(site_id: str, sock_path: Path) -> livestatus.SiteConfiguration:
+    return livestatus.SiteConfiguration(
+        alias=site_id,
+        disable_wato=True,
+        disabled=False,
+        id=SiteId(site_id),
+        insecure=False,
+        multisiteurl="",
+        persist=False,
+        proxy=None,
+        replicate_ec=False,
+        replicate_mkps=False,
+        replication=None,
+        message_broker_port=5672,
+        status_host=None,
+        timeout=5,
+        url_prefix="",
+        user_login=True,
+        user_sync=None,
+        is_trusted=False,
+        socket=f"unix:{sock_path}",
+    )
+
+
+@pytest.fixture(name="slow_and_fast_site")
+def fixture_slow_and_fast_site(tmp_path: Path) -> livestatus.MultiSiteConnection:
+    _serve_livestatus(tmp_path / "slow", b'[["slow-host"]]', delay=0.5)
+    _serve_livestatus(tmp_path / "fast", b'[["fast-host"]]', delay=0.0)
+    return livestatus.MultiSiteConnection(
+        livestatus.SiteConfigurations(
+            {
+                SiteId("slow"): _site_config("slow", tmp_path / "slow"),
+                SiteId("fast"): _site_config("fast", tmp_path / "fast"),
+            }
+        )
+    )
+
+
+def test_query_parallel_keeps_site_order(
+    slow_and_fast_site: livestatus.MultiSiteConnection,
+) -> None:
+    slow_and_fast_site.set_prepend_site(True)
+    assert slow_and_fast_site.query("GET hosts\nColumns: name") == [
+        ["slow", "slow-host"],
+        ["fast", "fast-host"],
+    ]
+    assert slow_and_fast_site.alive_sites() == ["slow", "fast"]
+    assert not slow_and_fast_site.dead_sites()
+
+
+def test_query_parallel_partial_results(slow_and_fast_site: livestatus.MultiSiteConnection) -> None:
+    slow_and_fast_site.set_response_deadline(0.2)
+    assert slow_and_fast_site.query("GET hosts\nColumns: name") == [["fast-host"]]
+    assert slow_and_fast_site.alive_sites() == ["fast"]
+    assert list(slow_and_fast_site.dead_sites()) == ["slow"]
+
+
+def test_query_parallel_no_partial_results(
+    slow_and_fast_site: livestatus.MultiSiteConnection,
+) -> None:
+    slow_and_fast_site.set_response_deadline(0.2, partial_results=False)
+    with pytest.raises(livestatus.MKLivestatusSocketError, match="site\\(s\\) slow"):
+        slow_and_fast_site.query("GET hosts\nColumns: name")
+
+
+@pytest.mark.parametrize(
+    "query, response",
+    [
+        pytest.param(
+            "GET log\nColumns: message time",
+            b'[["a line\\nwith a newline", 1],\n["another line", 2]]\n',
+            id="python",
+        ),
+        pytest.param(
+            livestatus.Query(livestatus.QuerySpecification("log", ["message", "time"])),
+            b'[["a line\\nwith a newline",1],\n["another line",2]]\n',
+            id="json",
+        ),
+    ],
+)
+def test_query_iter(
+    monkeypatch: MonkeyPatch, tmp_path: Path, query: str | livestatus.Query, response: bytes
+) -> None:
+    monkeypatch.setattr("cmk.livestatus_client._connection._STREAMING_CHUNK_SIZE", 7)
+    _serve_livestatus(tmp_path / "live", response, delay=0.0)
+    live = livestatus.SingleSiteConnection(f"unix:{tmp_path / 'live'}")
+
+    assert list(live.query_iter(query)) == [["a line\nwith a newline", 1], ["another line", 2]]
+    assert live.socket is not None
+
+
+@pytest.mark.parametrize(
+    "response, rows",
+    [
+        (b"[]\n", []),
+        (b"[[1]]\n", [[1]]),
+    ],
+)
+def test_query_iter_small_responses(
+    tmp_path: Path, response: bytes, rows: Sequence[Sequence[int]]
+) -> None:
+    _serve_livestatus(tmp_path / "live", response, delay=0.0)
+    live = livestatus.SingleSiteConnection(f"unix:{tmp_path / 'live'}")
+
+    assert list(live.query_iter("GET hosts\nColumns: state")) == rows
+
+
+def test_query_iter_not_consumed(tmp_path: Path) -> None:
+    _serve_livestatus(tmp_path / "live", b'[["host1"],\n["host2"]]\n', delay=0.0)
+    live = livestatus.SingleSiteConnection(f"unix:{tmp_path / 'live'}")
+
+    rows = live.query_iter("GET hosts\nColumns: name")
+    assert next(rows) == ["host1"]
+    rows.close()
+    # The rest of the response must not end up in the next query
+    assert live.socket is None
+
+
+def test_query_iter_multisite(slow_and_fast_site: livestatus.MultiSiteConnection) -> None:
+    slow_and_fast_site.set_prepend_site(True)
+    assert list(slow_and_fast_site.query_iter("GET hosts\nColumns: name")) == [
+        ["slow", "slow-host"],
+        ["fast", "fast-host"],
+    ]